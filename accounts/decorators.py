@@ -29,7 +29,10 @@ def require_school_head(*, submission_kwarg: str | None = None, school_kwarg: st
 
                 submission = kwargs[submission_kwarg]
                 if not isinstance(submission, Submission):
-                    submission = get_object_or_404(Submission, pk=submission)
+                    submission = get_object_or_404(
+                        Submission.objects.select_related("school", "school__profile", "form_template", "period"),
+                        pk=submission,
+                    )
                 kwargs.setdefault("submission_obj", submission)
                 target_school = submission.school
             elif school_kwarg and school_kwarg in kwargs:
@@ -53,3 +53,32 @@ def scope_submissions(user: User):
         return qs.filter(school__district__in=profile.districts.all())
 
     return Submission.objects.none()
+
+
+def scope_status_counters(user: User):
+    """``SubmissionStatusCounter`` rows covering ``scope_submissions(user)``.
+
+    Returns None when that scope is a single school, which the per-district
+    counters cannot express; callers then count submissions directly.
+    """
+    from submissions.models import SubmissionStatusCounter
+
+    if not getattr(user, "is_authenticated", False):
+        return SubmissionStatusCounter.objects.none()
+
+    qs = SubmissionStatusCounter.objects.all()
+
+    if roles.is_sgod_admin(user) or roles.is_section_admin(user):
+        return qs
+
+    profile = roles.get_profile(user)
+    if not profile:
+        return SubmissionStatusCounter.objects.none()
+
+    if profile.school_id:
+        return None
+
+    if profile.districts.exists():
+        return qs.filter(district__in=profile.districts.all())
+
+    return SubmissionStatusCounter.objects.none()
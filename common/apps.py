@@ -1,6 +1,12 @@
 from django.apps import AppConfig
+from django.db.backends.signals import connection_created
 
 
 class CommonConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'common'
+
+    def ready(self):
+        from .db import configure_sqlite_connection
+
+        connection_created.connect(configure_sqlite_connection, dispatch_uid='common.configure_sqlite_connection')
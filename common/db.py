@@ -0,0 +1,181 @@
+"""SQLite write coordination for deadline surges.
+
+SQLite allows one writer at a time.  At quarter close many school heads save
+at once and requests fail with ``database is locked``.  This module:
+
+* applies ``settings.SQLITE_PRAGMAS`` (WAL, busy_timeout, synchronous) to
+  every new SQLite connection via ``connection_created`` (see
+  :class:`common.apps.CommonConfig`);
+* queues heavy writes behind a per-process write slot
+  (``settings.SQLITE_WRITE_CONCURRENCY``) so threads of one worker do not
+  fight over the file lock;
+* runs them in a short explicit transaction that is retried with jittered
+  exponential backoff when SQLite still reports a lock
+  (``settings.SQLITE_WRITE_RETRIES``).
+
+On other database engines the queue and retries are no-ops.
+"""
+from __future__ import annotations
+
+import functools
+import logging
+import random
+import sqlite3
+import threading
+import time
+from contextlib import contextmanager
+
+from django.conf import settings
+from django.db import DEFAULT_DB_ALIAS, OperationalError, connections, transaction
+
+logger = logging.getLogger(__name__)
+
+LOCK_ERROR_MARKERS = ("database is locked", "database table is locked", "database is busy")
+
+BACKOFF_BASE_SECONDS = 0.05
+BACKOFF_CAP_SECONDS = 2.0
+
+_write_gates: dict[str, threading.BoundedSemaphore] = {}
+_write_gates_lock = threading.Lock()
+_local = threading.local()
+
+
+def apply_sqlite_pragmas(cursor, pragmas=None) -> None:
+    """Run ``PRAGMA name = value`` for each configured pragma on ``cursor``."""
+    pragmas = getattr(settings, "SQLITE_PRAGMAS", {}) if pragmas is None else pragmas
+    for name, value in pragmas.items():
+        if not str(name).isidentifier():
+            raise ValueError(f"Invalid SQLite pragma name: {name!r}")
+        cursor.execute(f"PRAGMA {name} = {value}")
+
+
+def configure_sqlite_connection(sender, connection, **kwargs) -> None:
+    """``connection_created`` receiver applying ``SQLITE_PRAGMAS``."""
+    if connection.vendor != "sqlite":
+        return
+    with connection.cursor() as cursor:
+        apply_sqlite_pragmas(cursor)
+
+
+def is_lock_error(exc: BaseException) -> bool:
+    """True for Django or raw ``sqlite3`` errors caused by a held lock."""
+    message = str(exc).lower()
+    return isinstance(exc, (OperationalError, sqlite3.OperationalError)) and any(
+        marker in message for marker in LOCK_ERROR_MARKERS
+    )
+
+
+def backoff_delay(attempt: int, base: float = BACKOFF_BASE_SECONDS, cap: float = BACKOFF_CAP_SECONDS) -> float:
+    """Full-jitter exponential backoff for retry ``attempt`` (0-based)."""
+    return random.uniform(0, min(cap, base * (2 ** attempt)))
+
+
+def _add_lock_wait(seconds: float) -> None:
+    _local.lock_wait = getattr(_local, "lock_wait", 0.0) + seconds
+
+
+def consume_lock_wait() -> float:
+    """Seconds this thread spent queued for a write slot or backing off since the last call."""
+    waited = getattr(_local, "lock_wait", 0.0)
+    _local.lock_wait = 0.0
+    return waited
+
+
+def _write_gate(using: str) -> threading.BoundedSemaphore | None:
+    if connections[using].vendor != "sqlite":
+        return None
+    slots = getattr(settings, "SQLITE_WRITE_CONCURRENCY", 1)
+    if not slots or slots < 1:
+        return None
+    with _write_gates_lock:
+        gate = _write_gates.get(using)
+        if gate is None:
+            gate = _write_gates[using] = threading.BoundedSemaphore(slots)
+    return gate
+
+
+@contextmanager
+def write_slot(using: str = DEFAULT_DB_ALIAS):
+    """Hold one of the process's SQLite write slots (re-entrant per thread)."""
+    gate = _write_gate(using)
+    held = getattr(_local, "held", None)
+    if held is None:
+        held = _local.held = set()
+    if gate is None or using in held:
+        yield
+        return
+    started = time.perf_counter()
+    gate.acquire()
+    waited = time.perf_counter() - started
+    _add_lock_wait(waited)
+    waited_ms = waited * 1000
+    if waited_ms > 100:
+        logger.info("[PERF][DB] waited %.0f ms for the %s write slot", waited_ms, using)
+    held.add(using)
+    try:
+        yield
+    finally:
+        held.discard(using)
+        gate.release()
+
+
+def retry_on_lock(func=None, *, using: str = DEFAULT_DB_ALIAS, attempts: int | None = None):
+    """Run ``func`` in ``transaction.atomic`` and retry it on SQLite lock errors.
+
+    Inside an outer transaction the call runs once: only the outermost
+    transaction can be safely replayed.
+    """
+    def decorator(inner):
+        @functools.wraps(inner)
+        def wrapper(*args, **kwargs):
+            connection = connections[using]
+            if connection.in_atomic_block or connection.vendor != "sqlite":
+                with transaction.atomic(using=using):
+                    return inner(*args, **kwargs)
+            retries = getattr(settings, "SQLITE_WRITE_RETRIES", 5) if attempts is None else attempts
+            attempt = 0
+            while True:
+                try:
+                    with transaction.atomic(using=using):
+                        return inner(*args, **kwargs)
+                except OperationalError as exc:
+                    if not is_lock_error(exc) or attempt >= retries:
+                        raise
+                    delay = backoff_delay(attempt)
+                    attempt += 1
+                    logger.warning(
+                        "[PERF][DB] %s hit a locked database; retry %d/%d in %.0f ms",
+                        inner.__qualname__, attempt, retries, delay * 1000,
+                    )
+                    time.sleep(delay)
+                    _add_lock_wait(delay)
+        return wrapper
+
+    return decorator if func is None else decorator(func)
+
+
+def coordinated_write(func=None, *, using: str = DEFAULT_DB_ALIAS, attempts: int | None = None):
+    """Queue ``func`` behind the write slot, then run it via :func:`retry_on_lock`."""
+    def decorator(inner):
+        retried = retry_on_lock(inner, using=using, attempts=attempts)
+
+        @functools.wraps(inner)
+        def wrapper(*args, **kwargs):
+            with write_slot(using):
+                return retried(*args, **kwargs)
+        return wrapper
+
+    return decorator if func is None else decorator(func)
+
+
+@contextmanager
+def coordinated_transaction(using: str = DEFAULT_DB_ALIAS):
+    """Hold the write slot for one ``transaction.atomic`` block.
+
+    For write sections that cannot simply be run again because they update
+    objects the caller keeps using (e.g. a view saving bound formsets).
+    Unlike :func:`coordinated_write` a lock error is not retried; SQLite's
+    ``busy_timeout`` still covers waits on other processes.
+    """
+    with write_slot(using), transaction.atomic(using=using):
+        yield
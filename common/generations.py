@@ -0,0 +1,28 @@
+"""Generation counters for cache invalidation.
+
+A cached result that depends on a whole table cannot be dropped row by row.
+Instead its key includes :func:`current` for the data it reads, and writers
+call :func:`bump` in the transaction that changes that data, so the next
+read misses and recomputes; stale entries simply age out.
+
+Counters are :class:`~common.models.GenerationCounter` rows rather than
+cache entries: the default cache is a per-process ``LocMemCache``, and a
+bump made by one gunicorn worker (or a management command) has to reach the
+others.  Being part of the writer's transaction, a bump becomes visible
+exactly when the change does.
+"""
+from __future__ import annotations
+
+from django.db.models import F
+
+from .models import GenerationCounter
+
+
+def current(name: str) -> int:
+    """The generation of ``name``; 0 until it is first bumped."""
+    return GenerationCounter.objects.filter(name=name).values_list("value", flat=True).first() or 0
+
+
+def bump(name: str) -> None:
+    if not GenerationCounter.objects.filter(name=name).update(value=F("value") + 1):
+        GenerationCounter.objects.bulk_create([GenerationCounter(name=name, value=1)], ignore_conflicts=True)
@@ -0,0 +1,44 @@
+"""Apply the retention policies in ``settings.RETENTION_POLICIES`` (see :mod:`common.retention`)."""
+from __future__ import annotations
+
+from django.core.management.base import BaseCommand, CommandError
+
+from common.retention import load_policies, purge
+
+
+class Command(BaseCommand):
+    help = "Delete (and optionally archive) rows older than their retention policy, in bounded chunks."
+
+    def add_arguments(self, parser):  # pragma: no cover - CLI wiring
+        parser.add_argument('models', nargs='*', help='Limit to these "app.Model" labels (default: every policy).')
+        parser.add_argument('--chunk-size', type=int, default=None, help='Rows deleted per batch (default RETENTION_CHUNK_SIZE).')
+        parser.add_argument('--pause', type=float, default=None, help='Seconds to sleep between batches (default RETENTION_PAUSE_SECONDS).')
+        parser.add_argument('--no-archive', action='store_true', help='Skip the JSONL archive even for policies that ask for one.')
+        parser.add_argument('--dry-run', action='store_true', help='Only count the rows that would be deleted.')
+
+    def handle(self, *args, **opts):
+        policies = load_policies()
+        wanted = {label.lower() for label in opts['models']}
+        if wanted:
+            policies = [policy for policy in policies if policy.model_label.lower() in wanted]
+            unknown = wanted - {policy.model_label.lower() for policy in policies}
+            if unknown:
+                raise CommandError(f"No retention policy for: {', '.join(sorted(unknown))}")
+        for policy in policies:
+            stats = purge(
+                policy,
+                chunk_size=opts['chunk_size'],
+                pause=opts['pause'],
+                dry_run=opts['dry_run'],
+                archive=False if opts['no_archive'] else None,
+            )
+            if stats.dry_run:
+                self.stdout.write(f"[DRY-RUN] {policy.model_label}: would delete {stats.rows} rows older than {policy.days} days.")
+                continue
+            line = (
+                f"{policy.model_label}: deleted {stats.rows} rows in {stats.batches} batches, "
+                f"{stats.seconds:.1f} s ({stats.rows_per_second:.0f} rows/s)"
+            )
+            if stats.archive_path and stats.rows:
+                line += f"; archived to {stats.archive_path}"
+            self.stdout.write(line)
@@ -0,0 +1,21 @@
+"""Rebuild the search documents registered with common.search."""
+from __future__ import annotations
+
+from django.core.management.base import BaseCommand, CommandError
+
+from common import search
+
+
+class Command(BaseCommand):
+    help = "Recompute search documents (all kinds, or the kinds given) from their source tables."
+
+    def add_arguments(self, parser):  # pragma: no cover - CLI wiring
+        parser.add_argument('kinds', nargs='*', help='Document kinds to rebuild (default: every registered kind).')
+
+    def handle(self, *args, **opts):
+        kinds = opts['kinds'] or search.registered_kinds()
+        unknown = set(kinds) - set(search.registered_kinds())
+        if unknown:
+            raise CommandError(f"Unknown search document kind(s): {', '.join(sorted(unknown))}")
+        for kind in kinds:
+            self.stdout.write(f"{kind}: indexed {search.rebuild(kind)} documents.")
@@ -0,0 +1,218 @@
+"""
+Deadline-surge benchmark for the SQLite write coordination in common/db.py.
+
+Simulates autosaving clients against a scratch SQLite database registered as
+an extra connection alias.  Every client thread upserts its submission's
+``SubmissionDraftBuffer`` row through the ORM every ``--interval`` seconds,
+the way ``submissions.drafts.buffer_changes`` does: a select and then a
+create or save, inside one of Django's deferred transactions.
+
+The write runs through ``common.db.coordinated_write``, so it gets the
+project's SQLITE_PRAGMAS (applied by the ``connection_created`` receiver),
+the SQLITE_WRITE_CONCURRENCY write slot and the SQLITE_WRITE_RETRIES lock
+retries.  ``--baseline`` runs the same write with those three settings
+switched off, which leaves Django's default SQLite setup: a rollback
+journal, Python's 5 s busy timeout, no queue and no retries.
+"""
+from __future__ import annotations
+
+import os
+import random
+import tempfile
+import threading
+import time
+
+from django.apps import apps
+from django.core.management.base import BaseCommand, CommandError
+from django.db import DEFAULT_DB_ALIAS, OperationalError, connections
+from django.test.utils import override_settings
+from django.utils import timezone
+
+from common.db import consume_lock_wait, coordinated_write, is_lock_error
+
+ALIAS = "surge_benchmark"
+BASELINE_SETTINGS = {"SQLITE_PRAGMAS": {}, "SQLITE_WRITE_CONCURRENCY": 0, "SQLITE_WRITE_RETRIES": 0}
+
+
+def _percentile(values, pct):
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    index = min(len(ordered) - 1, max(0, int(round(pct / 100 * (len(ordered) - 1)))))
+    return ordered[index]
+
+
+def _save_draft(submission_id: int, payload: dict) -> None:
+    """One autosave of the ``slp`` tab, shaped like ``drafts.buffer_changes``."""
+    from submissions.drafts import payload_hash
+    from submissions.models import SubmissionDraftBuffer
+
+    buffers = SubmissionDraftBuffer.objects.using(ALIAS)
+    buffer = buffers.select_for_update().filter(submission_id=submission_id, tab="slp").first()
+    if buffer is None:
+        buffers.create(submission_id=submission_id, tab="slp", payload=payload, payload_hash=payload_hash(payload))
+    else:
+        buffer.payload = payload
+        buffer.payload_hash = payload_hash(payload)
+        buffer.save(using=ALIAS, update_fields=["payload", "payload_hash", "updated_at"])
+
+
+class Command(BaseCommand):
+    help = "Benchmark sustained SQLite ORM writes per second with many concurrent autosaving clients."
+
+    def add_arguments(self, parser):  # pragma: no cover - CLI wiring
+        parser.add_argument('--clients', type=int, default=500, help='Concurrent autosaving clients (threads).')
+        parser.add_argument('--duration', type=float, default=15.0, help='Benchmark length in seconds.')
+        parser.add_argument('--interval', type=float, default=2.0, help='Seconds between autosaves per client.')
+        parser.add_argument('--payload-cells', type=int, default=40, help='Cells in each draft payload.')
+        parser.add_argument('--database', default='', help='Scratch SQLite file to use (default: a temporary file).')
+        parser.add_argument(
+            '--baseline',
+            action='store_true',
+            help="Switch off SQLITE_PRAGMAS, the write slot and retries (Django's default SQLite settings)."
+        )
+        parser.add_argument(
+            '--fail-on-lock',
+            action='store_true',
+            help='Exit with an error if any write ultimately failed with a lock error.'
+        )
+
+    def handle(self, *args, **options):
+        clients = max(1, options['clients'])
+        duration = max(1.0, options['duration'])
+        interval = max(0.01, options['interval'])
+        coordinated = not options['baseline']
+
+        path = options['database']
+        cleanup = not path
+        if not path:
+            handle, path = tempfile.mkstemp(prefix='surge-', suffix='.sqlite3')
+            os.close(handle)
+        elif os.path.exists(path):
+            raise CommandError(f"{path} already exists; the benchmark needs a scratch file it can create.")
+
+        with override_settings(**({} if coordinated else BASELINE_SETTINGS)):
+            self._register(path)
+            try:
+                self._create_schema()
+                submission_ids = self._seed(clients)
+                self.stdout.write(
+                    f"Running {clients} clients for {duration:.0f}s (autosave every {interval:.1f}s, "
+                    f"{'coordinated' if coordinated else 'baseline'}) on {path}"
+                )
+                stats, latencies, lock_waits, wall = self._run(submission_ids, duration, interval, options)
+            finally:
+                connections[ALIAS].close()
+                del connections[ALIAS]
+                del connections.settings[ALIAS]
+                if cleanup:
+                    for suffix in ('', '-wal', '-shm', '-journal'):
+                        try:
+                            os.remove(path + suffix)
+                        except OSError:
+                            pass
+
+        attempted = stats['writes'] + stats['lock_failures'] + stats['other_failures']
+        self.stdout.write(f"Writes:           {stats['writes']} of {attempted} attempted")
+        self.stdout.write(f"Writes/second:    {stats['writes'] / wall:.1f}")
+        self.stdout.write(f"Lock failures:    {stats['lock_failures']}")
+        self.stdout.write(f"Other failures:   {stats['other_failures']}")
+        self.stdout.write(
+            "Latency ms:       p50={:.1f} p95={:.1f} p99={:.1f} max={:.1f}".format(
+                *(v * 1000 for v in (
+                    _percentile(latencies, 50), _percentile(latencies, 95),
+                    _percentile(latencies, 99), max(latencies, default=0.0),
+                ))
+            )
+        )
+        self.stdout.write(f"Slot/backoff ms:  p95={_percentile(lock_waits, 95) * 1000:.1f}")
+        if options['fail_on_lock'] and stats['lock_failures']:
+            raise CommandError(f"{stats['lock_failures']} writes failed with a locked database.")
+        self.stdout.write(self.style.SUCCESS('Surge benchmark finished.'))
+
+    @staticmethod
+    def _register(path: str) -> None:
+        databases = connections.configure_settings({
+            DEFAULT_DB_ALIAS: connections.settings[DEFAULT_DB_ALIAS],
+            ALIAS: {'ENGINE': 'django.db.backends.sqlite3', 'NAME': path},
+        })
+        connections.settings[ALIAS] = databases[ALIAS]
+
+    @staticmethod
+    def _create_schema() -> None:
+        # Tables straight from the models, as the test runner does without migrations:
+        # data migrations write to the default database.
+        with connections[ALIAS].schema_editor() as editor:
+            for model in apps.get_models():
+                if model._meta.managed and not model._meta.proxy:
+                    editor.create_model(model)
+
+    @staticmethod
+    def _seed(clients: int) -> list[int]:
+        """One draft submission per client; returns their ids."""
+        from organizations.models import District, School, Section
+        from submissions.models import FormTemplate, Period, Submission
+
+        # bulk_create throughout: save signals (search indexing, counters) write to the default database.
+        today = timezone.localdate()
+        [section] = Section.objects.using(ALIAS).bulk_create([Section(code='surge', name='Surge')])
+        [district] = District.objects.using(ALIAS).bulk_create([District(code='surge', name='Surge')])
+        [period] = Period.objects.using(ALIAS).bulk_create([
+            Period(label='Q1', school_year_start=today.year, quarter_tag='Q1', display_order=1)
+        ])
+        [form] = FormTemplate.objects.using(ALIAS).bulk_create([FormTemplate(
+            section=section, code='surge-form', title='Surge Form', period_type=FormTemplate.PeriodType.QUARTER,
+            open_at=today, close_at=today,
+        )])
+        schools = School.objects.using(ALIAS).bulk_create(
+            School(code=f'surge-{n:05d}', name=f'Surge School {n}', district=district) for n in range(clients)
+        )
+        Submission.objects.using(ALIAS).bulk_create(
+            Submission(school=school, form_template=form, period=period) for school in schools
+        )
+        return list(Submission.objects.using(ALIAS).order_by('pk').values_list('pk', flat=True))
+
+    @staticmethod
+    def _run(submission_ids, duration, interval, options):
+        write = coordinated_write(_save_draft, using=ALIAS)
+        stats_lock = threading.Lock()
+        stats = {'writes': 0, 'lock_failures': 0, 'other_failures': 0}
+        latencies: list[float] = []
+        lock_waits: list[float] = []
+        start_barrier = threading.Barrier(len(submission_ids))
+        deadline_holder = {}
+        cells = range(options['payload_cells'])
+
+        def client(submission_id: int) -> None:
+            start_barrier.wait()
+            deadline = deadline_holder.setdefault('deadline', time.perf_counter() + duration)
+            time.sleep(random.uniform(0, interval))
+            try:
+                while time.perf_counter() < deadline:
+                    payload = {f'slp_row:{n}:dnme': {'value': random.randint(0, 40), 'version': None} for n in cells}
+                    consume_lock_wait()
+                    started = time.perf_counter()
+                    try:
+                        write(submission_id, payload)
+                        outcome = 'writes'
+                    except OperationalError as exc:
+                        outcome = 'lock_failures' if is_lock_error(exc) else 'other_failures'
+                    except Exception:
+                        outcome = 'other_failures'
+                    elapsed = time.perf_counter() - started
+                    with stats_lock:
+                        stats[outcome] += 1
+                        if outcome == 'writes':
+                            latencies.append(elapsed)
+                            lock_waits.append(consume_lock_wait())
+                    time.sleep(max(0.0, interval - elapsed) * random.uniform(0.8, 1.2))
+            finally:
+                connections[ALIAS].close()
+
+        threads = [threading.Thread(target=client, args=(pk,), daemon=True) for pk in submission_ids]
+        wall_start = time.perf_counter()
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        return stats, latencies, lock_waits, time.perf_counter() - wall_start
@@ -0,0 +1,83 @@
+# Generated by Django 4.2.30 on 2026-10-19 01:05
+
+from django.db import DatabaseError, migrations, models, transaction
+
+SQLITE_FTS = [
+    # External-content FTS5 table over common_searchdocument; the trigram tokenizer
+    # answers substring (icontains-style) queries of three or more characters.
+    """CREATE VIRTUAL TABLE common_searchdocument_fts USING fts5(
+        text, kind UNINDEXED, content='common_searchdocument', content_rowid='id', tokenize='trigram'
+    )""",
+    """CREATE TRIGGER common_searchdocument_fts_ai AFTER INSERT ON common_searchdocument BEGIN
+        INSERT INTO common_searchdocument_fts(rowid, text, kind) VALUES (new.id, new.text, new.kind);
+    END""",
+    """CREATE TRIGGER common_searchdocument_fts_ad AFTER DELETE ON common_searchdocument BEGIN
+        INSERT INTO common_searchdocument_fts(common_searchdocument_fts, rowid, text, kind)
+        VALUES ('delete', old.id, old.text, old.kind);
+    END""",
+    """CREATE TRIGGER common_searchdocument_fts_au AFTER UPDATE ON common_searchdocument BEGIN
+        INSERT INTO common_searchdocument_fts(common_searchdocument_fts, rowid, text, kind)
+        VALUES ('delete', old.id, old.text, old.kind);
+        INSERT INTO common_searchdocument_fts(rowid, text, kind) VALUES (new.id, new.text, new.kind);
+    END""",
+]
+SQLITE_FTS_DROP = [
+    "DROP TRIGGER IF EXISTS common_searchdocument_fts_ai",
+    "DROP TRIGGER IF EXISTS common_searchdocument_fts_ad",
+    "DROP TRIGGER IF EXISTS common_searchdocument_fts_au",
+    "DROP TABLE IF EXISTS common_searchdocument_fts",
+]
+POSTGRES_TRIGRAM = [
+    "CREATE EXTENSION IF NOT EXISTS pg_trgm",
+    "CREATE INDEX common_searchdocument_text_trgm ON common_searchdocument USING gin (text gin_trgm_ops)",
+]
+
+
+def create_search_index(apps, schema_editor):
+    """FTS5 on SQLite, a trigram GIN index on PostgreSQL; without either, common.search falls back to icontains."""
+    connection = schema_editor.connection
+    statements = {"sqlite": SQLITE_FTS, "postgresql": POSTGRES_TRIGRAM}.get(connection.vendor, [])
+    try:
+        with transaction.atomic(using=connection.alias), connection.cursor() as cursor:
+            for statement in statements:
+                cursor.execute(statement)
+    except DatabaseError:
+        # SQLite without FTS5/trigram (before 3.34) or no rights to create pg_trgm: search stays on icontains.
+        pass
+
+
+def drop_search_index(apps, schema_editor):
+    vendor = schema_editor.connection.vendor
+    statements = {
+        "sqlite": SQLITE_FTS_DROP,
+        "postgresql": ["DROP INDEX IF EXISTS common_searchdocument_text_trgm"],
+    }.get(vendor, [])
+    with schema_editor.connection.cursor() as cursor:
+        for statement in statements:
+            cursor.execute(statement)
+
+
+class Migration(migrations.Migration):
+
+    initial = True
+
+    dependencies = [
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='SearchDocument',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('kind', models.CharField(max_length=32)),
+                ('object_id', models.PositiveBigIntegerField()),
+                ('text', models.TextField()),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+            ],
+        ),
+        migrations.AddConstraint(
+            model_name='searchdocument',
+            constraint=models.UniqueConstraint(fields=('kind', 'object_id'), name='search_document_unique_object'),
+        ),
+        migrations.RunPython(create_search_index, drop_search_index),
+    ]
@@ -0,0 +1,21 @@
+# Generated by Django 4.2.30 on 2026-10-19 02:49
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('common', '0001_search_document'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='GenerationCounter',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('name', models.CharField(max_length=64, unique=True)),
+                ('value', models.PositiveBigIntegerField(default=0)),
+            ],
+        ),
+    ]
@@ -1,3 +1,34 @@
 from django.db import models
 
-# Create your models here.
+
+class SearchDocument(models.Model):
+    """Searchable text for one object of one kind (see common.search).
+
+    Apps keep their documents current from signals; the backend-specific
+    index on ``text`` (an FTS5 table on SQLite, a trigram index on
+    PostgreSQL) is created by migration 0001 and, on SQLite, maintained by
+    triggers.
+    """
+
+    kind = models.CharField(max_length=32)
+    object_id = models.PositiveBigIntegerField()
+    text = models.TextField()
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(fields=("kind", "object_id"), name="search_document_unique_object"),
+        ]
+
+    def __str__(self) -> str:  # pragma: no cover - trivial
+        return f"SearchDocument({self.kind} #{self.object_id})"
+
+
+class GenerationCounter(models.Model):
+    """A named cache generation (see common.generations), shared by every process."""
+
+    name = models.CharField(max_length=64, unique=True)
+    value = models.PositiveBigIntegerField(default=0)
+
+    def __str__(self) -> str:  # pragma: no cover - trivial
+        return f"GenerationCounter({self.name}={self.value})"
@@ -0,0 +1,148 @@
+"""Bounded retention: delete old rows in primary-key ranges, optionally archiving them first.
+
+One big ``DELETE`` holds the SQLite write lock for its whole run and leaves
+PostgreSQL a burst of dead tuples.  :func:`purge` instead walks the rows a
+:class:`RetentionPolicy` selects in ascending primary key order,
+``chunk_size`` at a time; each chunk is deleted with a ``pk BETWEEN`` range
+in its own coordinated write (see :mod:`common.db`), with a pause between
+chunks so other writers get the lock.  With ``archive=True`` each chunk is
+first appended to a gzip-compressed JSONL file under
+``settings.RETENTION_ARCHIVE_DIR``.
+
+Policies come from ``settings.RETENTION_POLICIES`` (``"app.Model" -> options``)
+and are applied by ``manage.py apply_retention``.
+"""
+from __future__ import annotations
+
+import gzip
+import json
+import logging
+import time
+from dataclasses import dataclass, field
+from datetime import timedelta
+from pathlib import Path
+
+from django.apps import apps
+from django.conf import settings
+from django.core.serializers.json import DjangoJSONEncoder
+from django.utils import timezone
+
+from .db import coordinated_write
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_CHUNK_SIZE = 1000
+DEFAULT_PAUSE_SECONDS = 0.05
+
+
+@dataclass
+class RetentionPolicy:
+    model_label: str
+    days: int
+    date_field: str = "created_at"
+    filters: dict = field(default_factory=dict)
+    archive: bool = False
+
+    @property
+    def model(self):
+        return apps.get_model(self.model_label)
+
+    def queryset(self, now=None):
+        cutoff = (now or timezone.now()) - timedelta(days=self.days)
+        return self.model._default_manager.filter(**{f"{self.date_field}__lt": cutoff}, **self.filters)
+
+
+@dataclass
+class PurgeStats:
+    model_label: str
+    rows: int = 0
+    batches: int = 0
+    seconds: float = 0.0
+    archive_path: Path | None = None
+    dry_run: bool = False
+
+    @property
+    def rows_per_second(self) -> float:
+        return self.rows / self.seconds if self.seconds else 0.0
+
+
+def load_policies() -> list[RetentionPolicy]:
+    """``settings.RETENTION_POLICIES`` as :class:`RetentionPolicy` objects."""
+    return [
+        RetentionPolicy(model_label=label, **options)
+        for label, options in getattr(settings, "RETENTION_POLICIES", {}).items()
+    ]
+
+
+def archive_root() -> Path:
+    return Path(getattr(settings, "RETENTION_ARCHIVE_DIR", Path(settings.BASE_DIR) / "retention_archive"))
+
+
+def _archive_path(policy: RetentionPolicy, now) -> Path:
+    return archive_root() / f"{policy.model_label.lower()}-{now:%Y%m%d-%H%M%S}.jsonl.gz"
+
+
+def _append_archive(path: Path, rows) -> None:
+    path.parent.mkdir(parents=True, exist_ok=True)
+    with gzip.open(path, "at", encoding="utf-8") as handle:
+        for row in rows:
+            handle.write(json.dumps(row, cls=DjangoJSONEncoder, ensure_ascii=False))
+            handle.write("\n")
+
+
+@coordinated_write
+def _delete_range(queryset, first_pk, last_pk) -> int:
+    return queryset.filter(pk__gte=first_pk, pk__lte=last_pk).delete()[0]
+
+
+def purge(
+    policy: RetentionPolicy,
+    *,
+    chunk_size: int | None = None,
+    pause: float | None = None,
+    dry_run: bool = False,
+    archive: bool | None = None,
+    now=None,
+) -> PurgeStats:
+    """Apply ``policy``: delete (and optionally archive) its expired rows chunk by chunk.
+
+    The policy filters are re-applied inside every ``pk`` range, so rows that
+    stopped matching since the chunk was picked are left alone.  A dry run
+    only counts.
+    """
+    now = now or timezone.now()
+    chunk_size = max(1, chunk_size or getattr(settings, "RETENTION_CHUNK_SIZE", DEFAULT_CHUNK_SIZE))
+    pause = getattr(settings, "RETENTION_PAUSE_SECONDS", DEFAULT_PAUSE_SECONDS) if pause is None else pause
+    archive = policy.archive if archive is None else archive
+    expired = policy.queryset(now)
+    stats = PurgeStats(model_label=policy.model_label, dry_run=dry_run)
+    if dry_run:
+        stats.rows = expired.count()
+        return stats
+    if archive:
+        stats.archive_path = _archive_path(policy, now)
+
+    started = time.perf_counter()
+    last_pk = None
+    while True:
+        window = expired.order_by("pk")
+        if last_pk is not None:
+            window = window.filter(pk__gt=last_pk)
+        pks = list(window.values_list("pk", flat=True)[:chunk_size])
+        if not pks:
+            break
+        first_pk, last_pk = pks[0], pks[-1]
+        if archive:
+            _append_archive(stats.archive_path, expired.filter(pk__gte=first_pk, pk__lte=last_pk).order_by("pk").values())
+        stats.rows += _delete_range(expired, first_pk, last_pk)
+        stats.batches += 1
+        if len(pks) < chunk_size:
+            break
+        if pause:
+            time.sleep(pause)
+    stats.seconds = time.perf_counter() - started
+    logger.info(
+        "[PERF][RETENTION] %s: deleted %d rows in %d batches, %.1f s (%.0f rows/s)",
+        policy.model_label, stats.rows, stats.batches, stats.seconds, stats.rows_per_second,
+    )
+    return stats
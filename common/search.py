@@ -0,0 +1,120 @@
+"""Indexed text search over :class:`~common.models.SearchDocument` rows.
+
+Each app keeps one document per searchable object (``kind`` + ``object_id``
++ ``text``) current from its signals with :func:`index_document` /
+:func:`remove_document`, and registers a full rebuild with :func:`register`
+for ``manage.py rebuild_search_index``.  :func:`search_ids` returns the ids
+of the matching objects, best match first, using whatever index the
+database has:
+
+* SQLite: the FTS5 ``trigram`` table created by migration 0001, ranked by
+  bm25.  Matching is case-insensitive substring matching, like the
+  ``icontains`` filters it replaces, for queries of three or more
+  characters; shorter queries fall back to ``icontains``.
+* PostgreSQL: ``ILIKE`` backed by the ``pg_trgm`` GIN index, ranked by
+  trigram similarity.
+* Anything else (or an index that could not be created): ``icontains`` on
+  the single ``text`` column.
+"""
+from __future__ import annotations
+
+import logging
+from functools import lru_cache
+from typing import Callable, Iterable
+
+from django.db import DatabaseError, connection, transaction
+from django.db.models.expressions import RawSQL
+
+from .models import SearchDocument
+
+logger = logging.getLogger(__name__)
+
+MIN_TRIGRAM_QUERY = 3
+REBUILD_BATCH_SIZE = 500
+
+_rebuilders: dict[str, Callable[[], Iterable[tuple[int, str]]]] = {}
+
+
+def register(kind: str, documents: Callable[[], Iterable[tuple[int, str]]]) -> None:
+    """Register ``documents()``, yielding ``(object_id, text)`` for every object of ``kind``, for rebuilds."""
+    _rebuilders[kind] = documents
+
+
+def registered_kinds() -> list[str]:
+    return sorted(_rebuilders)
+
+
+def normalize(text: str) -> str:
+    return " ".join((text or "").split())
+
+
+def index_document(kind: str, object_id: int, text: str) -> None:
+    SearchDocument.objects.update_or_create(kind=kind, object_id=object_id, defaults={"text": normalize(text)})
+
+
+def remove_document(kind: str, object_id: int) -> None:
+    SearchDocument.objects.filter(kind=kind, object_id=object_id).delete()
+
+
+@transaction.atomic
+def rebuild(kind: str) -> int:
+    """Replace every document of ``kind`` with what its registered builder yields."""
+    SearchDocument.objects.filter(kind=kind).delete()
+    batch = []
+    total = 0
+    for object_id, text in _rebuilders[kind]():
+        batch.append(SearchDocument(kind=kind, object_id=object_id, text=normalize(text)))
+        if len(batch) >= REBUILD_BATCH_SIZE:
+            total += len(SearchDocument.objects.bulk_create(batch))
+            batch = []
+    total += len(SearchDocument.objects.bulk_create(batch))
+    return total
+
+
+@lru_cache(maxsize=None)
+def _postgres_has_trigram(alias: str) -> bool:
+    with connection.cursor() as cursor:
+        cursor.execute("SELECT 1 FROM pg_extension WHERE extname = 'pg_trgm'")
+        return cursor.fetchone() is not None
+
+
+def _fts_match(query: str) -> str:
+    """The query as one FTS5 phrase (a substring match under the trigram tokenizer)."""
+    return '"' + query.replace('"', '""') + '"'
+
+
+def _sqlite_fts_ids(kind: str, query: str, limit: int | None) -> list[int]:
+    sql = (
+        "SELECT d.object_id FROM common_searchdocument_fts AS f"
+        " JOIN common_searchdocument AS d ON d.id = f.rowid"
+        " WHERE common_searchdocument_fts MATCH %s AND f.kind = %s"
+        " ORDER BY f.rank"
+    )
+    params: list = [_fts_match(query), kind]
+    if limit is not None:
+        sql += " LIMIT %s"
+        params.append(limit)
+    with connection.cursor() as cursor:
+        cursor.execute(sql, params)
+        return [row[0] for row in cursor.fetchall()]
+
+
+def search_ids(kind: str, query: str, *, limit: int | None = None) -> list[int]:
+    """Ids of the ``kind`` objects whose document contains ``query``, best match first."""
+    query = normalize(query)
+    if not query:
+        return []
+    vendor = connection.vendor
+    if vendor == "sqlite" and len(query) >= MIN_TRIGRAM_QUERY:
+        try:
+            return _sqlite_fts_ids(kind, query, limit)
+        except DatabaseError:
+            logger.warning("[PERF][SEARCH] FTS5 index unavailable; falling back to icontains", exc_info=True)
+
+    documents = SearchDocument.objects.filter(kind=kind, text__icontains=query)
+    if vendor == "postgresql" and _postgres_has_trigram(connection.alias):
+        documents = documents.order_by(RawSQL("similarity(text, %s)", (query,)).desc(), "object_id")
+    else:
+        documents = documents.order_by("object_id")
+    ids = documents.values_list("object_id", flat=True)
+    return list(ids[:limit] if limit is not None else ids)
@@ -1,3 +1,233 @@
-from django.test import TestCase
+import gzip
+import io
+import json
+import shutil
+import tempfile
+from datetime import timedelta
+from pathlib import Path
+from unittest import mock
 
-# Create your tests here.
+from django.core.cache import cache
+from django.core.management import call_command
+from django.db import OperationalError, connection, connections, transaction
+from django.test import SimpleTestCase, TestCase, TransactionTestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+
+from common import generations, search
+from common.db import coordinated_write, is_lock_error, retry_on_lock
+from common.models import SearchDocument
+from common.retention import RetentionPolicy, load_policies, purge
+from notifications.models import EmailNotification, NotificationEvent
+from organizations.models import School, SchoolProfile
+from organizations.search import SCHOOL_DOCUMENTS
+
+
+class SQLitePragmaTests(TestCase):
+    def test_busy_timeout_applied_to_connections(self):
+        with connection.cursor() as cursor:
+            cursor.execute("PRAGMA busy_timeout")
+            self.assertEqual(cursor.fetchone()[0], 5000)
+
+
+class GenerationTests(TestCase):
+    def test_bumps_follow_the_writing_transaction_and_outlive_the_cache(self):
+        self.assertEqual(generations.current("things"), 0)
+        generations.bump("things")
+        generations.bump("things")
+        self.assertEqual(generations.current("things"), 2)
+
+        with self.assertRaises(RuntimeError), transaction.atomic():
+            generations.bump("things")
+            raise RuntimeError("rolled back")
+        self.assertEqual(generations.current("things"), 2)
+
+        cache.clear()
+        self.assertEqual(generations.current("things"), 2)
+        self.assertEqual(generations.current("other"), 0)
+
+
+class RetryOnLockTests(TransactionTestCase):
+    def test_lock_errors_are_retried_with_backoff(self):
+        calls = []
+
+        @retry_on_lock(attempts=3)
+        def flaky_write():
+            calls.append(connection.in_atomic_block)
+            if len(calls) < 3:
+                raise OperationalError("database is locked")
+            return "saved"
+
+        with mock.patch("common.db.time.sleep") as sleep:
+            self.assertEqual(flaky_write(), "saved")
+
+        self.assertEqual(calls, [True, True, True])
+        self.assertEqual(sleep.call_count, 2)
+
+    def test_gives_up_after_attempts_and_ignores_other_errors(self):
+        @coordinated_write(attempts=1)
+        def always_locked():
+            raise OperationalError("database is locked")
+
+        @coordinated_write
+        def broken():
+            raise OperationalError("no such table: missing")
+
+        with mock.patch("common.db.time.sleep") as sleep:
+            with self.assertRaises(OperationalError):
+                always_locked()
+            self.assertEqual(sleep.call_count, 1)
+            with self.assertRaises(OperationalError):
+                broken()
+            self.assertEqual(sleep.call_count, 1)
+
+        self.assertTrue(is_lock_error(OperationalError("database table is locked")))
+        self.assertFalse(is_lock_error(ValueError("database is locked")))
+
+
+class SurgeBenchmarkTests(SimpleTestCase):
+    def test_coordinated_orm_writes_on_a_scratch_database(self):
+        out = io.StringIO()
+        call_command(
+            "sqlite_surge_benchmark", "--clients", "4", "--duration", "1", "--interval", "0.05",
+            "--fail-on-lock", stdout=out,
+        )
+        output = out.getvalue()
+        self.assertRegex(output, r"Writes: +(\d+) of \1 attempted")
+        self.assertIn("Lock failures:    0", output)
+        self.assertNotIn("surge_benchmark", connections.settings)
+
+
+class RetentionTests(TestCase):
+    def setUp(self):
+        archive_dir = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, archive_dir, ignore_errors=True)
+        self.archive_dir = Path(archive_dir)
+        settings_override = override_settings(RETENTION_ARCHIVE_DIR=archive_dir, RETENTION_PAUSE_SECONDS=0)
+        settings_override.enable()
+        self.addCleanup(settings_override.disable)
+
+    def make_emails(self, count, status=EmailNotification.Status.SENT, days_old=60):
+        emails = EmailNotification.objects.bulk_create([
+            EmailNotification(to_email=f"school{index}@example.com", subject="Report", body="", status=status)
+            for index in range(count)
+        ])
+        EmailNotification.objects.filter(pk__in=[email.pk for email in emails]).update(
+            created_at=timezone.now() - timedelta(days=days_old)
+        )
+
+    def test_deletes_expired_rows_in_chunks_and_keeps_the_rest(self):
+        self.make_emails(7)
+        self.make_emails(2, days_old=1)
+        self.make_emails(3, status=EmailNotification.Status.FAILED)
+        policy = RetentionPolicy("notifications.EmailNotification", days=30, filters={"status": "sent"})
+
+        self.assertEqual(purge(policy, dry_run=True).rows, 7)
+        self.assertEqual(EmailNotification.objects.count(), 12)
+
+        with mock.patch("common.retention.time.sleep") as sleep:
+            stats = purge(policy, chunk_size=3, pause=0.5)
+
+        self.assertEqual((stats.rows, stats.batches), (7, 3))
+        self.assertEqual(sleep.call_count, 2)
+        self.assertIsNone(stats.archive_path)
+        self.assertEqual(EmailNotification.objects.filter(status="sent").count(), 2)
+        self.assertEqual(EmailNotification.objects.filter(status="failed").count(), 3)
+
+    def test_archive_writes_deleted_rows_as_gzipped_jsonl(self):
+        self.make_emails(5)
+        policy = RetentionPolicy("notifications.EmailNotification", days=30, archive=True)
+
+        stats = purge(policy, chunk_size=2)
+
+        self.assertEqual((stats.rows, stats.batches), (5, 3))
+        self.assertEqual(stats.archive_path.parent, self.archive_dir)
+        with gzip.open(stats.archive_path, "rt", encoding="utf-8") as handle:
+            rows = [json.loads(line) for line in handle]
+        self.assertEqual(len(rows), 5)
+        self.assertEqual(rows[0]["to_email"], "school0@example.com")
+        self.assertEqual([row["id"] for row in rows], sorted(row["id"] for row in rows))
+        self.assertFalse(EmailNotification.objects.exists())
+
+    @override_settings(RETENTION_POLICIES={
+        "notifications.EmailNotification": {"days": 30, "filters": {"status": "sent"}},
+        "notifications.NotificationEvent": {"days": 30, "filters": {"status": "processed"}},
+    })
+    def test_apply_retention_command_reports_throughput(self):
+        self.make_emails(4)
+        event = NotificationEvent.objects.create(kind="test.echo", object_id=1, status=NotificationEvent.Status.PROCESSED)
+        NotificationEvent.objects.filter(pk=event.pk).update(created_at=timezone.now() - timedelta(days=31))
+        self.assertEqual(
+            [policy.model_label for policy in load_policies()],
+            ["notifications.EmailNotification", "notifications.NotificationEvent"],
+        )
+
+        out = io.StringIO()
+        call_command("apply_retention", "--chunk-size", "3", stdout=out)
+
+        self.assertIn("notifications.EmailNotification: deleted 4 rows in 2 batches", out.getvalue())
+        self.assertIn("notifications.NotificationEvent: deleted 1 rows in 1 batches", out.getvalue())
+        self.assertIn("rows/s", out.getvalue())
+        self.assertFalse(EmailNotification.objects.exists())
+        self.assertFalse(NotificationEvent.objects.exists())
+
+    def test_notifications_purge_uses_the_retention_engine(self):
+        self.make_emails(3)
+        self.make_emails(1, status=EmailNotification.Status.PENDING)
+        out = io.StringIO()
+        call_command("notifications_purge", "--dry-run", stdout=out)
+        self.assertIn("Would delete 3 SENT notifications", out.getvalue())
+
+        call_command("notifications_purge", "--chunk-size", "2", stdout=out)
+        self.assertIn("Deleted 3 SENT notifications older than 30 days in 2 batches", out.getvalue())
+        self.assertEqual(EmailNotification.objects.count(), 1)
+
+
+class SearchTests(TestCase):
+    def setUp(self):
+        self.long_school = School.objects.create(code="riverside-nhs", name="Riverside National High School Annex")
+        self.short_school = School.objects.create(code="riverside-es", name="Riverside ES")
+        self.other_school = School.objects.create(code="hillcrest-es", name="Hillcrest ES")
+
+    def test_documents_follow_school_and_profile_changes(self):
+        profile = SchoolProfile.objects.create(
+            school=self.other_school, head_name="Dana Reyes", head_contact="dana@example.com"
+        )
+        self.assertEqual(search.search_ids(SCHOOL_DOCUMENTS, "dana reyes"), [self.other_school.pk])
+
+        self.other_school.name = "Lakeview ES"
+        self.other_school.save()
+        self.assertEqual(search.search_ids(SCHOOL_DOCUMENTS, "lakeview"), [self.other_school.pk])
+        self.assertEqual(search.search_ids(SCHOOL_DOCUMENTS, "hillcrest es"), [])
+
+        profile.delete()
+        self.assertEqual(search.search_ids(SCHOOL_DOCUMENTS, "dana"), [])
+        self.other_school.delete()
+        self.assertFalse(SearchDocument.objects.filter(kind=SCHOOL_DOCUMENTS, object_id=self.other_school.pk).exists())
+
+    def test_substring_queries_use_the_index_and_rank_closer_matches_first(self):
+        with CaptureQueriesContext(connection) as ctx:
+            ids = search.search_ids(SCHOOL_DOCUMENTS, "RIVERSIDE")
+        self.assertEqual(ids, [self.short_school.pk, self.long_school.pk])
+        if connection.vendor == "sqlite":
+            self.assertIn("common_searchdocument_fts", ctx.captured_queries[0]["sql"])
+        self.assertEqual(search.search_ids(SCHOOL_DOCUMENTS, "side nat"), [self.long_school.pk])
+        self.assertEqual(search.search_ids(SCHOOL_DOCUMENTS, "riverside", limit=1), [self.short_school.pk])
+
+    def test_short_queries_fall_back_to_icontains(self):
+        with CaptureQueriesContext(connection) as ctx:
+            ids = search.search_ids(SCHOOL_DOCUMENTS, "es")
+        self.assertEqual(ids, [self.short_school.pk, self.other_school.pk])
+        self.assertNotIn("common_searchdocument_fts", ctx.captured_queries[0]["sql"])
+        self.assertEqual(search.search_ids(SCHOOL_DOCUMENTS, "   "), [])
+
+    def test_rebuild_command_indexes_rows_written_without_signals(self):
+        School.objects.bulk_create([School(code="bulk-es", name="Bulkloaded ES")])
+        self.assertEqual(search.search_ids(SCHOOL_DOCUMENTS, "bulkloaded"), [])
+
+        out = io.StringIO()
+        call_command("rebuild_search_index", SCHOOL_DOCUMENTS, stdout=out)
+        bulk_school = School.objects.get(code="bulk-es")
+        self.assertEqual(search.search_ids(SCHOOL_DOCUMENTS, "bulkloaded"), [bulk_school.pk])
+        self.assertEqual(SearchDocument.objects.filter(kind=SCHOOL_DOCUMENTS).count(), 4)
+        self.assertIn(SCHOOL_DOCUMENTS, out.getvalue())
@@ -0,0 +1,188 @@
+"""Submission compliance matrix: every school × form template × period in scope.
+
+``district_submission_gaps`` answers "who has not submitted this one form for
+this one period".  :func:`build_matrix` answers it for a whole school year at
+once: the columns are the form templates of the year paired with the periods
+they apply to, and each cell is :data:`SUBMITTED` (submitted or noted),
+:data:`RETURNED`, :data:`DRAFT` or :data:`MISSING`.
+
+The cells come from one query over ``Submission`` (the school scope is a
+subquery, not an id list).  They are cached under a key made of
+``Submission.STATUS_GENERATION`` (see :mod:`common.generations`) and a hash
+of the scope, so any status change is visible on the next request while
+unchanged years are served from the cache.  School, template and period
+names are always read live.
+"""
+from __future__ import annotations
+
+import hashlib
+from collections import Counter
+from dataclasses import dataclass, field
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db.models import Q
+
+from common import generations
+from organizations.models import School
+from submissions.models import FormTemplate, Period, Submission
+
+MISSING = "missing"
+DRAFT = "draft"
+RETURNED = "returned"
+SUBMITTED = "submitted"
+STATES = (SUBMITTED, RETURNED, DRAFT, MISSING)
+
+STATE_BY_STATUS = {
+    Submission.Status.DRAFT: DRAFT,
+    Submission.Status.RETURNED: RETURNED,
+    Submission.Status.SUBMITTED: SUBMITTED,
+    Submission.Status.NOTED: SUBMITTED,
+}
+
+DEFAULT_CACHE_TIMEOUT = 60 * 10
+
+
+@dataclass
+class MatrixColumn:
+    form_template: FormTemplate
+    period: Period
+    counts: Counter = field(default_factory=Counter)
+
+    @property
+    def key(self) -> tuple[int, int]:
+        return (self.form_template.pk, self.period.pk)
+
+
+@dataclass
+class MatrixRow:
+    school: School
+    states: list[str]
+
+    @property
+    def counts(self) -> Counter:
+        return Counter(self.states)
+
+
+@dataclass
+class ComplianceMatrix:
+    columns: list[MatrixColumn]
+    rows: list[MatrixRow]
+    from_cache: bool = False
+
+    @property
+    def totals(self) -> Counter:
+        totals = Counter()
+        for column in self.columns:
+            totals.update(column.counts)
+        return totals
+
+    def district_rows(self) -> list[dict]:
+        """Per-district counts of each state, one entry per column, sorted by district name."""
+        by_district: dict[int | None, dict] = {}
+        for row in self.rows:
+            entry = by_district.setdefault(
+                row.school.district_id,
+                {"district": row.school.district, "schools": 0, "columns": [Counter() for _ in self.columns]},
+            )
+            entry["schools"] += 1
+            for counter, state in zip(entry["columns"], row.states):
+                counter[state] += 1
+        return sorted(by_district.values(), key=lambda entry: entry["district"].name if entry["district"] else "")
+
+    def as_dict(self) -> dict:
+        return {
+            "columns": [
+                {
+                    "form_code": column.form_template.code,
+                    "form_title": column.form_template.title,
+                    "period_id": column.period.pk,
+                    "period_label": column.period.label,
+                    "counts": {state: column.counts[state] for state in STATES},
+                }
+                for column in self.columns
+            ],
+            "schools": [
+                {
+                    "id": row.school.pk,
+                    "code": row.school.code,
+                    "name": row.school.name,
+                    "district": row.school.district.name if row.school.district else None,
+                    "states": row.states,
+                }
+                for row in self.rows
+            ],
+            "totals": {state: self.totals[state] for state in STATES},
+        }
+
+
+def applicable_columns(form_templates, periods) -> list[tuple[FormTemplate, Period]]:
+    """Pair each template with the periods it collects: its own school year and quarter when it names them."""
+    pairs = []
+    for form_template in form_templates:
+        for period in periods:
+            if form_template.school_year and form_template.school_year != period.school_year_start:
+                continue
+            if form_template.quarter_filter and form_template.quarter_filter != period.quarter_tag:
+                continue
+            pairs.append((form_template, period))
+    return pairs
+
+
+def _cache_key(school_ids: list[int], pairs) -> str:
+    digest = hashlib.sha1()
+    digest.update(",".join(map(str, school_ids)).encode())
+    digest.update(b"|")
+    digest.update(",".join(f"{template.pk}:{period.pk}" for template, period in pairs).encode())
+    generation = generations.current(Submission.STATUS_GENERATION)
+    return f"compliance-matrix:{generation}:{digest.hexdigest()}"
+
+
+def _fetch_states(schools, pairs) -> dict[tuple[int, int, int], str]:
+    """``{(school_id, template_id, period_id): state}`` for every existing submission in scope."""
+    template_ids = {template.pk for template, _ in pairs}
+    period_ids = {period.pk for _, period in pairs}
+    rows = Submission.objects.filter(
+        school__in=schools.values("pk"),
+        form_template_id__in=template_ids,
+        period_id__in=period_ids,
+    ).values_list("school_id", "form_template_id", "period_id", "status")
+    return {(school_id, template_id, period_id): STATE_BY_STATUS.get(status, DRAFT)
+            for school_id, template_id, period_id, status in rows.order_by()}
+
+
+def build_matrix(schools, form_templates, periods, *, use_cache: bool = True) -> ComplianceMatrix:
+    """Compliance of ``schools`` (a School queryset) for each applicable template × period."""
+    school_list = list(schools.select_related("district").order_by("district__name", "name"))
+    pairs = applicable_columns(form_templates, periods)
+    columns = [MatrixColumn(form_template, period) for form_template, period in pairs]
+    if not school_list or not pairs:
+        return ComplianceMatrix(columns=columns, rows=[MatrixRow(school, [MISSING] * len(columns)) for school in school_list])
+
+    key = _cache_key(sorted(school.pk for school in school_list), pairs)
+    states = cache.get(key) if use_cache else None
+    from_cache = states is not None
+    if states is None:
+        states = _fetch_states(schools, pairs)
+        if use_cache:
+            cache.set(key, states, getattr(settings, "COMPLIANCE_MATRIX_CACHE_TIMEOUT", DEFAULT_CACHE_TIMEOUT))
+
+    rows = []
+    for school in school_list:
+        row_states = [states.get((school.pk, *column.key), MISSING) for column in columns]
+        for column, state in zip(columns, row_states):
+            column.counts[state] += 1
+        rows.append(MatrixRow(school, row_states))
+    return ComplianceMatrix(columns=columns, rows=rows, from_cache=from_cache)
+
+
+def year_scope(section=None, school_year: int | None = None):
+    """Active templates (of ``section`` when given) and the periods of ``school_year`` (latest when None)."""
+    if school_year is None:
+        school_year = Period.objects.order_by("-school_year_start").values_list("school_year_start", flat=True).first()
+    periods = list(Period.objects.filter(school_year_start=school_year).order_by("display_order", "id"))
+    form_templates = FormTemplate.objects.active().select_related("section")
+    if section is not None:
+        form_templates = form_templates.filter(section=section)
+    form_templates = form_templates.filter(Q(school_year__isnull=True) | Q(school_year=school_year))
+    return school_year, list(form_templates.order_by("section__code", "code")), periods
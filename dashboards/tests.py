@@ -1,11 +1,16 @@
 from __future__ import annotations
 
 from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.db import connection
 from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
 from django.urls import reverse
 from django.utils import timezone
 
 from accounts.models import UserProfile
+from dashboards import compliance
+from notifications.models import EmailNotification
 from organizations.models import District, School, Section, SchoolProfile
 from submissions import constants as smea_constants
 from submissions.models import (
@@ -21,6 +26,7 @@ from submissions.models import (
     Form1SLPTopOutstanding,
     FormTemplate,
     Period,
+    ReminderCampaign,
     Submission,
     SubmissionTimeline,
     SMEAActivityRow,
@@ -520,3 +526,188 @@ class DashboardViewsTests(TestCase):
         self.assertContains(response, "Contact missing")
         self.assertContains(response, other_section.name)
 
+
+class ReminderCampaignTests(TestCase):
+    def setUp(self):
+        User = get_user_model()
+        self.section = Section.objects.create(code="smme", name="School Management")
+        self.period = Period.objects.create(label="Q1", school_year_start=2025, quarter_tag="Q1", display_order=1)
+        self.form = FormTemplate.objects.create(
+            section=self.section,
+            code="smea-form-1",
+            title="SMEA Form 1",
+            period_type=FormTemplate.PeriodType.QUARTER,
+            open_at=timezone.now().date(),
+            close_at=timezone.now().date(),
+        )
+        self.district_north = District.objects.create(code="north", name="North District")
+        district_south = District.objects.create(code="south", name="South District")
+        self.school_submitted = School.objects.create(code="north-submitted", name="North Submitted School", district=self.district_north)
+        self.school_pending = School.objects.create(code="north-pending", name="North Pending School", district=self.district_north)
+        school_other = School.objects.create(code="south-school", name="South School", district=district_south)
+        SchoolProfile.objects.create(school=self.school_submitted, head_name="Pat Reyes")
+        SchoolProfile.objects.create(school=self.school_pending, head_name="Alex Cruz")
+        SchoolProfile.objects.create(school=school_other, head_name="Jamie Santos")
+        Submission.objects.create(
+            school=self.school_submitted,
+            form_template=self.form,
+            period=self.period,
+            status=Submission.Status.SUBMITTED,
+            submitted_at=timezone.now(),
+        )
+
+        self.section_admin = User.objects.create_user(username="sectionadmin", password="password")
+        profile = UserProfile.objects.get(user=self.section_admin)
+        profile.section_admin_codes = [self.section.code]
+        profile.save(update_fields=["section_admin_codes", "updated_at"])
+        self.psds = User.objects.create_user(username="psds", password="password")
+        UserProfile.objects.get(user=self.psds).districts.add(self.district_north)
+        self.sgod_admin = User.objects.create_user(username="sgod", password="password")
+        profile = UserProfile.objects.get(user=self.sgod_admin)
+        profile.is_sgod_admin = True
+        profile.save(update_fields=["is_sgod_admin", "updated_at"])
+        self.school_head = User.objects.create_user(username="schoolhead", password="password")
+        profile = UserProfile.objects.get(user=self.school_head)
+        profile.school = self.school_submitted
+        profile.save(update_fields=["school", "updated_at"])
+
+    def _post_reminders(self, user, **extra):
+        self.client.force_login(user)
+        data = {"section": self.section.code, "form_code": self.form.code, "period_id": self.period.id, **extra}
+        return self.client.post(reverse("district_reminder_campaign"), data)
+
+    def test_reminder_campaign_queues_one_email_per_missing_school(self):
+        SchoolProfile.objects.filter(school=self.school_pending).update(notification_email="north@example.com")
+        SchoolProfile.objects.filter(school=self.school_submitted).update(notification_email="done@example.com")
+        response = self._post_reminders(self.section_admin)
+        self.assertEqual(response.status_code, 302)
+        campaign = ReminderCampaign.objects.get()
+        self.assertEqual(
+            (campaign.missing_schools, campaign.queued, campaign.without_email, campaign.created_by),
+            (2, 1, 1, self.section_admin),
+        )
+        reminder = EmailNotification.objects.get()
+        self.assertEqual(reminder.to_email, "north@example.com")
+        self.assertIn("North Pending School", reminder.subject)
+        self.assertIn("Good day, Alex Cruz.", reminder.body)
+        self.assertEqual(reminder.status, EmailNotification.Status.PENDING)
+
+        page = self.client.get(self._post_reminders(self.section_admin)["Location"])
+        self.assertEqual(ReminderCampaign.objects.first().already_pending, 1)
+        self.assertEqual(EmailNotification.objects.count(), 1)
+        self.assertContains(page, "1 school(s) already had a reminder waiting to be sent.")
+        self.assertContains(page, "0 queued")
+
+    def test_reminder_campaign_respects_scope_and_role(self):
+        SchoolProfile.objects.update(notification_email="school@example.com")
+        self._post_reminders(self.psds)
+        self.assertEqual(ReminderCampaign.objects.get().missing_schools, 1)
+
+        self.assertEqual(self._post_reminders(self.school_head).status_code, 403)
+        self.client.force_login(self.section_admin)
+        self.assertEqual(self.client.get(reverse("district_reminder_campaign")).status_code, 405)
+
+    def test_reminder_campaign_query_count_does_not_grow_with_schools(self):
+        def queries_for_new_schools(count):
+            for index in range(count):
+                school = School.objects.create(code=f"bulk-{count}-{index}", name=f"Bulk {index}", district=self.district_north)
+                SchoolProfile.objects.create(school=school, head_name="Head", notification_email=f"b{count}-{index}@example.com")
+            EmailNotification.objects.all().delete()
+            with CaptureQueriesContext(connection) as queries:
+                self._post_reminders(self.sgod_admin)
+            return len(queries)
+
+        self._post_reminders(self.sgod_admin)  # warm up per-process lookups
+        self.assertEqual(queries_for_new_schools(3), queries_for_new_schools(30))
+
+
+class ComplianceMatrixTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        User = get_user_model()
+        self.section = Section.objects.create(code="smme", name="School Management")
+        self.q1 = Period.objects.create(label="Q1", school_year_start=2025, quarter_tag="Q1", display_order=1)
+        self.q2 = Period.objects.create(label="Q2", school_year_start=2025, quarter_tag="Q2", display_order=2)
+        Period.objects.create(label="Q1", school_year_start=2024, quarter_tag="Q1", display_order=1)
+        today = timezone.now().date()
+        self.form = FormTemplate.objects.create(
+            section=self.section, code="smea-form-1", title="SMEA Form 1", open_at=today, close_at=today,
+        )
+        self.q2_only = FormTemplate.objects.create(
+            section=self.section, code="sy2025-q2-form", title="Q2 Form", open_at=today, close_at=today,
+            school_year=2025, quarter_filter="Q2",
+        )
+        FormTemplate.objects.create(
+            section=self.section, code="old-form", title="Old Form", open_at=today, close_at=today, school_year=2024,
+        )
+        north = District.objects.create(code="north", name="North District")
+        south = District.objects.create(code="south", name="South District")
+        self.north_school = School.objects.create(code="north-school", name="North School", district=north)
+        self.south_school = School.objects.create(code="south-school", name="South School", district=south)
+        self.submitted = Submission.objects.create(
+            school=self.north_school, form_template=self.form, period=self.q1, status=Submission.Status.SUBMITTED,
+        )
+        Submission.objects.create(
+            school=self.north_school, form_template=self.q2_only, period=self.q2, status=Submission.Status.NOTED,
+        )
+        Submission.objects.create(
+            school=self.south_school, form_template=self.form, period=self.q2, status=Submission.Status.DRAFT,
+        )
+
+        self.sgod_admin = User.objects.create_user(username="sgod", password="password")
+        profile = UserProfile.objects.get(user=self.sgod_admin)
+        profile.is_sgod_admin = True
+        profile.save(update_fields=["is_sgod_admin", "updated_at"])
+        self.psds = User.objects.create_user(username="psds", password="password")
+        UserProfile.objects.get(user=self.psds).districts.add(north)
+
+    def test_matrix_covers_every_applicable_form_and_period_in_one_query(self):
+        school_year, form_templates, periods = compliance.year_scope()
+        self.assertEqual(school_year, 2025)
+
+        with CaptureQueriesContext(connection) as queries:
+            matrix = compliance.build_matrix(School.objects.all(), form_templates, periods)
+
+        self.assertEqual(
+            [(column.form_template.code, column.period.label) for column in matrix.columns],
+            [("smea-form-1", "Q1"), ("smea-form-1", "Q2"), ("sy2025-q2-form", "Q2")],
+        )
+        self.assertEqual(
+            {row.school.code: row.states for row in matrix.rows},
+            {
+                "north-school": ["submitted", "missing", "submitted"],
+                "south-school": ["missing", "draft", "missing"],
+            },
+        )
+        self.assertEqual(matrix.totals["missing"], 3)
+        submission_queries = [query for query in queries.captured_queries if "submissions_submission" in query["sql"]]
+        self.assertEqual(len(submission_queries), 1)
+        self.assertFalse(matrix.from_cache)
+
+    def test_cached_cells_are_dropped_when_a_status_changes(self):
+        _, form_templates, periods = compliance.year_scope(self.section)
+        compliance.build_matrix(School.objects.all(), form_templates, periods)
+        cached = compliance.build_matrix(School.objects.all(), form_templates, periods)
+        self.assertTrue(cached.from_cache)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            self.submitted.mark_returned(self.sgod_admin, "Please fix enrolment.")
+
+        fresh = compliance.build_matrix(School.objects.all(), form_templates, periods)
+        self.assertFalse(fresh.from_cache)
+        self.assertEqual(fresh.rows[0].states[0], "returned")
+
+    def test_views_are_scoped_to_the_reviewer(self):
+        self.client.force_login(self.psds)
+        response = self.client.get(reverse("district_compliance_matrix_data"), {"section": "smme"})
+        self.assertEqual(response.status_code, 200)
+        payload = response.json()
+        self.assertEqual(payload["school_year"], 2025)
+        self.assertEqual([school["code"] for school in payload["schools"]], ["north-school"])
+        self.assertEqual(payload["totals"], {"submitted": 2, "returned": 0, "draft": 0, "missing": 1})
+
+        self.client.force_login(self.sgod_admin)
+        response = self.client.get(reverse("district_compliance_matrix"), {"school_year": "2025"})
+        self.assertContains(response, "South School")
+        self.assertContains(response, 'class="cell cell--draft"')
+        self.assertEqual(len(response.context["district_rows"]), 2)
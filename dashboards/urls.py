@@ -6,6 +6,9 @@ urlpatterns = [
     # Core dashboard views
     path("", views.school_home, name="school_home"),
     path("dashboards/district-submissions/", views.district_submission_gaps, name="district_submission_gaps"),
+    path("dashboards/district-submissions/reminders/", views.district_reminder_campaign, name="district_reminder_campaign"),
+    path("dashboards/district-submissions/matrix/", views.district_compliance_matrix, name="district_compliance_matrix"),
+    path("dashboards/district-submissions/matrix/data/", views.district_compliance_matrix_data, name="district_compliance_matrix_data"),
     path("dashboards/smme-kpi/", views.smme_kpi_dashboard, name="smme_kpi_dashboard"),
     path("dashboards/smme-kpi/data/", views.smme_kpi_dashboard_data, name="smme_kpi_dashboard_data"),
     path("dashboards/smme-kpi/api/", views.smme_kpi_api, name="smme_kpi_api"),
@@ -8,24 +8,30 @@ from typing import Iterable
 from django.contrib import messages
 from django.contrib.auth.decorators import login_required
 from django.core.exceptions import PermissionDenied
-from django.db.models import Count, Max, F
+from django.db.models import Count, Max, F, Q
 from django.http import HttpResponse
 from django.shortcuts import get_object_or_404, redirect, render
 from django.urls import reverse
 from django.utils import timezone
+from django.utils.http import urlencode
 from django.http import JsonResponse
+from django.views.decorators.http import require_http_methods
 
 from accounts import scope as account_scope
 from accounts import services as account_services
 from organizations.models import District, Section
 from dashboards.performance import PerformanceMonitor
+from submissions.progress import completion_summaries
 from submissions.models import (
     Form1SLPRow,
     FormTemplate,
     Period,
+    ReminderCampaign,
     Submission,
     SubmissionTimeline,
 )
+from submissions.reminders import launch_reminder_campaign
+from dashboards import compliance
 
 
 _COMPLETED_STATUSES = {
@@ -97,15 +103,13 @@ def school_home(request):
                     status__in=[Submission.Status.DRAFT, Submission.Status.RETURNED],
                 )
                 .select_related("form_template", "form_template__section", "period")
-                .prefetch_related(
-                    "smea_projects__activities",
-                    "form1_slp_rows",
-                )
                 .order_by("-updated_at")
             )
-            
-            for submission in draft_qs:
-                completion = submission.get_completion_summary()
+            draft_list = list(draft_qs)
+            completion_by_id = completion_summaries(draft_list)
+
+            for submission in draft_list:
+                completion = completion_by_id[submission.id]
                 draft_data = {
                     'submission': submission,
                     'progress': completion['overall_progress'],
@@ -451,34 +455,28 @@ def school_home(request):
                     form_template__section=section,
                     period__quarter_tag=f'Q{q}',
                     period__school_year_start=school_year_start
-                ).select_related('form_template', 'period')
+                ).aggregate(
+                    total=Count('id'),
+                    completed=Count('id', filter=Q(status__in=[Submission.Status.SUBMITTED, Submission.Status.NOTED])),
+                    drafts=Count('id', filter=Q(status__in=[Submission.Status.DRAFT, Submission.Status.RETURNED])),
+                )
                 
-                total_forms = q_submissions.count()
-                completed_forms = q_submissions.filter(
-                    status__in=[Submission.Status.SUBMITTED, Submission.Status.NOTED]
-                ).count()
-                draft_forms = q_submissions.filter(
-                    status__in=[Submission.Status.DRAFT, Submission.Status.RETURNED]
-                ).count()
+                total_forms = q_submissions['total']
+                completed_forms = q_submissions['completed']
+                draft_forms = q_submissions['drafts']
                 
-                # Calculate average completion for drafts in this quarter
+                # Average completion for drafts in this quarter, reusing the
+                # progress already computed in bulk for the section cards.
                 q_completion = 0
                 if draft_forms > 0:
-                    q_drafts = q_submissions.filter(
-                        status__in=[Submission.Status.DRAFT, Submission.Status.RETURNED]
-                    )
-                    q_progress_sum = 0
-                    q_progress_count = 0
-                    for sub in q_drafts:
-                        try:
-                            completion_data = sub.get_completion_summary()
-                            q_progress_sum += completion_data.get('overall_progress', 0)
-                            q_progress_count += 1
-                        except:
-                            pass
-                    
-                    if q_progress_count > 0:
-                        q_completion = q_progress_sum // q_progress_count
+                    q_progress = [
+                        draft['progress']
+                        for draft in drafts_by_section.get(section.id, [])
+                        if draft['submission'].period.quarter_tag == f'Q{q}'
+                        and draft['submission'].period.school_year_start == school_year_start
+                    ]
+                    if q_progress:
+                        q_completion = sum(q_progress) // len(q_progress)
                 
                 section_quarter_stats.append({
                     'quarter': q,
@@ -536,6 +534,14 @@ def _require_sgod_access(user) -> None:
         raise PermissionDenied("SGOD access required.")
 
 
+def _can_send_reminders(user, section) -> bool:
+    return bool(section) and (
+        account_services.user_is_sgod_admin(user)
+        or account_services.user_is_section_admin(user, section)
+        or account_services.user_is_psds(user)
+    )
+
+
 def _latest_period() -> Period | None:
     return (
         Period.objects.order_by("-school_year_start", "-display_order").first()
@@ -603,7 +609,7 @@ def district_submission_gaps(request):
                 school_id__in=school_ids,
                 form_template=form_template,
                 period=period,
-            ).only("school_id", "status")
+            ).only("school_id", "status", "completion_sections", "completion_updated_at")
         )
 
     submitted_school_ids = {
@@ -611,6 +617,13 @@ def district_submission_gaps(request):
         for submission in submissions
         if submission.status in _COMPLETED_STATUSES
     }
+    drafts = [submission for submission in submissions if submission.status not in _COMPLETED_STATUSES]
+    # Drafts without a stored snapshot are counted on the fly.
+    completion_by_id = completion_summaries(drafts)
+    draft_progress_by_school = {
+        submission.school_id: completion_by_id[submission.pk]["overall_progress"]
+        for submission in drafts
+    }
 
     district_rows = []
     total_schools = 0
@@ -640,8 +653,11 @@ def district_submission_gaps(request):
                     "missing_head_name": not bool(head_name.strip()),
                     "missing_head_contact": not bool(head_contact.strip()),
                     "grade_span_warning": school.id in mismatched_ids,
+                    "has_draft": school.id in draft_progress_by_school,
+                    "draft_progress": draft_progress_by_school.get(school.id, 0),
                 }
             )
+        missing_schools.sort(key=lambda entry: (-entry["draft_progress"], entry["school"].name))
         district_rows.append(
             {
                 "district": payload["district"],
@@ -662,6 +678,14 @@ def district_submission_gaps(request):
     available_districts = list(
         District.objects.filter(pk__in=scoped_district_ids).order_by("name")
     )
+    can_send_reminders = bool(form_template and period) and _can_send_reminders(user, section)
+    last_campaign = (
+        ReminderCampaign.objects.filter(form_template=form_template, period=period)
+        .select_related("created_by")
+        .first()
+        if can_send_reminders
+        else None
+    )
 
     return render(
         request,
@@ -679,10 +703,89 @@ def district_submission_gaps(request):
             "total_schools": total_schools,
             "total_submitted": total_submitted,
             "total_missing": total_schools - total_submitted,
+            "can_send_reminders": can_send_reminders,
+            "last_reminder_campaign": last_campaign,
         },
     )
 
 
+@login_required
+@require_http_methods(["POST"])
+def district_reminder_campaign(request):
+    """Queue reminders to every school in the user's scope that has not submitted the selected form."""
+    user = request.user
+    _require_reviewer_access(user)
+    section = get_object_or_404(Section, code__iexact=request.POST.get("section", ""))
+    if not _can_send_reminders(user, section):
+        raise PermissionDenied("You cannot send reminders for this section.")
+    form_template = get_object_or_404(FormTemplate, code=request.POST.get("form_code", ""), section=section)
+    period = get_object_or_404(Period, pk=request.POST.get("period_id") or 0)
+    district_id = request.POST.get("district_id") or ""
+    district = get_object_or_404(District, pk=district_id) if district_id else None
+
+    schools = account_scope.scope_schools(user)
+    if district:
+        schools = schools.filter(district=district)
+    campaign = launch_reminder_campaign(
+        form_template=form_template, period=period, schools=schools, district=district, actor=user
+    )
+    message = f"Queued {campaign.queued} reminder(s) for {form_template.title} ({period.label})."
+    if campaign.already_pending:
+        message += f" {campaign.already_pending} school(s) already had a reminder waiting to be sent."
+    if campaign.without_email:
+        message += f" {campaign.without_email} school(s) have no notification email."
+    messages.success(request, message)
+
+    query = {"section": section.code, "form_code": form_template.code, "period_id": period.pk}
+    if district:
+        query["district_id"] = district.pk
+    return redirect(f"{reverse('district_submission_gaps')}?{urlencode(query)}")
+
+
+def _compliance_matrix(request) -> dict:
+    """Filters and :func:`dashboards.compliance.build_matrix` result shared by the matrix page and its JSON."""
+    user = request.user
+    _require_reviewer_access(user)
+
+    section_code = request.GET.get("section") or ""
+    section = get_object_or_404(Section, code__iexact=section_code) if section_code else None
+    school_year = request.GET.get("school_year") or ""
+    school_year, form_templates, periods = compliance.year_scope(
+        section, int(school_year) if school_year.isdigit() else None
+    )
+
+    scoped = account_scope.scope_schools(user)
+    district_id = request.GET.get("district_id") or ""
+    schools = scoped.filter(district_id=district_id) if district_id.isdigit() else scoped
+    return {
+        "sections": Section.objects.order_by("name"),
+        "selected_section": section,
+        "school_years": Period.objects.order_by("-school_year_start").values_list("school_year_start", flat=True).distinct(),
+        "selected_school_year": school_year,
+        "districts": District.objects.filter(pk__in=scoped.values("district_id")).order_by("name"),
+        "selected_district_id": int(district_id) if district_id.isdigit() else None,
+        "matrix": compliance.build_matrix(schools, form_templates, periods),
+    }
+
+
+@login_required
+def district_compliance_matrix(request):
+    """Submission status of every school in scope for each form template and period of a school year."""
+    context = _compliance_matrix(request)
+    context["district_rows"] = context["matrix"].district_rows()
+    return render(request, "dashboards/district_compliance_matrix.html", context)
+
+
+@login_required
+def district_compliance_matrix_data(request):
+    context = _compliance_matrix(request)
+    return JsonResponse({
+        "school_year": context["selected_school_year"],
+        "section": context["selected_section"].code if context["selected_section"] else None,
+        **context["matrix"].as_dict(),
+    })
+
+
 @login_required
 @PerformanceMonitor.profile_view
 def smme_kpi_dashboard(request):
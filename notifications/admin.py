@@ -1,6 +1,7 @@
 from django.contrib import admin
 from django.utils.html import format_html
-from .models import EmailNotification
+from .models import EmailNotification, NotificationEvent
+from .services import send_notifications
 
 
 @admin.register(EmailNotification)
@@ -12,24 +13,31 @@ class EmailNotificationAdmin(admin.ModelAdmin):
     actions = ["action_resend_now", "action_requeue"]
 
     def action_resend_now(self, request, queryset):
-        success = 0
-        for notif in queryset:
-            if notif.status == EmailNotification.Status.SENT:
-                continue
-            if notif.status == EmailNotification.Status.FAILED:
-                notif.requeue()
-            if notif.send():
-                success += 1
+        success = send_notifications(queryset.exclude(status=EmailNotification.Status.SENT))
         self.message_user(request, f"Resent {success} email(s).")
     action_resend_now.short_description = "Resend selected now"
 
     def action_requeue(self, request, queryset):
         count = 0
+        skipped = 0
         for notif in queryset.exclude(status=EmailNotification.Status.SENT):
-            notif.requeue()
-            count += 1
-        self.message_user(request, f"Requeued {count} email(s) for sending.")
+            if notif.requeue():
+                count += 1
+            else:
+                skipped += 1
+        message = f"Requeued {count} email(s) for sending."
+        if skipped:
+            message += f" Skipped {skipped}: an identical email is already pending."
+        self.message_user(request, message)
     action_requeue.short_description = "Requeue selected (set to pending)"
 from django.contrib import admin
 
 # Register your models here.
+
+
+@admin.register(NotificationEvent)
+class NotificationEventAdmin(admin.ModelAdmin):
+    list_display = ("kind", "object_id", "status", "attempts", "created_at", "processed_at")
+    list_filter = ("status", "kind")
+    search_fields = ("object_id", "last_error")
+    readonly_fields = ("created_at", "processed_at", "last_error")
@@ -1,6 +1,6 @@
 from django.core.management.base import BaseCommand
-from django.utils import timezone
-from datetime import timedelta
+
+from common.retention import RetentionPolicy, purge
 from notifications.models import EmailNotification
 
 
@@ -10,14 +10,20 @@ class Command(BaseCommand):
     def add_arguments(self, parser):
         parser.add_argument("--days", type=int, default=30, help="Age in days after which SENT notifications are purged")
         parser.add_argument("--dry-run", action="store_true", help="Show how many would be deleted without deleting")
+        parser.add_argument("--chunk-size", type=int, default=None, help="Rows deleted per batch (default RETENTION_CHUNK_SIZE)")
 
     def handle(self, *args, **opts):
         days = opts.get("days")
-        cutoff = timezone.now() - timedelta(days=days)
-        qs = EmailNotification.objects.filter(status=EmailNotification.Status.SENT, created_at__lt=cutoff)
-        count = qs.count()
-        if opts.get("dry_run"):
-            self.stdout.write(f"[DRY-RUN] Would delete {count} SENT notifications older than {days} days.")
+        policy = RetentionPolicy(
+            model_label="notifications.EmailNotification",
+            days=days,
+            filters={"status": EmailNotification.Status.SENT},
+        )
+        stats = purge(policy, chunk_size=opts.get("chunk_size"), dry_run=opts.get("dry_run"))
+        if stats.dry_run:
+            self.stdout.write(f"[DRY-RUN] Would delete {stats.rows} SENT notifications older than {days} days.")
             return
-        deleted = qs.delete()[0]
-        self.stdout.write(f"Deleted {deleted} SENT notifications older than {days} days.")
\ No newline at end of file
+        self.stdout.write(
+            f"Deleted {stats.rows} SENT notifications older than {days} days "
+            f"in {stats.batches} batches ({stats.rows_per_second:.0f} rows/s)."
+        )
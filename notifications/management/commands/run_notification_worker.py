@@ -0,0 +1,37 @@
+import signal
+
+from django.core.management.base import BaseCommand
+from notifications.services import DEFAULT_LEASE_SECONDS, SEND_BATCH_SIZE
+from notifications.worker import DEFAULT_IDLE_SECONDS, DEFAULT_THREADS, NotificationWorker, mail_provider
+
+
+class Command(BaseCommand):
+    help = "Keep turning outbox events into emails and delivering queued email notifications with leased batches, a thread pool, rate limits and retry backoff."
+
+    def add_arguments(self, parser):  # pragma: no cover - CLI wiring
+        parser.add_argument("--threads", type=int, default=DEFAULT_THREADS, help="Concurrent sending threads (one mail connection each)")
+        parser.add_argument("--batch-size", type=int, default=SEND_BATCH_SIZE, help="Emails leased per batch")
+        parser.add_argument("--lease-seconds", type=int, default=DEFAULT_LEASE_SECONDS, help="How long a leased batch stays reserved for this worker")
+        parser.add_argument("--idle-seconds", type=float, default=DEFAULT_IDLE_SECONDS, help="Sleep between polls when nothing is queued")
+        parser.add_argument("--rate", type=float, default=None, help="Max messages per second (default: NOTIFICATION_RATE_LIMITS for the provider)")
+        parser.add_argument("--max-retries", type=int, default=None, help="Stop retrying a failed email after this many attempts")
+        parser.add_argument("--max-batches", type=int, default=None, help="Exit after this many polls (default: run until stopped)")
+
+    def handle(self, *args, **options):
+        worker = NotificationWorker(
+            threads=options["threads"],
+            batch_size=options["batch_size"],
+            lease_seconds=options["lease_seconds"],
+            idle_seconds=options["idle_seconds"],
+            max_retries=options["max_retries"],
+            rate=options["rate"],
+        )
+        for signum in (signal.SIGINT, signal.SIGTERM):
+            signal.signal(signum, worker.stop)
+        rate = f"{worker.limiter.rate:g}/s" if worker.limiter.rate else "unlimited"
+        self.stdout.write(f"Notification worker started ({worker.threads} thread(s), provider {mail_provider()}, rate {rate}).")
+        totals = worker.run(max_batches=options["max_batches"])
+        self.stdout.write(self.style.SUCCESS(
+            f"Notification worker stopped: processed {totals['events']} event(s) and sent {totals['sent']} of "
+            f"{totals['leased']} leased email(s) in {totals['batches']} poll(s)."
+        ))
@@ -1,9 +1,10 @@
 from django.core.management.base import BaseCommand
+from notifications.outbox import process_pending_events
 from notifications.services import send_all_pending
 
 
 class Command(BaseCommand):
-    help = "Send all pending email notifications (batched)."
+    help = "Turn pending outbox events into emails, then send pending email notifications (leased batches; safe alongside run_notification_worker)."
 
     def add_arguments(self, parser):
         parser.add_argument("--limit", type=int, default=50, help="Max pending emails to attempt in one run")
@@ -25,7 +26,14 @@ class Command(BaseCommand):
                 total = base_qs.count() + fq.count()
             else:
                 total = base_qs.count()
-            self.stdout.write(self.style.WARNING(f"Dry run: {total} email(s) would be attempted."))
+            from notifications.models import NotificationEvent
+            events = NotificationEvent.objects.filter(status=NotificationEvent.Status.PENDING).count()
+            self.stdout.write(self.style.WARNING(f"Dry run: {events} event(s) would be processed and {total} email(s) would be attempted."))
             return
+        events = process_pending_events(limit=limit)
+        if events["processed"] or events["failed"]:
+            self.stdout.write(
+                f"Processed {events['processed']} event(s) into {events['emails']} email(s); {events['failed']} failed."
+            )
         sent = send_all_pending(limit=limit, retry_failed=options.get("retry_failed", False), max_retries=options.get("max_retries"))
         self.stdout.write(self.style.SUCCESS(f"Sent {sent} email(s)."))
@@ -0,0 +1,32 @@
+# Generated by Django 4.2.30 on 2026-10-19 00:29
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('notifications', '0003_notification_event'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='emailnotification',
+            name='lease_token',
+            field=models.UUIDField(blank=True, editable=False, null=True),
+        ),
+        migrations.AddField(
+            model_name='emailnotification',
+            name='leased_until',
+            field=models.DateTimeField(blank=True, editable=False, null=True),
+        ),
+        migrations.AddField(
+            model_name='emailnotification',
+            name='next_attempt_at',
+            field=models.DateTimeField(blank=True, null=True),
+        ),
+        migrations.AddIndex(
+            model_name='emailnotification',
+            index=models.Index(fields=['status', 'created_at'], name='notificatio_status_1d75ae_idx'),
+        ),
+    ]
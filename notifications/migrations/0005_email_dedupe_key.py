@@ -0,0 +1,42 @@
+# Generated by Django 4.2.30 on 2026-10-19 00:38
+
+import hashlib
+
+from django.db import migrations, models
+
+
+def forwards(apps, schema_editor):
+    """Key the pending rows; later duplicates of a key stay unkeyed so the constraint can be added."""
+    EmailNotification = apps.get_model("notifications", "EmailNotification")
+    seen = set()
+    batch = []
+    pending = EmailNotification.objects.filter(status="pending").order_by("created_at", "pk")
+    for notif in pending.only("pk", "to_email", "subject").iterator():
+        raw = "\x1f".join(("", (notif.to_email or "").strip().lower(), notif.subject or ""))
+        key = hashlib.sha256(raw.encode("utf-8")).hexdigest()
+        if key in seen:
+            continue
+        seen.add(key)
+        notif.dedupe_key = key
+        batch.append(notif)
+    EmailNotification.objects.bulk_update(batch, ["dedupe_key"], batch_size=500)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('notifications', '0004_email_leasing'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='emailnotification',
+            name='dedupe_key',
+            field=models.CharField(blank=True, editable=False, max_length=64, null=True),
+        ),
+        migrations.RunPython(forwards, migrations.RunPython.noop),
+        migrations.AddConstraint(
+            model_name='emailnotification',
+            constraint=models.UniqueConstraint(condition=models.Q(('status', 'pending')), fields=('dedupe_key',), name='notification_pending_dedupe_key'),
+        ),
+    ]
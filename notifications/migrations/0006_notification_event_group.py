@@ -0,0 +1,22 @@
+# Generated by Django 4.2.30 on 2026-10-19 00:41
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('notifications', '0005_email_dedupe_key'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='notificationevent',
+            name='group_key',
+            field=models.CharField(blank=True, max_length=64),
+        ),
+        migrations.AddIndex(
+            model_name='notificationevent',
+            index=models.Index(fields=['status', 'kind', 'group_key'], name='notificatio_status_d40059_idx'),
+        ),
+    ]
@@ -0,0 +1,23 @@
+# Generated by Django 4.2.30 on 2026-10-19 01:21
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('notifications', '0006_notification_event_group'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='notificationevent',
+            name='lease_token',
+            field=models.UUIDField(blank=True, editable=False, null=True),
+        ),
+        migrations.AddField(
+            model_name='notificationevent',
+            name='leased_until',
+            field=models.DateTimeField(blank=True, editable=False, null=True),
+        ),
+    ]
@@ -1,5 +1,7 @@
+import hashlib
+
 from django.db import models
-from django.core.mail import send_mail
+from django.core.mail import EmailMultiAlternatives, send_mail
 from django.utils import timezone
 
 
@@ -19,13 +21,33 @@ class EmailNotification(models.Model):
 	sent_at = models.DateTimeField(null=True, blank=True)
 	last_attempt_at = models.DateTimeField(null=True, blank=True)
 	retry_count = models.PositiveIntegerField(default=0)
+	next_attempt_at = models.DateTimeField(null=True, blank=True)
+	# make_dedupe_key() of recipient, subject and template kind; unique among PENDING rows.
+	dedupe_key = models.CharField(max_length=64, null=True, blank=True, editable=False)
+	# Set by notifications.services.lease_notifications while a sender owns the row.
+	lease_token = models.UUIDField(null=True, blank=True, editable=False)
+	leased_until = models.DateTimeField(null=True, blank=True, editable=False)
 
 	class Meta:
 		ordering = ["-created_at"]
+		indexes = [models.Index(fields=("status", "created_at"))]
+		constraints = [
+			models.UniqueConstraint(
+				fields=("dedupe_key",),
+				condition=models.Q(status="pending"),
+				name="notification_pending_dedupe_key",
+			),
+		]
 
 	def __str__(self):  # pragma: no cover - trivial
 		return f"EmailNotification(to={self.to_email}, status={self.status})"
 
+	@staticmethod
+	def make_dedupe_key(to_email: str, subject: str, kind: str = "") -> str:
+		"""Hash of the normalized recipient, subject and template kind."""
+		raw = "\x1f".join((kind or "", (to_email or "").strip().lower(), subject or ""))
+		return hashlib.sha256(raw.encode("utf-8")).hexdigest()
+
 	def send(self, *, fail_silently=False) -> bool:
 		if self.status == self.Status.SENT:
 			return True
@@ -52,9 +74,64 @@ class EmailNotification(models.Model):
 			self.save(update_fields=["status", "sent_at", "last_attempt_at"])
 			return True
 
-	def requeue(self) -> None:
+	def as_message(self, connection=None) -> EmailMultiAlternatives:
+		"""The message :meth:`send` would deliver, bound to ``connection`` for batched sending."""
+		message = EmailMultiAlternatives(
+			subject=self.subject,
+			body=self.body,
+			to=[self.to_email],
+			connection=connection,
+		)
+		if self.html_body:
+			message.attach_alternative(self.html_body, "text/html")
+		return message
+
+	def requeue(self) -> bool:
+		"""Set back to PENDING; False (and left as is) when an identical email is already pending."""
+		if self.dedupe_key and EmailNotification.objects.filter(
+			dedupe_key=self.dedupe_key, status=self.Status.PENDING
+		).exclude(pk=self.pk).exists():
+			return False
 		self.status = self.Status.PENDING
 		self.error_message = ""
 		self.save(update_fields=["status", "error_message"])
+		return True
+
+
+class NotificationEvent(models.Model):
+	"""Outbox row written in the same transaction as the change it reports.
+
+	Only the facts are stored (``kind``, the object id and a small payload);
+	``notifications.outbox`` turns events into :class:`EmailNotification`
+	rows outside the request, so no template is rendered and no mail
+	provider is contacted while the user waits.
+	"""
+
+	class Status(models.TextChoices):
+		PENDING = "pending", "Pending"
+		PROCESSED = "processed", "Processed"
+		FAILED = "failed", "Failed"
+
+	kind = models.CharField(max_length=64)
+	object_id = models.PositiveBigIntegerField()
+	# Events sharing a group (e.g. one school) are coalesced into a digest when their kind has a digest window.
+	group_key = models.CharField(max_length=64, blank=True)
+	payload = models.JSONField(default=dict, blank=True)
+	status = models.CharField(max_length=16, choices=Status.choices, default=Status.PENDING)
+	attempts = models.PositiveSmallIntegerField(default=0)
+	last_error = models.CharField(max_length=512, blank=True)
+	created_at = models.DateTimeField(auto_now_add=True)
+	processed_at = models.DateTimeField(null=True, blank=True)
+	# Set by notifications.outbox while a drain owns the event, so overlapping drains never handle it twice.
+	lease_token = models.UUIDField(null=True, blank=True, editable=False)
+	leased_until = models.DateTimeField(null=True, blank=True, editable=False)
 
+	class Meta:
+		ordering = ["id"]
+		indexes = [
+			models.Index(fields=("status", "id")),
+			models.Index(fields=("status", "kind", "group_key")),
+		]
 
+	def __str__(self):  # pragma: no cover - trivial
+		return f"NotificationEvent({self.kind} #{self.object_id}, status={self.status})"
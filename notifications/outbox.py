@@ -0,0 +1,268 @@
+"""Transactional outbox for notifications.
+
+Writers call :func:`record_event` (or :func:`record_events`) inside the
+transaction that makes the change, so an event exists exactly when the
+change was committed.  :func:`process_pending_events` later turns events
+into :class:`~notifications.models.EmailNotification` rows by calling the
+handler configured for their kind in ``settings.NOTIFICATION_EVENT_HANDLERS``
+(``kind -> "dotted.path"``).  A handler receives a list of events of its
+kind and returns ``{event.pk: [queue_email kwargs, ...]}``.
+
+Digests: when ``settings.NOTIFICATION_DIGEST_WINDOWS`` gives a kind a window
+(seconds), its events that share a ``group_key`` are held until the oldest
+of them is that old, and are then handed to the handler together so it can
+send one message per recipient instead of one per event.
+
+``send_pending_notifications`` and every poll of ``run_notification_worker``
+drain the outbox before sending, which also releases digest groups whose
+window has ended.  With ``NOTIFICATIONS_SEND_IMMEDIATELY`` a background
+thread drains it once the writer's transaction commits, so the request never
+waits for rendering or the mail provider; a drain that has to hold a group
+back schedules another one for when the group falls due.  Drains
+therefore overlap; each one leases the events it picked (a conditional
+``UPDATE``, as ``lease_notifications`` does for emails) and handles only
+the ones it won.
+"""
+from __future__ import annotations
+
+import logging
+import threading
+import uuid
+from collections import defaultdict
+from datetime import datetime, timedelta
+from functools import lru_cache
+from typing import Callable, Iterable
+
+from django.conf import settings
+from django.db import connections, transaction
+from django.db.models import F, Min, Q
+from django.utils import timezone
+from django.utils.module_loading import import_string
+
+from common.db import coordinated_write
+
+from .models import NotificationEvent
+from .services import DEFAULT_LEASE_SECONDS, queue_emails, send_all_pending
+
+logger = logging.getLogger(__name__)
+
+MAX_EVENT_ATTEMPTS = 5
+DEFAULT_EVENT_BATCH = 100
+
+
+class LeaseLost(Exception):
+    """The events' lease expired and another drain took them over."""
+
+
+def record_event(kind: str, object_id: int, group_key: str = "", **payload) -> NotificationEvent:
+    event = NotificationEvent.objects.create(kind=kind, object_id=object_id, group_key=group_key, payload=payload)
+    _schedule_drain()
+    return event
+
+
+def record_events(kind: str, items: Iterable[tuple[int, dict, str]]) -> list[NotificationEvent]:
+    """Bulk variant of :func:`record_event` taking ``(object_id, payload, group_key)`` triples."""
+    events = NotificationEvent.objects.bulk_create([
+        NotificationEvent(kind=kind, object_id=object_id, payload=payload, group_key=group_key)
+        for object_id, payload, group_key in items
+    ])
+    if events:
+        _schedule_drain()
+    return events
+
+
+def digest_window(kind: str) -> int:
+    """Seconds events of ``kind`` wait to be coalesced; 0 when the kind is not digested."""
+    return int(getattr(settings, "NOTIFICATION_DIGEST_WINDOWS", {}).get(kind) or 0)
+
+
+def _held_groups(pending, now) -> dict[tuple[str, str], datetime]:
+    """``{(kind, group_key): due}`` for groups whose oldest pending event is still inside its digest window."""
+    held = {}
+    for kind in getattr(settings, "NOTIFICATION_DIGEST_WINDOWS", {}):
+        window = digest_window(kind)
+        if not window:
+            continue
+        groups = (
+            pending.filter(kind=kind).exclude(group_key="")
+            .values("group_key").annotate(first=Min("created_at"))
+            .filter(first__gt=now - timedelta(seconds=window))
+            .values_list("group_key", "first")
+        )
+        held.update(((kind, group_key), first + timedelta(seconds=window)) for group_key, first in groups.order_by())
+    return held
+
+
+@lru_cache(maxsize=None)
+def _handler(kind: str) -> Callable:
+    handlers = getattr(settings, "NOTIFICATION_EVENT_HANDLERS", {})
+    if kind not in handlers:
+        raise LookupError(f"No notification handler configured for {kind!r}")
+    return import_string(handlers[kind])
+
+
+def _free(now) -> Q:
+    return Q(leased_until__isnull=True) | Q(leased_until__lt=now)
+
+
+@coordinated_write
+def _claim_events(ids: list[int], token: uuid.UUID, lease_seconds: int) -> int:
+    now = timezone.now()
+    return NotificationEvent.objects.filter(
+        _free(now), status=NotificationEvent.Status.PENDING, pk__in=ids
+    ).update(lease_token=token, leased_until=now + timedelta(seconds=lease_seconds))
+
+
+def _apply_handler(kind: str, events: list[NotificationEvent], token: uuid.UUID) -> int:
+    """Queue the emails for ``events`` and mark them processed in one transaction.
+
+    Raises :class:`LeaseLost` (rolling the emails back) when any of the
+    events is no longer leased under ``token``.
+    """
+    with transaction.atomic():
+        emails_by_event = _handler(kind)(events)
+        emails = [email for event in events for email in emails_by_event.get(event.pk, [])]
+        queued = len(queue_emails(emails))
+        updated = NotificationEvent.objects.filter(
+            pk__in=[event.pk for event in events], status=NotificationEvent.Status.PENDING, lease_token=token
+        ).update(
+            status=NotificationEvent.Status.PROCESSED,
+            processed_at=timezone.now(),
+            attempts=F("attempts") + 1,
+            last_error="",
+            lease_token=None,
+            leased_until=None,
+        )
+        if updated != len(events):
+            raise LeaseLost(f"{len(events) - updated} of {len(events)} {kind} events were taken over")
+    return queued
+
+
+def _record_failure(event: NotificationEvent, exc: Exception) -> None:
+    event.attempts += 1
+    event.last_error = f"{type(exc).__name__}: {exc}"[:512]
+    if event.attempts >= MAX_EVENT_ATTEMPTS:
+        event.status = NotificationEvent.Status.FAILED
+    event.lease_token = None
+    event.leased_until = None
+    event.save(update_fields=["attempts", "last_error", "status", "lease_token", "leased_until"])
+
+
+def process_pending_events(
+    limit: int | None = DEFAULT_EVENT_BATCH, *, lease_seconds: int = DEFAULT_LEASE_SECONDS
+) -> dict[str, int]:
+    """Turn up to ``limit`` pending events into queued emails.
+
+    Events of one kind are handled as a batch.  If the batch fails, each
+    event is retried alone so one bad event does not hold back the others;
+    an event that keeps failing is marked FAILED after
+    :data:`MAX_EVENT_ATTEMPTS` tries.  Digest groups still inside their
+    window are skipped, and a group that is due is always processed whole,
+    even past ``limit``.
+
+    The picked events are leased for ``lease_seconds`` first, and only the
+    ones this call won are handled, so an overlapping drain never turns the
+    same event into a second email.  A drain that dies leaves its events to
+    be picked up again once the lease expires.
+    """
+    stats = {"processed": 0, "failed": 0, "emails": 0}
+    now = timezone.now()
+    pending = NotificationEvent.objects.filter(status=NotificationEvent.Status.PENDING)
+    held = _held_groups(pending, now)
+    if held:
+        _schedule_release(min(held.values()))
+    available = pending.filter(_free(now))
+    events = available.order_by("id")
+    if limit is not None:
+        events = events[:limit]
+    by_kind: dict[str, list[NotificationEvent]] = defaultdict(list)
+    due_groups: dict[str, set[str]] = defaultdict(set)
+    for event in events:
+        if (event.kind, event.group_key) in held:
+            continue
+        by_kind[event.kind].append(event)
+        if event.group_key and digest_window(event.kind):
+            due_groups[event.kind].add(event.group_key)
+    for kind, group_keys in due_groups.items():
+        picked = {event.pk for event in by_kind[kind]}
+        rest = available.filter(kind=kind, group_key__in=group_keys).exclude(pk__in=picked).order_by("id")
+        by_kind[kind].extend(rest)
+
+    token = uuid.uuid4()
+    ids = [event.pk for batch in by_kind.values() for event in batch]
+    if not ids or not _claim_events(ids, token, lease_seconds):
+        return stats
+    won = set(NotificationEvent.objects.filter(lease_token=token).values_list("pk", flat=True))
+
+    for kind, batch in by_kind.items():
+        batch = [event for event in batch if event.pk in won]
+        if not batch:
+            continue
+        singles = batch if len(batch) == 1 else []
+        if not singles:
+            try:
+                stats["emails"] += _apply_handler(kind, batch, token)
+                stats["processed"] += len(batch)
+                continue
+            except Exception:
+                logger.warning("[PERF][OUTBOX] %s batch failed; retrying its %d events one by one", kind, len(batch))
+                singles = batch
+        for event in singles:
+            try:
+                stats["emails"] += _apply_handler(kind, [event], token)
+                stats["processed"] += 1
+            except LeaseLost:
+                logger.warning("[PERF][OUTBOX] %s event %s was taken over by another drain", kind, event.pk)
+            except Exception as exc:
+                logger.exception("[PERF][OUTBOX] %s event %s failed", kind, event.pk)
+                _record_failure(event, exc)
+                stats["failed"] += 1
+    return stats
+
+
+def drain(limit: int | None = DEFAULT_EVENT_BATCH) -> dict[str, int]:
+    """Process pending events, then try to send what is queued."""
+    stats = process_pending_events(limit)
+    stats["sent"] = send_all_pending(limit=limit)
+    return stats
+
+
+def _drain_in_background() -> None:
+    try:
+        drain()
+    except Exception:
+        logger.exception("[PERF][OUTBOX] background drain failed")
+    finally:
+        connections.close_all()
+
+
+_release_lock = threading.Lock()
+_release_timer: threading.Timer | None = None
+_release_at: datetime | None = None
+
+
+def _schedule_release(due: datetime) -> None:
+    """Drain again once the earliest held digest group is due (one timer per process)."""
+    global _release_timer, _release_at
+    if not getattr(settings, "NOTIFICATIONS_SEND_IMMEDIATELY", False):
+        return
+    with _release_lock:
+        if _release_timer is not None and _release_timer.is_alive() and _release_at <= due:
+            return
+        if _release_timer is not None:
+            _release_timer.cancel()
+        # One second past the due time, so the group is no longer "inside" its window.
+        delay = max((due - timezone.now()).total_seconds(), 0) + 1
+        _release_timer = threading.Timer(delay, _drain_in_background)
+        _release_timer.name = "notification-digest-release"
+        _release_timer.daemon = True
+        _release_at = due
+        _release_timer.start()
+
+
+def _schedule_drain() -> None:
+    if not getattr(settings, "NOTIFICATIONS_SEND_IMMEDIATELY", False):
+        return
+    transaction.on_commit(
+        lambda: threading.Thread(target=_drain_in_background, name="notification-outbox", daemon=True).start()
+    )
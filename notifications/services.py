@@ -1,37 +1,132 @@
 from __future__ import annotations
 
-from typing import Optional
+import logging
+import uuid
+from datetime import timedelta
+from typing import Callable, Iterable, Optional
 from django.conf import settings
+from django.core.mail import get_connection
+from django.db import IntegrityError, connections, transaction
+from django.utils import timezone
 from .models import EmailNotification
 from django.db.models import Q
 
+from common.db import backoff_delay, coordinated_write
 
-def queue_email(to_email: str, subject: str, body: str, html_body: str | None = None) -> EmailNotification:
+logger = logging.getLogger(__name__)
+
+SEND_BATCH_SIZE = 50
+DEDUPE_LOOKUP_CHUNK = 500
+DEFAULT_LEASE_SECONDS = 5 * 60
+RETRY_BACKOFF_BASE_SECONDS = 60
+RETRY_BACKOFF_CAP_SECONDS = 6 * 60 * 60
+_SEND_FIELDS = [
+    "status", "error_message", "sent_at", "last_attempt_at", "retry_count",
+    "next_attempt_at", "lease_token", "leased_until",
+]
+
+
+def queue_email(
+    to_email: str, subject: str, body: str, html_body: str | None = None, kind: str = ""
+) -> EmailNotification:
     """Create a pending email notification.
 
-    Duplicate suppression: if an identical pending notification (same to_email + subject)
-    already exists, do not create a new one; instead return existing.
+    Duplicate suppression: if an identical pending notification (same recipient
+    ignoring case, subject and template ``kind``) already exists, do not create
+    a new one; instead return existing.  The check is one probe of the unique
+    index on pending ``dedupe_key``s, and that constraint also settles two
+    requests racing to queue the same email.
     """
-    existing = EmailNotification.objects.filter(
-        to_email__iexact=to_email,
-        subject=subject,
-        status=EmailNotification.Status.PENDING,
-    ).first()
+    dedupe_key = EmailNotification.make_dedupe_key(to_email, subject, kind)
+    pending = EmailNotification.objects.filter(dedupe_key=dedupe_key, status=EmailNotification.Status.PENDING)
+    existing = pending.first()
     if existing:
         return existing
-    notif = EmailNotification.objects.create(
-        to_email=to_email,
-        subject=subject,
-        body=body,
-        html_body=html_body or "",
-    )
+    try:
+        with transaction.atomic():
+            notif = EmailNotification.objects.create(
+                to_email=to_email,
+                subject=subject,
+                body=body,
+                html_body=html_body or "",
+                dedupe_key=dedupe_key,
+            )
+    except IntegrityError:
+        existing = pending.first()
+        if existing is None:
+            raise
+        return existing
     # Optional: send immediately if configured (useful on platforms without a scheduler)
+    if getattr(settings, "NOTIFICATIONS_SEND_IMMEDIATELY", False):
+        transaction.on_commit(lambda: _send_quietly([notif]))
+    return notif
+
+
+def queue_emails(emails: Iterable[dict], *, send_now: bool = True) -> list[EmailNotification]:
+    """Queue many notifications with one duplicate lookup and one insert.
+
+    ``emails`` are :func:`queue_email` kwargs.  Duplicates are suppressed the
+    same way (by pending ``dedupe_key``), including duplicates within the
+    batch.  If a concurrent writer queued one of them first, the batch falls
+    back to row-by-row inserts.  Returns only the newly created rows.
+    ``send_now=False`` leaves them to the sender even with
+    ``NOTIFICATIONS_SEND_IMMEDIATELY`` (for large batches such as reminders).
+    """
+    keyed = [
+        (EmailNotification.make_dedupe_key(email["to_email"], email["subject"], email.get("kind", "")), email)
+        for email in emails
+    ]
+    if not keyed:
+        return []
+    keys = list({key for key, _ in keyed})
+    seen = set()
+    for start in range(0, len(keys), DEDUPE_LOOKUP_CHUNK):
+        seen.update(
+            EmailNotification.objects.filter(
+                status=EmailNotification.Status.PENDING,
+                dedupe_key__in=keys[start:start + DEDUPE_LOOKUP_CHUNK],
+            ).order_by().values_list("dedupe_key", flat=True)
+        )
+    batch = []
+    for key, email in keyed:
+        if key in seen:
+            continue
+        seen.add(key)
+        batch.append(
+            EmailNotification(
+                to_email=email["to_email"],
+                subject=email["subject"],
+                body=email["body"],
+                html_body=email.get("html_body") or "",
+                dedupe_key=key,
+            )
+        )
     try:
-        if getattr(settings, "NOTIFICATIONS_SEND_IMMEDIATELY", False):
-            notif.send()
+        with transaction.atomic():
+            created = EmailNotification.objects.bulk_create(batch)
+    except IntegrityError:
+        created = []
+        for notif in batch:
+            notif.pk = None
+            try:
+                with transaction.atomic():
+                    notif.save(force_insert=True)
+            except IntegrityError:
+                continue
+            created.append(notif)
+    if send_now and getattr(settings, "NOTIFICATIONS_SEND_IMMEDIATELY", False) and created:
+        transaction.on_commit(lambda: _send_quietly(created))
+    return created
+
+
+def _send_quietly(notifications) -> None:
+    try:
+        pending = EmailNotification.objects.filter(
+            pk__in=[notif.pk for notif in notifications], status=EmailNotification.Status.PENDING
+        )
+        send_notifications(lease_notifications(pending, None))
     except Exception:
-        pass
-    return notif
+        logger.exception("[PERF][MAIL] immediate send failed")
 
 
 def send_email_now(to_email: str, subject: str, body: str, html_body: str | None = None) -> bool:
@@ -40,14 +135,136 @@ def send_email_now(to_email: str, subject: str, body: str, html_body: str | None
     return notif.send()
 
 
+def retry_delay(retry_count: int) -> timedelta:
+    """Full-jitter exponential backoff before retry number ``retry_count`` (1-based)."""
+    return timedelta(seconds=backoff_delay(
+        max(retry_count - 1, 0), base=RETRY_BACKOFF_BASE_SECONDS, cap=RETRY_BACKOFF_CAP_SECONDS
+    ))
+
+
+def _mark_failed(notif: EmailNotification, exc: Exception, now) -> None:
+    notif.status = EmailNotification.Status.FAILED
+    notif.error_message = str(exc)[:500]
+    notif.retry_count = (notif.retry_count or 0) + 1
+    notif.last_attempt_at = now
+    notif.next_attempt_at = now + retry_delay(notif.retry_count)
+
+
+def _release(notif: EmailNotification) -> None:
+    notif.lease_token = None
+    notif.leased_until = None
+
+
+def lease_notifications(
+    queryset, limit: Optional[int], *, lease_seconds: int = DEFAULT_LEASE_SECONDS
+) -> list[EmailNotification]:
+    """Claim up to ``limit`` rows of ``queryset`` that no other sender holds.
+
+    The claim is a conditional ``UPDATE`` (run as a coordinated write, so
+    SQLite lock errors are retried) that stamps a fresh lease token
+    and expiry on rows whose lease is absent or expired, so two senders
+    racing for the same rows never both win them; on PostgreSQL the
+    candidates are also picked with ``SKIP LOCKED`` so they do not queue
+    behind each other.  ``send_notifications`` clears the lease when it
+    writes the outcome back.  A sender that dies leaves its rows to be
+    reclaimed once ``lease_seconds`` have passed.
+    """
+    token = uuid.uuid4()
+    if not _claim(queryset, limit, token, lease_seconds):
+        return []
+    return list(EmailNotification.objects.filter(lease_token=token).order_by("created_at", "pk"))
+
+
+@coordinated_write
+def _claim(queryset, limit: Optional[int], token: uuid.UUID, lease_seconds: int) -> int:
+    now = timezone.now()
+    free = Q(leased_until__isnull=True) | Q(leased_until__lt=now)
+    candidates = queryset.filter(free).order_by("created_at", "pk")
+    if connections[queryset.db].features.has_select_for_update_skip_locked:
+        candidates = candidates.select_for_update(skip_locked=True)
+    if limit is not None:
+        candidates = candidates[:limit]
+    ids = list(candidates.values_list("pk", flat=True))
+    if not ids:
+        return 0
+    return EmailNotification.objects.filter(free, pk__in=ids).update(
+        lease_token=token, leased_until=now + timedelta(seconds=lease_seconds)
+    )
+
+
+@coordinated_write
+def _write_back(notifications: list[EmailNotification]) -> None:
+    EmailNotification.objects.bulk_update(notifications, _SEND_FIELDS)
+
+
+def send_notifications(
+    notifications: Iterable[EmailNotification],
+    *,
+    connection=None,
+    batch_size: int = SEND_BATCH_SIZE,
+    throttle: Callable[[], object] | None = None,
+) -> int:
+    """Send ``notifications`` over one mail backend connection; returns the count sent.
+
+    ``EmailNotification.send`` goes through ``send_mail``, which opens a new
+    SMTP/HTTP connection per email.  Here the connection is opened once and
+    each batch of ``batch_size`` rows is written back with one
+    ``bulk_update``.  Messages are handed to ``send_messages`` one at a time
+    so a rejected recipient only fails its own row and nothing already
+    delivered is sent again.  FAILED rows are retried; SENT rows are skipped.
+    ``throttle`` is called before each message (see
+    :class:`notifications.worker.RateLimiter`).  A failed row gets its next
+    attempt time from :func:`retry_delay`.
+    """
+    pending = [notif for notif in notifications if notif.status != EmailNotification.Status.SENT]
+    if not pending:
+        return 0
+    connection = connection or get_connection()
+    sent_count = 0
+    try:
+        connection.open()
+    except Exception as exc:  # pragma: no cover - network dependent
+        now = timezone.now()
+        for notif in pending:
+            _mark_failed(notif, exc, now)
+            _release(notif)
+        _write_back(pending)
+        logger.warning("[PERF][MAIL] could not open mail connection: %s", exc)
+        return 0
+    try:
+        for start in range(0, len(pending), batch_size):
+            batch = pending[start:start + batch_size]
+            for notif in batch:
+                _release(notif)
+                if throttle is not None:
+                    throttle()
+                try:
+                    delivered = connection.send_messages([notif.as_message(connection)])
+                except Exception as exc:
+                    _mark_failed(notif, exc, timezone.now())
+                    continue
+                if not delivered:
+                    _mark_failed(notif, RuntimeError("Mail backend did not accept the message"), timezone.now())
+                    continue
+                notif.status = EmailNotification.Status.SENT
+                notif.error_message = ""
+                notif.next_attempt_at = None
+                notif.sent_at = notif.last_attempt_at = timezone.now()
+                sent_count += 1
+            _write_back(batch)
+    finally:
+        connection.close()
+    logger.info("[PERF][MAIL] sent %d of %d email(s) over one connection", sent_count, len(pending))
+    return sent_count
+
+
 def send_all_pending(limit: Optional[int] = 50, *, retry_failed: bool = False, max_retries: Optional[int] = None) -> int:
     """Attempt to send queued notifications.
 
     - When retry_failed=True, include FAILED items up to max_retries.
+    - Rows are leased first, so concurrent runs and workers never send the same row.
     - Returns count successfully sent.
     """
-    from django.db.models import Q
-
     base_q = Q(status=EmailNotification.Status.PENDING)
     if retry_failed:
         base_q |= Q(status=EmailNotification.Status.FAILED)
@@ -57,13 +274,4 @@ def send_all_pending(limit: Optional[int] = 50, *, retry_failed: bool = False, m
     else:
         qs = EmailNotification.objects.filter(status=EmailNotification.Status.PENDING).order_by("created_at")
 
-    if limit is not None:
-        qs = qs[:limit]
-    sent_count = 0
-    for notif in qs:
-        if notif.status == EmailNotification.Status.FAILED:
-            # Transition to pending prior to retry
-            notif.requeue()
-        if notif.send():
-            sent_count += 1
-    return sent_count
+    return send_notifications(lease_notifications(qs, limit))
@@ -1,3 +1,266 @@
-from django.test import TestCase
+import uuid
+from datetime import timedelta
+from smtplib import SMTPRecipientsRefused
 
-# Create your tests here.
+from django.core import mail
+from django.core.mail.backends import locmem
+from django.db import IntegrityError, transaction
+from django.test import TestCase, override_settings
+from django.utils import timezone
+
+from notifications import outbox
+from notifications.models import EmailNotification, NotificationEvent
+from notifications.services import lease_notifications, queue_email, queue_emails, send_all_pending
+from notifications.worker import NotificationWorker, RateLimiter
+
+
+def echo_handler(events):
+    if any(event.payload.get("explode") for event in events):
+        raise RuntimeError("handler failed")
+    return {
+        event.pk: [{"to_email": event.payload["to"], "subject": f"Event {event.object_id}", "body": "Hello"}]
+        for event in events
+    }
+
+
+overlapping_drains = []
+
+
+def overlapping_handler(events):
+    """Starts another drain while this one is still handling its events."""
+    if not overlapping_drains:
+        overlapping_drains.append({})
+        overlapping_drains[0].update(outbox.process_pending_events())
+    return echo_handler(events)
+
+
+def stolen_lease_handler(events):
+    """Simulates another drain taking the events over after this drain's lease expired."""
+    NotificationEvent.objects.filter(pk__in=[event.pk for event in events]).update(lease_token=uuid.uuid4())
+    return echo_handler(events)
+
+
+@override_settings(NOTIFICATION_EVENT_HANDLERS={
+    "test.echo": "notifications.tests.echo_handler",
+    "test.overlap": "notifications.tests.overlapping_handler",
+    "test.stolen": "notifications.tests.stolen_lease_handler",
+})
+class NotificationOutboxTests(TestCase):
+    def setUp(self):
+        outbox._handler.cache_clear()
+        self.addCleanup(outbox._handler.cache_clear)
+
+    def test_events_become_emails_once(self):
+        outbox.record_events("test.echo", [(1, {"to": "a@example.com"}, ""), (2, {"to": "b@example.com"}, "")])
+        self.assertFalse(EmailNotification.objects.exists())
+
+        stats = outbox.process_pending_events()
+        self.assertEqual(stats, {"processed": 2, "failed": 0, "emails": 2})
+        self.assertEqual(
+            sorted(EmailNotification.objects.values_list("to_email", flat=True)), ["a@example.com", "b@example.com"]
+        )
+        self.assertEqual(outbox.process_pending_events()["processed"], 0)
+
+    def test_failing_event_does_not_block_the_batch(self):
+        outbox.record_event("test.echo", 1, to="a@example.com")
+        bad = outbox.record_event("test.echo", 2, to="b@example.com", explode=True)
+        outbox.record_event("unknown.kind", 3)
+
+        for attempt in range(1, outbox.MAX_EVENT_ATTEMPTS + 1):
+            stats = outbox.process_pending_events()
+            bad.refresh_from_db()
+            self.assertEqual(bad.attempts, attempt)
+        self.assertEqual(bad.status, NotificationEvent.Status.FAILED)
+        self.assertIn("handler failed", bad.last_error)
+        self.assertEqual(stats["failed"], 2)
+        self.assertEqual(list(EmailNotification.objects.values_list("to_email", flat=True)), ["a@example.com"])
+        self.assertEqual(NotificationEvent.objects.filter(status=NotificationEvent.Status.FAILED).count(), 2)
+
+
+    def test_overlapping_drains_never_handle_an_event_twice(self):
+        outbox.record_events("test.overlap", [(1, {"to": "a@example.com"}, ""), (2, {"to": "b@example.com"}, "")])
+        self.addCleanup(overlapping_drains.clear)
+
+        stats = outbox.process_pending_events()
+        self.assertEqual(overlapping_drains, [{"processed": 0, "failed": 0, "emails": 0}])
+        self.assertEqual(stats, {"processed": 2, "failed": 0, "emails": 2})
+        self.assertEqual(EmailNotification.objects.count(), 2)
+
+    def test_drain_whose_lease_was_taken_over_rolls_back(self):
+        outbox.record_events("test.stolen", [(1, {"to": "a@example.com"}, ""), (2, {"to": "b@example.com"}, "")])
+
+        stats = outbox.process_pending_events()
+        self.assertEqual(stats, {"processed": 0, "failed": 0, "emails": 0})
+        self.assertFalse(EmailNotification.objects.exists())
+        self.assertEqual(
+            list(NotificationEvent.objects.values_list("status", "attempts")),
+            [(NotificationEvent.Status.PENDING, 0)] * 2,
+        )
+
+class RejectingBackend(locmem.EmailBackend):
+    """locmem backend that counts opened connections and refuses bounce* recipients."""
+
+    opened = 0
+
+    def open(self):
+        RejectingBackend.opened += 1
+        return super().open()
+
+    def send_messages(self, messages):
+        if any(address.startswith("bounce") for message in messages for address in message.to):
+            raise SMTPRecipientsRefused({"bounce@example.com": (550, b"No such user")})
+        return super().send_messages(messages)
+
+
+@override_settings(EMAIL_BACKEND="notifications.tests.RejectingBackend")
+class BatchedSendTests(TestCase):
+    def setUp(self):
+        RejectingBackend.opened = 0
+
+    def _queue(self, *recipients, **extra):
+        return [
+            EmailNotification.objects.create(
+                to_email=to, subject=f"Subject {to}", body="Body", html_body="<p>Body</p>", **extra
+            )
+            for to in recipients
+        ]
+
+    def test_send_all_pending_uses_one_connection_and_bulk_updates(self):
+        self._queue("a@example.com", "b@example.com", "c@example.com")
+        retried = self._queue("d@example.com", status=EmailNotification.Status.FAILED, retry_count=1)[0]
+
+        # lease: pick ids + claim + leased rows; write-back: one bulk_update (each write in a savepoint here)
+        with self.assertNumQueries(8):
+            sent = send_all_pending(limit=None, retry_failed=True)
+
+        self.assertEqual(sent, 4)
+        self.assertEqual(RejectingBackend.opened, 1)
+        self.assertEqual(len(mail.outbox), 4)
+        self.assertEqual(mail.outbox[0].alternatives, [("<p>Body</p>", "text/html")])
+        retried.refresh_from_db()
+        self.assertEqual(retried.status, EmailNotification.Status.SENT)
+        self.assertIsNotNone(retried.sent_at)
+        self.assertFalse(EmailNotification.objects.exclude(status=EmailNotification.Status.SENT).exists())
+
+    def test_rejected_recipient_only_fails_its_own_row(self):
+        self._queue("a@example.com", "bounce@example.com", "c@example.com")
+
+        self.assertEqual(send_all_pending(limit=None), 2)
+
+        bounced = EmailNotification.objects.get(to_email="bounce@example.com")
+        self.assertEqual(bounced.status, EmailNotification.Status.FAILED)
+        self.assertEqual(bounced.retry_count, 1)
+        self.assertIn("No such user", bounced.error_message)
+        self.assertEqual(sorted(message.to[0] for message in mail.outbox), ["a@example.com", "c@example.com"])
+        self.assertEqual(send_all_pending(limit=None), 0)
+
+
+@override_settings(EMAIL_BACKEND="notifications.tests.RejectingBackend", NOTIFICATION_RATE_LIMITS={})
+class NotificationWorkerTests(TestCase):
+    def _queue(self, count, prefix="user"):
+        return EmailNotification.objects.bulk_create(
+            EmailNotification(to_email=f"{prefix}{n}@example.com", subject=f"Subject {n}", body="Body")
+            for n in range(count)
+        )
+
+    def test_leases_never_overlap_until_they_expire(self):
+        self._queue(5)
+        pending = EmailNotification.objects.filter(status=EmailNotification.Status.PENDING)
+
+        first = lease_notifications(pending, 3)
+        second = lease_notifications(pending, 3)
+        self.assertEqual(len(first), 3)
+        self.assertEqual(len(second), 2)
+        self.assertFalse({n.pk for n in first} & {n.pk for n in second})
+        self.assertEqual(lease_notifications(pending, 3), [])
+
+        EmailNotification.objects.filter(pk=first[0].pk).update(leased_until=timezone.now() - timedelta(seconds=1))
+        self.assertEqual([n.pk for n in lease_notifications(pending, 3)], [first[0].pk])
+
+    def test_worker_sends_and_backs_off_failures(self):
+        self._queue(3)
+        self._queue(1, prefix="bounce")
+        worker = NotificationWorker(threads=1, batch_size=10, idle_seconds=0, max_retries=3)
+
+        self.assertEqual(worker.run_once(), {"events": 0, "leased": 4, "sent": 3})
+        bounced = EmailNotification.objects.get(to_email="bounce0@example.com")
+        self.assertEqual(bounced.status, EmailNotification.Status.FAILED)
+        self.assertIsNone(bounced.lease_token)
+        self.assertGreater(bounced.next_attempt_at, bounced.last_attempt_at)
+        # Not due yet, so the next poll has nothing to do.
+        self.assertEqual(worker.run_once(), {"events": 0, "leased": 0, "sent": 0})
+
+        EmailNotification.objects.filter(pk=bounced.pk).update(next_attempt_at=timezone.now())
+        self.assertEqual(worker.run_once()["leased"], 1)
+        EmailNotification.objects.filter(pk=bounced.pk).update(next_attempt_at=timezone.now(), retry_count=3)
+        self.assertEqual(worker.run(max_batches=2), {"batches": 2, "events": 0, "leased": 0, "sent": 0})
+        self.assertEqual(len(mail.outbox), 3)
+
+    def test_stop_ends_run_after_current_batch(self):
+        self._queue(2)
+        worker = NotificationWorker(threads=1, batch_size=1, idle_seconds=0)
+        worker.limiter = RateLimiter(None)
+        original = worker.run_once
+
+        def run_once_then_stop(pool=None):
+            stats = original(pool)
+            worker.stop()
+            return stats
+
+        worker.run_once = run_once_then_stop
+        self.assertEqual(worker.run(), {"batches": 1, "events": 0, "leased": 1, "sent": 1})
+        self.assertEqual(EmailNotification.objects.filter(status=EmailNotification.Status.PENDING).count(), 1)
+
+    def test_rate_limiter_spaces_calls(self):
+        now = [0.0]
+        sleeps = []
+
+        def sleep(seconds):
+            sleeps.append(seconds)
+            now[0] += seconds
+
+        limiter = RateLimiter(2, clock=lambda: now[0], sleep=sleep)
+        waits = [limiter.acquire() for _ in range(4)]
+        self.assertEqual(waits[:2], [0.0, 0.0])
+        self.assertAlmostEqual(now[0], 1.0)
+        self.assertAlmostEqual(sum(sleeps), 1.0)
+
+
+class DedupeKeyTests(TestCase):
+    def test_queue_email_suppresses_pending_duplicates_by_key(self):
+        first = queue_email("Head@Example.com", "Noted: Form 1", "Body", kind="emails/submission_noted.html")
+        again = queue_email(" head@example.com", "Noted: Form 1", "Body", kind="emails/submission_noted.html")
+        other_kind = queue_email("head@example.com", "Noted: Form 1", "Body", kind="emails/submission_generic.html")
+
+        self.assertEqual(again.pk, first.pk)
+        self.assertNotEqual(other_kind.pk, first.pk)
+        self.assertEqual(first.dedupe_key, EmailNotification.make_dedupe_key("head@example.com", "Noted: Form 1", "emails/submission_noted.html"))
+
+        EmailNotification.objects.filter(pk=first.pk).update(status=EmailNotification.Status.SENT)
+        self.assertNotEqual(queue_email("head@example.com", "Noted: Form 1", "Body", kind="emails/submission_noted.html").pk, first.pk)
+
+    def test_constraint_rejects_a_racing_pending_duplicate(self):
+        notif = queue_email("a@example.com", "Subject", "Body")
+        with self.assertRaises(IntegrityError), transaction.atomic():
+            EmailNotification.objects.create(to_email="A@example.com", subject="Subject", body="Body", dedupe_key=notif.dedupe_key)
+
+    def test_queue_emails_dedupes_in_one_lookup(self):
+        queue_email("a@example.com", "Subject", "Body")
+        emails = [
+            {"to_email": "A@example.com", "subject": "Subject", "body": "Body"},
+            {"to_email": "b@example.com", "subject": "Subject", "body": "Body"},
+            {"to_email": "B@example.com", "subject": "Subject", "body": "Body"},
+        ]
+        with self.assertNumQueries(4):  # lookup + savepoint, insert, release
+            created = queue_emails(emails)
+        self.assertEqual([notif.to_email for notif in created], ["b@example.com"])
+
+    def test_requeue_skips_when_an_identical_email_is_pending(self):
+        failed = queue_email("a@example.com", "Subject", "Body")
+        EmailNotification.objects.filter(pk=failed.pk).update(status=EmailNotification.Status.FAILED)
+        failed.refresh_from_db()
+        queue_email("a@example.com", "Subject", "Body")
+
+        self.assertFalse(failed.requeue())
+        failed.refresh_from_db()
+        self.assertEqual(failed.status, EmailNotification.Status.FAILED)
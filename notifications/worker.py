@@ -0,0 +1,160 @@
+"""Long-running email delivery worker.
+
+Each poll of :class:`NotificationWorker` first drains the transactional
+outbox (:func:`~notifications.outbox.process_pending_events`, which leases
+the events it handles), so status changes become emails without a cron run
+of ``send_pending_notifications``.  It then leases a batch of sendable
+:class:`~notifications.models.EmailNotification` rows
+(:func:`~notifications.services.lease_notifications`), splits it across a
+bounded thread pool and delivers each share over its own backend connection
+(:func:`~notifications.services.send_notifications`).  Because rows are
+leased before they are sent, any number of workers (and one-shot
+``send_pending_notifications`` runs) can share the queue without sending a
+row twice.
+
+Failed rows are retried after :func:`~notifications.services.retry_delay`
+(exponential backoff with jitter on ``retry_count``) until
+``NOTIFICATION_MAX_RETRIES`` attempts have failed.  Sending is throttled per
+mail provider with ``settings.NOTIFICATION_RATE_LIMITS`` (messages per
+second, per worker process).  :meth:`NotificationWorker.stop` lets the
+current batch finish and then returns from :meth:`NotificationWorker.run`.
+"""
+from __future__ import annotations
+
+import logging
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable
+
+from django.conf import settings
+from django.db import connections
+from django.db.models import Q
+from django.utils import timezone
+
+from .models import EmailNotification
+from .outbox import process_pending_events
+from .services import DEFAULT_LEASE_SECONDS, SEND_BATCH_SIZE, lease_notifications, send_notifications
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_THREADS = 4
+DEFAULT_IDLE_SECONDS = 5.0
+DEFAULT_MAX_RETRIES = 5
+
+
+def mail_provider() -> str:
+    """Short name of the configured mail provider, e.g. ``mailgun`` or ``smtp``."""
+    provider = getattr(settings, "ANYMAIL_PROVIDER", "")
+    if provider:
+        return provider
+    return settings.EMAIL_BACKEND.rsplit(".", 2)[-2]
+
+
+class RateLimiter:
+    """Thread-safe token bucket allowing ``rate`` calls per second (unlimited when falsy)."""
+
+    def __init__(self, rate: float | None, *, clock: Callable[[], float] = time.monotonic, sleep=time.sleep):
+        self.rate = float(rate or 0)
+        self._clock = clock
+        self._sleep = sleep
+        self._lock = threading.Lock()
+        self._tokens = max(self.rate, 1.0)
+        self._updated = clock()
+
+    def acquire(self) -> float:
+        """Block until a call is allowed; returns the seconds waited."""
+        if self.rate <= 0:
+            return 0.0
+        waited = 0.0
+        while True:
+            with self._lock:
+                now = self._clock()
+                self._tokens = min(max(self.rate, 1.0), self._tokens + (now - self._updated) * self.rate)
+                self._updated = now
+                if self._tokens >= 1:
+                    self._tokens -= 1
+                    return waited
+                delay = (1 - self._tokens) / self.rate
+            self._sleep(delay)
+            waited += delay
+
+
+def sendable_notifications(max_retries: int = DEFAULT_MAX_RETRIES):
+    """Pending rows plus failed rows whose backoff has elapsed and retries remain."""
+    now = timezone.now()
+    due = Q(next_attempt_at__isnull=True) | Q(next_attempt_at__lte=now)
+    return EmailNotification.objects.filter(due).filter(
+        Q(status=EmailNotification.Status.PENDING)
+        | Q(status=EmailNotification.Status.FAILED, retry_count__lt=max_retries)
+    )
+
+
+class NotificationWorker:
+    def __init__(
+        self,
+        *,
+        threads: int = DEFAULT_THREADS,
+        batch_size: int = SEND_BATCH_SIZE,
+        lease_seconds: int = DEFAULT_LEASE_SECONDS,
+        idle_seconds: float = DEFAULT_IDLE_SECONDS,
+        max_retries: int | None = None,
+        rate: float | None = None,
+    ):
+        self.threads = max(1, threads)
+        self.batch_size = max(1, batch_size)
+        self.lease_seconds = lease_seconds
+        self.idle_seconds = idle_seconds
+        self.max_retries = (
+            max_retries if max_retries is not None
+            else getattr(settings, "NOTIFICATION_MAX_RETRIES", DEFAULT_MAX_RETRIES)
+        )
+        if rate is None:
+            rate = getattr(settings, "NOTIFICATION_RATE_LIMITS", {}).get(mail_provider())
+        self.limiter = RateLimiter(rate)
+        self.stop_event = threading.Event()
+
+    def stop(self, *args) -> None:
+        """Finish the batch in flight, then leave :meth:`run` (usable as a signal handler)."""
+        self.stop_event.set()
+
+    def _deliver(self, share: list[EmailNotification]) -> int:
+        try:
+            return send_notifications(share, throttle=self.limiter.acquire)
+        finally:
+            connections.close_all()
+
+    def run_once(self, pool: ThreadPoolExecutor | None = None) -> dict[str, int]:
+        """Drain pending outbox events, then lease one batch and deliver it.
+
+        Returns ``{"events": n, "leased": n, "sent": n}``.
+        """
+        events = process_pending_events(self.batch_size, lease_seconds=self.lease_seconds)["processed"]
+        leased = lease_notifications(
+            sendable_notifications(self.max_retries), self.batch_size, lease_seconds=self.lease_seconds
+        )
+        if not leased:
+            return {"events": events, "leased": 0, "sent": 0}
+        if pool is None or self.threads == 1:
+            sent = send_notifications(leased, throttle=self.limiter.acquire)
+        else:
+            shares = [leased[index::self.threads] for index in range(self.threads)]
+            sent = sum(pool.map(self._deliver, [share for share in shares if share]))
+        logger.info("[PERF][MAIL] worker sent %d of %d leased email(s)", sent, len(leased))
+        return {"events": events, "leased": len(leased), "sent": sent}
+
+    def run(self, max_batches: int | None = None) -> dict[str, int]:
+        """Deliver batches until stopped (or ``max_batches`` ran); sleeps ``idle_seconds`` when the queue is empty."""
+        totals = {"batches": 0, "events": 0, "leased": 0, "sent": 0}
+        with ThreadPoolExecutor(max_workers=self.threads, thread_name_prefix="notification-worker") as pool:
+            while not self.stop_event.is_set():
+                if max_batches is not None and totals["batches"] >= max_batches:
+                    break
+                stats = self.run_once(pool)
+                totals["batches"] += 1
+                totals["events"] += stats["events"]
+                totals["leased"] += stats["leased"]
+                totals["sent"] += stats["sent"]
+                if not stats["leased"]:
+                    self.stop_event.wait(self.idle_seconds)
+        return totals
@@ -4,3 +4,6 @@ from django.apps import AppConfig
 class OrganizationsConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'organizations'
+
+    def ready(self):
+        from . import search  # noqa: F401  (registers the search documents and their signal receivers)
@@ -0,0 +1,34 @@
+from django.db import migrations
+
+
+def forwards(apps, schema_editor):
+    """One search document per existing school (same text as organizations.search.school_text)."""
+    School = apps.get_model("organizations", "School")
+    SchoolProfile = apps.get_model("organizations", "SchoolProfile")
+    SearchDocument = apps.get_model("common", "SearchDocument")
+    profiles = {profile.school_id: profile for profile in SchoolProfile.objects.all()}
+    documents = []
+    for school in School.objects.order_by("pk"):
+        profile = profiles.get(school.pk)
+        parts = [school.name, school.code]
+        if profile is not None:
+            parts += [profile.head_name, profile.head_contact]
+        text = " ".join("\n".join(part for part in parts if part).split())
+        documents.append(SearchDocument(kind="school", object_id=school.pk, text=text))
+    SearchDocument.objects.bulk_create(documents, batch_size=500, ignore_conflicts=True)
+
+
+def backwards(apps, schema_editor):
+    apps.get_model("common", "SearchDocument").objects.filter(kind="school").delete()
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('common', '0001_search_document'),
+        ('organizations', '0005_schoolprofile_notification_email'),
+    ]
+
+    operations = [
+        migrations.RunPython(forwards, backwards),
+    ]
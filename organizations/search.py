@@ -0,0 +1,64 @@
+"""Search documents for schools (see common.search).
+
+One ``school`` document per school holds its name, code and the head's
+name and contact from its profile, which is everything the review queue,
+the school profile list and the directory search on.  The receivers below
+keep it current; ``manage.py rebuild_search_index`` rebuilds it after bulk
+writes that skip signals.
+"""
+from __future__ import annotations
+
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from common import search
+
+from .models import School, SchoolProfile
+
+SCHOOL_DOCUMENTS = "school"
+
+
+def school_text(school: School, profile: SchoolProfile | None = None) -> str:
+    parts = [school.name, school.code]
+    if profile is not None:
+        parts += [profile.head_name, profile.head_contact]
+    return "\n".join(part for part in parts if part)
+
+
+def _profile(school: School) -> SchoolProfile | None:
+    try:
+        return school.profile
+    except SchoolProfile.DoesNotExist:
+        return None
+
+
+def school_documents():
+    for school in School.objects.select_related("profile").order_by("pk").iterator(chunk_size=500):
+        yield school.pk, school_text(school, _profile(school))
+
+
+search.register(SCHOOL_DOCUMENTS, school_documents)
+
+
+@receiver(post_save, sender=School, dispatch_uid="organizations.search.index_school")
+def index_school(sender, instance, raw=False, **kwargs):
+    if not raw:
+        search.index_document(SCHOOL_DOCUMENTS, instance.pk, school_text(instance, _profile(instance)))
+
+
+@receiver(post_save, sender=SchoolProfile, dispatch_uid="organizations.search.index_profile")
+def index_profile(sender, instance, raw=False, **kwargs):
+    if not raw:
+        search.index_document(SCHOOL_DOCUMENTS, instance.school_id, school_text(instance.school, instance))
+
+
+@receiver(post_delete, sender=SchoolProfile, dispatch_uid="organizations.search.unindex_profile")
+def unindex_profile(sender, instance, **kwargs):
+    school = School.objects.filter(pk=instance.school_id).first()
+    if school is not None:
+        search.index_document(SCHOOL_DOCUMENTS, school.pk, school_text(school))
+
+
+@receiver(post_delete, sender=School, dispatch_uid="organizations.search.unindex_school")
+def unindex_school(sender, instance, **kwargs):
+    search.remove_document(SCHOOL_DOCUMENTS, instance.pk)
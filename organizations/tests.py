@@ -106,6 +106,17 @@ class SchoolProfileViewTests(TestCase):
         self.assertEqual(response.status_code, 200)
         self.assertEqual(list(response.context["profiles"]), [self.other_profile])
 
+    def test_list_search_ranks_closer_matches_first(self):
+        self.client.force_login(self.sgod)
+        self.other_profile.head_name = "Maria South"
+        self.other_profile.save()
+        response = self.client.get(reverse("organizations:school_profile_list"), {"q": "south"})
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(list(response.context["profiles"]), [self.profile, self.other_profile])
+
+        response = self.client.get(reverse("organizations:school_profile_list"), {"q": "MARIA"})
+        self.assertEqual(list(response.context["profiles"]), [self.other_profile])
+
     def test_list_filters_by_district(self):
         self.client.force_login(self.sgod)
         response = self.client.get(
@@ -182,6 +193,15 @@ class DirectoryManagementTests(TestCase):
         school = School.objects.get(code="new-school")
         self.assertTrue(SchoolProfile.objects.filter(school=school).exists())
 
+    def test_search_matches_school_head(self):
+        school = School.objects.create(code="hill-es", name="Hill ES", district=self.district)
+        SchoolProfile.objects.create(school=school, head_name="Corazon Lim")
+        School.objects.create(code="vale-es", name="Vale ES", district=self.district)
+        self.client.force_login(self.sgod)
+        response = self.client.get(reverse("organizations:manage_directory"), {"search": "corazon"})
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(list(response.context["schools"]), [school])
+
     def test_reset_password(self):
         self.client.force_login(self.sgod)
         url = reverse("organizations:manage_directory")
@@ -1,16 +1,17 @@
 from django import forms
 from django.contrib import messages
 from django.contrib.auth.decorators import login_required
-from django.db.models import Q
 from django.shortcuts import get_object_or_404, redirect, render
 from django.urls import reverse
 
 from accounts.decorators import require_school_head, require_sgod_admin
+from common import search
 
 from django.contrib.auth import get_user_model
 
 from .forms import SchoolForm, SchoolProfileForm, UserPasswordResetForm
 from .models import District, School, SchoolProfile, Section
+from .search import SCHOOL_DOCUMENTS
 
 
 @login_required
@@ -23,18 +24,20 @@ def school_profile_list(request):
     strand = request.GET.get("strand", "").strip()
 
     profiles_qs = base_qs
+    rank = {}
     if search_query:
-        profiles_qs = profiles_qs.filter(
-            Q(school__name__icontains=search_query)
-            | Q(school__code__icontains=search_query)
-            | Q(head_name__icontains=search_query)
-            | Q(head_contact__icontains=search_query)
-        )
+        rank = {
+            school_id: position
+            for position, school_id in enumerate(search.search_ids(SCHOOL_DOCUMENTS, search_query))
+        }
+        profiles_qs = profiles_qs.filter(school_id__in=rank)
     if district_id:
         profiles_qs = profiles_qs.filter(school__district_id=district_id)
 
     profiles_qs = profiles_qs.order_by("school__name")
     profiles = list(profiles_qs)
+    if rank:
+        profiles.sort(key=lambda profile: rank[profile.school_id])
     if strand:
         lowered = strand.lower()
         profiles = [
@@ -498,9 +501,9 @@ def manage_directory(request):
     # Search functionality
     search_query = request.GET.get("search", "").strip()
     if search_query:
-        schools = School.objects.select_related("district").filter(
-            Q(name__icontains=search_query) | Q(code__icontains=search_query)
-        ).order_by("name")[:50]
+        school_ids = search.search_ids(SCHOOL_DOCUMENTS, search_query, limit=50)
+        by_id = School.objects.select_related("district").in_bulk(school_ids)
+        schools = [by_id[pk] for pk in school_ids if pk in by_id]
     else:
         schools = School.objects.select_related("district").order_by("-id")[:50]
     
@@ -66,6 +66,17 @@ DATABASES = {
     }
 }
 
+# SQLite write coordination (see common/db.py); ignored on other engines.
+# WAL lets readers proceed during a write, busy_timeout makes writers wait for
+# the lock instead of failing at once, and heavy writes are serialized per process.
+SQLITE_PRAGMAS = {
+    'journal_mode': 'WAL',
+    'busy_timeout': 5000,  # ms
+    'synchronous': 'NORMAL',
+}
+SQLITE_WRITE_RETRIES = 5
+SQLITE_WRITE_CONCURRENCY = 1
+
 # Caching configuration for performance optimization
 CACHES = {
     'default': {
@@ -79,6 +90,11 @@ CACHES = {
     }
 }
 
+# Rendered review fragments of NOTED submissions (submissions.fragments)
+REVIEW_FRAGMENT_CACHE_TIMEOUT = 60 * 60 * 24
+# Cached compliance matrix cells (dashboards.compliance); also dropped on any submission status change
+COMPLIANCE_MATRIX_CACHE_TIMEOUT = 60 * 10
+
 # Cache settings for dashboard optimization
 CACHE_MIDDLEWARE_ALIAS = 'default'
 CACHE_MIDDLEWARE_SECONDS = 300
@@ -100,6 +116,10 @@ STATIC_URL = 'static/'
 STATICFILES_DIRS = [BASE_DIR / 'static']
 MEDIA_URL = '/media/'
 MEDIA_ROOT = str(BASE_DIR / 'media')
+# Rendered CSV/XLSX exports of submitted reports (submissions.export_cache); not web-served.
+EXPORT_CACHE_DIR = os.getenv('EXPORT_CACHE_DIR', str(BASE_DIR / 'export_cache'))
+# Gzipped JSONL copies of rows deleted by retention policies with archive=True (common.retention).
+RETENTION_ARCHIVE_DIR = os.getenv('RETENTION_ARCHIVE_DIR', str(BASE_DIR / 'retention_archive'))
 
 DEFAULT_AUTO_FIELD = 'django.db.models.BigAutoField'
 
@@ -157,9 +177,49 @@ EMAIL_USE_SSL = os.getenv('EMAIL_USE_SSL', '0').lower() in {'1','true','yes','on
 if EMAIL_USE_SSL:
     EMAIL_USE_TLS = False  # mutually exclusive
 
-# Notifications behaviour: set to '1' to send immediately upon queue
+# Notifications behaviour: set to '1' to drain the outbox and send right after each commit
 NOTIFICATIONS_SEND_IMMEDIATELY = os.getenv('NOTIFICATIONS_SEND_IMMEDIATELY', '0').lower() in {'1','true','yes','on'}
 
+# run_notification_worker: messages per second per worker process, keyed by provider
+# (ANYMAIL_PROVIDER or the EMAIL_BACKEND module, e.g. 'smtp'); unlisted providers are not throttled
+NOTIFICATION_RATE_LIMITS = {
+    'mailgun': 10,
+    'sendgrid': 10,
+    'mailjet': 10,
+    'smtp': 5,
+}
+NOTIFICATION_MAX_RETRIES = int(os.getenv('NOTIFICATION_MAX_RETRIES', '5'))
+
+# Outbox event kind -> handler building the emails for a batch of events (notifications.outbox)
+NOTIFICATION_EVENT_HANDLERS = {
+    'submission.status_changed': 'submissions.notifications.status_change_emails',
+}
+
+# Outbox event kind -> digest window in seconds: a school's events of that kind within the window
+# are sent as one digest email per recipient (0 / unset sends each event on its own)
+NOTIFICATION_DIGEST_WINDOWS = {
+    'submission.status_changed': int(os.getenv('NOTIFICATION_DIGEST_SECONDS', '0')),
+}
+
+# apply_retention: "app.Model" -> RetentionPolicy options (common.retention). Expired rows are
+# deleted RETENTION_CHUNK_SIZE primary keys at a time, RETENTION_PAUSE_SECONDS apart.
+RETENTION_POLICIES = {
+    'notifications.EmailNotification': {
+        'days': int(os.getenv('RETENTION_EMAIL_DAYS', '30')),
+        'filters': {'status': 'sent'},
+    },
+    'notifications.NotificationEvent': {
+        'days': int(os.getenv('RETENTION_EVENT_DAYS', '30')),
+        'filters': {'status': 'processed'},
+    },
+    'submissions.SubmissionTimeline': {
+        'days': int(os.getenv('RETENTION_TIMELINE_DAYS', '730')),
+        'archive': True,
+    },
+}
+RETENTION_CHUNK_SIZE = int(os.getenv('RETENTION_CHUNK_SIZE', '1000'))
+RETENTION_PAUSE_SECONDS = float(os.getenv('RETENTION_PAUSE_SECONDS', '0.05'))
+
 # If DEFAULT_FROM_EMAIL not provided and Mailgun sender domain exists, derive a sensible default
 if DEFAULT_FROM_EMAIL == 'no-reply@localhost':
     _derived_sender_domain = os.getenv('MAILGUN_SENDER_DOMAIN') or os.getenv('MAILGUN_DOMAIN')
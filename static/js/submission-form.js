@@ -246,6 +246,7 @@ document.addEventListener('DOMContentLoaded', function() {
           window.location.assign(url.toString());
           return;
         }
+        if (cellAutosave.navigate(target)) return;
         if (nextTabInput) nextTabInput.value = target;
         if (skipValidationInput) skipValidationInput.value = '1';
         if (autosaveInput) autosaveInput.value = '1';
@@ -254,6 +255,103 @@ document.addEventListener('DOMContentLoaded', function() {
     });
   }
 
+  // ---------------- Field-level autosave ----------------
+  // Edited cells of existing formset rows are PATCHed as JSON (only the changed
+  // values) instead of re-posting the whole tab. New/deleted rows and any other
+  // inputs (JSON builders, reasons, signatories) still use the full form submit.
+  // Idle autosaves only fill the server-side draft buffer; tab switches and
+  // page unloads apply it to the report.
+  const cellAutosave = {
+    form: null,
+    prefixes: {},
+    pending: new Map(),
+    versions: {},
+    needsFullSave: false,
+    initialTotals: {},
+    timer: null,
+    inFlight: null,
+    hasBuffered: false,
+
+    init() {
+      const form = byId('submission-form');
+      if (!form || form.dataset.canEdit !== '1' || !form.dataset.autosaveUrl) return;
+      try { this.prefixes = JSON.parse(form.dataset.autosavePrefixes || '{}'); } catch (e) { return; }
+      this.form = form;
+      this.initialTotals = this.totals();
+      form.addEventListener('change', (e) => this.onChange(e.target));
+      window.addEventListener('beforeunload', () => {
+        if (this.pending.size || this.hasBuffered) this.flush({ keepalive: true });
+      });
+    },
+
+    totals() {
+      const totals = {};
+      this.form.querySelectorAll('input[name$="-TOTAL_FORMS"]').forEach(el => { totals[el.name] = el.value; });
+      return totals;
+    },
+
+    describe(input) {
+      const m = /^(.+)-(\d+)-(\w+)$/.exec(input.name || '');
+      if (!m || !this.prefixes[m[1]]) return null;
+      const target = this.prefixes[m[1]];
+      if (target.fields.indexOf(m[3]) === -1) return null;
+      const idInput = this.form.querySelector(`input[name="${m[1]}-${m[2]}-id"]`);
+      if (!idInput || !idInput.value) return null;
+      return { model: target.model, id: parseInt(idInput.value, 10), field: m[3], version: idInput.dataset.version };
+    },
+
+    onChange(input) {
+      if (!input || input.type === 'hidden') return;
+      const cell = input.name ? this.describe(input) : null;
+      if (!cell) { this.needsFullSave = true; return; }
+      cell.value = input.type === 'checkbox' ? input.checked : input.value;
+      const ref = `${cell.model}:${cell.id}`;
+      if (this.versions[ref]) cell.version = this.versions[ref];
+      // Rows rendered without a version cannot be checked for conflicts; save them with the form.
+      if (!cell.version) { this.needsFullSave = true; return; }
+      this.pending.set(`${ref}:${cell.field}`, cell);
+      clearTimeout(this.timer);
+      this.timer = setTimeout(() => this.flush({ buffer: true }), 1500);
+    },
+
+    flush(options = {}) {
+      const buffer = !!options.buffer;
+      if (!this.pending.size && (buffer || !this.hasBuffered)) return this.inFlight || Promise.resolve(true);
+      const changes = Array.from(this.pending.values());
+      this.pending.clear();
+      const csrf = this.form.querySelector('input[name="csrfmiddlewaretoken"]');
+      const request = fetch(this.form.dataset.autosaveUrl, {
+        method: 'PATCH',
+        headers: { 'Content-Type': 'application/json', 'X-CSRFToken': csrf ? csrf.value : '' },
+        body: JSON.stringify({ changes, buffer }),
+        credentials: 'same-origin',
+        keepalive: !!options.keepalive,
+      }).then(resp => resp.json().then(data => {
+        if (resp.ok) this.hasBuffered = buffer;
+        Object.assign(this.versions, data.versions || {});
+        // Conflicts/errors: let the full form submit (with its validation) take over.
+        if (!resp.ok) this.needsFullSave = true;
+        return resp.ok;
+      })).catch(() => { this.needsFullSave = true; return false; });
+      this.inFlight = request;
+      return request;
+    },
+
+    navigate(targetTab) {
+      if (!this.form || this.needsFullSave) return false;
+      const totals = this.totals();
+      if (Object.keys(totals).some(name => totals[name] !== this.initialTotals[name])) return false;
+      clearTimeout(this.timer);
+      this.flush().then(ok => {
+        if (!ok) { this.form.submit(); return; }
+        const url = new URL(window.location.href);
+        url.searchParams.set('tab', targetTab);
+        window.location.assign(url.toString());
+      });
+      return true;
+    },
+  };
+
   // ---------------- Projects ----------------
   function renumberProjects() {
     const sections = Array.from(document.querySelectorAll('.project-section'));
@@ -1543,6 +1641,7 @@ document.addEventListener('DOMContentLoaded', function() {
 
   function init() {
     initTabsAndForm();
+    cellAutosave.init();
     attachProjectDeleteHandlers();
     attachActivityDeleteHandlers();
     // Make Activity headers clickable to collapse/expand
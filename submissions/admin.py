@@ -18,6 +18,7 @@ from .models import (
     Form1SupervisionRow,
     FormTemplate,
     Period,
+    ReminderCampaign,
     SMEAActivityRow,
     SMEAProject,
     Submission,
@@ -292,4 +293,8 @@ class Form1SignatoriesAdmin(admin.ModelAdmin):
     list_display = ("submission", "prepared_by", "submitted_to")
 
 
-
+@admin.register(ReminderCampaign)
+class ReminderCampaignAdmin(admin.ModelAdmin):
+    list_display = ("form_template", "period", "district", "created_by", "created_at", "missing_schools", "queued", "without_email")
+    list_filter = ("period", "form_template")
+    readonly_fields = ("created_at",)
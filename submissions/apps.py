@@ -4,3 +4,6 @@ from django.apps import AppConfig
 class SubmissionsConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'submissions'
+
+    def ready(self):
+        from . import search  # noqa: F401  (registers the search documents and their signal receivers)
@@ -0,0 +1,288 @@
+"""Field-level autosave for the SMEA Form 1 editor.
+
+The editor sends only the cells that changed since the last autosave::
+
+    {"changes": [{"model": "slp_row", "id": 12, "field": "dnme",
+                  "value": 4, "version": "3f2a9c0d1e7b"}]}
+
+Each ``model`` key maps to a whitelisted set of editable fields.  Values are
+validated with the model field's own ``clean()`` plus the model's ``clean()``,
+and all rows are written with one ``bulk_update`` per model inside a single
+transaction.  Row versions are short hashes of the editable values, so a
+client that sends a stale ``version`` gets a conflict instead of silently
+overwriting another tab's edits.  The editor renders each row's version as
+``data-version`` on its ``id`` input (see :func:`stamp_row_versions`), and
+every change must carry one.
+"""
+from __future__ import annotations
+
+import hashlib
+import json
+from collections import defaultdict
+from dataclasses import dataclass, field
+
+from django.core.exceptions import ValidationError
+from django.core.serializers.json import DjangoJSONEncoder
+from django.db import transaction
+from django.utils import timezone
+
+from .models import (
+    Form1PctRow,
+    Form1RMAIntervention,
+    Form1RMARow,
+    Form1SLPRow,
+    Form1SupervisionRow,
+    ReadingAssessmentCRLA,
+    ReadingAssessmentPHILIRI,
+    ReadingInterventionNew,
+    Submission,
+)
+
+MAX_AUTOSAVE_CHANGES = 2000
+
+
+@dataclass(frozen=True)
+class AutosaveTarget:
+    model: type
+    submission_lookup: str
+    fields: tuple[str, ...]
+    # Formset prefix used by edit_submission, so the editor can map inputs.
+    prefix: str
+    # Editor tab the rows live on; draft buffers are kept per tab.
+    tab: str
+    # Completion section (see submissions.progress) affected by the edit.
+    section: str | None = None
+
+
+AUTOSAVE_TARGETS: dict[str, AutosaveTarget] = {
+    "pct_row": AutosaveTarget(Form1PctRow, "header__submission", ("percent", "action_points"), "pct", "pct", "pct"),
+    "slp_row": AutosaveTarget(
+        Form1SLPRow,
+        "submission",
+        (
+            "enrolment", "dnme", "fs", "s", "vs", "o", "is_offered",
+            "top_three_llc", "intervention_plan", "non_mastery_reasons", "non_mastery_other",
+        ),
+        "slp_rows",
+        "slp",
+        "slp",
+    ),
+    "reading_crla": AutosaveTarget(
+        ReadingAssessmentCRLA,
+        "submission",
+        ("mt_grade_1", "mt_grade_2", "mt_grade_3", "fil_grade_2", "fil_grade_3", "eng_grade_3"),
+        "reading_crla_new",
+        "reading",
+    ),
+    "reading_philiri": AutosaveTarget(
+        ReadingAssessmentPHILIRI,
+        "submission",
+        tuple(f"{language}_grade_{grade}" for language in ("eng", "fil") for grade in range(4, 11)),
+        "reading_philiri_new",
+        "reading",
+    ),
+    "reading_intervention": AutosaveTarget(
+        ReadingInterventionNew, "submission", ("description",), "reading_interventions_new", "reading"
+    ),
+    "rma_row": AutosaveTarget(
+        Form1RMARow,
+        "submission",
+        (
+            "enrolment", "emerging_not_proficient", "emerging_low_proficient",
+            "developing_nearly_proficient", "transitioning_proficient", "at_grade_level",
+        ),
+        "rma_rows",
+        "rma",
+        "rma",
+    ),
+    "rma_intervention": AutosaveTarget(Form1RMAIntervention, "submission", ("description",), "rma_interventions", "rma"),
+    "supervision_row": AutosaveTarget(
+        Form1SupervisionRow,
+        "submission",
+        ("grade_label", "total_teachers", "teachers_supervised_observed_ta", "intervention_support_provided", "result"),
+        "supervision_rows",
+        "supervision",
+        "supervision",
+    ),
+}
+
+
+def autosave_prefix_map() -> dict[str, dict[str, object]]:
+    """``{formset prefix: {"model": key, "fields": [...]}}`` for the editor JS."""
+    return {
+        target.prefix: {"model": key, "fields": list(target.fields)}
+        for key, target in AUTOSAVE_TARGETS.items()
+    }
+
+
+def row_version(instance, fields) -> str:
+    """Short hash of the editable values of ``instance``."""
+    payload = json.dumps([getattr(instance, name) for name in fields], cls=DjangoJSONEncoder)
+    return hashlib.sha1(payload.encode("utf-8")).hexdigest()[:12]
+
+
+def stamp_row_versions(formsets) -> None:
+    """Render each saved row's version as ``data-version`` on its ``id`` input.
+
+    Call it before the formsets are validated: validation copies posted
+    values onto the instances.
+    """
+    targets = {target.prefix: target for target in AUTOSAVE_TARGETS.values()}
+    for formset in formsets:
+        target = targets.get(getattr(formset, "prefix", None))
+        if target is None:
+            continue
+        for form in formset.forms:
+            if form.instance.pk and "id" in form.fields:
+                form.fields["id"].widget.attrs["data-version"] = row_version(form.instance, target.fields)
+
+
+def posted_row_refs(formsets) -> set[str]:
+    """``"<model key>:<id>"`` of the saved rows a bound formset posted back."""
+    keys = {target.prefix: key for key, target in AUTOSAVE_TARGETS.items()}
+    refs = set()
+    for formset in formsets:
+        key = keys.get(getattr(formset, "prefix", None))
+        if key is None or not formset.is_bound:
+            continue
+        refs.update(f"{key}:{form.instance.pk}" for form in formset.forms if form.instance.pk)
+    return refs
+
+
+@dataclass
+class AutosaveResult:
+    versions: dict[str, str] = field(default_factory=dict)
+    conflicts: dict[str, str] = field(default_factory=dict)
+    errors: dict[str, list[str]] = field(default_factory=dict)
+    updated_rows: int = 0
+
+    @property
+    def ok(self) -> bool:
+        return not self.conflicts and not self.errors
+
+    def as_dict(self) -> dict:
+        return {
+            "ok": self.ok,
+            "versions": self.versions,
+            "conflicts": self.conflicts,
+            "errors": self.errors,
+            "updated_rows": self.updated_rows,
+        }
+
+
+def parse_changes(payload) -> list[dict]:
+    """Validate the request envelope; raises ``ValidationError`` on bad input."""
+    changes = payload.get("changes") if isinstance(payload, dict) else None
+    if not isinstance(changes, list):
+        raise ValidationError("Expected a JSON object with a 'changes' list.")
+    if len(changes) > MAX_AUTOSAVE_CHANGES:
+        raise ValidationError(f"At most {MAX_AUTOSAVE_CHANGES} changes can be saved at once.")
+    parsed = []
+    for change in changes:
+        if not isinstance(change, dict):
+            raise ValidationError("Each change must be an object.")
+        target = AUTOSAVE_TARGETS.get(change.get("model"))
+        if target is None:
+            raise ValidationError(f"Unsupported model '{change.get('model')}'.")
+        if change.get("field") not in target.fields:
+            raise ValidationError(f"Field '{change.get('field')}' cannot be autosaved on {change['model']}.")
+        try:
+            row_id = int(change.get("id"))
+        except (TypeError, ValueError):
+            raise ValidationError("Each change needs a numeric row id.")
+        if not change.get("version"):
+            raise ValidationError("Each change needs the row's version; reload the editor.")
+        parsed.append({
+            "model": change["model"],
+            "id": row_id,
+            "field": change["field"],
+            "value": change.get("value"),
+            "version": change["version"],
+        })
+    return parsed
+
+
+def _blank_to_default(model_field, value):
+    # Cleared number inputs arrive as "" - store them the way the formsets do.
+    if value in ("", None) and model_field.get_internal_type().endswith("IntegerField") and not model_field.null:
+        return model_field.get_default() if model_field.has_default() else 0
+    return value
+
+
+def apply_cell_changes(submission: Submission, changes: list[dict], user=None) -> AutosaveResult:
+    """Validate and persist ``changes`` (as returned by :func:`parse_changes`).
+
+    Rows with a stale version or invalid values are skipped and reported;
+    every other row is written in the same transaction.
+    """
+    result = AutosaveResult()
+    by_model: dict[str, dict[int, list[dict]]] = defaultdict(lambda: defaultdict(list))
+    for change in changes:
+        by_model[change["model"]][change["id"]].append(change)
+
+    touched_sections: set[str] = set()
+    with transaction.atomic():
+        for model_key, rows_changes in by_model.items():
+            target = AUTOSAVE_TARGETS[model_key]
+            rows = (
+                target.model.objects.select_for_update()
+                .filter(pk__in=rows_changes.keys(), **{target.submission_lookup: submission})
+            )
+            rows_by_id = {row.pk: row for row in rows}
+            to_update = []
+            changed_fields: set[str] = set()
+            for row_id, row_changes in rows_changes.items():
+                ref = f"{model_key}:{row_id}"
+                row = rows_by_id.get(row_id)
+                if row is None:
+                    result.errors[ref] = ["Row not found for this submission."]
+                    continue
+                current_version = row_version(row, target.fields)
+                client_version = next((c["version"] for c in row_changes if c["version"]), None)
+                if client_version and client_version != current_version:
+                    result.conflicts[ref] = current_version
+                    continue
+                row_errors = []
+                row_fields = set()
+                for change in row_changes:
+                    model_field = row._meta.get_field(change["field"])
+                    try:
+                        value = model_field.clean(_blank_to_default(model_field, change["value"]), row)
+                    except ValidationError as exc:
+                        row_errors.extend(f"{change['field']}: {message}" for message in exc.messages)
+                        continue
+                    setattr(row, change["field"], value)
+                    row_fields.add(change["field"])
+                if not row_errors:
+                    try:
+                        row.clean()
+                    except ValidationError as exc:
+                        row_errors.extend(exc.messages)
+                if row_errors:
+                    result.errors[ref] = row_errors
+                    continue
+                new_version = row_version(row, target.fields)
+                result.versions[ref] = new_version
+                if new_version == current_version:
+                    # Same values as stored: nothing to write.
+                    continue
+                to_update.append(row)
+                changed_fields |= row_fields
+            if to_update:
+                target.model.objects.bulk_update(to_update, sorted(changed_fields))
+                result.updated_rows += len(to_update)
+                if target.section:
+                    touched_sections.add(target.section)
+
+        if result.updated_rows:
+            submission.last_modified_by = user
+            submission.updated_at = timezone.now()
+            submission.refresh_completion(sorted(touched_sections), save=False)
+            Submission.objects.filter(pk=submission.pk).update(
+                last_modified_by=user,
+                updated_at=submission.updated_at,
+                completion_progress=submission.completion_progress,
+                completion_sections=submission.completion_sections,
+                completion_updated_at=submission.completion_updated_at,
+            )
+    return result
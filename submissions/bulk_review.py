@@ -0,0 +1,132 @@
+"""Note or return many submitted reports in one transaction.
+
+``Submission.mark_noted``/``mark_returned`` save one row, insert one
+timeline entry and record one outbox event per call.  :func:`bulk_review`
+applies the same transition to a whole queue selection: one ``UPDATE`` for
+the status columns (they are identical across the selection), one
+``bulk_create`` for the timeline, one snapshot delete for returned reports
+and one ``bulk_create`` of outbox events
+(:func:`submissions.notifications.record_status_changes`), all inside a
+single coordinated write.  The ``UPDATE`` skips ``Submission.save``, so the
+status counters and the status generation are updated here.
+"""
+from __future__ import annotations
+
+import logging
+from dataclasses import dataclass, field
+
+from django.core.exceptions import ValidationError
+from django.db.models import QuerySet
+from django.utils import timezone
+
+from common import generations
+from common.db import coordinated_write
+
+from . import counters
+from .fragments import discard_fragments
+from .notifications import record_status_changes
+from .models import Submission, SubmissionSnapshot, SubmissionTimeline
+
+logger = logging.getLogger(__name__)
+
+MAX_BULK_REVIEW = 500
+TIMELINE_BATCH_SIZE = 100
+
+ACTION_NOTE = "note"
+ACTION_RETURN = "return"
+
+
+@dataclass
+class BulkReviewResult:
+    action: str
+    transitioned: list[int] = field(default_factory=list)
+    skipped: list[int] = field(default_factory=list)
+
+
+def _transition_values(action: str, actor, remarks: str, now) -> dict:
+    """Columns ``mark_noted``/``mark_returned`` + ``_transition`` would save; identical for every report."""
+    if action == ACTION_NOTE:
+        values = {
+            "status": Submission.Status.NOTED,
+            "noted_at": now,
+            "noted_by": actor,
+            "noted_remarks": remarks,
+            "returned_at": None,
+            "returned_by": None,
+        }
+    else:
+        values = {
+            "status": Submission.Status.RETURNED,
+            "returned_at": now,
+            "returned_by": actor,
+            "returned_remarks": remarks,
+            "noted_at": None,
+            "noted_by": None,
+        }
+    values.update(last_modified_by=actor, updated_at=now)
+    return values
+
+
+@coordinated_write
+def bulk_review(submissions: QuerySet, action: str, actor, remarks: str = "") -> BulkReviewResult:
+    """Note or return every SUBMITTED report in ``submissions``; others are skipped.
+
+    ``submissions`` should already be scoped to what ``actor`` may review.
+    Raises ``ValidationError`` for an unknown action, a return without
+    remarks or more than :data:`MAX_BULK_REVIEW` reports.
+    """
+    if action not in {ACTION_NOTE, ACTION_RETURN}:
+        raise ValidationError(f"Unsupported review action: {action}")
+    remarks = (remarks or "").strip()
+    if action == ACTION_RETURN and not remarks:
+        raise ValidationError("Remarks are required when returning a submission.")
+
+    selected = list(
+        submissions.select_for_update(of=("self",)).order_by("pk")
+    )
+    if len(selected) > MAX_BULK_REVIEW:
+        raise ValidationError(f"Select at most {MAX_BULK_REVIEW} submissions at a time.")
+
+    result = BulkReviewResult(action=action)
+    ready = []
+    for submission in selected:
+        if submission.status == Submission.Status.SUBMITTED:
+            ready.append(submission)
+        else:
+            result.skipped.append(submission.pk)
+    if not ready:
+        return result
+
+    # Fragment keys use the old updated_at, so drop them before it moves.
+    discard_fragments(*ready)
+    values = _transition_values(action, actor, remarks, timezone.now())
+    timeline_actor = actor if actor and getattr(actor, "is_authenticated", False) else None
+    timeline = []
+    for submission in ready:
+        for name, value in values.items():
+            setattr(submission, name, value)
+        timeline.append(
+            SubmissionTimeline(
+                submission=submission,
+                actor=timeline_actor,
+                from_status=Submission.Status.SUBMITTED,
+                to_status=submission.status,
+                remarks=remarks,
+            )
+        )
+    # Every selected report gets the same values, so one UPDATE covers them all.
+    Submission.objects.filter(pk__in=[submission.pk for submission in ready]).update(**values)
+    counters.record_status_changes(ready, Submission.Status.SUBMITTED, values["status"])
+    generations.bump(Submission.STATUS_GENERATION)
+    SubmissionTimeline.objects.bulk_create(timeline, batch_size=TIMELINE_BATCH_SIZE)
+    if action == ACTION_RETURN:
+        SubmissionSnapshot.objects.filter(submission__in=ready).delete()
+    result.transitioned = [submission.pk for submission in ready]
+
+    record_status_changes(ready, Submission.Status.SUBMITTED, values["status"], remarks)
+
+    logger.info(
+        "[PERF][REVIEW] bulk %s: %d transitioned, %d skipped",
+        action, len(result.transitioned), len(result.skipped),
+    )
+    return result
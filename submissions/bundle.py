@@ -0,0 +1,179 @@
+"""Load a submission's Form 1 rows in a fixed number of queries.
+
+:class:`SubmissionBundle` exposes every Form 1 child table as an ordered
+list.  Each list is fetched with one query the first time it is read, with
+its own children prefetched or joined (project activities, PCT rows, per-row
+SLP analysis), so the review pages, exports and the editor never fall into
+per-row lazy loads and only pay for the tables they actually show.
+"""
+from __future__ import annotations
+
+from dataclasses import dataclass
+from functools import cached_property
+from typing import Optional
+
+from django.db.models import Case, IntegerField, Prefetch, When
+
+from .models import (
+    Form1ADMHeader,
+    Form1ADMRow,
+    Form1PctHeader,
+    Form1PctRow,
+    Form1ReadingCRLA,
+    Form1ReadingIntervention,
+    Form1ReadingPHILIRI,
+    Form1RMAIntervention,
+    Form1RMARow,
+    Form1Signatories,
+    Form1SLPLLCEntry,
+    Form1SLPRow,
+    Form1SLPTopDNME,
+    Form1SLPTopOutstanding,
+    Form1SupervisionRow,
+    ReadingAssessmentCRLA,
+    ReadingAssessmentPHILIRI,
+    ReadingDifficultyPlan,
+    ReadingInterventionNew,
+    SMEAActivityRow,
+    SMEAProject,
+    Submission,
+)
+
+RMA_GRADE_NUMBERS = {"k": 0, **{f"g{n}": n for n in range(1, 11)}}
+
+
+def _assessment_order(**levels) -> dict:
+    return {
+        "period_order": Case(
+            When(period="bosy", then=0),
+            When(period="mosy", then=1),
+            When(period="eosy", then=2),
+            default=99,
+            output_field=IntegerField(),
+        ),
+        "level_order": Case(
+            *[When(level=level, then=rank) for level, rank in levels.items()],
+            default=99,
+            output_field=IntegerField(),
+        ),
+    }
+
+
+@dataclass(eq=False)
+class SubmissionBundle:
+    submission: Submission
+
+    # --- projects ----------------------------------------------------------
+    @cached_property
+    def projects(self) -> list[SMEAProject]:
+        """Projects with ``activities.all()`` prefetched in ``row_order``."""
+        return list(
+            SMEAProject.objects.filter(submission=self.submission)
+            .order_by("id")
+            .prefetch_related(Prefetch("activities", queryset=SMEAActivityRow.objects.order_by("row_order", "id")))
+        )
+
+    # --- implementation & action points ------------------------------------
+    @cached_property
+    def pct_header(self) -> Optional[Form1PctHeader]:
+        return (
+            Form1PctHeader.objects.filter(submission=self.submission)
+            .prefetch_related(Prefetch("rows", queryset=Form1PctRow.objects.order_by("area")))
+            .first()
+        )
+
+    @property
+    def pct_rows(self) -> list[Form1PctRow]:
+        return list(self.pct_header.rows.all()) if self.pct_header else []
+
+    # --- SLP ---------------------------------------------------------------
+    @cached_property
+    def slp_rows(self) -> list[Form1SLPRow]:
+        """SLP rows in the school's grade/subject order, per-row ``analysis`` joined."""
+        from .views import slp_grade_subject_pairs
+
+        pair_index = {pair: index for index, pair in enumerate(slp_grade_subject_pairs(self.submission.school))}
+        rows = Form1SLPRow.objects.filter(submission=self.submission).select_related("analysis")
+        return sorted(
+            rows,
+            key=lambda row: (pair_index.get((row.grade_label, row.subject), len(pair_index)), row.grade_label, row.subject),
+        )
+
+    @cached_property
+    def slp_llc_entries(self) -> list[Form1SLPLLCEntry]:
+        return list(Form1SLPLLCEntry.objects.filter(submission=self.submission).order_by("order"))
+
+    @cached_property
+    def slp_top_dnme(self) -> list[Form1SLPTopDNME]:
+        return list(Form1SLPTopDNME.objects.filter(submission=self.submission).order_by("position"))
+
+    @cached_property
+    def slp_top_outstanding(self) -> list[Form1SLPTopOutstanding]:
+        return list(Form1SLPTopOutstanding.objects.filter(submission=self.submission).order_by("position"))
+
+    # --- reading -----------------------------------------------------------
+    @cached_property
+    def legacy_crla(self) -> list[Form1ReadingCRLA]:
+        return list(
+            Form1ReadingCRLA.objects.filter(submission=self.submission).order_by("level", "timing", "subject", "band")
+        )
+
+    @cached_property
+    def legacy_philiri(self) -> list[Form1ReadingPHILIRI]:
+        return list(Form1ReadingPHILIRI.objects.filter(submission=self.submission).order_by("level", "timing", "language"))
+
+    @cached_property
+    def legacy_reading_interventions(self) -> list[Form1ReadingIntervention]:
+        return list(Form1ReadingIntervention.objects.filter(submission=self.submission).order_by("order"))
+
+    @cached_property
+    def crla_assessments(self) -> list[ReadingAssessmentCRLA]:
+        return list(
+            ReadingAssessmentCRLA.objects.filter(submission=self.submission)
+            .annotate(**_assessment_order(low_emerging=1, high_emerging=2, developing=3, transitioning=4))
+            .order_by("period_order", "level_order")
+        )
+
+    @cached_property
+    def philiri_assessments(self) -> list[ReadingAssessmentPHILIRI]:
+        return list(
+            ReadingAssessmentPHILIRI.objects.filter(submission=self.submission)
+            .annotate(**_assessment_order(frustration=1, instructional=2, independent=3))
+            .order_by("period_order", "level_order")
+        )
+
+    @cached_property
+    def reading_interventions(self) -> list[ReadingInterventionNew]:
+        return list(ReadingInterventionNew.objects.filter(submission=self.submission).order_by("order"))
+
+    @cached_property
+    def reading_difficulty_plans(self) -> list[ReadingDifficultyPlan]:
+        return list(ReadingDifficultyPlan.objects.filter(submission=self.submission).order_by("period", "grade_label"))
+
+    # --- RMA ---------------------------------------------------------------
+    @cached_property
+    def rma_rows(self) -> list[Form1RMARow]:
+        """RMA rows ordered Kinder, Grade 1 ... Grade 10 (unknown labels last)."""
+        rows = Form1RMARow.objects.filter(submission=self.submission).order_by("id")
+        return sorted(rows, key=lambda row: RMA_GRADE_NUMBERS.get(row.grade_label, 99))
+
+    @cached_property
+    def rma_interventions(self) -> list[Form1RMAIntervention]:
+        return list(Form1RMAIntervention.objects.filter(submission=self.submission).order_by("order"))
+
+    # --- supervision, ADM, signatories -------------------------------------
+    @cached_property
+    def supervision_rows(self) -> list[Form1SupervisionRow]:
+        return list(Form1SupervisionRow.objects.filter(submission=self.submission).order_by("grade_label", "id"))
+
+    @cached_property
+    def adm_header(self) -> Optional[Form1ADMHeader]:
+        return Form1ADMHeader.objects.filter(submission=self.submission).first()
+
+    @cached_property
+    def adm_rows(self) -> list[Form1ADMRow]:
+        return list(Form1ADMRow.objects.filter(submission=self.submission).order_by("id"))
+
+    @cached_property
+    def signatories(self) -> Optional[Form1Signatories]:
+        return Form1Signatories.objects.filter(submission=self.submission).first()
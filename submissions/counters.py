@@ -0,0 +1,119 @@
+"""Denormalised submission counts per section, period, district and status.
+
+``review_queue`` shows how many reports are pending, returned and noted for
+the reviewer's scope.  Counting submissions for every tab on every load gets
+slower as the table grows, so :class:`~submissions.models.SubmissionStatusCounter`
+keeps those numbers instead: ``Submission.save``/``delete`` call
+:func:`record_status_change` and ``bulk_review`` calls
+:func:`record_status_changes`, in the same transaction as the change, and
+:func:`status_counts` sums the few matching rows.
+
+A ``QuerySet.delete`` must call :func:`record_deletions` on the queryset
+first.  Other writes that bypass the model (``QuerySet.update``,
+``bulk_create``, moving a school to another district) are not tracked;
+``manage.py rebuild_status_counters`` recomputes the table from scratch.
+"""
+from __future__ import annotations
+
+from collections import Counter
+from typing import Iterable
+
+from django.db import transaction
+from django.db.models import Count, F, Sum
+
+from .models import Submission, SubmissionStatusCounter
+
+_FORM_TEMPLATE = Submission._meta.get_field("form_template")
+_SCHOOL = Submission._meta.get_field("school")
+
+
+def _counter_keys(submissions: Iterable[Submission]) -> dict[int, tuple]:
+    """``{submission.pk: (section_id, period_id, district_id)}``, with one query for any not already loaded."""
+    keys = {}
+    missing = []
+    for submission in submissions:
+        if _FORM_TEMPLATE.is_cached(submission) and _SCHOOL.is_cached(submission):
+            keys[submission.pk] = (
+                submission.form_template.section_id, submission.period_id, submission.school.district_id
+            )
+        else:
+            missing.append(submission.pk)
+    if missing:
+        rows = Submission.objects.filter(pk__in=missing).values_list(
+            "pk", "form_template__section_id", "period_id", "school__district_id"
+        )
+        keys.update((pk, (section_id, period_id, district_id)) for pk, section_id, period_id, district_id in rows)
+    return keys
+
+
+def _apply(deltas: Counter) -> None:
+    changed = {key: delta for key, delta in deltas.items() if delta}
+    if not changed:
+        return
+    # Make sure every row exists (a no-op for the ones that do), then move them all with F() updates.
+    SubmissionStatusCounter.objects.bulk_create(
+        [
+            SubmissionStatusCounter(section_id=section_id, period_id=period_id, district_id=district_id, status=status)
+            for section_id, period_id, district_id, status in changed
+        ],
+        ignore_conflicts=True,
+    )
+    for (section_id, period_id, district_id, status), delta in changed.items():
+        SubmissionStatusCounter.objects.filter(
+            section_id=section_id, period_id=period_id, district_id=district_id, status=status
+        ).update(count=F("count") + delta)
+
+
+def record_status_changes(submissions: Iterable[Submission], from_status: str | None, to_status: str | None) -> None:
+    """Move ``submissions`` from ``from_status`` to ``to_status`` (None for created / deleted rows)."""
+    deltas: Counter = Counter()
+    for key in _counter_keys(submissions).values():
+        if from_status:
+            deltas[(*key, from_status)] -= 1
+        if to_status:
+            deltas[(*key, to_status)] += 1
+    _apply(deltas)
+
+
+def _grouped_counts(submissions):
+    """``(section_id, period_id, district_id, status, count)`` rows for a Submission queryset."""
+    return (
+        submissions.values(
+            "period_id", "status", section=F("form_template__section_id"), district=F("school__district_id")
+        )
+        .annotate(total=Count("pk"))
+        .values_list("section", "period_id", "district", "status", "total")
+        .order_by()
+    )
+
+
+def record_deletions(submissions) -> None:
+    """Take the rows of a Submission queryset out of the counters; call it just before ``submissions.delete()``."""
+    deltas: Counter = Counter()
+    for section_id, period_id, district_id, status, total in _grouped_counts(submissions):
+        deltas[(section_id, period_id, district_id, status)] -= total
+    _apply(deltas)
+
+
+def record_status_change(submission: Submission, from_status: str | None, to_status: str | None) -> None:
+    record_status_changes([submission], from_status, to_status)
+
+
+def status_counts(counters) -> dict[str, int]:
+    """``{status: count}`` summed over a ``SubmissionStatusCounter`` queryset (one query)."""
+    rows = counters.values("status").annotate(total=Sum("count")).order_by()
+    return {row["status"]: row["total"] for row in rows}
+
+
+@transaction.atomic
+def rebuild_counters() -> int:
+    """Recompute every counter from the submissions table; returns the number of counter rows."""
+    SubmissionStatusCounter.objects.all().delete()
+    rows = _grouped_counts(Submission.objects.all())
+    counters = SubmissionStatusCounter.objects.bulk_create([
+        SubmissionStatusCounter(
+            section_id=section_id, period_id=period_id, district_id=district_id, status=status, count=total
+        )
+        for section_id, period_id, district_id, status, total in rows
+    ])
+    return len(counters)
@@ -0,0 +1,300 @@
+"""Write-behind draft buffer for editor autosaves.
+
+Periodic autosaves do not touch the normalized Form 1 tables.  The changed
+cells are merged into one :class:`~submissions.models.SubmissionDraftBuffer`
+row per (submission, tab), and a payload hash skips the write entirely when
+the client resends a state the buffer already holds.  Buffers are applied
+through :func:`submissions.autosave.apply_cell_changes` on tab switch, when
+the editor is (re)loaded or posted, and by ``manage.py flush_draft_buffers``
+once they have been idle for a while.
+
+A flush removes only the cells it applied.  Cells of rows that conflict,
+fail validation or belong to a report that was submitted meanwhile stay in
+the buffer with the reason in ``failures``; the editor lists them on its
+next load (see :func:`unsaved_cells`) and a full save of the rows
+supersedes them (see :func:`discard_rows`).
+"""
+from __future__ import annotations
+
+import hashlib
+import json
+import logging
+from collections import defaultdict
+from dataclasses import dataclass, field
+from datetime import timedelta
+
+from django.core.serializers.json import DjangoJSONEncoder
+from django.db import transaction
+from django.utils import timezone
+
+from common.db import coordinated_write
+
+from .autosave import AUTOSAVE_TARGETS, AutosaveResult, apply_cell_changes
+from .models import Submission, SubmissionDraftBuffer
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_IDLE_SECONDS = 120
+
+CONFLICT = "conflict"
+ERROR = "error"
+LOCKED = "locked"
+
+
+def payload_hash(payload: dict) -> str:
+    encoded = json.dumps(payload, sort_keys=True, cls=DjangoJSONEncoder)
+    return hashlib.sha1(encoded.encode("utf-8")).hexdigest()
+
+
+def merge_changes(payload: dict, changes) -> dict:
+    """Return ``payload`` with ``changes`` applied; later values win.
+
+    The first version seen for a row is kept, so the conflict check on flush
+    compares against the state the user started editing from.
+    """
+    merged = dict(payload)
+    row_versions = {}
+    for key, entry in merged.items():
+        row_ref = key.rsplit(":", 1)[0]
+        if entry.get("version"):
+            row_versions.setdefault(row_ref, entry["version"])
+    for change in changes:
+        row_ref = f"{change['model']}:{change['id']}"
+        version = row_versions.setdefault(row_ref, change.get("version"))
+        merged[f"{row_ref}:{change['field']}"] = {"value": change["value"], "version": version}
+    return merged
+
+
+def changes_from_payload(payload: dict) -> list[dict]:
+    changes = []
+    for key, entry in payload.items():
+        model, row_id, field_name = key.split(":")
+        changes.append({
+            "model": model,
+            "id": int(row_id),
+            "field": field_name,
+            "value": entry.get("value"),
+            "version": entry.get("version"),
+        })
+    return changes
+
+
+@dataclass
+class BufferResult:
+    buffered_tabs: list[str] = field(default_factory=list)
+    unchanged_tabs: list[str] = field(default_factory=list)
+
+    def as_dict(self) -> dict:
+        return {
+            "ok": True,
+            "buffered": True,
+            "tabs": self.buffered_tabs,
+            "unchanged": self.unchanged_tabs,
+        }
+
+
+def buffer_changes(submission: Submission, changes: list[dict], user=None) -> BufferResult:
+    """Merge ``changes`` (as returned by ``parse_changes``) into the tab buffers."""
+    result = BufferResult()
+    by_tab: dict[str, list[dict]] = defaultdict(list)
+    for change in changes:
+        by_tab[AUTOSAVE_TARGETS[change["model"]].tab].append(change)
+    if not by_tab:
+        return result
+
+    with transaction.atomic():
+        existing = {
+            buffer.tab: buffer
+            for buffer in SubmissionDraftBuffer.objects.select_for_update().filter(
+                submission=submission, tab__in=by_tab.keys()
+            )
+        }
+        for tab, tab_changes in sorted(by_tab.items()):
+            buffer = existing.get(tab)
+            payload = merge_changes(buffer.payload if buffer else {}, tab_changes)
+            digest = payload_hash(payload)
+            if buffer is not None and buffer.payload_hash == digest:
+                result.unchanged_tabs.append(tab)
+                continue
+            if buffer is None:
+                SubmissionDraftBuffer.objects.create(
+                    submission=submission, tab=tab, payload=payload, payload_hash=digest, updated_by=user
+                )
+            else:
+                buffer.payload = payload
+                buffer.payload_hash = digest
+                buffer.updated_by = user
+                buffer.save(update_fields=["payload", "payload_hash", "updated_by", "updated_at"])
+            result.buffered_tabs.append(tab)
+    return result
+
+
+def _row_ref(key: str) -> str:
+    return key.rsplit(":", 1)[0]
+
+
+def _result_failures(result: AutosaveResult) -> dict[str, dict]:
+    failures = {
+        ref: {"state": CONFLICT, "detail": "Changed elsewhere since this editor loaded it."}
+        for ref in result.conflicts
+    }
+    failures.update((ref, {"state": ERROR, "detail": "; ".join(messages)}) for ref, messages in result.errors.items())
+    return failures
+
+
+def _keep_failed_cells(submission, buffers, payload: dict, failures: dict[str, dict], user) -> None:
+    """Leave only the cells of ``failures`` rows buffered (by tab) and delete buffers left empty."""
+    kept: dict[str, dict] = defaultdict(dict)
+    for key, entry in payload.items():
+        ref = _row_ref(key)
+        if ref in failures:
+            kept[AUTOSAVE_TARGETS[ref.split(":", 1)[0]].tab][key] = entry
+    existing = {buffer.tab: buffer for buffer in buffers}
+    emptied = [buffer.pk for tab, buffer in existing.items() if tab not in kept]
+    if emptied:
+        SubmissionDraftBuffer.objects.filter(pk__in=emptied).delete()
+    for tab, cells in kept.items():
+        tab_failures = {ref: failures[ref] for ref in {_row_ref(key) for key in cells}}
+        buffer = existing.get(tab)
+        if buffer is None:
+            # Only newer ``changes`` reach a tab that was not flushed; add them to whatever it holds.
+            buffer, _ = SubmissionDraftBuffer.objects.select_for_update().get_or_create(
+                submission=submission, tab=tab, defaults={"updated_by": user}
+            )
+            cells = {**buffer.payload, **cells}
+            tab_failures = {**buffer.failures, **tab_failures}
+        buffer.payload = cells
+        buffer.payload_hash = payload_hash(cells)
+        buffer.failures = tab_failures
+        # updated_at is left alone so the idle clock keeps running from the last keystroke.
+        buffer.save(update_fields=["payload", "payload_hash", "failures"])
+
+
+def flush_draft_buffers(submission: Submission, *, tabs=None, changes=(), user=None) -> AutosaveResult:
+    """Apply buffered cells (plus any newer ``changes``) and drop the cells that were applied.
+
+    Rows that conflict or fail validation are reported in the returned
+    result and stay buffered, marked in ``failures``, so nothing typed is
+    lost; the editor shows them and a full form save of the row supersedes them.
+    """
+    with transaction.atomic():
+        buffers = SubmissionDraftBuffer.objects.select_for_update().filter(submission=submission)
+        if tabs is not None:
+            buffers = buffers.filter(tab__in=list(tabs))
+        buffers = list(buffers)
+        payload: dict = {}
+        for buffer in buffers:
+            payload.update(buffer.payload)
+        payload = merge_changes(payload, changes)
+        if not payload:
+            return AutosaveResult()
+        if user is None:
+            user = next((buffer.updated_by for buffer in buffers if buffer.updated_by_id), None)
+        result = apply_cell_changes(submission, changes_from_payload(payload), user)
+        _keep_failed_cells(submission, buffers, payload, _result_failures(result), user)
+    if not result.ok:
+        logger.warning(
+            "[AUTOSAVE] Draft buffer flush for submission %s kept %d conflicting and %d invalid rows buffered",
+            submission.pk, len(result.conflicts), len(result.errors),
+        )
+    return result
+
+
+def mark_locked(submission: Submission, tabs=None) -> int:
+    """Flag every buffered row of ``tabs`` as waiting on a report that is no longer editable."""
+    buffers = SubmissionDraftBuffer.objects.filter(submission=submission)
+    if tabs is not None:
+        buffers = buffers.filter(tab__in=list(tabs))
+    detail = "The report was submitted before these edits were saved."
+    marked = 0
+    for buffer in buffers:
+        buffer.failures = {ref: {"state": LOCKED, "detail": detail} for ref in {_row_ref(key) for key in buffer.payload}}
+        buffer.save(update_fields=["failures"])
+        marked += 1
+    return marked
+
+
+def unsaved_cells(submission: Submission) -> list[dict]:
+    """Buffered cells that a flush could not apply, for the editor to show."""
+    cells = []
+    for buffer in SubmissionDraftBuffer.objects.filter(submission=submission).order_by("tab"):
+        for key, entry in sorted(buffer.payload.items()):
+            failure = buffer.failures.get(_row_ref(key))
+            if failure is None:
+                continue
+            model, row_id, field_name = key.split(":")
+            cells.append({
+                "tab": buffer.tab,
+                "model": model,
+                "id": int(row_id),
+                "field": field_name,
+                "value": entry.get("value"),
+                "state": failure["state"],
+                "detail": failure["detail"],
+            })
+    return cells
+
+
+def discard_rows(submission: Submission, refs) -> int:
+    """Drop the buffered cells of the ``"<model key>:<id>"`` rows in ``refs``.
+
+    Used after a full save of a tab: the rows it wrote back supersede whatever
+    was left buffered for them, while cells of other rows stay.
+    """
+    refs = set(refs)
+    if not refs:
+        return 0
+    dropped = 0
+    for buffer in SubmissionDraftBuffer.objects.select_for_update().filter(submission=submission):
+        payload = {key: entry for key, entry in buffer.payload.items() if _row_ref(key) not in refs}
+        if len(payload) == len(buffer.payload):
+            continue
+        dropped += len(buffer.payload) - len(payload)
+        if not payload:
+            buffer.delete()
+            continue
+        buffer.payload = payload
+        buffer.payload_hash = payload_hash(payload)
+        buffer.failures = {ref: failure for ref, failure in buffer.failures.items() if ref not in refs}
+        buffer.save(update_fields=["payload", "payload_hash", "failures"])
+    return dropped
+
+
+def discard_draft_buffers(submission: Submission, tabs=None) -> int:
+    buffers = SubmissionDraftBuffer.objects.filter(submission=submission)
+    if tabs is not None:
+        buffers = buffers.filter(tab__in=list(tabs))
+    deleted, _ = buffers.delete()
+    return deleted
+
+
+def flush_idle_draft_buffers(idle_seconds: int = DEFAULT_IDLE_SECONDS, *, now=None) -> dict[str, int]:
+    """Flush buffers not touched for ``idle_seconds``; returns counters for logging.
+
+    Buffers that already hold failed cells are left for the editor: retrying
+    them without the user would only fail again.
+    """
+    cutoff = (now or timezone.now()) - timedelta(seconds=idle_seconds)
+    idle = defaultdict(list)
+    for submission_id, tab, failures in SubmissionDraftBuffer.objects.filter(updated_at__lte=cutoff).values_list(
+        "submission_id", "tab", "failures"
+    ):
+        if not failures:
+            idle[submission_id].append(tab)
+
+    stats = {"submissions": 0, "rows": 0, "conflicts": 0, "errors": 0}
+    submissions = Submission.objects.in_bulk(idle.keys())
+    for submission_id, tabs in idle.items():
+        submission = submissions.get(submission_id)
+        if submission is None:
+            continue
+        if not submission.is_editable_by_school():
+            # Submitted/locked meanwhile: keep the edits, flagged, in case the report is returned.
+            mark_locked(submission, tabs)
+            continue
+        result = coordinated_write(flush_draft_buffers)(submission, tabs=tabs)
+        stats["submissions"] += 1
+        stats["rows"] += result.updated_rows
+        stats["conflicts"] += len(result.conflicts)
+        stats["errors"] += len(result.errors)
+    return stats
@@ -0,0 +1,181 @@
+"""On-disk cache of rendered CSV/XLSX exports of submitted reports.
+
+SUBMITTED and NOTED reports export from their frozen snapshot, so the bytes
+of a given tab/format only change when the submission row does.
+:func:`cached_export` stores each rendered file under
+``settings.EXPORT_CACHE_DIR/<submission id>/<digest>.<format>``, where the
+digest covers the submission id, ``updated_at``, tab, format and
+:data:`EXPORT_CACHE_VERSION`.  A new ``updated_at`` therefore lands on a new
+file; the old one is left for ``manage.py purge_export_cache``.
+
+Drafts and returned reports are rendered on every request.  Bump
+:data:`EXPORT_CACHE_VERSION` whenever a builder or renderer in
+:mod:`submissions.exports` changes its output.
+"""
+from __future__ import annotations
+
+import hashlib
+import logging
+import os
+import re
+import tempfile
+import time
+from pathlib import Path
+from typing import Callable
+
+from django.conf import settings
+from django.http import FileResponse, HttpResponse
+
+from .exports import EXPORT_TABS
+from .models import Submission
+from .snapshots import SNAPSHOT_STATUSES, SNAPSHOT_VERSION
+
+logger = logging.getLogger(__name__)
+
+EXPORT_CACHE_VERSION = 1
+EXPORT_FORMATS = {
+    "csv": "text/csv",
+    "xlsx": "application/vnd.openxmlformats-officedocument.spreadsheetml.sheet",
+}
+CACHEABLE_STATUSES = SNAPSHOT_STATUSES
+TEMP_PREFIX = ".tmp-"
+TEMP_GRACE_SECONDS = 60 * 60
+
+_RANGE_RE = re.compile(r"^bytes=(\d*)-(\d*)$")
+
+
+def cache_root() -> Path:
+    return Path(getattr(settings, "EXPORT_CACHE_DIR", Path(settings.MEDIA_ROOT).parent / "export_cache"))
+
+
+def export_digest(submission_id: int, updated_at, tab: str, file_format: str) -> str:
+    stamp = updated_at.isoformat() if updated_at else ""
+    key = f"{submission_id}:{stamp}:{tab}:{file_format}:{EXPORT_CACHE_VERSION}:{SNAPSHOT_VERSION}"
+    return hashlib.sha256(key.encode("utf-8")).hexdigest()[:32]
+
+
+def export_path(submission: Submission, tab: str, file_format: str) -> Path:
+    digest = export_digest(submission.pk, submission.updated_at, tab, file_format)
+    return cache_root() / str(submission.pk) / f"{digest}.{file_format}"
+
+
+def _write_atomic(path: Path, payload: bytes) -> None:
+    path.parent.mkdir(parents=True, exist_ok=True)
+    fd, tmp_name = tempfile.mkstemp(prefix=TEMP_PREFIX, dir=path.parent)
+    try:
+        with os.fdopen(fd, "wb") as handle:
+            handle.write(payload)
+        os.replace(tmp_name, path)
+    except BaseException:
+        Path(tmp_name).unlink(missing_ok=True)
+        raise
+
+
+def cached_export(submission: Submission, tab: str, file_format: str, render: Callable[[], bytes]) -> Path | bytes:
+    """Path of the cached export, or freshly rendered bytes for a report that cannot be cached.
+
+    ``render`` is only called on a miss.  Failing to write the cache file is
+    logged and the rendered bytes are returned instead.
+    """
+    if submission.status not in CACHEABLE_STATUSES:
+        return render()
+    path = export_path(submission, tab, file_format)
+    if path.is_file():
+        return path
+    payload = render()
+    try:
+        _write_atomic(path, payload)
+    except OSError:
+        logger.exception("[PERF][EXPORT] Could not cache %s export of submission %s", tab, submission.pk)
+        return payload
+    logger.debug("[PERF][EXPORT] cached %s %s export of submission %s", tab, file_format, submission.pk)
+    return path
+
+
+def _requested_range(request, size: int, etag: str) -> tuple[int, int] | None | bool:
+    """``(start, end)`` for a satisfiable single range, ``None`` for the whole file, ``False`` if unsatisfiable."""
+    header = request.headers.get("Range", "").strip()
+    if not header or size == 0:
+        return None
+    if_range = request.headers.get("If-Range")
+    if if_range and if_range.strip() != etag:
+        return None
+    match = _RANGE_RE.match(header)
+    if not match or match.groups() == ("", ""):
+        # Multiple ranges or another unit: answering with the full body is allowed.
+        return None
+    first, last = match.groups()
+    if first:
+        start = int(first)
+        end = min(int(last), size - 1) if last else size - 1
+    else:
+        start = max(size - int(last), 0)
+        end = size - 1
+    if start >= size or start > end:
+        return False
+    return start, end
+
+
+def export_file_response(request, path: Path, filename: str, file_format: str):
+    """Serve a cached export, honouring a single ``Range: bytes=`` request."""
+    content_type = EXPORT_FORMATS[file_format]
+    size = path.stat().st_size
+    etag = f'"{path.stem}"'
+    requested = _requested_range(request, size, etag)
+    if requested is False:
+        response = HttpResponse(status=416)
+        response["Content-Range"] = f"bytes */{size}"
+    elif requested is None:
+        response = FileResponse(path.open("rb"), content_type=content_type, as_attachment=True, filename=filename)
+    else:
+        start, end = requested
+        with path.open("rb") as handle:
+            handle.seek(start)
+            chunk = handle.read(end - start + 1)
+        response = HttpResponse(chunk, status=206, content_type=content_type)
+        response["Content-Range"] = f"bytes {start}-{end}/{size}"
+        response["Content-Disposition"] = f"attachment; filename=\"{filename}\""
+    response["Accept-Ranges"] = "bytes"
+    response["ETag"] = etag
+    return response
+
+
+def purge_stale_exports(dry_run: bool = False) -> dict[str, int]:
+    """Delete cached exports that no current submission state points at.
+
+    A file is stale when its submission is gone, is no longer SUBMITTED/NOTED,
+    or has moved to a new ``updated_at``.  Temporary files younger than
+    :data:`TEMP_GRACE_SECONDS` belong to in-flight writes and are kept.
+    """
+    stats = {"files": 0, "bytes": 0, "kept": 0}
+    root = cache_root()
+    if not root.is_dir():
+        return stats
+    directories = {int(entry.name): entry for entry in root.iterdir() if entry.is_dir() and entry.name.isdigit()}
+    submissions = Submission.objects.filter(pk__in=directories).only("id", "status", "updated_at").in_bulk()
+    now = time.time()
+    for submission_id, directory in directories.items():
+        submission = submissions.get(submission_id)
+        current: set[str] = set()
+        if submission is not None and submission.status in CACHEABLE_STATUSES:
+            current = {
+                f"{export_digest(submission_id, submission.updated_at, tab, file_format)}.{file_format}"
+                for tab in EXPORT_TABS
+                for file_format in EXPORT_FORMATS
+            }
+        for entry in directory.iterdir():
+            if not entry.is_file():
+                continue
+            info = entry.stat()
+            if entry.name in current or (
+                entry.name.startswith(TEMP_PREFIX) and now - info.st_mtime < TEMP_GRACE_SECONDS
+            ):
+                stats["kept"] += 1
+                continue
+            stats["files"] += 1
+            stats["bytes"] += info.st_size
+            if not dry_run:
+                entry.unlink(missing_ok=True)
+        if not dry_run and not any(directory.iterdir()):
+            directory.rmdir()
+    return stats
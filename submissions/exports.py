@@ -3,12 +3,13 @@ from __future__ import annotations
 import csv
 import io
 from dataclasses import dataclass
+from decimal import Decimal
 import json
 from typing import Any, Iterable, List
 
 from django.utils.text import slugify
 
-from . import constants as smea_constants
+from .bundle import SubmissionBundle
 
 
 @dataclass(slots=True)
@@ -33,42 +34,53 @@ class SubmissionExport:
     def iter_tables(self) -> Iterable[ExportTable]:
         return tuple(self.tables)
 
+    def as_dict(self) -> dict:
+        """JSON-safe form stored in submission snapshots; see :meth:`from_dict`."""
+        return {
+            "filename_prefix": self.filename_prefix,
+            "tables": [
+                {
+                    "title": table.title,
+                    "headers": list(table.headers),
+                    "rows": [[_encode_cell(value) for value in row] for row in table.rows],
+                }
+                for table in self.tables
+            ],
+        }
+
+    @classmethod
+    def from_dict(cls, data: dict) -> "SubmissionExport":
+        return cls(
+            filename_prefix=data["filename_prefix"],
+            tables=[
+                ExportTable(
+                    title=table["title"],
+                    headers=list(table["headers"]),
+                    rows=[[_decode_cell(value) for value in row] for row in table["rows"]],
+                )
+                for table in data["tables"]
+            ],
+        )
 
-def _build_filename_prefix(submission) -> str:
-    school_code = slugify(submission.school.code) if submission.school else "submission"
-    period_label = slugify(submission.period.label) if submission.period else "period"
-    return f"{school_code}-{submission.id}-{period_label}"[:64]
 
+def _encode_cell(value: Any) -> Any:
+    # Decimals are tagged so CSV/XLSX output matches a live export exactly.
+    if isinstance(value, Decimal):
+        return {"decimal": str(value)}
+    return value
 
 
+def _decode_cell(value: Any) -> Any:
+    if isinstance(value, dict) and "decimal" in value:
+        return Decimal(value["decimal"])
+    return value
+
+
+def export_filename_prefix(submission) -> str:
+    school_code = slugify(submission.school.code) if submission.school else "submission"
+    period_label = slugify(submission.period.label) if submission.period else "period"
+    return f"{school_code}-{submission.id}-{period_label}"[:64]
 
-def _grade_numbers_for_submission(submission):
-    school = getattr(submission, "school", None)
-    if not school:
-        return sorted(smea_constants.GRADE_NUMBER_TO_LABEL.keys())
-    profile = getattr(school, "profile", None)
-    start = getattr(profile, "grade_span_start", None)
-    end = getattr(profile, "grade_span_end", None)
-    if start is None or end is None:
-        start = getattr(school, "min_grade", None)
-        end = getattr(school, "max_grade", None)
-    if start is None or end is None:
-        return sorted(smea_constants.GRADE_NUMBER_TO_LABEL.keys())
-    start = max(0, start)
-    end = max(start, end)
-    return [n for n in range(start, end + 1) if n in smea_constants.GRADE_NUMBER_TO_LABEL]
-
-
-def _slp_pair_index(submission):
-    pairs = []
-    for grade_number in _grade_numbers_for_submission(submission):
-        grade_label = smea_constants.GRADE_NUMBER_TO_LABEL[grade_number]
-        subjects = smea_constants.SLP_SUBJECTS_BY_GRADE.get(grade_number, [smea_constants.SLP_DEFAULT_SUBJECT])
-        for subject_code, _ in subjects:
-            pairs.append((grade_label, subject_code))
-    if not pairs:
-        pairs.append((smea_constants.GRADE_NUMBER_TO_LABEL.get(0, "Grade 1"), smea_constants.SLP_DEFAULT_SUBJECT[0]))
-    return {pair: index for index, pair in enumerate(pairs)}
 
 def _build_school_profile_table(submission) -> ExportTable:
     school = getattr(submission, "school", None)
@@ -91,12 +103,9 @@ def _build_school_profile_table(submission) -> ExportTable:
     )
 
 
-def build_slp_export(submission) -> SubmissionExport:
-    pair_index = _slp_pair_index(submission)
-    slp_rows_sorted = sorted(
-        submission.form1_slp_rows.all(),
-        key=lambda row: pair_index.get((row.grade_label, row.subject), len(pair_index)),
-    )
+def build_slp_export(submission, bundle: SubmissionBundle | None = None) -> SubmissionExport:
+    bundle = bundle or SubmissionBundle(submission)
+    slp_rows_sorted = bundle.slp_rows
     def _summarize_interventions(value: Any) -> str:
         text = value or ""
         if not isinstance(text, str):
@@ -151,14 +160,8 @@ def build_slp_export(submission) -> SubmissionExport:
         getattr(analysis, "best_practices", ""),
     ]
 
-    dnme_rows = [
-        [entry.position, entry.grade_label, entry.count]
-        for entry in submission.form1_slp_top_dnme.all().order_by("position")
-    ]
-    outstanding_rows = [
-        [entry.position, entry.grade_label, entry.count]
-        for entry in submission.form1_slp_top_outstanding.all().order_by("position")
-    ]
+    dnme_rows = [[entry.position, entry.grade_label, entry.count] for entry in bundle.slp_top_dnme]
+    outstanding_rows = [[entry.position, entry.grade_label, entry.count] for entry in bundle.slp_top_outstanding]
 
     tables = [
         ExportTable(
@@ -197,10 +200,11 @@ def build_slp_export(submission) -> SubmissionExport:
         ),
     ]
     tables.insert(0, _build_school_profile_table(submission))
-    return SubmissionExport(filename_prefix=_build_filename_prefix(submission), tables=tables)
+    return SubmissionExport(filename_prefix=export_filename_prefix(submission), tables=tables)
 
 
-def build_reading_export(submission) -> SubmissionExport:
+def build_reading_export(submission, bundle: SubmissionBundle | None = None) -> SubmissionExport:
+    bundle = bundle or SubmissionBundle(submission)
     # Derive timing phrase from quarter
     q = getattr(getattr(submission, 'period', None), 'quarter_tag', None)
     def _timing_from_quarter(qtag: str | None) -> str:
@@ -229,7 +233,7 @@ def build_reading_export(submission) -> SubmissionExport:
             entry.get_band_display(),
             entry.count,
         ]
-        for entry in submission.form1_crla.all().order_by("level", "timing", "subject", "band")
+        for entry in bundle.legacy_crla
     ]
 
     philiri_rows = [
@@ -242,20 +246,16 @@ def build_reading_export(submission) -> SubmissionExport:
             entry.band_6_9,
             entry.band_10,
         ]
-        for entry in submission.form1_philiri.all().order_by("level", "timing", "language")
+        for entry in bundle.legacy_philiri
     ]
 
-    interventions = [
-        [entry.order, entry.description]
-        for entry in submission.form1_reading_interventions.all().order_by("order")
-    ]
+    interventions = [[entry.order, entry.description] for entry in bundle.legacy_reading_interventions]
 
     # Reading Difficulties & Interventions (structured)
     difficulties_rows: list[list[str]] = []
     # Prefer model rows if populated; fall back to JSON stored in submission.data
     try:
-        rdp_qs = submission.reading_difficulty_plans.all().order_by('period', 'grade_label')
-        for plan in rdp_qs:
+        for plan in bundle.reading_difficulty_plans:
             period = (plan.period or '').upper()
             grade = plan.get_grade_label_display() if hasattr(plan, 'get_grade_label_display') else plan.grade_label
             pairs = plan.data if isinstance(plan.data, list) else []
@@ -307,10 +307,11 @@ def build_reading_export(submission) -> SubmissionExport:
         ),
     ]
     tables.insert(0, _build_school_profile_table(submission))
-    return SubmissionExport(filename_prefix=_build_filename_prefix(submission), tables=tables)
+    return SubmissionExport(filename_prefix=export_filename_prefix(submission), tables=tables)
 
 
-def build_rma_export(submission) -> SubmissionExport:
+def build_rma_export(submission, bundle: SubmissionBundle | None = None) -> SubmissionExport:
+    bundle = bundle or SubmissionBundle(submission)
     rma_rows = [
         [
             row.get_grade_label_display() if hasattr(row, "get_grade_label_display") else row.grade_label,
@@ -321,13 +322,10 @@ def build_rma_export(submission) -> SubmissionExport:
             row.transitioning_proficient,
             row.at_grade_level,
         ]
-        for row in submission.form1_rma_rows.all().order_by("grade_label")
+        for row in sorted(bundle.rma_rows, key=lambda row: row.grade_label)
     ]
 
-    rma_interventions = [
-        [entry.order, entry.description]
-        for entry in submission.form1_rma_interventions.all().order_by("order")
-    ]
+    rma_interventions = [[entry.order, entry.description] for entry in bundle.rma_interventions]
 
     tables = [
         ExportTable(
@@ -350,10 +348,11 @@ def build_rma_export(submission) -> SubmissionExport:
         ),
     ]
     tables.insert(0, _build_school_profile_table(submission))
-    return SubmissionExport(filename_prefix=_build_filename_prefix(submission), tables=tables)
+    return SubmissionExport(filename_prefix=export_filename_prefix(submission), tables=tables)
 
 
-def build_adm_export(submission) -> SubmissionExport:
+def build_adm_export(submission, bundle: SubmissionBundle | None = None) -> SubmissionExport:
+    bundle = bundle or SubmissionBundle(submission)
     adm_rows = [
         [
             row.ppas_conducted,
@@ -371,7 +370,7 @@ def build_adm_export(submission) -> SubmissionExport:
             row.q4_response,
             row.q5_response,
         ]
-        for row in submission.form1_adm_rows.all().order_by("id")
+        for row in bundle.adm_rows
     ]
 
     tables = [
@@ -397,7 +396,7 @@ def build_adm_export(submission) -> SubmissionExport:
         )
     ]
     tables.insert(0, _build_school_profile_table(submission))
-    return SubmissionExport(filename_prefix=_build_filename_prefix(submission), tables=tables)
+    return SubmissionExport(filename_prefix=export_filename_prefix(submission), tables=tables)
 
 
 _TAB_BUILDERS = {
@@ -407,13 +406,15 @@ _TAB_BUILDERS = {
     "adm": build_adm_export,
 }
 
+EXPORT_TABS = tuple(_TAB_BUILDERS)
+
 
-def build_export_for_tab(submission, tab: str) -> SubmissionExport:
+def build_export_for_tab(submission, tab: str, bundle: SubmissionBundle | None = None) -> SubmissionExport:
     try:
         builder = _TAB_BUILDERS[tab]
     except KeyError as exc:
         raise ValueError(f"Unsupported export tab: {tab}") from exc
-    return builder(submission)
+    return builder(submission, bundle=bundle)
 
 
 def render_export_to_csv(export: SubmissionExport) -> bytes:
@@ -10,6 +10,13 @@ from django.forms.models import BaseInlineFormSet
 
 # Improved: skip validation for forms marked for deletion by setting empty_permitted
 class DeletionFriendlyBaseInlineFormSet(BaseInlineFormSet):
+    def __init__(self, *args, rows=None, **kwargs):
+        super().__init__(*args, **kwargs)
+        if rows is not None:
+            # Child rows already loaded by the caller (see submissions.bundle);
+            # use them instead of querying per parent instance.
+            self._queryset = list(rows)
+
     def is_valid(self):
         # Before validation, forcibly mark forms with DELETE checked as empty_permitted
         if self.can_delete:
@@ -140,6 +147,7 @@ SLPLLCEntryFormSet = forms.modelformset_factory(
 
 from . import constants as smea_constants
 from . import constants as smea_constants
+from .bulk_review import MAX_BULK_REVIEW
 from .models import (
     Form1ADMHeader,
     Form1ADMRow,
@@ -301,6 +309,25 @@ class SubmissionReviewForm(forms.Form):
 
 
 
+class BulkSubmissionReviewForm(SubmissionReviewForm):
+    """Note or return the submissions ticked in the review queue."""
+
+    submission_ids = forms.Field(widget=forms.MultipleHiddenInput, required=False)
+
+    def clean_submission_ids(self):
+        raw = self.cleaned_data.get("submission_ids") or []
+        try:
+            ids = sorted({int(value) for value in raw})
+        except (TypeError, ValueError):
+            raise forms.ValidationError("Invalid submission selection.")
+        if not ids:
+            raise forms.ValidationError("Select at least one submission.")
+        if len(ids) > MAX_BULK_REVIEW:
+            raise forms.ValidationError(f"Select at most {MAX_BULK_REVIEW} submissions at a time.")
+        return ids
+
+
+
 
 
 class Form1PctRowForm(forms.ModelForm):
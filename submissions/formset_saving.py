@@ -0,0 +1,132 @@
+"""Diff-aware persistence for the SMEA Form 1 model formsets.
+
+``formset.save()`` re-saves every form whose raw input differs from its
+initial value with a full-column UPDATE per row.  :func:`save_formset_diff`
+compares each form's constructed instance with the values it was loaded
+with, skips rows that end up identical, and writes the rest with a single
+``bulk_update`` per formset limited to the columns that actually changed.
+Deletions become one filtered DELETE.  None of the Form 1 row models
+override ``save()``, so bypassing it loses no behaviour.
+"""
+from __future__ import annotations
+
+from dataclasses import dataclass
+
+from django.core.exceptions import FieldDoesNotExist
+from django.utils import timezone
+
+
+@dataclass
+class FormsetSaveStats:
+    """Write counters for one editor save; logged by ``edit_submission``."""
+
+    updated: int = 0
+    created: int = 0
+    deleted: int = 0
+    unchanged: int = 0
+    statements: int = 0
+
+    @property
+    def rows_written(self) -> int:
+        return self.updated + self.created + self.deleted
+
+    def __str__(self) -> str:
+        return (
+            f"updated={self.updated} created={self.created} deleted={self.deleted} "
+            f"unchanged={self.unchanged} statements={self.statements}"
+        )
+
+
+def _comparable(value):
+    return getattr(value, "pk", value)
+
+
+def _assign_differs(instance, name, value) -> bool:
+    # Compare foreign keys by id so unchanged rows don't fetch the related object.
+    attname = instance._meta.get_field(name).attname
+    return getattr(instance, attname) != _comparable(value)
+
+
+def changed_model_fields(form) -> list[str]:
+    """Model fields whose value on ``form.instance`` differs from what was loaded."""
+    instance = form.instance
+    opts = instance._meta
+    changed = []
+    for name in form.fields:
+        try:
+            model_field = opts.get_field(name)
+        except FieldDoesNotExist:
+            continue  # form-only field (e.g. the SLP "reasons" checkboxes)
+        if not getattr(model_field, "concrete", False) or model_field.primary_key or model_field.many_to_many:
+            continue
+        if _comparable(model_field.value_from_object(instance)) != _comparable(form.initial.get(name)):
+            changed.append(name)
+    return changed
+
+
+def save_formset_diff(formset, stats: FormsetSaveStats | None = None, **assign) -> list:
+    """Persist a validated model formset, writing only what changed.
+
+    ``assign`` sets attributes (typically ``submission=...``) on new rows and
+    on existing rows where they differ.  Returns the created and updated
+    instances, like ``formset.save()``.
+    """
+    stats = stats if stats is not None else FormsetSaveStats()
+    model = formset.model
+    auto_now_fields = [f.name for f in model._meta.concrete_fields if getattr(f, "auto_now", False)]
+    deleted_forms = set(formset.deleted_forms) if formset.can_delete else set()
+
+    to_update = []
+    update_fields: set[str] = set()
+    deleted_pks = []
+    formset.deleted_objects = []
+    formset.changed_objects = []
+    formset.new_objects = []
+
+    for form in formset.initial_forms:
+        instance = form.instance
+        if instance.pk is None:
+            continue
+        if form in deleted_forms:
+            deleted_pks.append(instance.pk)
+            formset.deleted_objects.append(instance)
+            continue
+        fields = changed_model_fields(form) if form.has_changed() else []
+        for name, value in assign.items():
+            if _assign_differs(instance, name, value):
+                setattr(instance, name, value)
+                fields.append(name)
+        if not fields:
+            stats.unchanged += 1
+            continue
+        if auto_now_fields:
+            now = timezone.now()
+            for name in auto_now_fields:
+                setattr(instance, name, now)
+            fields.extend(auto_now_fields)
+        to_update.append(instance)
+        update_fields.update(fields)
+        formset.changed_objects.append((instance, fields))
+
+    for form in formset.extra_forms:
+        if not form.has_changed() or form in deleted_forms:
+            continue
+        instance = form.save(commit=False)
+        for name, value in assign.items():
+            setattr(instance, name, value)
+        instance.save()
+        form.save_m2m()
+        formset.new_objects.append(instance)
+        stats.created += 1
+        stats.statements += 1
+
+    if deleted_pks:
+        model._default_manager.filter(pk__in=deleted_pks).delete()
+        stats.deleted += len(deleted_pks)
+        stats.statements += 1
+    if to_update:
+        model._default_manager.bulk_update(to_update, sorted(update_fields))
+        stats.updated += len(to_update)
+        stats.statements += 1
+
+    return [instance for instance, _ in formset.changed_objects] + formset.new_objects
@@ -0,0 +1,92 @@
+"""Cached HTML fragments of the reviewer pages for NOTED submissions.
+
+A NOTED report no longer changes, yet supervisors and PSDS keep reopening
+it.  :func:`render_fragments` renders the submission-only parts of
+``review_detail`` and ``review_submission_tabs`` (the ``_review_*.html``
+partials) and, for NOTED reports, keeps the HTML in the default cache under
+a key made of the submission id, its ``updated_at`` and a hash of the
+partials' source, so editing a partial never serves stale markup.  The
+per-user parts of those pages (navigation, role links, messages, the review
+form) are still rendered on every request.
+
+``Submission._transition`` calls :func:`discard_fragments` before it saves,
+so reopening or returning a report drops its fragments right away.
+"""
+from __future__ import annotations
+
+import hashlib
+import logging
+from functools import lru_cache
+from typing import Callable, Iterable
+
+from django.conf import settings
+from django.core.cache import cache
+from django.template.loader import get_template, render_to_string
+from django.utils.safestring import SafeString, mark_safe
+
+from .models import Submission
+
+logger = logging.getLogger(__name__)
+
+CACHEABLE_STATUSES = frozenset({Submission.Status.NOTED})
+FRAGMENT_TEMPLATES = {
+    "detail": "submissions/_review_detail_body.html",
+    "tabs-summary": "submissions/_review_tabs_summary.html",
+    "tabs-panel": "submissions/_review_tabs_panel.html",
+}
+DEFAULT_TIMEOUT = 60 * 60 * 24
+
+
+@lru_cache(maxsize=None)
+def template_version() -> str:
+    """Short hash of the fragment templates' source."""
+    digest = hashlib.sha1()
+    for name in sorted(set(FRAGMENT_TEMPLATES.values())):
+        digest.update(get_template(name).template.source.encode("utf-8"))
+    return digest.hexdigest()[:12]
+
+
+def fragment_key(submission: Submission, name: str) -> str:
+    stamp = submission.updated_at.timestamp() if submission.updated_at else 0
+    return f"review-fragment:{submission.pk}:{stamp:.6f}:{template_version()}:{name}"
+
+
+def fragment_names() -> list[str]:
+    """Every fragment a submission can have: the detail body, the tabs summary and one panel per tab."""
+    from .views import SUBMISSION_TABS
+
+    return ["detail", "tabs-summary", *(f"tabs-panel:{tab['key']}" for tab in SUBMISSION_TABS)]
+
+
+def render_fragments(
+    submission: Submission, names: Iterable[str], build_context: Callable[[], dict]
+) -> dict[str, SafeString]:
+    """Return ``{name: html}``; ``build_context`` runs at most once, and only if a fragment must be rendered."""
+    names = list(names)
+    cacheable = submission.status in CACHEABLE_STATUSES
+    keys = {name: fragment_key(submission, name) for name in names} if cacheable else {}
+    cached = cache.get_many(list(keys.values())) if keys else {}
+    fragments = {name: mark_safe(cached[keys[name]]) for name in names if keys.get(name) in cached}
+    missing = [name for name in names if name not in fragments]
+    if not missing:
+        return fragments
+
+    context = build_context()
+    rendered = {
+        name: render_to_string(FRAGMENT_TEMPLATES[name.split(":", 1)[0]], context)
+        for name in missing
+    }
+    if cacheable:
+        timeout = getattr(settings, "REVIEW_FRAGMENT_CACHE_TIMEOUT", DEFAULT_TIMEOUT)
+        cache.set_many({keys[name]: str(html) for name, html in rendered.items()}, timeout)
+        logger.debug("[PERF][FRAGMENT] cached %s for submission %s", ", ".join(missing), submission.pk)
+    fragments.update((name, mark_safe(html)) for name, html in rendered.items())
+    return fragments
+
+
+def discard_fragments(*submissions: Submission) -> None:
+    """Drop every cached fragment of ``submissions`` at their current ``updated_at``."""
+    names = fragment_names()
+    keys = [fragment_key(submission, name) for submission in submissions if submission.pk is not None for name in names]
+    if keys:
+        cache.delete_many(keys)
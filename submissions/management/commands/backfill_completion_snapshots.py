@@ -0,0 +1,31 @@
+from __future__ import annotations
+
+from django.core.management.base import BaseCommand
+
+from submissions.models import Submission
+from submissions.progress import fill_missing_snapshots
+
+
+class Command(BaseCommand):
+    help = "Store completion snapshots (completion_progress/completion_sections) on submissions."
+
+    def add_arguments(self, parser):  # pragma: no cover - CLI wiring
+        parser.add_argument(
+            '--all',
+            action='store_true',
+            help='Recompute every submission, not only those without a snapshot.'
+        )
+        parser.add_argument(
+            '--batch-size',
+            type=int,
+            default=500,
+            help='Number of submissions written per UPDATE batch.'
+        )
+
+    def handle(self, *args, **options):
+        batch_size = max(1, options.get('batch_size') or 500)
+        if options.get('all'):
+            # Clear the stored snapshots so every submission counts as missing one.
+            Submission.objects.update(completion_updated_at=None)
+        updated = fill_missing_snapshots(Submission.objects.all(), batch_size=batch_size)
+        self.stdout.write(self.style.SUCCESS(f'Stored completion snapshots for {updated} submissions.'))
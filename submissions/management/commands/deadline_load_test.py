@@ -0,0 +1,429 @@
+"""
+Rehearse the end-of-quarter rush.
+
+N simulated school heads each run start_submission -> repeated tab autosaves
+(buffered PATCHes, flushed on every "tab switch") -> submit_submission, while
+M reviewers poll review_queue and smme_kpi_dashboard until the heads finish.
+Requests go through the Django test client in a thread pool (default) or to a
+running server with --base-url.  Per phase the command reports throughput,
+error rate, latency percentiles and, in-process, the time spent queued for
+the SQLite write slot or backing off from locks (see common/db.py).
+
+Load-test schools, users and the form template they submit are namespaced by
+--prefix; their submissions are reset at the start of every run and
+everything created is removed at the end unless --keep-data is given.  In
+live mode the users log in with a random per-run password (or --password),
+which is made unusable again when the data is kept.
+"""
+from __future__ import annotations
+
+import json
+import random
+import re
+import secrets
+import threading
+import time
+from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+from datetime import timedelta
+
+from django.contrib.auth import get_user_model
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connections, transaction
+from django.test import Client
+from django.urls import reverse
+from django.utils import timezone
+
+from accounts.models import UserProfile
+from common import generations
+from common.db import consume_lock_wait
+from organizations.models import District, School, SchoolProfile, Section
+from submissions import counters as submission_counters
+from submissions.models import FormTemplate, Period, Submission
+
+# Tab -> (formset prefix, {field: value factory}) used for the autosave phase.
+AUTOSAVE_CELLS = {
+    "slp": ("slp_rows", {
+        "enrolment": lambda: random.randint(20, 45),
+        "intervention_plan": lambda: f"Remediation plan {random.randint(1, 999)}",
+    }),
+    "rma": ("rma_rows", {"enrolment": lambda: random.randint(20, 45)}),
+    "supervision": ("supervision_rows", {"total_teachers": lambda: random.randint(1, 30)}),
+    "pct": ("pct", {"percent": lambda: random.randint(0, 100)}),
+}
+PHASES = ("start", "open_tab", "autosave", "submit", "review_queue", "kpi_dashboard")
+
+ROW_ID_RE = r'name="{prefix}-(\d+)-id"[^>]*value="(\d+)"[^>]*data-version="(\w+)"'
+SUBMISSION_URL_RE = re.compile(r"/submission/(\d+)/")
+
+
+def _delete_submissions(submissions) -> int:
+    """Queryset delete that keeps the status counters and matrix generation in step (it skips Submission.delete)."""
+    with transaction.atomic():
+        submission_counters.record_deletions(submissions)
+        generations.bump(Submission.STATUS_GENERATION)
+        deleted, _ = submissions.delete()
+    return deleted
+
+
+def _percentile(values, pct):
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(round(pct / 100 * (len(ordered) - 1))))]
+
+
+@dataclass
+class PhaseStats:
+    latencies: list[float] = field(default_factory=list)
+    errors: int = 0
+    lock_wait: float = 0.0
+    first_started: float | None = None
+    last_finished: float = 0.0
+
+
+class Recorder:
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.phases: dict[str, PhaseStats] = defaultdict(PhaseStats)
+
+    def record(self, phase: str, started: float, ok: bool, lock_wait: float) -> None:
+        finished = time.perf_counter()
+        with self._lock:
+            stats = self.phases[phase]
+            stats.latencies.append(finished - started)
+            stats.errors += 0 if ok else 1
+            stats.lock_wait += lock_wait
+            stats.first_started = started if stats.first_started is None else min(stats.first_started, started)
+            stats.last_finished = max(stats.last_finished, finished)
+
+
+class TestClientDriver:
+    """Issues requests in-process; lock wait is read from common.db."""
+
+    measures_lock_wait = True
+
+    def __init__(self, user):
+        # Server errors become 500 responses; the default re-raise is not thread-safe.
+        self.client = Client(raise_request_exception=False)
+        self.client.force_login(user)
+
+    def request(self, method, path, *, data=None, json_body=None):
+        if json_body is not None:
+            response = self.client.generic(method, path, data=json_body, content_type="application/json")
+        elif method == "POST":
+            response = self.client.post(path, data or {})
+        else:
+            response = self.client.get(path, data or {})
+        return response.status_code, response.content.decode("utf-8", "replace"), response.get("Location", "")
+
+
+class LiveServerDriver:
+    """Issues requests to a running server with ``requests``."""
+
+    measures_lock_wait = False
+
+    def __init__(self, base_url, username, password):
+        try:
+            import requests
+        except ImportError as exc:  # pragma: no cover - optional dependency
+            raise CommandError("--base-url needs the 'requests' package.") from exc
+        self.base_url = base_url.rstrip("/")
+        self.session = requests.Session()
+        login_url = f"{self.base_url}{reverse('login')}"
+        self.session.get(login_url, timeout=30)
+        response = self.session.post(
+            login_url,
+            data={
+                "username": username,
+                "password": password,
+                "csrfmiddlewaretoken": self.session.cookies.get("csrftoken", ""),
+            },
+            headers={"Referer": login_url},
+            timeout=30,
+        )
+        if "sessionid" not in self.session.cookies:
+            raise CommandError(f"Login failed for {username} ({response.status_code}).")
+
+    def request(self, method, path, *, data=None, json_body=None):
+        csrf = self.session.cookies.get("csrftoken", "")
+        headers = {"X-CSRFToken": csrf, "Referer": f"{self.base_url}{path}"}
+        if method == "POST" and data is not None:
+            data = {**data, "csrfmiddlewaretoken": csrf}
+        if json_body is not None:
+            headers["Content-Type"] = "application/json"
+        response = self.session.request(
+            method,
+            f"{self.base_url}{path}",
+            params=data if method == "GET" else None,
+            data=json_body if json_body is not None else (data if method != "GET" else None),
+            headers=headers,
+            allow_redirects=False,
+            timeout=120,
+        )
+        return response.status_code, response.text, response.headers.get("Location", "")
+
+
+class Command(BaseCommand):
+    help = "Simulate the deadline surge: school heads autosaving and submitting while reviewers browse."
+
+    def add_arguments(self, parser):  # pragma: no cover - CLI wiring
+        parser.add_argument('--school-heads', type=int, default=50, help='Simulated school heads.')
+        parser.add_argument('--reviewers', type=int, default=5, help='Simulated reviewers.')
+        parser.add_argument('--autosaves', type=int, default=10, help='Autosaves per school head.')
+        parser.add_argument('--flush-every', type=int, default=5, help='Every Nth autosave is a tab switch (flush).')
+        parser.add_argument('--tabs', default='slp,rma,supervision', help='Tabs the heads cycle through.')
+        parser.add_argument('--think-time', type=float, default=0.2, help='Seconds between a client\'s requests.')
+        parser.add_argument('--workers', type=int, default=0, help='Thread pool size (default: one per client).')
+        parser.add_argument('--base-url', default='', help='Drive a running server instead of the test client.')
+        parser.add_argument('--password', default='', help='Password for load-test users (live mode; default: random).')
+        parser.add_argument('--prefix', default='loadtest', help='Namespace for created schools and users.')
+        parser.add_argument('--section', default='smme', help='Section code of the form and review queue.')
+        parser.add_argument(
+            '--form-code', default='', help='Existing form template to submit (default: a <prefix>-form template).'
+        )
+        parser.add_argument('--period-id', type=int, default=0, help='Period to submit for (default: first active).')
+        parser.add_argument('--no-submit', action='store_true', help='Skip the submit_submission phase.')
+        parser.add_argument('--keep-data', action='store_true', help='Keep load-test data when finished.')
+
+    def handle(self, *args, **options):
+        tabs = [tab.strip() for tab in options['tabs'].split(',') if tab.strip()]
+        unknown = [tab for tab in tabs if tab not in AUTOSAVE_CELLS]
+        if unknown:
+            raise CommandError(f"Unsupported tabs: {', '.join(unknown)} (choose from {', '.join(AUTOSAVE_CELLS)}).")
+        live = bool(options['base_url'])
+        if live and not options['password']:
+            options['password'] = secrets.token_urlsafe(24)
+
+        fixtures = self._prepare(options, live)
+        heads, reviewers = fixtures['heads'], fixtures['reviewers']
+        recorder = Recorder()
+        heads_done = threading.Event()
+        workers = options['workers'] or (len(heads) + len(reviewers))
+
+        def make_driver(user):
+            if live:
+                return LiveServerDriver(options['base_url'], user.username, options['password'])
+            return TestClientDriver(user)
+
+        def timed(driver, phase, method, path, **kwargs):
+            if driver.measures_lock_wait:
+                consume_lock_wait()
+            started = time.perf_counter()
+            try:
+                status, body, location = driver.request(method, path, **kwargs)
+            except Exception as exc:  # network error or server exception
+                self.stderr.write(f"{phase} {path} failed: {exc}")
+                recorder.record(phase, started, False, 0.0)
+                return None, "", ""
+            lock_wait = consume_lock_wait() if driver.measures_lock_wait else 0.0
+            recorder.record(phase, started, status < 400, lock_wait)
+            return status, body, location
+
+        def school_head(user):
+            try:
+                driver = make_driver(user)
+                start_path = reverse('start_submission', args=[fixtures['form'].code, fixtures['period'].pk])
+                status, _, location = timed(driver, 'start', 'GET', start_path)
+                match = SUBMISSION_URL_RE.search(location or '')
+                if not match:
+                    return
+                submission_id = int(match.group(1))
+                edit_path = reverse('edit_submission', args=[submission_id])
+                autosave_path = reverse('autosave_submission', args=[submission_id])
+                row_ids = {}
+                versions = {}
+                for n in range(options['autosaves']):
+                    tab = tabs[n % len(tabs)]
+                    prefix, cells = AUTOSAVE_CELLS[tab]
+                    model_key = fixtures['prefix_models'][prefix]
+                    if tab not in row_ids:
+                        _, body, _ = timed(driver, 'open_tab', 'GET', edit_path, data={'tab': tab})
+                        rows = re.findall(ROW_ID_RE.format(prefix=prefix), body)
+                        row_ids[tab] = [int(pk) for _, pk, _ in rows]
+                        versions.update((f'{model_key}:{pk}', version) for _, pk, version in rows)
+                    if not row_ids[tab]:
+                        continue
+                    row_id = random.choice(row_ids[tab])
+                    version = versions[f'{model_key}:{row_id}']
+                    changes = [
+                        {'model': model_key, 'id': row_id, 'field': name, 'value': factory(), 'version': version}
+                        for name, factory in cells.items()
+                    ]
+                    flush = options['flush_every'] and (n + 1) % options['flush_every'] == 0
+                    status, body, _ = timed(driver, 'autosave', 'PATCH', autosave_path,
+                                            json_body=json.dumps({'changes': changes, 'buffer': not flush}))
+                    if flush and status == 200:
+                        versions.update(json.loads(body).get('versions', {}))
+                    time.sleep(options['think_time'])
+                if not options['no_submit']:
+                    timed(driver, 'submit', 'POST', edit_path,
+                          data={'tab': tabs[0], 'action': 'submit_submission'})
+            finally:
+                if not live:
+                    connections.close_all()
+
+        def reviewer(user):
+            try:
+                driver = make_driver(user)
+                queue_path = reverse('review_queue', args=[fixtures['section'].code])
+                kpi_path = reverse('smme_kpi_dashboard')
+                while True:
+                    timed(driver, 'review_queue', 'GET', queue_path)
+                    timed(driver, 'kpi_dashboard', 'GET', kpi_path)
+                    if heads_done.is_set():
+                        return
+                    time.sleep(options['think_time'])
+            finally:
+                if not live:
+                    connections.close_all()
+
+        self.stdout.write(
+            f"Driving {len(heads)} school heads and {len(reviewers)} reviewers "
+            f"({'live: ' + options['base_url'] if live else 'test client'}, {workers} workers)..."
+        )
+        wall_start = time.perf_counter()
+        with ThreadPoolExecutor(max_workers=workers) as pool:
+            # Heads are queued first: reviewers poll until the heads finish, so with
+            # fewer workers than clients they must not take every worker.
+            head_futures = [pool.submit(school_head, user) for user in heads]
+            reviewer_futures = [pool.submit(reviewer, user) for user in reviewers]
+            for future in head_futures:
+                future.result()
+            heads_done.set()
+            for future in reviewer_futures:
+                future.result()
+        wall = time.perf_counter() - wall_start
+
+        self._report(recorder, wall, live)
+        if options['keep_data']:
+            if live:
+                for user in heads + reviewers:
+                    user.set_unusable_password()
+                    user.save(update_fields=['password'])
+            self.stdout.write(f"Load-test data kept (prefix {fixtures['prefix']!r}).")
+        else:
+            self._cleanup(fixtures)
+            self.stdout.write("Load-test data removed.")
+
+    def _prepare(self, options, live):
+        from submissions.autosave import autosave_prefix_map
+
+        prefix = options['prefix']
+        created = []
+        section, section_created = Section.objects.get_or_create(
+            code=options['section'], defaults={'name': options['section'].upper()}
+        )
+        if section_created:
+            created.append(section)
+        if options['form_code']:
+            form = FormTemplate.objects.filter(code=options['form_code'], is_active=True).first()
+            if form is None:
+                raise CommandError(f"No active form template with code {options['form_code']!r}.")
+        else:
+            today = timezone.localdate()
+            form, _ = FormTemplate.objects.get_or_create(
+                code=f'{prefix}-form',
+                defaults={
+                    'section': section,
+                    'title': 'Load Test SMEA Form 1',
+                    'period_type': FormTemplate.PeriodType.QUARTER,
+                    'open_at': today,
+                    'close_at': today + timedelta(days=30),
+                },
+            )
+            created.append(form)
+        if options['period_id']:
+            period = Period.objects.filter(pk=options['period_id']).first()
+            if period is None:
+                raise CommandError(f"Period {options['period_id']} does not exist.")
+        else:
+            period = Period.objects.filter(is_active=True).order_by('school_year_start', 'display_order').first()
+            if period is None:
+                period = Period.objects.create(
+                    label='Q1', school_year_start=timezone.localdate().year, quarter_tag='Q1', display_order=1
+                )
+                created.append(period)
+
+        district, _ = District.objects.get_or_create(code=f'{prefix}-district', defaults={'name': f'{prefix} district'})
+        User = get_user_model()
+
+        def ensure_user(username):
+            user, user_created = User.objects.get_or_create(username=username)
+            if user_created or live:
+                if live:
+                    user.set_password(options['password'])
+                else:
+                    user.set_unusable_password()
+                user.save(update_fields=['password'])
+            return user
+
+        heads = []
+        for n in range(max(0, options['school_heads'])):
+            school, _ = School.objects.get_or_create(
+                code=f'{prefix}-school-{n:04d}',
+                defaults={'name': f'Load Test School {n:04d}', 'district': district},
+            )
+            SchoolProfile.objects.get_or_create(school=school, defaults={'grade_span_start': 1, 'grade_span_end': 6})
+            user = ensure_user(f'{prefix}-head-{n:04d}')
+            UserProfile.objects.filter(user=user).update(school=school)
+            heads.append(user)
+
+        reviewers = []
+        for n in range(max(0, options['reviewers'])):
+            user = ensure_user(f'{prefix}-reviewer-{n:04d}')
+            UserProfile.objects.filter(user=user).update(is_sgod_admin=True)
+            reviewers.append(user)
+
+        # Every run starts from blank drafts.
+        reset = _delete_submissions(Submission.objects.filter(
+            school__code__startswith=f'{prefix}-school-', form_template=form, period=period
+        ))
+        if reset:
+            self.stdout.write(f"Reset {reset} rows from previous load-test submissions.")
+
+        prefix_models = {formset_prefix: entry['model'] for formset_prefix, entry in autosave_prefix_map().items()}
+        return {
+            'prefix': prefix,
+            'section': section,
+            'form': form,
+            'period': period,
+            'district': district,
+            'heads': heads,
+            'reviewers': reviewers,
+            'prefix_models': prefix_models,
+            'created': created,
+        }
+
+    def _report(self, recorder, wall, live):
+        self.stdout.write(f"\nWall time: {wall:.1f}s")
+        header = f"{'phase':<14}{'requests':>9}{'req/s':>9}{'errors':>8}{'p50 ms':>9}{'p95 ms':>9}{'p99 ms':>9}"
+        header += "" if live else f"{'lock wait ms':>14}"
+        self.stdout.write(header)
+        for phase in PHASES:
+            stats = recorder.phases.get(phase)
+            if not stats or not stats.latencies:
+                continue
+            count = len(stats.latencies)
+            span = max(stats.last_finished - (stats.first_started or 0), 1e-9)
+            line = (
+                f"{phase:<14}{count:>9}{count / span:>9.1f}{stats.errors / count:>7.1%} "
+                f"{_percentile(stats.latencies, 50) * 1000:>8.1f}"
+                f"{_percentile(stats.latencies, 95) * 1000:>9.1f}"
+                f"{_percentile(stats.latencies, 99) * 1000:>9.1f}"
+            )
+            if not live:
+                line += f"{stats.lock_wait * 1000:>14.1f}"
+            self.stdout.write(line)
+        self.stdout.write(self.style.SUCCESS("Load test finished."))
+
+    @staticmethod
+    def _cleanup(fixtures):
+        prefix = fixtures['prefix']
+        get_user_model().objects.filter(username__regex=rf'^{re.escape(prefix)}-(head|reviewer)-\d+$').delete()
+        _delete_submissions(Submission.objects.filter(school__code__startswith=f'{prefix}-school-'))
+        School.objects.filter(code__startswith=f'{prefix}-school-').delete()
+        fixtures['district'].delete()
+        for obj in reversed(fixtures['created']):
+            obj.delete()
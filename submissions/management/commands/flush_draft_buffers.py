@@ -0,0 +1,25 @@
+from __future__ import annotations
+
+from django.core.management.base import BaseCommand
+
+from submissions.drafts import DEFAULT_IDLE_SECONDS, flush_idle_draft_buffers
+
+
+class Command(BaseCommand):
+    help = "Apply autosave draft buffers that have been idle to the SMEA Form 1 tables."
+
+    def add_arguments(self, parser):  # pragma: no cover - CLI wiring
+        parser.add_argument(
+            '--idle-seconds',
+            type=int,
+            default=DEFAULT_IDLE_SECONDS,
+            help='Only flush buffers not updated for at least this many seconds (0 flushes everything).'
+        )
+
+    def handle(self, *args, **options):
+        idle_seconds = max(0, options.get('idle_seconds') or 0)
+        stats = flush_idle_draft_buffers(idle_seconds)
+        self.stdout.write(self.style.SUCCESS(
+            f"Flushed draft buffers for {stats['submissions']} submissions "
+            f"({stats['rows']} rows written, {stats['conflicts']} conflicts, {stats['errors']} invalid rows)."
+        ))
@@ -0,0 +1,22 @@
+from __future__ import annotations
+
+from django.core.management.base import BaseCommand
+
+from submissions.export_cache import cache_root, purge_stale_exports
+
+
+class Command(BaseCommand):
+    help = "Delete cached CSV/XLSX exports whose submission was changed, reopened or deleted."
+
+    def add_arguments(self, parser):  # pragma: no cover - CLI wiring
+        parser.add_argument("--dry-run", action="store_true", help="Report what would be deleted without deleting")
+
+    def handle(self, *args, **options):
+        dry_run = options.get("dry_run")
+        stats = purge_stale_exports(dry_run=dry_run)
+        verb = "Would delete" if dry_run else "Deleted"
+        prefix = "[DRY-RUN] " if dry_run else ""
+        self.stdout.write(self.style.SUCCESS(
+            f"{prefix}{verb} {stats['files']} stale export files ({stats['bytes']} bytes) "
+            f"from {cache_root()}; kept {stats['kept']}."
+        ))
@@ -0,0 +1,13 @@
+from __future__ import annotations
+
+from django.core.management.base import BaseCommand
+
+from submissions.counters import rebuild_counters
+
+
+class Command(BaseCommand):
+    help = "Recompute the review queue status counters from the submissions table."
+
+    def handle(self, *args, **options):
+        rows = rebuild_counters()
+        self.stdout.write(self.style.SUCCESS(f"Rebuilt {rows} status counter rows."))
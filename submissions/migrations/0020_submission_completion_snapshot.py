@@ -0,0 +1,28 @@
+# Generated by Django 4.2.30 on 2026-10-18 23:27
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('submissions', '0019_formtemplate_reading_timing_override_and_more'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='submission',
+            name='completion_progress',
+            field=models.PositiveSmallIntegerField(default=0),
+        ),
+        migrations.AddField(
+            model_name='submission',
+            name='completion_sections',
+            field=models.JSONField(blank=True, default=dict),
+        ),
+        migrations.AddField(
+            model_name='submission',
+            name='completion_updated_at',
+            field=models.DateTimeField(blank=True, null=True),
+        ),
+    ]
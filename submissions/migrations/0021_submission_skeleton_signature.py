@@ -0,0 +1,18 @@
+# Generated by Django 4.2.30 on 2026-10-18 23:30
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('submissions', '0020_submission_completion_snapshot'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='submission',
+            name='skeleton_signature',
+            field=models.CharField(blank=True, default='', max_length=40),
+        ),
+    ]
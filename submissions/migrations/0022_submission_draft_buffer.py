@@ -0,0 +1,32 @@
+# Generated by Django 4.2.30 on 2026-10-18 23:40
+
+from django.conf import settings
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+        ('submissions', '0021_submission_skeleton_signature'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='SubmissionDraftBuffer',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('tab', models.CharField(max_length=20)),
+                ('payload', models.JSONField(blank=True, default=dict)),
+                ('payload_hash', models.CharField(blank=True, max_length=40)),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('updated_at', models.DateTimeField(auto_now=True, db_index=True)),
+                ('submission', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='draft_buffers', to='submissions.submission')),
+                ('updated_by', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='submission_draft_buffers', to=settings.AUTH_USER_MODEL)),
+            ],
+            options={
+                'unique_together': {('submission', 'tab')},
+            },
+        ),
+    ]
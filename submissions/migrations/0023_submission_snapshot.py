@@ -0,0 +1,25 @@
+# Generated by Django 4.2.30 on 2026-10-18 23:59
+
+import django.core.serializers.json
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('submissions', '0022_submission_draft_buffer'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='SubmissionSnapshot',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('version', models.PositiveSmallIntegerField()),
+                ('payload', models.JSONField(encoder=django.core.serializers.json.DjangoJSONEncoder)),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('submission', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, related_name='snapshot', to='submissions.submission')),
+            ],
+        ),
+    ]
@@ -0,0 +1,35 @@
+# Generated by Django 4.2.30 on 2026-10-19 00:45
+
+from django.conf import settings
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+        ('organizations', '0005_schoolprofile_notification_email'),
+        ('submissions', '0023_submission_snapshot'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ReminderCampaign',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('missing_schools', models.PositiveIntegerField(default=0)),
+                ('queued', models.PositiveIntegerField(default=0)),
+                ('already_pending', models.PositiveIntegerField(default=0)),
+                ('without_email', models.PositiveIntegerField(default=0)),
+                ('created_by', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='reminder_campaigns', to=settings.AUTH_USER_MODEL)),
+                ('district', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='reminder_campaigns', to='organizations.district')),
+                ('form_template', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='reminder_campaigns', to='submissions.formtemplate')),
+                ('period', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='reminder_campaigns', to='submissions.period')),
+            ],
+            options={
+                'ordering': ['-created_at'],
+            },
+        ),
+    ]
@@ -0,0 +1,76 @@
+# Generated by Django 4.2.30 on 2026-10-19 00:59
+
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+def forwards(apps, schema_editor):
+    """Count the existing submissions (same grouping as submissions.counters.rebuild_counters)."""
+    Submission = apps.get_model("submissions", "Submission")
+    SubmissionStatusCounter = apps.get_model("submissions", "SubmissionStatusCounter")
+    rows = (
+        Submission.objects.values(
+            "period_id", "status",
+            section=models.F("form_template__section_id"), district=models.F("school__district_id"),
+        )
+        .annotate(total=models.Count("pk"))
+        .values_list("section", "period_id", "district", "status", "total")
+        .order_by()
+    )
+    SubmissionStatusCounter.objects.bulk_create([
+        SubmissionStatusCounter(
+            section_id=section_id, period_id=period_id, district_id=district_id, status=status, count=total
+        )
+        for section_id, period_id, district_id, status, total in rows
+    ])
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('organizations', '0005_schoolprofile_notification_email'),
+        ('submissions', '0024_reminder_campaign'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='SubmissionStatusCounter',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('status', models.CharField(choices=[('draft', 'Draft'), ('submitted', 'Submitted'), ('returned', 'Returned'), ('noted', 'Noted')], max_length=16)),
+                ('count', models.IntegerField(default=0)),
+            ],
+        ),
+        migrations.AddIndex(
+            model_name='submission',
+            index=models.Index(fields=['status', 'submitted_at'], name='submissions_status_37dcdc_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='submission',
+            index=models.Index(fields=['status', 'noted_at'], name='submissions_status_a46990_idx'),
+        ),
+        migrations.AddField(
+            model_name='submissionstatuscounter',
+            name='district',
+            field=models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.CASCADE, related_name='status_counters', to='organizations.district'),
+        ),
+        migrations.AddField(
+            model_name='submissionstatuscounter',
+            name='period',
+            field=models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='status_counters', to='submissions.period'),
+        ),
+        migrations.AddField(
+            model_name='submissionstatuscounter',
+            name='section',
+            field=models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='status_counters', to='organizations.section'),
+        ),
+        migrations.AddConstraint(
+            model_name='submissionstatuscounter',
+            constraint=models.UniqueConstraint(condition=models.Q(('district__isnull', False)), fields=('section', 'period', 'district', 'status'), name='status_counter_unique_key'),
+        ),
+        migrations.AddConstraint(
+            model_name='submissionstatuscounter',
+            constraint=models.UniqueConstraint(condition=models.Q(('district__isnull', True)), fields=('section', 'period', 'status'), name='status_counter_unique_key_no_district'),
+        ),
+        migrations.RunPython(forwards, migrations.RunPython.noop),
+    ]
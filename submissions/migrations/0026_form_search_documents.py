@@ -0,0 +1,31 @@
+from django.db import migrations
+
+
+def forwards(apps, schema_editor):
+    """One search document per existing form template (see submissions.search)."""
+    FormTemplate = apps.get_model("submissions", "FormTemplate")
+    SearchDocument = apps.get_model("common", "SearchDocument")
+    SearchDocument.objects.bulk_create(
+        [
+            SearchDocument(kind="form_template", object_id=pk, text=" ".join(title.split()))
+            for pk, title in FormTemplate.objects.order_by("pk").values_list("pk", "title")
+        ],
+        batch_size=500,
+        ignore_conflicts=True,
+    )
+
+
+def backwards(apps, schema_editor):
+    apps.get_model("common", "SearchDocument").objects.filter(kind="form_template").delete()
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('common', '0001_search_document'),
+        ('submissions', '0025_submission_status_counter'),
+    ]
+
+    operations = [
+        migrations.RunPython(forwards, backwards),
+    ]
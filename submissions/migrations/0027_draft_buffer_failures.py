@@ -0,0 +1,18 @@
+# Generated by Django 4.2.30 on 2026-10-19 01:25
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('submissions', '0026_form_search_documents'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='submissiondraftbuffer',
+            name='failures',
+            field=models.JSONField(blank=True, default=dict),
+        ),
+    ]
@@ -7,13 +7,15 @@ from typing import Optional
 
 from django.conf import settings
 from django.core.exceptions import ValidationError
+from django.core.serializers.json import DjangoJSONEncoder
 from django.core.validators import MaxValueValidator, MinValueValidator
-from django.db import models
+from django.db import models, transaction
 from django.db.models import Count
 from django.utils import timezone
 from django.utils.text import slugify
 
-from organizations.models import Section, School
+from common import generations
+from organizations.models import District, Section, School
 
 from . import constants as smea_constants
 
@@ -152,8 +154,17 @@ class SubmissionQuerySet(models.QuerySet):
     def noted(self):
         return self.with_status(Submission.Status.NOTED)
 
+    def with_completion_counts(self):
+        """Annotate the counts used for section completion (one query total)."""
+        from .progress import completion_count_annotations
+
+        return self.annotate(**completion_count_annotations())
+
 
 class Submission(models.Model):
+    # Generation (common.generations) bumped whenever a submission is created, deleted or changes status.
+    STATUS_GENERATION = "submission-status"
+
     class Status(models.TextChoices):
         DRAFT = "draft", "Draft"
         SUBMITTED = "submitted", "Submitted"
@@ -197,6 +208,14 @@ class Submission(models.Model):
 
     data = models.JSONField(default=dict, blank=True)
 
+    # Completion snapshot, refreshed per tab when the school saves the form.
+    completion_progress = models.PositiveSmallIntegerField(default=0)
+    completion_sections = models.JSONField(default=dict, blank=True)
+    completion_updated_at = models.DateTimeField(null=True, blank=True)
+    # Hash of the inputs that shaped the materialized child rows (see
+    # submissions.views.materialize_submission_skeleton).
+    skeleton_signature = models.CharField(max_length=40, blank=True, default="")
+
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
     last_modified_by = models.ForeignKey(
@@ -220,6 +239,9 @@ class Submission(models.Model):
         indexes = [
             models.Index(fields=("status", "updated_at")),
             models.Index(fields=("form_template", "period")),
+            # review_queue listing order and its "submitted today" / "noted this week" stats
+            models.Index(fields=("status", "submitted_at")),
+            models.Index(fields=("status", "noted_at")),
         ]
 
     def __str__(self) -> str:  # pragma: no cover - trivial
@@ -280,10 +302,31 @@ class Submission(models.Model):
     def is_editable_by_school(self) -> bool:
         return self.status in {self.Status.DRAFT, self.Status.RETURNED}
 
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        instance = super().from_db(db, field_names, values)
+        # Status as stored, so save() can move the status counters when it changes.
+        instance._stored_status = instance.__dict__.get("status")
+        return instance
+
     def save(self, *args, **kwargs):
+        from .counters import record_status_change
+
         is_new = self._state.adding
         actor = getattr(self, "last_modified_by", None)
-        super().save(*args, **kwargs)
+        update_fields = kwargs.get("update_fields")
+        status_saved = is_new or update_fields is None or "status" in update_fields
+        stored_status = None if is_new else getattr(self, "_stored_status", None)
+        with transaction.atomic():
+            super().save(*args, **kwargs)
+            if is_new:
+                record_status_change(self, None, self.status)
+            elif status_saved and stored_status is not None and stored_status != self.status:
+                record_status_change(self, stored_status, self.status)
+            if status_saved:
+                generations.bump(self.STATUS_GENERATION)
+        if status_saved:
+            self._stored_status = self.status
         if is_new:
             SubmissionTimeline.objects.create(
                 submission=self,
@@ -293,10 +336,22 @@ class Submission(models.Model):
                 remarks="Submission created" if self.status == self.Status.DRAFT else "Status initialized",
             )
 
+    def delete(self, *args, **kwargs):
+        from .counters import record_status_change
+
+        with transaction.atomic():
+            generations.bump(self.STATUS_GENERATION)
+            record_status_change(self, getattr(self, "_stored_status", self.status), None)
+            return super().delete(*args, **kwargs)
+
     def _transition(self, target_status: str, actor, remarks: str = "") -> None:
         previous_status = self.status
         if previous_status == target_status:
             return
+        # Cached review fragments are keyed on the current updated_at; drop them before it moves.
+        from .fragments import discard_fragments
+
+        discard_fragments(self)
         # Keep remarks from previous cycle when moving out of RETURNED state.
         if target_status != self.Status.RETURNED:
             self.returned_at = None
@@ -307,270 +362,144 @@ class Submission(models.Model):
         self.status = target_status
         self.last_modified_by = actor
         self.updated_at = timezone.now()
-        self.save()
-        SubmissionTimeline.objects.create(
-            submission=self,
-            actor=actor if actor and getattr(actor, "is_authenticated", False) else None,
-            from_status=previous_status,
-            to_status=target_status,
-            remarks=remarks or "",
-        )
-        # Notification hook: email school on important transitions
-        try:
-            profile = getattr(self.school, "profile", None)
-            to_email = getattr(profile, "notification_email", None)
-            if to_email:
-                form_title = getattr(self.form_template, "title", "Form")
-                section_name = getattr(getattr(self.form_template, "section", None), "name", "Section")
-                period_label = getattr(self.period, "label", "")
-                from django.template.loader import render_to_string
-                from django.utils.html import strip_tags
-                site_url = getattr(settings, 'SITE_URL', '')
-                submission_path = f"/submissions/submission/{self.id}/"  # matches submissions.urls pattern name edit_submission
-                submission_url = f"{site_url}{submission_path}" if site_url else submission_path
-                if target_status == self.Status.RETURNED:
-                    subject = f"Returned: {form_title} — {section_name} ({period_label})"
-                    ctx = {
-                        "title": form_title,
-                        "section": section_name,
-                        "period": period_label,
-                        "remarks": remarks or "No remarks provided.",
-                        "status": "returned",
-                        "site_url": site_url,
-                        "submission_url": submission_url,
-                    }
-                elif target_status == self.Status.NOTED:
-                    subject = f"Noted: {form_title} — {section_name} ({period_label})"
-                    ctx = {
-                        "title": form_title,
-                        "section": section_name,
-                        "period": period_label,
-                        "remarks": remarks or "No remarks.",
-                        "status": "noted",
-                        "site_url": site_url,
-                        "submission_url": submission_url,
-                    }
-                elif target_status == self.Status.SUBMITTED:
-                    # Optional: notify school confirmation of submission
-                    subject = f"Submitted: {form_title} — {section_name} ({period_label})"
-                    ctx = {
-                        "title": form_title,
-                        "section": section_name,
-                        "period": period_label,
-                        "remarks": "",
-                        "status": "submitted",
-                        "site_url": site_url,
-                        "submission_url": submission_url,
-                    }
-                else:
-                    subject = None
-                    ctx = None
-                if subject and ctx is not None:
-                    template_map = {
-                        "returned": "emails/submission_returned.html",
-                        "noted": "emails/submission_noted.html",
-                        "submitted": "emails/submission_submitted.html",
-                    }
-                    tpl = template_map.get(ctx["status"]) or "emails/submission_generic.html"
-                    html_body = render_to_string(tpl, ctx)
-                    text_body = strip_tags(html_body)
-                    from notifications.services import queue_email  # type: ignore
-                    queue_email(to_email=to_email, subject=subject, body=text_body, html_body=html_body)
-        except Exception:
-            # Non-blocking: never fail the transition due to notification issues
-            pass
+        from .notifications import record_status_change
+        from .snapshots import discard_snapshot, write_snapshot
+
+        with transaction.atomic():
+            self.save()
+            SubmissionTimeline.objects.create(
+                submission=self,
+                actor=actor if actor and getattr(actor, "is_authenticated", False) else None,
+                from_status=previous_status,
+                to_status=target_status,
+                remarks=remarks or "",
+            )
+            # Freeze the review/export read model on submit; drop it once the school can edit again.
+            if target_status == self.Status.SUBMITTED:
+                write_snapshot(self)
+            elif target_status in {self.Status.RETURNED, self.Status.DRAFT}:
+                discard_snapshot(self)
+            # Notification hook: the email is rendered and sent by the outbox worker, not here.
+            record_status_change(self, previous_status, target_status, remarks)
+
+    @property
+    def email_path(self) -> str:
+        return f"/submissions/submission/{self.id}/"  # matches submissions.urls pattern name edit_submission
+
+    def status_change_context(self, target_status: str, remarks: str = "") -> Optional[tuple[str, str, dict]]:
+        """``(subject, template, context)`` of the email about ``target_status``, or None when nothing is sent."""
+        form_title = getattr(self.form_template, "title", "Form")
+        section_name = getattr(getattr(self.form_template, "section", None), "name", "Section")
+        period_label = getattr(self.period, "label", "")
+        site_url = getattr(settings, 'SITE_URL', '')
+        submission_path = self.email_path
+        submission_url = f"{site_url}{submission_path}" if site_url else submission_path
+        if target_status == self.Status.RETURNED:
+            subject = f"Returned: {form_title} — {section_name} ({period_label})"
+            ctx = {
+                "title": form_title,
+                "section": section_name,
+                "period": period_label,
+                "remarks": remarks or "No remarks provided.",
+                "status": "returned",
+                "site_url": site_url,
+                "submission_url": submission_url,
+            }
+        elif target_status == self.Status.NOTED:
+            subject = f"Noted: {form_title} — {section_name} ({period_label})"
+            ctx = {
+                "title": form_title,
+                "section": section_name,
+                "period": period_label,
+                "remarks": remarks or "No remarks.",
+                "status": "noted",
+                "site_url": site_url,
+                "submission_url": submission_url,
+            }
+        elif target_status == self.Status.SUBMITTED:
+            # Optional: notify school confirmation of submission
+            subject = f"Submitted: {form_title} — {section_name} ({period_label})"
+            ctx = {
+                "title": form_title,
+                "section": section_name,
+                "period": period_label,
+                "remarks": "",
+                "status": "submitted",
+                "site_url": site_url,
+                "submission_url": submission_url,
+            }
+        else:
+            return None
+        template_map = {
+            "returned": "emails/submission_returned.html",
+            "noted": "emails/submission_noted.html",
+            "submitted": "emails/submission_submitted.html",
+        }
+        return subject, template_map.get(ctx["status"]) or "emails/submission_generic.html", ctx
+
+    def status_change_email(self, target_status: str, remarks: str = "") -> Optional[dict]:
+        """``queue_email`` kwargs telling the school about ``target_status``, or None when nothing is sent."""
+        profile = getattr(self.school, "profile", None)
+        to_email = getattr(profile, "notification_email", None)
+        if not to_email:
+            return None
+        parts = self.status_change_context(target_status, remarks)
+        if parts is None:
+            return None
+        from django.template.loader import render_to_string
+        from django.utils.html import strip_tags
+        subject, tpl, ctx = parts
+        html_body = render_to_string(tpl, ctx)
+        text_body = strip_tags(html_body)
+        return {"to_email": to_email, "subject": subject, "body": text_body, "html_body": html_body, "kind": tpl}
 
     # --- Progress tracking methods -----------------------------------------
-    
+
+    def _completion_counts(self) -> dict:
+        from .progress import COMPLETION_COUNT_FIELDS, counts_from_instance
+
+        counts = counts_from_instance(self)
+        if counts is None:
+            counts = (
+                Submission.objects.filter(pk=self.pk)
+                .order_by()
+                .with_completion_counts()
+                .values(*COMPLETION_COUNT_FIELDS)
+                .get()
+            )
+        return counts
+
+    def refresh_completion(self, sections=None, *, save: bool = True) -> dict:
+        """Recount completion for ``sections`` (default: all) and store it."""
+        from .progress import SECTION_KEYS, refresh_completion_snapshot
+
+        return refresh_completion_snapshot(self, SECTION_KEYS if sections is None else sections, save=save)
+
     def get_section_completion(self) -> dict:
         """
         Calculate completion status for each section.
         Returns dict with section keys and completion data.
         """
-        sections = {}
-        
-        # Projects & Activities
-        project_count = self.smea_projects.count()
-        activity_count = sum(p.activities.count() for p in self.smea_projects.all())
-        sections['projects'] = {
-            'complete': project_count > 0 and activity_count > 0,
-            'status': 'complete' if (project_count > 0 and activity_count > 0) else 'incomplete',
-            'detail': f"{project_count} project{'s' if project_count != 1 else ''}, {activity_count} activit{'ies' if activity_count != 1 else 'y'}",
-            'progress': 100 if (project_count > 0 and activity_count > 0) else 0,
-        }
-        
-        # % Implementation (PCT)
-        try:
-            pct_header = self.form1_pct_header
-            pct_rows = pct_header.rows.all()
-            filled_rows = sum(1 for row in pct_rows if row.percent is not None or row.action_points)
-            total_rows = pct_rows.count()
-            pct_progress = int((filled_rows / total_rows * 100)) if total_rows > 0 else 0
-            sections['pct'] = {
-                'complete': pct_progress == 100,
-                'status': 'complete' if pct_progress == 100 else ('in-progress' if pct_progress > 0 else 'not-started'),
-                'detail': f"{filled_rows} of {total_rows} areas completed",
-                'progress': pct_progress,
-            }
-        except Exception:
-            sections['pct'] = {
-                'complete': False,
-                'status': 'not-started',
-                'detail': 'Not started',
-                'progress': 0,
-            }
-        
-        # SLP
-        slp_rows = self.form1_slp_rows.all()
-        offered_rows = slp_rows.filter(is_offered=True)
-        offered_count = offered_rows.count()
-        
-        if offered_count == 0:
-            sections['slp'] = {
-                'complete': False,
-                'status': 'not-started',
-                'detail': 'No subjects marked as offered',
-                'progress': 0,
-            }
-        else:
-            # Check if offered subjects have data
-            completed_rows = 0
-            for row in offered_rows:
-                # Consider complete if proficiency data and LLC/intervention are filled
-                has_proficiency = any([
-                    row.dnme, row.fs, row.s, row.vs, row.o
-                ])
-                has_llc = bool(row.top_three_llc and row.top_three_llc.strip())
-                has_intervention = bool(row.intervention_plan and row.intervention_plan.strip())
-                # Count as complete if it has proficiency data AND (LLC or intervention)
-                if has_proficiency and (has_llc or has_intervention):
-                    completed_rows += 1
-            
-            slp_progress = int((completed_rows / offered_count * 100)) if offered_count > 0 else 0
-            sections['slp'] = {
-                'complete': slp_progress == 100,
-                'status': 'complete' if slp_progress == 100 else ('in-progress' if slp_progress > 0 else 'not-started'),
-                'detail': f"{completed_rows} of {offered_count} offered subjects completed",
-                'progress': slp_progress,
-            }
-        
-        # Reading Assessment
-        crla_count = self.form1_crla.count()
-        philiri_count = self.form1_philiri.count()
-        reading_interventions = self.form1_reading_interventions.count()
-        
-        has_reading_data = crla_count > 0 or philiri_count > 0
-        reading_complete = has_reading_data and reading_interventions > 0
-        
-        if reading_complete:
-            reading_status = 'complete'
-            reading_detail = f'CRLA: {crla_count}, PHILIRI: {philiri_count}, Interventions: {reading_interventions}'
-            reading_progress = 100
-        elif has_reading_data:
-            reading_status = 'in-progress'
-            reading_detail = f'Assessment data entered, {reading_interventions}/5 interventions'
-            reading_progress = 60
-        else:
-            reading_status = 'not-started'
-            reading_detail = 'Not started'
-            reading_progress = 0
-        
-        sections['reading'] = {
-            'complete': reading_complete,
-            'status': reading_status,
-            'detail': reading_detail,
-            'progress': reading_progress,
-        }
-        
-        # RMA
-        rma_rows_count = self.form1_rma_rows.count()
-        rma_interventions = self.form1_rma_interventions.count()
-        
-        has_rma_data = rma_rows_count > 0
-        rma_complete = has_rma_data and rma_interventions > 0
-        
-        if rma_complete:
-            rma_status = 'complete'
-            rma_detail = f'{rma_rows_count} grade levels, {rma_interventions} interventions'
-            rma_progress = 100
-        elif has_rma_data:
-            rma_status = 'in-progress'
-            rma_detail = f'{rma_rows_count} grade levels, {rma_interventions}/5 interventions'
-            rma_progress = 60
-        else:
-            rma_status = 'not-started'
-            rma_detail = 'Not started'
-            rma_progress = 0
-        
-        sections['rma'] = {
-            'complete': rma_complete,
-            'status': rma_status,
-            'detail': rma_detail,
-            'progress': rma_progress,
-        }
-        
-        # Instructional Supervision
-        supervision_rows_count = self.form1_supervision_rows.count()
-        
-        # Check if any supervision rows have meaningful data
-        has_supervision_data = False
-        if supervision_rows_count > 0:
-            for row in self.form1_supervision_rows.all():
-                if (row.teachers_supervised_observed_ta > 0 or 
-                    (row.intervention_support_provided and row.intervention_support_provided.strip()) or
-                    (row.result and row.result.strip())):
-                    has_supervision_data = True
-                    break
-        
-        if has_supervision_data:
-            supervision_status = 'complete'
-            supervision_detail = f'{supervision_rows_count} supervision records'
-            supervision_progress = 100
-        elif supervision_rows_count > 0:
-            supervision_status = 'in-progress'
-            supervision_detail = f'{supervision_rows_count} records (incomplete)'
-            supervision_progress = 50
-        else:
-            supervision_status = 'not-started'
-            supervision_detail = 'Not started'
-            supervision_progress = 0
-        
-        sections['supervision'] = {
-            'complete': has_supervision_data,
-            'status': supervision_status,
-            'detail': supervision_detail,
-            'progress': supervision_progress,
-        }
-        
-        return sections
-    
+        from .progress import build_section_completion
+
+        return build_section_completion(self._completion_counts())
+
     def get_overall_progress(self) -> int:
         """
         Calculate overall completion percentage (0-100).
         Averages progress across all sections.
         """
-        sections = self.get_section_completion()
-        total_progress = sum(section['progress'] for section in sections.values())
-        section_count = len(sections)
-        return int(total_progress / section_count) if section_count > 0 else 0
-    
+        from .progress import overall_progress
+
+        return overall_progress(self.get_section_completion())
+
     def get_completion_summary(self) -> dict:
         """
         Get high-level completion summary for dashboard display.
         """
-        sections = self.get_section_completion()
-        completed = sum(1 for s in sections.values() if s['complete'])
-        in_progress = sum(1 for s in sections.values() if s['status'] == 'in-progress')
-        not_started = sum(1 for s in sections.values() if s['status'] == 'not-started')
-        
-        return {
-            'overall_progress': self.get_overall_progress(),
-            'completed_sections': completed,
-            'in_progress_sections': in_progress,
-            'not_started_sections': not_started,
-            'total_sections': len(sections),
-            'sections': sections,
-        }
+        from .progress import build_completion_summary
+
+        return build_completion_summary(self.get_section_completion())
 
 
 def _submission_attachment_upload_to(instance: "SubmissionAttachment", filename: str) -> str:
@@ -647,6 +576,121 @@ class SubmissionTimeline(models.Model):
         actor = self.actor or "System"
         return f"{self.submission_id} {self.from_status}->{self.to_status} by {actor}"
 
+
+class SubmissionDraftBuffer(models.Model):
+    """Latest unsaved autosave state for one editor tab (see submissions.drafts).
+
+    ``payload`` maps ``"<model>:<row id>:<field>"`` to ``{"value", "version"}``;
+    it is applied to the Form 1 tables on save, tab switch, submit or idle flush.
+    Cells that could not be applied stay in the payload, and ``failures`` maps
+    their ``"<model>:<row id>"`` to ``{"state", "detail"}`` for the editor.
+    """
+
+    submission = models.ForeignKey(Submission, on_delete=models.CASCADE, related_name="draft_buffers")
+    tab = models.CharField(max_length=20)
+    payload = models.JSONField(default=dict, blank=True)
+    payload_hash = models.CharField(max_length=40, blank=True)
+    failures = models.JSONField(default=dict, blank=True)
+    updated_by = models.ForeignKey(
+        settings.AUTH_USER_MODEL,
+        null=True,
+        blank=True,
+        on_delete=models.SET_NULL,
+        related_name="submission_draft_buffers",
+    )
+    created_at = models.DateTimeField(auto_now_add=True)
+    updated_at = models.DateTimeField(auto_now=True, db_index=True)
+
+    class Meta:
+        unique_together = ("submission", "tab")
+
+    def __str__(self) -> str:  # pragma: no cover - trivial
+        return f"Draft buffer {self.submission_id}/{self.tab}"
+
+
+class SubmissionSnapshot(models.Model):
+    """Frozen Form 1 payload of a submitted report (see submissions.snapshots).
+
+    Written once when the school submits and deleted when the report is
+    returned or reopened; review pages and exports read from it instead of
+    re-joining the Form 1 tables.
+    """
+
+    submission = models.OneToOneField(Submission, on_delete=models.CASCADE, related_name="snapshot")
+    version = models.PositiveSmallIntegerField()
+    payload = models.JSONField(encoder=DjangoJSONEncoder)
+    created_at = models.DateTimeField(auto_now_add=True)
+
+    def __str__(self) -> str:  # pragma: no cover - trivial
+        return f"Snapshot v{self.version} of {self.submission_id}"
+
+
+class ReminderCampaign(models.Model):
+    """One "please submit" reminder run (see submissions.reminders).
+
+    Records who asked for it, the form/period/district it targeted and how
+    many reminders were queued; the emails themselves are
+    ``notifications.EmailNotification`` rows.
+    """
+
+    form_template = models.ForeignKey(FormTemplate, on_delete=models.CASCADE, related_name="reminder_campaigns")
+    period = models.ForeignKey(Period, on_delete=models.CASCADE, related_name="reminder_campaigns")
+    district = models.ForeignKey(
+        District, null=True, blank=True, on_delete=models.SET_NULL, related_name="reminder_campaigns"
+    )
+    created_by = models.ForeignKey(
+        settings.AUTH_USER_MODEL,
+        null=True,
+        blank=True,
+        on_delete=models.SET_NULL,
+        related_name="reminder_campaigns",
+    )
+    created_at = models.DateTimeField(auto_now_add=True)
+    missing_schools = models.PositiveIntegerField(default=0)
+    queued = models.PositiveIntegerField(default=0)
+    already_pending = models.PositiveIntegerField(default=0)
+    without_email = models.PositiveIntegerField(default=0)
+
+    class Meta:
+        ordering = ["-created_at"]
+
+    def __str__(self) -> str:  # pragma: no cover - trivial
+        return f"Reminders for {self.form_template_id}/{self.period_id} ({self.queued} queued)"
+
+
+class SubmissionStatusCounter(models.Model):
+    """How many submissions of a section/period/district are in each status (see submissions.counters).
+
+    Kept in step by ``Submission.save``/``delete`` and ``bulk_review`` in the
+    same transaction as the status change, so ``review_queue`` reads its tab
+    counts from a handful of rows instead of counting submissions.
+    """
+
+    section = models.ForeignKey(Section, on_delete=models.CASCADE, related_name="status_counters")
+    period = models.ForeignKey(Period, on_delete=models.CASCADE, related_name="status_counters")
+    district = models.ForeignKey(
+        District, null=True, blank=True, on_delete=models.CASCADE, related_name="status_counters"
+    )
+    status = models.CharField(max_length=16, choices=Submission.Status.choices)
+    count = models.IntegerField(default=0)
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(
+                fields=("section", "period", "district", "status"),
+                condition=models.Q(district__isnull=False),
+                name="status_counter_unique_key",
+            ),
+            models.UniqueConstraint(
+                fields=("section", "period", "status"),
+                condition=models.Q(district__isnull=True),
+                name="status_counter_unique_key_no_district",
+            ),
+        ]
+
+    def __str__(self) -> str:  # pragma: no cover - trivial
+        return f"{self.section_id}/{self.period_id}/{self.district_id} {self.status}: {self.count}"
+
 # ---- SMME: SMEA Form 1 (v2) specific tables ----
 
 
@@ -0,0 +1,134 @@
+"""Outbox events for Form 1 status changes and the emails built from them.
+
+``Submission._transition`` and :mod:`submissions.bulk_review` record a
+:data:`STATUS_CHANGED` event (submission id, from/to status, remarks) in the
+transaction that changes the status, grouped by school.
+:func:`status_change_emails` is the outbox handler (see
+``settings.NOTIFICATION_EVENT_HANDLERS``): it renders
+``Submission.status_change_email`` for a batch of events, once per form,
+period, status and remarks, and reuses that rendering with each report's
+own link.
+
+With a digest window for :data:`STATUS_CHANGED` in
+``settings.NOTIFICATION_DIGEST_WINDOWS``, a school's transitions within the
+window arrive together and a recipient with more than one of them gets a
+single ``emails/submission_digest.html`` message listing them all.
+"""
+from __future__ import annotations
+
+from collections import defaultdict
+from typing import Iterable
+
+from django.template.loader import render_to_string
+from django.utils.html import strip_tags
+
+from notifications import outbox
+
+from .models import Submission
+
+STATUS_CHANGED = "submission.status_changed"
+NOTIFIED_STATUSES = frozenset({Submission.Status.SUBMITTED, Submission.Status.RETURNED, Submission.Status.NOTED})
+DIGEST_TEMPLATE = "emails/submission_digest.html"
+
+
+def _payload(from_status: str, to_status: str, remarks: str) -> dict:
+    return {"from_status": from_status, "to_status": to_status, "remarks": remarks or ""}
+
+
+def _group_key(submission: Submission) -> str:
+    return f"school:{submission.school_id}"
+
+
+def record_status_change(submission: Submission, from_status: str, to_status: str, remarks: str = "") -> None:
+    if to_status in NOTIFIED_STATUSES:
+        outbox.record_event(
+            STATUS_CHANGED, submission.pk, group_key=_group_key(submission), **_payload(from_status, to_status, remarks)
+        )
+
+
+def record_status_changes(
+    submissions: Iterable[Submission], from_status: str, to_status: str, remarks: str = ""
+) -> None:
+    if to_status in NOTIFIED_STATUSES:
+        payload = _payload(from_status, to_status, remarks)
+        outbox.record_events(
+            STATUS_CHANGED, [(submission.pk, payload, _group_key(submission)) for submission in submissions]
+        )
+
+
+def _digest_email(to_email: str, entries: list) -> dict | None:
+    """One message covering every ``(event, submission)`` in ``entries``."""
+    items = []
+    for event, submission in entries:
+        parts = submission.status_change_context(event.payload.get("to_status", ""), event.payload.get("remarks", ""))
+        if parts is not None:
+            items.append(parts[2])
+    if not items:
+        return None
+    first_event, first_submission = entries[0]
+    school_name = getattr(first_submission.school, "name", "")
+    subject = f"{len(items)} report updates — {school_name}" if school_name else f"{len(items)} report updates"
+    html_body = render_to_string(DIGEST_TEMPLATE, {
+        "items": items,
+        "school": school_name,
+        "subject": subject,
+        "site_url": items[0]["site_url"],
+        "has_returned": any(item["status"] == "returned" for item in items),
+    })
+    return {
+        "to_email": to_email,
+        "subject": subject,
+        "body": strip_tags(html_body),
+        "html_body": html_body,
+        # Each digest is its own message, even when an earlier one with the same count is still queued.
+        "kind": f"{DIGEST_TEMPLATE}:{first_event.pk}",
+    }
+
+
+def status_change_emails(events) -> dict[int, list[dict]]:
+    """Outbox handler: ``{event.pk: [queue_email kwargs]}`` for :data:`STATUS_CHANGED` events."""
+    submissions = Submission.objects.select_related(
+        "school__profile", "form_template__section", "period"
+    ).in_bulk({event.object_id for event in events})
+    emails: dict[int, list[dict]] = {event.pk: [] for event in events}
+    by_recipient: dict[str, list] = defaultdict(list)
+    for event in events:
+        submission = submissions.get(event.object_id)
+        if submission is None:
+            continue
+        profile = getattr(submission.school, "profile", None)
+        to_email = getattr(profile, "notification_email", None)
+        if to_email:
+            by_recipient[to_email].append((event, submission))
+
+    singles = []
+    digest = outbox.digest_window(STATUS_CHANGED) > 0
+    for to_email, entries in by_recipient.items():
+        if digest and len(entries) > 1:
+            email = _digest_email(to_email, entries)
+            if email:
+                emails[entries[0][0].pk].append(email)
+        else:
+            singles.extend((to_email, event, submission) for event, submission in entries)
+
+    rendered: dict[tuple, tuple[str, dict]] = {}
+    for to_email, event, submission in sorted(singles, key=lambda entry: entry[1].pk):
+        to_status = event.payload.get("to_status", "")
+        remarks = event.payload.get("remarks", "")
+        group = (submission.form_template_id, submission.period_id, to_status, remarks)
+        if group not in rendered:
+            email = submission.status_change_email(to_status, remarks)
+            if email:
+                rendered[group] = (submission.email_path, email)
+                emails[event.pk].append(email)
+            continue
+        # Within a group the emails differ only in recipient and the link to the report.
+        path, first = rendered[group]
+        own_path = submission.email_path
+        emails[event.pk].append({
+            **first,
+            "to_email": to_email,
+            "body": first["body"].replace(path, own_path),
+            "html_body": first["html_body"].replace(path, own_path),
+        })
+    return emails
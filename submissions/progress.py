@@ -0,0 +1,403 @@
+"""Set-based completion tracking for SMEA Form 1 submissions.
+
+Every count needed to describe section completion is expressed as a
+correlated subquery, so annotating a queryset of submissions costs a single
+query no matter how many drafts are listed.  ``build_section_completion``
+turns those counts into the same per-section dictionaries the dashboards have
+always rendered.
+
+The result is also persisted on ``Submission`` (``completion_progress``,
+``completion_sections``) whenever a tab is saved, so listings can read and
+sort by progress without counting anything; :func:`completion_summaries`
+falls back to the bulk calculation for submissions without a snapshot.
+"""
+from __future__ import annotations
+
+from typing import Iterable, Mapping
+
+from django.db.models import Count, IntegerField, OuterRef, Q, Subquery
+from django.db.models.functions import Coalesce, Trim
+from django.utils import timezone
+
+from .models import (
+    Form1PctRow,
+    Form1ReadingCRLA,
+    Form1ReadingIntervention,
+    Form1ReadingPHILIRI,
+    Form1RMAIntervention,
+    Form1RMARow,
+    Form1SLPRow,
+    Form1SupervisionRow,
+    SMEAActivityRow,
+    SMEAProject,
+)
+
+
+SECTION_KEYS = ("projects", "pct", "slp", "reading", "rma", "supervision")
+SNAPSHOT_FIELDS = ["completion_progress", "completion_sections", "completion_updated_at"]
+
+
+def _count_subquery(queryset, link: str):
+    """Return ``COUNT(*)`` of ``queryset`` rows linked to the outer submission."""
+    counted = (
+        queryset.filter(**{link: OuterRef("pk")})
+        .order_by()
+        .values(link)
+        .annotate(total=Count("pk"))
+        .values("total")[:1]
+    )
+    return Coalesce(Subquery(counted, output_field=IntegerField()), 0)
+
+
+def _slp_completed_rows():
+    # Offered rows with proficiency data AND either an LLC or an intervention plan.
+    return (
+        Form1SLPRow.objects.alias(
+            llc_text=Trim("top_three_llc"),
+            plan_text=Trim("intervention_plan"),
+        )
+        .filter(is_offered=True)
+        .filter(Q(dnme__gt=0) | Q(fs__gt=0) | Q(s__gt=0) | Q(vs__gt=0) | Q(o__gt=0))
+        .exclude(Q(llc_text="") & Q(plan_text=""))
+    )
+
+
+def _supervision_filled_rows():
+    return Form1SupervisionRow.objects.alias(
+        support_text=Trim("intervention_support_provided"),
+        result_text=Trim("result"),
+    ).filter(
+        Q(teachers_supervised_observed_ta__gt=0)
+        | ~Q(support_text="")
+        | ~Q(result_text="")
+    )
+
+
+_SECTION_COUNT_ANNOTATIONS = {
+    "projects": lambda: {
+        "progress_project_count": _count_subquery(SMEAProject.objects.all(), "submission"),
+        "progress_activity_count": _count_subquery(SMEAActivityRow.objects.all(), "project__submission"),
+    },
+    "pct": lambda: {
+        "progress_pct_total": _count_subquery(Form1PctRow.objects.all(), "header__submission"),
+        "progress_pct_filled": _count_subquery(
+            Form1PctRow.objects.filter(Q(percent__isnull=False) | ~Q(action_points="")),
+            "header__submission",
+        ),
+    },
+    "slp": lambda: {
+        "progress_slp_offered": _count_subquery(Form1SLPRow.objects.filter(is_offered=True), "submission"),
+        "progress_slp_completed": _count_subquery(_slp_completed_rows(), "submission"),
+    },
+    "reading": lambda: {
+        "progress_crla_count": _count_subquery(Form1ReadingCRLA.objects.all(), "submission"),
+        "progress_philiri_count": _count_subquery(Form1ReadingPHILIRI.objects.all(), "submission"),
+        "progress_reading_interventions": _count_subquery(Form1ReadingIntervention.objects.all(), "submission"),
+    },
+    "rma": lambda: {
+        "progress_rma_rows": _count_subquery(Form1RMARow.objects.all(), "submission"),
+        "progress_rma_interventions": _count_subquery(Form1RMAIntervention.objects.all(), "submission"),
+    },
+    "supervision": lambda: {
+        "progress_supervision_rows": _count_subquery(Form1SupervisionRow.objects.all(), "submission"),
+        "progress_supervision_filled": _count_subquery(_supervision_filled_rows(), "submission"),
+    },
+}
+
+
+def completion_count_annotations(sections: Iterable[str] = SECTION_KEYS) -> dict[str, object]:
+    """Annotations consumed by :func:`build_section_completion`."""
+    annotations = {}
+    for key in sections:
+        annotations.update(_SECTION_COUNT_ANNOTATIONS[key]())
+    return annotations
+
+
+COMPLETION_COUNT_FIELDS = tuple(completion_count_annotations().keys())
+
+
+def counts_from_instance(submission) -> dict[str, int] | None:
+    """Return annotated completion counts from ``submission`` if present."""
+    if not all(hasattr(submission, name) for name in COMPLETION_COUNT_FIELDS):
+        return None
+    return {name: getattr(submission, name) or 0 for name in COMPLETION_COUNT_FIELDS}
+
+
+def _status_for(progress: int) -> str:
+    if progress == 100:
+        return "complete"
+    return "in-progress" if progress > 0 else "not-started"
+
+
+def _projects_completion(counts: Mapping[str, int]) -> dict:
+    project_count = counts["progress_project_count"]
+    activity_count = counts["progress_activity_count"]
+    projects_complete = project_count > 0 and activity_count > 0
+    return {
+        "complete": projects_complete,
+        "status": "complete" if projects_complete else "incomplete",
+        "detail": f"{project_count} project{'s' if project_count != 1 else ''}, {activity_count} activit{'ies' if activity_count != 1 else 'y'}",
+        "progress": 100 if projects_complete else 0,
+    }
+
+
+def _pct_completion(counts: Mapping[str, int]) -> dict:
+    pct_total = counts["progress_pct_total"]
+    if not pct_total:
+        return {
+            "complete": False,
+            "status": "not-started",
+            "detail": "Not started",
+            "progress": 0,
+        }
+    pct_filled = counts["progress_pct_filled"]
+    pct_progress = int(pct_filled / pct_total * 100)
+    return {
+        "complete": pct_progress == 100,
+        "status": _status_for(pct_progress),
+        "detail": f"{pct_filled} of {pct_total} areas completed",
+        "progress": pct_progress,
+    }
+
+
+def _slp_completion(counts: Mapping[str, int]) -> dict:
+    offered_count = counts["progress_slp_offered"]
+    if offered_count == 0:
+        return {
+            "complete": False,
+            "status": "not-started",
+            "detail": "No subjects marked as offered",
+            "progress": 0,
+        }
+    completed_rows = counts["progress_slp_completed"]
+    slp_progress = int(completed_rows / offered_count * 100)
+    return {
+        "complete": slp_progress == 100,
+        "status": _status_for(slp_progress),
+        "detail": f"{completed_rows} of {offered_count} offered subjects completed",
+        "progress": slp_progress,
+    }
+
+
+def _reading_completion(counts: Mapping[str, int]) -> dict:
+    crla_count = counts["progress_crla_count"]
+    philiri_count = counts["progress_philiri_count"]
+    reading_interventions = counts["progress_reading_interventions"]
+    has_reading_data = crla_count > 0 or philiri_count > 0
+    if has_reading_data and reading_interventions > 0:
+        return {
+            "complete": True,
+            "status": "complete",
+            "detail": f"CRLA: {crla_count}, PHILIRI: {philiri_count}, Interventions: {reading_interventions}",
+            "progress": 100,
+        }
+    if has_reading_data:
+        return {
+            "complete": False,
+            "status": "in-progress",
+            "detail": f"Assessment data entered, {reading_interventions}/5 interventions",
+            "progress": 60,
+        }
+    return {
+        "complete": False,
+        "status": "not-started",
+        "detail": "Not started",
+        "progress": 0,
+    }
+
+
+def _rma_completion(counts: Mapping[str, int]) -> dict:
+    rma_rows_count = counts["progress_rma_rows"]
+    rma_interventions = counts["progress_rma_interventions"]
+    if rma_rows_count > 0 and rma_interventions > 0:
+        return {
+            "complete": True,
+            "status": "complete",
+            "detail": f"{rma_rows_count} grade levels, {rma_interventions} interventions",
+            "progress": 100,
+        }
+    if rma_rows_count > 0:
+        return {
+            "complete": False,
+            "status": "in-progress",
+            "detail": f"{rma_rows_count} grade levels, {rma_interventions}/5 interventions",
+            "progress": 60,
+        }
+    return {
+        "complete": False,
+        "status": "not-started",
+        "detail": "Not started",
+        "progress": 0,
+    }
+
+
+def _supervision_completion(counts: Mapping[str, int]) -> dict:
+    supervision_rows_count = counts["progress_supervision_rows"]
+    has_supervision_data = counts["progress_supervision_filled"] > 0
+    if has_supervision_data:
+        supervision_status, supervision_progress = "complete", 100
+        supervision_detail = f"{supervision_rows_count} supervision records"
+    elif supervision_rows_count > 0:
+        supervision_status, supervision_progress = "in-progress", 50
+        supervision_detail = f"{supervision_rows_count} records (incomplete)"
+    else:
+        supervision_status, supervision_progress = "not-started", 0
+        supervision_detail = "Not started"
+    return {
+        "complete": has_supervision_data,
+        "status": supervision_status,
+        "detail": supervision_detail,
+        "progress": supervision_progress,
+    }
+
+
+_SECTION_BUILDERS = {
+    "projects": _projects_completion,
+    "pct": _pct_completion,
+    "slp": _slp_completion,
+    "reading": _reading_completion,
+    "rma": _rma_completion,
+    "supervision": _supervision_completion,
+}
+
+
+def build_section_completion(counts: Mapping[str, int], sections: Iterable[str] = SECTION_KEYS) -> dict:
+    """Translate completion counts into per-section status dictionaries."""
+    return {key: _SECTION_BUILDERS[key](counts) for key in sections}
+
+
+def overall_progress(sections: Mapping[str, Mapping]) -> int:
+    """Average progress across sections (0-100)."""
+    if not sections:
+        return 0
+    return int(sum(section["progress"] for section in sections.values()) / len(sections))
+
+
+def build_completion_summary(sections: Mapping[str, Mapping]) -> dict:
+    return {
+        "overall_progress": overall_progress(sections),
+        "completed_sections": sum(1 for s in sections.values() if s["complete"]),
+        "in_progress_sections": sum(1 for s in sections.values() if s["status"] == "in-progress"),
+        "not_started_sections": sum(1 for s in sections.values() if s["status"] == "not-started"),
+        "total_sections": len(sections),
+        "sections": dict(sections),
+    }
+
+
+def bulk_completion_summaries(submissions: Iterable) -> dict[int, dict]:
+    """Return ``{submission_id: completion summary}`` for many submissions.
+
+    Instances already annotated via ``Submission.objects.with_completion_counts()``
+    are used as-is; any others are resolved with one extra query in total.
+    """
+    submissions = list(submissions)
+    counts_by_id: dict[int, dict[str, int]] = {}
+    missing_ids = []
+    for submission in submissions:
+        counts = counts_from_instance(submission)
+        if counts is None:
+            missing_ids.append(submission.pk)
+        else:
+            counts_by_id[submission.pk] = counts
+    if missing_ids:
+        from .models import Submission
+
+        rows = (
+            Submission.objects.filter(pk__in=missing_ids)
+            .order_by()
+            .with_completion_counts()
+            .values("pk", *COMPLETION_COUNT_FIELDS)
+        )
+        for row in rows:
+            pk = row.pop("pk")
+            counts_by_id[pk] = row
+    return {
+        pk: build_completion_summary(build_section_completion(counts))
+        for pk, counts in counts_by_id.items()
+    }
+
+
+def snapshot_summary(submission) -> dict | None:
+    """Return the persisted completion summary, or ``None`` if incomplete."""
+    stored = submission.completion_sections or {}
+    if submission.completion_updated_at is None or any(key not in stored for key in SECTION_KEYS):
+        return None
+    return build_completion_summary({key: stored[key] for key in SECTION_KEYS})
+
+
+def completion_summaries(submissions: Iterable) -> dict[int, dict]:
+    """Completion summaries keyed by id, preferring persisted snapshots."""
+    summaries: dict[int, dict] = {}
+    pending = []
+    for submission in submissions:
+        summary = snapshot_summary(submission)
+        if summary is None:
+            pending.append(submission)
+        else:
+            summaries[submission.pk] = summary
+    if pending:
+        summaries.update(bulk_completion_summaries(pending))
+    return summaries
+
+
+def refresh_completion_snapshot(submission, sections: Iterable[str] = SECTION_KEYS, *, save: bool = True) -> dict:
+    """Recount ``sections`` for ``submission`` and merge them into its snapshot.
+
+    Sections missing from the stored snapshot are recounted as well, so the
+    first refresh always produces a complete picture.  With ``save=False`` the
+    caller is responsible for persisting the ``completion_*`` fields.
+    """
+    from .models import Submission
+
+    requested = set(sections)
+    stored = dict(submission.completion_sections or {})
+    recount = [key for key in SECTION_KEYS if key in requested or key not in stored]
+    if recount:
+        annotations = completion_count_annotations(recount)
+        counts = (
+            Submission.objects.filter(pk=submission.pk)
+            .order_by()
+            .annotate(**annotations)
+            .values(*annotations)
+            .get()
+        )
+        stored.update(build_section_completion(counts, recount))
+
+    submission.completion_sections = {key: stored[key] for key in SECTION_KEYS}
+    submission.completion_progress = overall_progress(submission.completion_sections)
+    submission.completion_updated_at = timezone.now()
+    if save:
+        Submission.objects.filter(pk=submission.pk).update(
+            completion_sections=submission.completion_sections,
+            completion_progress=submission.completion_progress,
+            completion_updated_at=submission.completion_updated_at,
+        )
+    return build_completion_summary(submission.completion_sections)
+
+
+def fill_missing_snapshots(queryset, *, batch_size: int = 500) -> int:
+    """Store a completion snapshot on every submission in ``queryset`` lacking one.
+
+    Returns the number of submissions updated.  Callers that sort or filter
+    on ``completion_progress`` run this first, so drafts that predate the
+    snapshot (or were never saved since) are not ranked as 0%.
+    """
+    from .models import Submission
+
+    now = timezone.now()
+    batch: list = []
+    updated = 0
+    pending = queryset.filter(completion_updated_at__isnull=True).select_related(None).order_by("id")
+    for submission in pending.with_completion_counts().only("id").iterator(chunk_size=batch_size):
+        submission.completion_sections = build_section_completion(counts_from_instance(submission))
+        submission.completion_progress = overall_progress(submission.completion_sections)
+        submission.completion_updated_at = now
+        batch.append(submission)
+        if len(batch) >= batch_size:
+            Submission.objects.bulk_update(batch, SNAPSHOT_FIELDS)
+            updated += len(batch)
+            batch.clear()
+    if batch:
+        Submission.objects.bulk_update(batch, SNAPSHOT_FIELDS)
+        updated += len(batch)
+    return updated
@@ -0,0 +1,35 @@
+"""Search documents for form templates (see common.search).
+
+The review queue matches its search box against school documents
+(``organizations.search``) and these ``form_template`` documents, which hold
+each template's title.
+"""
+from __future__ import annotations
+
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from common import search
+
+from .models import FormTemplate
+
+FORM_DOCUMENTS = "form_template"
+
+
+def form_documents():
+    for pk, title in FormTemplate.objects.order_by("pk").values_list("pk", "title"):
+        yield pk, title
+
+
+search.register(FORM_DOCUMENTS, form_documents)
+
+
+@receiver(post_save, sender=FormTemplate, dispatch_uid="submissions.search.index_form")
+def index_form(sender, instance, raw=False, **kwargs):
+    if not raw:
+        search.index_document(FORM_DOCUMENTS, instance.pk, instance.title)
+
+
+@receiver(post_delete, sender=FormTemplate, dispatch_uid="submissions.search.unindex_form")
+def unindex_form(sender, instance, **kwargs):
+    search.remove_document(FORM_DOCUMENTS, instance.pk)
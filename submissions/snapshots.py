@@ -0,0 +1,306 @@
+"""Read model for the reviewer pages and exports of submitted reports.
+
+:func:`collect_review_data` gathers what ``review_detail`` and
+``review_submission_tabs`` show, ordered and limited to the school's grade
+span and SHS strands.  When a school submits, :func:`write_snapshot` freezes
+that data together with every tab's export tables into one
+:class:`~submissions.models.SubmissionSnapshot` row; returning or reopening
+the report deletes it.  While a report is SUBMITTED or NOTED,
+:func:`review_data` and :func:`export_for_tab` rebuild model instances from
+the snapshot instead of re-joining the Form 1 tables.
+
+Rows are stored as ``{"fields": [attname, ...], "rows": [[value, ...]]}``.
+Bump :data:`SNAPSHOT_VERSION` whenever the payload shape or a snapshotted
+model's columns change; stale snapshots are rebuilt on first read.
+"""
+from __future__ import annotations
+
+import logging
+from collections import defaultdict
+
+from django.db import DEFAULT_DB_ALIAS
+
+from common.db import coordinated_write
+from organizations.models import SchoolProfile
+
+from . import constants as smea_constants
+from .bundle import RMA_GRADE_NUMBERS, SubmissionBundle
+from .exports import EXPORT_TABS, SubmissionExport, build_export_for_tab
+from .models import (
+    Form1ADMHeader,
+    Form1ADMRow,
+    Form1PctHeader,
+    Form1PctRow,
+    Form1ReadingCRLA,
+    Form1ReadingIntervention,
+    Form1ReadingPHILIRI,
+    Form1RMAIntervention,
+    Form1RMARow,
+    Form1Signatories,
+    Form1SLPLLCEntry,
+    Form1SLPRow,
+    Form1SLPTopDNME,
+    Form1SLPTopOutstanding,
+    Form1SupervisionRow,
+    ReadingAssessmentCRLA,
+    ReadingAssessmentPHILIRI,
+    ReadingInterventionNew,
+    SMEAActivityRow,
+    SMEAProject,
+    Submission,
+    SubmissionSnapshot,
+)
+
+logger = logging.getLogger(__name__)
+
+SNAPSHOT_VERSION = 1
+SNAPSHOT_STATUSES = frozenset({Submission.Status.SUBMITTED, Submission.Status.NOTED})
+
+# Review data key -> model of the rows stored under it.
+SNAPSHOT_ROWS = {
+    "projects": SMEAProject,
+    "project_activities": SMEAActivityRow,
+    "pct_header": Form1PctHeader,
+    "pct_rows": Form1PctRow,
+    "slp_rows": Form1SLPRow,
+    "slp_llc_entries": Form1SLPLLCEntry,
+    "slp_top_dnme": Form1SLPTopDNME,
+    "slp_top_outstanding": Form1SLPTopOutstanding,
+    "legacy_crla_entries": Form1ReadingCRLA,
+    "legacy_philiri_entries": Form1ReadingPHILIRI,
+    "legacy_reading_interventions": Form1ReadingIntervention,
+    "matrix_crla_entries": ReadingAssessmentCRLA,
+    "matrix_philiri_entries": ReadingAssessmentPHILIRI,
+    "matrix_reading_interventions": ReadingInterventionNew,
+    "rma_rows": Form1RMARow,
+    "rma_interventions": Form1RMAIntervention,
+    "supervision_rows": Form1SupervisionRow,
+    "adm_rows": Form1ADMRow,
+    "adm_header": Form1ADMHeader,
+    "signatories": Form1Signatories,
+    "school_profile": SchoolProfile,
+}
+SINGLE_ROWS = frozenset({"pct_header", "adm_header", "signatories", "school_profile"})
+SNAPSHOT_VALUES = ("school_profile_strands", "grade_span_label")
+
+
+def clean_strand_labels(raw) -> list[str]:
+    """Return SHS strand labels from stored codes/labels, skipping serialized noise."""
+    if not raw:
+        return []
+    valid_codes = {c for (c, _l, _p) in smea_constants.SHS_STRANDS}
+    label_for_code = {c: l for (c, l, _p) in smea_constants.SHS_STRANDS}
+    cleaned_codes = []
+    for item in raw:
+        if not item:
+            continue
+        s = str(item).strip()
+        if any(ch in s for ch in ['\\\\\\\\', '[', ']', '""', "']"]):
+            continue
+        lower = s.lower()
+        if lower in valid_codes:
+            cleaned_codes.append(lower)
+        else:
+            for code, label in label_for_code.items():
+                if lower == label.lower():
+                    cleaned_codes.append(code)
+                    break
+    return [label_for_code[code] for code in dict.fromkeys(cleaned_codes)]
+
+
+def _strand_prefixes(profile) -> set[str]:
+    raw_strands = set(getattr(profile, "strands", []) or [])
+    code_to_prefix = {c: p for (c, _l, p) in smea_constants.SHS_STRANDS}
+    label_to_code = {l: c for (c, l, _p) in smea_constants.SHS_STRANDS}
+    selected_codes = set()
+    for item in raw_strands:
+        if item in code_to_prefix:
+            selected_codes.add(item)
+        elif item in label_to_code:
+            selected_codes.add(label_to_code[item])
+    return {code_to_prefix[c] for c in selected_codes if c in code_to_prefix}
+
+
+def contextual_slp_rows(rows, allowed_grades, profile) -> list:
+    """Offered SLP rows within the grade span; SHS specializations limited to declared strands."""
+    try:
+        allowed_prefixes = _strand_prefixes(profile)
+    except Exception:
+        allowed_prefixes = set()
+    all_spec_prefixes = tuple(p for (_c, _l, p) in smea_constants.SHS_STRANDS)
+    filtered = []
+    for row in rows:
+        if hasattr(row, "is_offered") and not row.is_offered:
+            continue
+        gnum = smea_constants.GRADE_LABEL_TO_NUMBER.get(row.grade_label)
+        if allowed_grades is not None and gnum is not None and gnum not in allowed_grades:
+            continue
+        subject = (row.subject or "").strip()
+        is_specialized = any(subject.startswith(p) for p in all_spec_prefixes)
+        if gnum in (11, 12) and is_specialized and allowed_prefixes:
+            if not any((row.subject or "").startswith(p) for p in allowed_prefixes):
+                continue
+        filtered.append(row)
+    return filtered
+
+
+def contextual_rma_rows(rows, allowed_grades) -> list:
+    """RMA rows within the grade span, ordered lowest to highest grade."""
+    def _include(row):
+        num = RMA_GRADE_NUMBERS.get(row.grade_label)
+        if num is None:
+            return False
+        return allowed_grades is None or num in allowed_grades
+
+    return sorted((row for row in rows if _include(row)), key=lambda row: RMA_GRADE_NUMBERS.get(row.grade_label, 999))
+
+
+def collect_review_data(submission: Submission, bundle: SubmissionBundle | None = None) -> dict:
+    """Live review data for ``submission``, read through a :class:`SubmissionBundle`."""
+    from .views import grade_numbers_for_school
+
+    bundle = bundle or SubmissionBundle(submission)
+    school = submission.school
+    school_profile = getattr(school, "profile", None)
+    try:
+        allowed_grades = set(grade_numbers_for_school(school))
+    except Exception:
+        allowed_grades = None
+    return {
+        "projects": bundle.projects,
+        "pct_header": bundle.pct_header,
+        "pct_rows": bundle.pct_rows,
+        "slp_rows": contextual_slp_rows(bundle.slp_rows, allowed_grades, school_profile),
+        "slp_llc_entries": bundle.slp_llc_entries,
+        "slp_top_dnme": bundle.slp_top_dnme,
+        "slp_top_outstanding": bundle.slp_top_outstanding,
+        "legacy_crla_entries": bundle.legacy_crla,
+        "legacy_philiri_entries": bundle.legacy_philiri,
+        "legacy_reading_interventions": bundle.legacy_reading_interventions,
+        "matrix_crla_entries": bundle.crla_assessments,
+        "matrix_philiri_entries": bundle.philiri_assessments,
+        "matrix_reading_interventions": bundle.reading_interventions,
+        "rma_rows": contextual_rma_rows(bundle.rma_rows, allowed_grades),
+        "rma_interventions": bundle.rma_interventions,
+        "supervision_rows": bundle.supervision_rows,
+        "adm_rows": bundle.adm_rows,
+        "adm_header": bundle.adm_header,
+        "signatories": bundle.signatories,
+        "school_profile": school_profile,
+        "school_profile_strands": ", ".join(clean_strand_labels(getattr(school_profile, "strands", None))),
+        "grade_span_label": school.grade_span_label if school else "",
+    }
+
+
+def _dump_rows(model, rows) -> dict:
+    fields = [field.attname for field in model._meta.concrete_fields]
+    return {"fields": fields, "rows": [[getattr(row, name) for name in fields] for row in rows]}
+
+
+def _load_rows(model, dumped: dict) -> list:
+    by_attname = {field.attname: field for field in model._meta.concrete_fields}
+    names = dumped["fields"]
+    return [
+        model.from_db(
+            DEFAULT_DB_ALIAS,
+            names,
+            [by_attname[name].to_python(value) for name, value in zip(names, values)],
+        )
+        for values in dumped["rows"]
+    ]
+
+
+def _attach_prefetched(instance, accessor: str, rows: list) -> None:
+    """Make ``instance.<accessor>.all()`` return ``rows`` without a query."""
+    queryset = getattr(instance, accessor).all()
+    queryset._result_cache = list(rows)
+    queryset._prefetch_done = True
+    instance._prefetched_objects_cache = {**getattr(instance, "_prefetched_objects_cache", {}), accessor: queryset}
+
+
+def build_snapshot_payload(submission: Submission) -> dict:
+    bundle = SubmissionBundle(submission)
+    data = collect_review_data(submission, bundle)
+    data["project_activities"] = [activity for project in data["projects"] for activity in project.activities.all()]
+    rows = {}
+    for name, model in SNAPSHOT_ROWS.items():
+        value = data[name]
+        if name in SINGLE_ROWS:
+            value = [value] if value is not None else []
+        rows[name] = _dump_rows(model, value)
+    return {
+        "version": SNAPSHOT_VERSION,
+        "rows": rows,
+        "values": {name: data[name] for name in SNAPSHOT_VALUES},
+        "exports": {tab: build_export_for_tab(submission, tab, bundle=bundle).as_dict() for tab in EXPORT_TABS},
+    }
+
+
+def load_snapshot(snapshot: SubmissionSnapshot) -> dict:
+    """Review data rebuilt from ``snapshot`` as unsaved-looking model instances."""
+    payload = snapshot.payload
+    data = {name: _load_rows(model, payload["rows"][name]) for name, model in SNAPSHOT_ROWS.items()}
+    for name in SINGLE_ROWS:
+        data[name] = data[name][0] if data[name] else None
+    activities_by_project = defaultdict(list)
+    for activity in data.pop("project_activities"):
+        activities_by_project[activity.project_id].append(activity)
+    for project in data["projects"]:
+        _attach_prefetched(project, "activities", activities_by_project[project.pk])
+    if data["pct_header"] is not None:
+        _attach_prefetched(data["pct_header"], "rows", data["pct_rows"])
+    data.update(payload["values"])
+    return data
+
+
+@coordinated_write
+def _store_snapshot(submission: Submission, payload: dict) -> SubmissionSnapshot:
+    SubmissionSnapshot.objects.filter(submission=submission).delete()
+    return SubmissionSnapshot.objects.create(submission=submission, version=SNAPSHOT_VERSION, payload=payload)
+
+
+def write_snapshot(submission: Submission) -> SubmissionSnapshot | None:
+    """Freeze the current Form 1 data of ``submission``; never blocks the transition."""
+    try:
+        payload = build_snapshot_payload(submission)
+    except Exception:
+        logger.exception("[SNAPSHOT] Could not build the review snapshot for submission %s", submission.pk)
+        return None
+    return _store_snapshot(submission, payload)
+
+
+def discard_snapshot(submission: Submission) -> None:
+    SubmissionSnapshot.objects.filter(submission=submission).delete()
+    related = Submission.snapshot.related
+    if related.is_cached(submission):
+        related.delete_cached_value(submission)
+
+
+def current_snapshot(submission: Submission) -> SubmissionSnapshot | None:
+    """Snapshot of a SUBMITTED/NOTED report, written on first read if missing or stale."""
+    if submission.status not in SNAPSHOT_STATUSES:
+        return None
+    try:
+        snapshot = submission.snapshot
+    except SubmissionSnapshot.DoesNotExist:
+        snapshot = None
+    if snapshot is None or snapshot.version != SNAPSHOT_VERSION:
+        snapshot = write_snapshot(submission)
+    return snapshot
+
+
+def review_data(submission: Submission) -> dict:
+    snapshot = current_snapshot(submission)
+    if snapshot is not None:
+        return load_snapshot(snapshot)
+    return collect_review_data(submission)
+
+
+def export_for_tab(submission: Submission, tab: str) -> SubmissionExport:
+    snapshot = current_snapshot(submission)
+    if snapshot is None:
+        return build_export_for_tab(submission, tab)
+    try:
+        return SubmissionExport.from_dict(snapshot.payload["exports"][tab])
+    except KeyError as exc:
+        raise ValueError(f"Unsupported export tab: {tab}") from exc
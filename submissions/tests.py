@@ -1,12 +1,22 @@
 from __future__ import annotations
 
 import io
+import json
+import shutil
+import tempfile
 import unittest
+from pathlib import Path
+from unittest import mock
 
 from django.contrib.auth import get_user_model
+from django.core import mail
+from django.core.management import call_command
 from django.core.exceptions import ValidationError
+from django.core.cache import cache
 from django.core.files.uploadedfile import SimpleUploadedFile
-from django.test import TestCase
+from django.db import connection
+from django.test import TestCase, TransactionTestCase, override_settings
+from django.test.utils import CaptureQueriesContext
 from django.urls import reverse
 from django.utils import timezone
 try:
@@ -17,11 +27,18 @@ except ImportError:
 OPENPYXL_AVAILABLE = load_workbook is not None
 
 from accounts.models import UserProfile
+from common import generations
+from notifications.models import EmailNotification, NotificationEvent
+from notifications import outbox
+from notifications.outbox import process_pending_events
+from notifications.worker import NotificationWorker
 from organizations.models import District, School, SchoolProfile, Section
 from submissions import constants as smea_constants
+from submissions import drafts as submission_drafts
 from submissions.models import (
     Form1ADMRow,
     Form1PctHeader,
+    Form1PctRow,
     Form1RMARow,
     Form1RMAIntervention,
     Form1ReadingCRLA,
@@ -33,15 +50,29 @@ from submissions.models import (
     Form1SLPTopOutstanding,
     FormTemplate,
     Period,
+    ReadingInterventionNew,
     Submission,
     SubmissionAttachment,
+    SubmissionDraftBuffer,
+    SubmissionSnapshot,
+    SubmissionStatusCounter,
     SubmissionTimeline,
     SMEAActivityRow,
     SMEAProject,
 )
-from submissions.views import slp_grade_labels_for_school
+from submissions.views import ensure_slp_rows, materialize_submission_skeleton, slp_grade_labels_for_school
 from submissions.forms import Form1SLPRowForm
-from submissions.exports import build_slp_export
+from submissions.autosave import AUTOSAVE_TARGETS, row_version
+from submissions.bulk_review import ACTION_NOTE, bulk_review
+from submissions.bundle import SubmissionBundle
+from submissions.counters import status_counts
+from submissions.export_cache import export_path
+from submissions.exports import EXPORT_TABS, build_export_for_tab, build_slp_export, render_export_to_csv
+from submissions.fragments import fragment_key
+from submissions.notifications import STATUS_CHANGED
+from submissions.forms import Form1RMARowFormSet
+from submissions.formset_saving import FormsetSaveStats, save_formset_diff
+from submissions.progress import bulk_completion_summaries, completion_summaries
 
 
 class SubmissionWorkflowTests(TestCase):
@@ -721,3 +752,1184 @@ class Form1ModelValidationTests(TestCase):
 
 
 
+
+
+class SubmissionCompletionTests(TestCase):
+    def setUp(self):
+        self.section = Section.objects.create(code="smme", name="School Management")
+        self.district = District.objects.create(code="north", name="North District")
+        self.school = School.objects.create(code="completion-school", name="Completion School", district=self.district)
+        self.form = FormTemplate.objects.create(
+            section=self.section,
+            code="smea-form-1",
+            title="SMEA Form 1",
+            period_type=FormTemplate.PeriodType.QUARTER,
+            open_at=timezone.now().date(),
+            close_at=timezone.now().date(),
+        )
+        self.periods = [
+            Period.objects.create(
+                label=f"Q{index}",
+                school_year_start=2025,
+                quarter_tag=f"Q{index}",
+                display_order=index,
+            )
+            for index in range(1, 5)
+        ]
+
+    def _create_submission(self, period):
+        submission = Submission.objects.create(school=self.school, form_template=self.form, period=period)
+        project = SMEAProject.objects.create(submission=submission, project_title="Project", area_of_concern="Reading")
+        SMEAActivityRow.objects.create(project=project, activity="Baseline study")
+        header = Form1PctHeader.objects.create(submission=submission)
+        Form1PctRow.objects.create(header=header, area=smea_constants.SMEAActionArea.CHOICES[0][0], percent=50, action_points="Plan")
+        Form1SLPRow.objects.create(
+            submission=submission,
+            grade_label="Grade 3",
+            enrolment=10,
+            s=10,
+            top_three_llc="Reading",
+        )
+        Form1SLPRow.objects.create(submission=submission, grade_label="Grade 4", enrolment=10, s=10)
+        return submission
+
+    def test_summary_counts_match_related_rows(self):
+        submission = self._create_submission(self.periods[0])
+
+        summary = submission.get_completion_summary()
+
+        self.assertEqual(summary["sections"]["projects"]["progress"], 100)
+        self.assertEqual(summary["sections"]["pct"]["detail"], "1 of 1 areas completed")
+        self.assertEqual(summary["sections"]["slp"]["progress"], 50)
+        self.assertEqual(summary["sections"]["reading"]["status"], "not-started")
+        self.assertEqual(summary["total_sections"], 6)
+        self.assertEqual(summary["overall_progress"], 41)
+
+    def test_bulk_summaries_use_single_query(self):
+        submissions = [self._create_submission(period) for period in self.periods]
+        expected = {submission.id: submission.get_completion_summary() for submission in submissions}
+
+        with self.assertNumQueries(1):
+            annotated = list(Submission.objects.filter(school=self.school).with_completion_counts())
+            summaries = bulk_completion_summaries(annotated)
+
+        self.assertEqual(summaries, expected)
+
+    def test_refresh_completion_persists_snapshot(self):
+        submission = self._create_submission(self.periods[0])
+
+        summary = submission.refresh_completion()
+
+        submission.refresh_from_db()
+        self.assertEqual(submission.completion_progress, summary["overall_progress"])
+        self.assertEqual(submission.completion_sections["slp"]["progress"], 50)
+
+        Form1SLPRow.objects.filter(submission=submission).update(top_three_llc="Reading")
+        submission.refresh_completion(["slp"])
+        submission.refresh_from_db()
+        self.assertEqual(submission.completion_sections["slp"]["progress"], 100)
+        self.assertEqual(submission.completion_progress, submission.get_overall_progress())
+
+    def test_completion_summaries_read_snapshots_without_queries(self):
+        for period in self.periods:
+            self._create_submission(period)
+        call_command("backfill_completion_snapshots", stdout=io.StringIO())
+        submissions = list(Submission.objects.filter(school=self.school))
+
+        with self.assertNumQueries(0):
+            summaries = completion_summaries(submissions)
+
+        for submission in submissions:
+            self.assertEqual(summaries[submission.id], submission.get_completion_summary())
+
+
+class SubmissionSkeletonTests(TestCase):
+    def setUp(self):
+        User = get_user_model()
+        self.section = Section.objects.create(code="smme", name="School Management")
+        self.district = District.objects.create(code="north", name="North District")
+        self.school = School.objects.create(code="skeleton-school", name="Skeleton School", district=self.district)
+        SchoolProfile.objects.create(school=self.school, grade_span_start=1, grade_span_end=3)
+        self.period = Period.objects.create(label="Q2", school_year_start=2025, quarter_tag="Q2", display_order=2)
+        self.form = FormTemplate.objects.create(
+            section=self.section,
+            code="smea-form-1",
+            title="SMEA Form 1",
+            period_type=FormTemplate.PeriodType.QUARTER,
+            open_at=timezone.now().date(),
+            close_at=timezone.now().date(),
+        )
+        self.school_head = User.objects.create_user(
+            username="skeletonhead", email="skeleton@example.com", password="password"
+        )
+        profile = UserProfile.objects.get(user=self.school_head)
+        profile.school = self.school
+        profile.save(update_fields=["school", "updated_at"])
+        self.submission = Submission.objects.create(school=self.school, form_template=self.form, period=self.period)
+
+    def _reload(self):
+        return Submission.objects.select_related("school", "school__profile", "form_template", "period").get(
+            pk=self.submission.pk
+        )
+
+    def test_materialize_creates_rows_once_per_signature(self):
+        submission = self._reload()
+        self.assertTrue(materialize_submission_skeleton(submission))
+
+        self.assertEqual(Form1PctHeader.objects.get(submission=submission).rows.count(), 4)
+        self.assertEqual(
+            set(Form1RMARow.objects.filter(submission=submission).values_list("grade_label", flat=True)),
+            {"g1", "g2", "g3"},
+        )
+        self.assertEqual(Form1ReadingIntervention.objects.filter(submission=submission).count(), 5)
+        slp_count = Form1SLPRow.objects.filter(submission=submission).count()
+        self.assertGreater(slp_count, 0)
+
+        self.assertEqual(submission.completion_progress, submission.get_overall_progress())
+        self.assertEqual(self._reload().completion_sections, submission.completion_sections)
+
+        submission = self._reload()
+        with self.assertNumQueries(0):
+            self.assertFalse(materialize_submission_skeleton(submission))
+
+        self.school.profile.grade_span_end = 4
+        self.school.profile.save()
+        submission = self._reload()
+        self.assertTrue(materialize_submission_skeleton(submission))
+        self.assertIn("g4", Form1RMARow.objects.filter(submission=submission).values_list("grade_label", flat=True))
+        self.assertGreater(Form1SLPRow.objects.filter(submission=submission).count(), slp_count)
+
+    def test_edit_view_skips_materialization_on_repeat_visits(self):
+        self.client.force_login(self.school_head)
+        url = reverse("edit_submission", args=[self.submission.pk])
+
+        self.assertEqual(self.client.get(url).status_code, 200)
+        signature = Submission.objects.get(pk=self.submission.pk).skeleton_signature
+        self.assertTrue(signature)
+
+        # Rows removed behind the view's back stay removed while the signature matches.
+        Form1RMARow.objects.filter(submission=self.submission).delete()
+        self.assertEqual(self.client.get(url).status_code, 200)
+        self.assertFalse(Form1RMARow.objects.filter(submission=self.submission).exists())
+
+    def _rma_formset_data(self, **overrides):
+        queryset = Form1RMARow.objects.filter(submission=self.submission).order_by("id")
+        formset = Form1RMARowFormSet(queryset=queryset, prefix="rma_rows")
+        data = {
+            "rma_rows-TOTAL_FORMS": str(len(formset.forms)),
+            "rma_rows-INITIAL_FORMS": str(len(formset.forms)),
+        }
+        for form in formset.forms:
+            data[f"{form.prefix}-id"] = str(form.instance.pk)
+            for name in form.fields:
+                if name != "id":
+                    data[f"{form.prefix}-{name}"] = form.initial.get(name)
+        data.update(overrides)
+        return Form1RMARowFormSet(data=data, queryset=queryset, prefix="rma_rows")
+
+    def test_save_formset_diff_writes_only_changed_rows(self):
+        materialize_submission_skeleton(self._reload())
+
+        stats = FormsetSaveStats()
+        formset = self._rma_formset_data()
+        self.assertTrue(formset.is_valid())
+        self.assertEqual(save_formset_diff(formset, stats), [])
+        self.assertEqual((stats.updated, stats.statements, stats.unchanged), (0, 0, 3))
+
+        stats = FormsetSaveStats()
+        formset = self._rma_formset_data(**{"rma_rows-1-enrolment": "12", "rma_rows-1-at_grade_level": "12"})
+        self.assertTrue(formset.is_valid())
+        saved = save_formset_diff(formset, stats)
+
+        self.assertEqual(len(saved), 1)
+        self.assertEqual((stats.updated, stats.statements, stats.unchanged), (1, 1, 2))
+        self.assertEqual(formset.changed_objects[0][1], ["enrolment", "at_grade_level"])
+        saved[0].refresh_from_db()
+        self.assertEqual((saved[0].enrolment, saved[0].at_grade_level), (12, 12))
+
+    def test_ensure_slp_rows_reconciles_in_bulk_and_keeps_filled_rows(self):
+        pairs = [("Grade 1", "mtb"), ("Grade 1", "math"), ("Grade 2", "math")]
+        with self.assertNumQueries(2):
+            ensure_slp_rows(self.submission, pairs)
+        self.assertEqual(Form1SLPRow.objects.filter(submission=self.submission).count(), 3)
+
+        Form1SLPRow.objects.filter(submission=self.submission, grade_label="Grade 1", subject="mtb").update(
+            top_three_llc="Phonics"
+        )
+        analysed = Form1SLPRow.objects.get(submission=self.submission, grade_label="Grade 1", subject="math")
+        Form1SLPAnalysis.objects.create(slp_row=analysed, overall_strategy="Peer tutoring")
+
+        ensure_slp_rows(self.submission, [("Grade 3", "math")])
+
+        remaining = set(
+            Form1SLPRow.objects.filter(submission=self.submission).values_list("grade_label", "subject")
+        )
+        self.assertEqual(remaining, {("Grade 1", "mtb"), ("Grade 1", "math"), ("Grade 3", "math")})
+
+
+class EditSubmissionTabTests(TestCase):
+    def setUp(self):
+        User = get_user_model()
+        section = Section.objects.create(code="smme", name="School Management")
+        district = District.objects.create(code="north", name="North District")
+        self.school = School.objects.create(code="tabs-school", name="Tabs School", district=district)
+        SchoolProfile.objects.create(school=self.school, grade_span_start=1, grade_span_end=6, head_name="Head")
+        period = Period.objects.create(label="Q2", school_year_start=2025, quarter_tag="Q2", display_order=2)
+        form = FormTemplate.objects.create(
+            section=section,
+            code="smea-form-1",
+            title="SMEA Form 1",
+            period_type=FormTemplate.PeriodType.QUARTER,
+            open_at=timezone.now().date(),
+            close_at=timezone.now().date(),
+        )
+        self.school_head = User.objects.create_user(username="tabshead", email="tabs@example.com", password="password")
+        profile = UserProfile.objects.get(user=self.school_head)
+        profile.school = self.school
+        profile.save(update_fields=["school", "updated_at"])
+        self.submission = Submission.objects.create(school=self.school, form_template=form, period=period)
+        self.client.force_login(self.school_head)
+
+    def test_only_active_tab_forms_are_built(self):
+        url = reverse("edit_submission", args=[self.submission.pk])
+        for tab in ["projects", "pct", "slp", "reading", "rma", "supervision", "adm"]:
+            response = self.client.get(url, {"tab": tab})
+            self.assertEqual(response.status_code, 200, tab)
+            self.assertEqual(response.context["current_tab_template"], f"submissions/_edit_tab_{tab}.html")
+
+        response = self.client.get(url, {"tab": "pct"})
+        self.assertIn("pct_formset", response.context)
+        self.assertNotIn("slp_formset", response.context)
+        self.assertNotIn("rma_row_formset", response.context)
+
+    def test_locked_submission_disables_active_tab_forms(self):
+        Submission.objects.filter(pk=self.submission.pk).update(status=Submission.Status.SUBMITTED)
+        url = reverse("edit_submission", args=[self.submission.pk])
+        for tab in ["projects", "supervision", "adm"]:
+            self.assertEqual(self.client.get(url, {"tab": tab}).status_code, 200, tab)
+        response = self.client.get(url, {"tab": "rma"})
+        self.assertTrue(all(field.disabled for form in response.context["rma_row_formset"] for field in form.fields.values()))
+
+    def test_pct_post_saves_active_tab(self):
+        url = reverse("edit_submission", args=[self.submission.pk])
+        formset = self.client.get(url, {"tab": "pct"}).context["pct_formset"]
+        data = {
+            "tab": "pct",
+            "next_tab": "pct",
+            "action": "save_draft",
+            "pct-TOTAL_FORMS": str(formset.total_form_count()),
+            "pct-INITIAL_FORMS": str(formset.initial_form_count()),
+            "pct-MIN_NUM_FORMS": "0",
+            "pct-MAX_NUM_FORMS": "1000",
+        }
+        for index, form in enumerate(formset.forms):
+            data[f"pct-{index}-id"] = str(form.instance.pk)
+            data[f"pct-{index}-area"] = form.instance.area
+            data[f"pct-{index}-percent"] = "80"
+            data[f"pct-{index}-action_points"] = "Sustain"
+
+        response = self.client.post(url, data)
+
+        self.assertEqual(response.status_code, 302)
+        self.assertEqual(
+            set(Form1PctRow.objects.filter(header__submission=self.submission).values_list("percent", flat=True)),
+            {80},
+        )
+
+    def test_post_holds_the_write_slot_only_while_saving(self):
+        from common import db as common_db
+        from submissions import views as submission_views
+
+        url = reverse("edit_submission", args=[self.submission.pk])
+        formset = self.client.get(url, {"tab": "pct"}).context["pct_formset"]
+        data = {
+            "tab": "pct",
+            "next_tab": "pct",
+            "action": "save_draft",
+            "pct-TOTAL_FORMS": str(formset.total_form_count()),
+            "pct-INITIAL_FORMS": str(formset.initial_form_count()),
+            "pct-MIN_NUM_FORMS": "0",
+            "pct-MAX_NUM_FORMS": "1000",
+        }
+        for index, form in enumerate(formset.forms):
+            data[f"pct-{index}-id"] = str(form.instance.pk)
+            data[f"pct-{index}-area"] = form.instance.area
+            data[f"pct-{index}-percent"] = "not a number"
+
+        slots_held = []
+        build_context = submission_views._edit_submission_context
+
+        def recording_context(*args, **kwargs):
+            slots_held.append(set(getattr(common_db._local, "held", set())))
+            return build_context(*args, **kwargs)
+
+        with mock.patch.object(submission_views, "_edit_submission_context", side_effect=recording_context):
+            response = self.client.post(url, data)
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(slots_held, [set()])
+
+    def _version(self, row):
+        model_key = {Form1SLPRow: "slp_row", Form1RMARow: "rma_row"}[type(row)]
+        return row_version(row, AUTOSAVE_TARGETS[model_key].fields)
+
+    def test_editor_renders_row_versions_and_autosave_requires_them(self):
+        response = self.client.get(reverse("edit_submission", args=[self.submission.pk]), {"tab": "rma"})
+        row = Form1RMARow.objects.filter(submission=self.submission).first()
+        self.assertContains(response, f'data-version="{self._version(row)}"')
+
+        response = self._patch([{"model": "rma_row", "id": row.pk, "field": "enrolment", "value": 25}])
+        self.assertEqual(response.status_code, 400)
+        row.refresh_from_db()
+        self.assertEqual(row.enrolment, 0)
+
+    def _patch(self, changes):
+        return self.client.patch(
+            reverse("autosave_submission", args=[self.submission.pk]),
+            data=json.dumps({"changes": changes}),
+            content_type="application/json",
+        )
+
+    def test_autosave_applies_changed_cells_and_returns_versions(self):
+        self.client.get(reverse("edit_submission", args=[self.submission.pk]))
+        row = Form1SLPRow.objects.filter(submission=self.submission).first()
+        rma_row = Form1RMARow.objects.filter(submission=self.submission).first()
+
+        response = self._patch([
+            {"model": "slp_row", "id": row.pk, "field": "enrolment", "value": "20", "version": self._version(row)},
+            {"model": "slp_row", "id": row.pk, "field": "s", "value": 12, "version": self._version(row)},
+            {"model": "rma_row", "id": rma_row.pk, "field": "enrolment", "value": "",
+             "version": self._version(rma_row)},
+        ])
+
+        self.assertEqual(response.status_code, 200)
+        payload = response.json()
+        row.refresh_from_db()
+        self.assertEqual((row.enrolment, row.s), (20, 12))
+        version = payload["versions"][f"slp_row:{row.pk}"]
+
+        # A stale version is reported as a conflict and nothing is written.
+        stale = self._patch([{"model": "slp_row", "id": row.pk, "field": "s", "value": 5, "version": "stale"}])
+        self.assertEqual(stale.status_code, 409)
+        self.assertEqual(stale.json()["conflicts"][f"slp_row:{row.pk}"], version)
+        row.refresh_from_db()
+        self.assertEqual(row.s, 12)
+
+    def test_autosave_rejects_unlisted_fields_and_invalid_rows(self):
+        self.client.get(reverse("edit_submission", args=[self.submission.pk]))
+        row = Form1SLPRow.objects.filter(submission=self.submission).first()
+
+        response = self._patch([{"model": "slp_row", "id": row.pk, "field": "grade_label", "value": "Grade 9"}])
+        self.assertEqual(response.status_code, 400)
+
+        response = self._patch([
+            {"model": "slp_row", "id": row.pk, "field": "dnme", "value": 50, "version": self._version(row)},
+        ])
+        self.assertEqual(response.status_code, 422)
+        self.assertIn(f"slp_row:{row.pk}", response.json()["errors"])
+        row.refresh_from_db()
+        self.assertEqual(row.dnme, 0)
+
+    def test_buffered_autosave_defers_writes_until_flush(self):
+        self.client.get(reverse("edit_submission", args=[self.submission.pk]))
+        row = Form1SLPRow.objects.filter(submission=self.submission).first()
+        url = reverse("autosave_submission", args=[self.submission.pk])
+        body = json.dumps({"buffer": True, "changes": [
+            {"model": "slp_row", "id": row.pk, "field": "enrolment", "value": 30, "version": self._version(row)},
+        ]})
+
+        response = self.client.patch(url, data=body, content_type="application/json")
+        self.assertEqual(response.json()["tabs"], ["slp"])
+        buffer = SubmissionDraftBuffer.objects.get(submission=self.submission, tab="slp")
+        row.refresh_from_db()
+        self.assertEqual(row.enrolment, 0)
+
+        # Resending the same state is detected by hash and not written again.
+        response = self.client.patch(url, data=body, content_type="application/json")
+        self.assertEqual(response.json()["unchanged"], ["slp"])
+        self.assertEqual(SubmissionDraftBuffer.objects.get(pk=buffer.pk).updated_at, buffer.updated_at)
+
+        # Loading the editor applies the buffer to the SLP rows.
+        self.client.get(reverse("edit_submission", args=[self.submission.pk]) + "?tab=slp")
+        row.refresh_from_db()
+        self.assertEqual(row.enrolment, 30)
+        self.assertFalse(SubmissionDraftBuffer.objects.filter(submission=self.submission).exists())
+
+    def test_flush_draft_buffers_command_applies_idle_buffers(self):
+        self.client.get(reverse("edit_submission", args=[self.submission.pk]))
+        row = Form1RMARow.objects.filter(submission=self.submission).first()
+        self.client.patch(
+            reverse("autosave_submission", args=[self.submission.pk]),
+            data=json.dumps({"buffer": True, "changes": [
+                {"model": "rma_row", "id": row.pk, "field": "enrolment", "value": 25, "version": self._version(row)},
+            ]}),
+            content_type="application/json",
+        )
+
+        call_command("flush_draft_buffers", stdout=io.StringIO())
+        self.assertTrue(SubmissionDraftBuffer.objects.filter(submission=self.submission).exists())
+
+        call_command("flush_draft_buffers", "--idle-seconds", "0", stdout=io.StringIO())
+        row.refresh_from_db()
+        self.assertEqual(row.enrolment, 25)
+        self.assertFalse(SubmissionDraftBuffer.objects.filter(submission=self.submission).exists())
+
+    def test_flush_keeps_cells_it_could_not_apply(self):
+        self.client.get(reverse("edit_submission", args=[self.submission.pk]))
+        stale_row, fresh_row = Form1RMARow.objects.filter(submission=self.submission)[:2]
+        self.client.patch(
+            reverse("autosave_submission", args=[self.submission.pk]),
+            data=json.dumps({"buffer": True, "changes": [
+                {"model": "rma_row", "id": stale_row.pk, "field": "enrolment", "value": 40, "version": "stale"},
+                {"model": "rma_row", "id": fresh_row.pk, "field": "enrolment", "value": 25,
+                 "version": self._version(fresh_row)},
+            ]}),
+            content_type="application/json",
+        )
+
+        call_command("flush_draft_buffers", "--idle-seconds", "0", stdout=io.StringIO())
+        fresh_row.refresh_from_db()
+        stale_row.refresh_from_db()
+        self.assertEqual((fresh_row.enrolment, stale_row.enrolment), (25, 0))
+        buffer = SubmissionDraftBuffer.objects.get(submission=self.submission, tab="rma")
+        self.assertEqual(list(buffer.payload), [f"rma_row:{stale_row.pk}:enrolment"])
+        self.assertEqual(buffer.failures[f"rma_row:{stale_row.pk}"]["state"], "conflict")
+
+        # The idle flush leaves it for the editor, which lists it on load.
+        call_command("flush_draft_buffers", "--idle-seconds", "0", stdout=io.StringIO())
+        response = self.client.get(reverse("edit_submission", args=[self.submission.pk]), {"tab": "rma"})
+        self.assertEqual(
+            [(cell["id"], cell["value"], cell["state"]) for cell in response.context["unsaved_cells"]],
+            [(stale_row.pk, 40, "conflict")],
+        )
+        self.assertContains(response, "Some autosaved edits could not be saved.")
+
+    def test_idle_flush_keeps_edits_of_a_report_submitted_meanwhile(self):
+        self.client.get(reverse("edit_submission", args=[self.submission.pk]))
+        row = Form1RMARow.objects.filter(submission=self.submission).first()
+        self.client.patch(
+            reverse("autosave_submission", args=[self.submission.pk]),
+            data=json.dumps({"buffer": True, "changes": [
+                {"model": "rma_row", "id": row.pk, "field": "enrolment", "value": 25, "version": self._version(row)},
+            ]}),
+            content_type="application/json",
+        )
+        Submission.objects.filter(pk=self.submission.pk).update(status=Submission.Status.SUBMITTED)
+
+        call_command("flush_draft_buffers", "--idle-seconds", "0", stdout=io.StringIO())
+        buffer = SubmissionDraftBuffer.objects.get(submission=self.submission)
+        self.assertEqual(buffer.payload[f"rma_row:{row.pk}:enrolment"]["value"], 25)
+        self.assertEqual(buffer.failures[f"rma_row:{row.pk}"]["state"], "locked")
+
+    def test_subject_save_keeps_buffered_cells_of_other_rows(self):
+        self.client.get(reverse("edit_submission", args=[self.submission.pk]))
+        first, second = Form1SLPRow.objects.filter(submission=self.submission).order_by("id")[:2]
+        self.client.patch(
+            reverse("autosave_submission", args=[self.submission.pk]),
+            data=json.dumps({"buffer": True, "changes": [
+                {"model": "slp_row", "id": second.pk, "field": "enrolment", "value": 30,
+                 "version": self._version(second)},
+            ]}),
+            content_type="application/json",
+        )
+
+        response = self.client.post(reverse("edit_submission", args=[self.submission.pk]), {
+            "tab": "slp",
+            "action": "save_subject",
+            "current_subject_id": first.pk,
+            "current_subject_prefix": "slp_rows-0",
+            "current_subject_index": 0,
+            "slp_rows-0-enrolment": 12,
+            "slp_rows-0-s": 12,
+        })
+
+        self.assertEqual(response.status_code, 302)
+        first.refresh_from_db()
+        second.refresh_from_db()
+        self.assertEqual((first.enrolment, second.enrolment), (12, 30))
+        self.assertFalse(SubmissionDraftBuffer.objects.filter(submission=self.submission).exists())
+
+    def test_discard_rows_drops_only_the_given_rows(self):
+        self.client.get(reverse("edit_submission", args=[self.submission.pk]))
+        row = Form1SLPRow.objects.filter(submission=self.submission).first()
+        buffer = SubmissionDraftBuffer.objects.create(
+            submission=self.submission,
+            tab="slp",
+            payload={
+                f"slp_row:{row.pk}:enrolment": {"value": 40, "version": "stale"},
+                "rma_row:999999:enrolment": {"value": 5, "version": "stale"},
+            },
+            failures={
+                f"slp_row:{row.pk}": {"state": "conflict", "detail": "x"},
+                "rma_row:999999": {"state": "conflict", "detail": "x"},
+            },
+        )
+
+        submission_drafts.discard_rows(self.submission, {f"slp_row:{row.pk}"})
+
+        buffer.refresh_from_db()
+        self.assertEqual(list(buffer.payload), ["rma_row:999999:enrolment"])
+        self.assertEqual(list(buffer.failures), ["rma_row:999999"])
+
+
+def use_temp_export_cache(test) -> Path:
+    """Point EXPORT_CACHE_DIR at a throwaway directory for the duration of ``test``."""
+    cache_dir = tempfile.mkdtemp()
+    test.addCleanup(shutil.rmtree, cache_dir, ignore_errors=True)
+    settings_override = override_settings(EXPORT_CACHE_DIR=cache_dir)
+    settings_override.enable()
+    test.addCleanup(settings_override.disable)
+    return Path(cache_dir)
+
+
+class SubmissionSnapshotTests(TestCase):
+    def setUp(self):
+        use_temp_export_cache(self)
+        User = get_user_model()
+        section = Section.objects.create(code="smme", name="School Management")
+        district = District.objects.create(code="north", name="North District")
+        school = School.objects.create(code="snap-school", name="Snapshot School", district=district)
+        SchoolProfile.objects.create(school=school, grade_span_start=1, grade_span_end=6, head_name="Head")
+        period = Period.objects.create(label="Q2", school_year_start=2025, quarter_tag="Q2", display_order=2)
+        form = FormTemplate.objects.create(
+            section=section,
+            code="smea-form-1",
+            title="SMEA Form 1",
+            period_type=FormTemplate.PeriodType.QUARTER,
+            open_at=timezone.now().date(),
+            close_at=timezone.now().date(),
+        )
+        self.school_head = User.objects.create_user(username="snaphead", email="snap@example.com", password="password")
+        self.reviewer = User.objects.create_user(username="snapadmin", email="admin@example.com", password="password")
+        reviewer_profile = UserProfile.objects.get(user=self.reviewer)
+        reviewer_profile.section_admin_codes = [section.code]
+        reviewer_profile.save(update_fields=["section_admin_codes", "updated_at"])
+        self.submission = Submission.objects.create(school=school, form_template=form, period=period)
+        materialize_submission_skeleton(self.submission)
+        project = SMEAProject.objects.create(submission=self.submission, project_title="Reading Recovery")
+        SMEAActivityRow.objects.create(project=project, activity="Baseline assessment")
+        Form1SLPRow.objects.filter(submission=self.submission, grade_label="Grade 3").update(enrolment=30, dnme=4)
+
+    def test_submit_freezes_review_and_export_read_model(self):
+        live_export = render_export_to_csv(build_export_for_tab(self.submission, "slp"))
+        self.submission.mark_submitted(self.school_head)
+        snapshot = SubmissionSnapshot.objects.get(submission=self.submission)
+        self.assertEqual(snapshot.payload["version"], snapshot.version)
+
+        # Later writes to the Form 1 tables do not leak into the frozen review data.
+        Form1SLPRow.objects.filter(submission=self.submission).update(dnme=9)
+        self.client.force_login(self.reviewer)
+        response = self.client.get(reverse("review_submission_tabs", args=[self.submission.pk]), {"tab": "slp"})
+        self.assertEqual(response.status_code, 200)
+        grade3 = [row for row in response.context["slp_rows"] if row.grade_label == "Grade 3"]
+        self.assertTrue(grade3)
+        self.assertTrue(all(row.dnme == 4 for row in grade3))
+        self.assertEqual(
+            [activity.activity for project in response.context["projects"] for activity in project.activities.all()],
+            ["Baseline assessment"],
+        )
+        export = self.client.get(reverse("review_submission_export", args=[self.submission.pk, "csv"]), {"tab": "slp"})
+        self.assertEqual(b"".join(export.streaming_content), live_export)
+
+        self.submission.mark_returned(self.reviewer, "Please recheck")
+        self.assertFalse(SubmissionSnapshot.objects.filter(submission=self.submission).exists())
+
+    def test_stale_or_missing_snapshot_is_rebuilt_on_read(self):
+        self.submission.mark_submitted(self.school_head)
+        SubmissionSnapshot.objects.filter(submission=self.submission).update(version=0)
+        self.client.force_login(self.reviewer)
+        response = self.client.get(reverse("review_detail", args=[self.submission.pk]))
+        self.assertEqual(response.status_code, 200)
+        self.assertNotEqual(SubmissionSnapshot.objects.get(submission=self.submission).version, 0)
+
+
+class Form1ReviewFixture:
+    def setUp(self):
+        User = get_user_model()
+        section = Section.objects.create(code="smme", name="School Management")
+        district = District.objects.create(code="north", name="North District")
+        school = School.objects.create(code="bundle-school", name="Bundle School", district=district)
+        SchoolProfile.objects.create(school=school, grade_span_start=1, grade_span_end=10, head_name="Head")
+        period = Period.objects.create(label="Q2", school_year_start=2025, quarter_tag="Q2", display_order=2)
+        form = FormTemplate.objects.create(
+            section=section,
+            code="smea-form-1",
+            title="SMEA Form 1",
+            period_type=FormTemplate.PeriodType.QUARTER,
+            open_at=timezone.now().date(),
+            close_at=timezone.now().date(),
+        )
+        self.school_head = User.objects.create_user(username="bundlehead", email="bundle@example.com", password="password")
+        head_profile = UserProfile.objects.get(user=self.school_head)
+        head_profile.school = school
+        head_profile.save(update_fields=["school", "updated_at"])
+        self.reviewer = User.objects.create_user(username="bundleadmin", email="admin@example.com", password="password")
+        reviewer_profile = UserProfile.objects.get(user=self.reviewer)
+        reviewer_profile.section_admin_codes = [section.code]
+        reviewer_profile.save(update_fields=["section_admin_codes", "updated_at"])
+        self.submission = Submission.objects.create(school=school, form_template=form, period=period)
+        materialize_submission_skeleton(self.submission)
+        self.added = 0
+
+    def _add_rows(self, count):
+        for _ in range(count):
+            self.added += 1
+            project = SMEAProject.objects.create(submission=self.submission, project_title=f"Project {self.added}")
+            SMEAActivityRow.objects.bulk_create(
+                [SMEAActivityRow(project=project, activity=f"Activity {index}") for index in range(3)]
+            )
+            ReadingInterventionNew.objects.create(submission=self.submission, order=100 + self.added, description="Tutoring")
+            Form1RMAIntervention.objects.create(submission=self.submission, order=100 + self.added, description="Drills")
+            Form1ADMRow.objects.create(submission=self.submission, ppas_conducted=f"PPA {self.added}")
+
+    def _query_counts(self):
+        def count(action):
+            with CaptureQueriesContext(connection) as queries:
+                action()
+            return len(queries)
+
+        edit_url = reverse("edit_submission", args=[self.submission.pk])
+        tabs_url = reverse("review_submission_tabs", args=[self.submission.pk])
+        counts = {}
+        self.client.force_login(self.school_head)
+        counts["edit projects"] = count(lambda: self.client.get(edit_url, {"tab": "projects"}))
+        self.client.force_login(self.reviewer)
+        counts["review detail"] = count(lambda: self.client.get(reverse("review_detail", args=[self.submission.pk])))
+        counts["review tabs"] = count(lambda: self.client.get(tabs_url, {"tab": "projects"}))
+        submission = Submission.objects.select_related("school__profile", "school__district", "period").get(
+            pk=self.submission.pk
+        )
+        counts["exports"] = count(lambda: [build_export_for_tab(submission, tab) for tab in EXPORT_TABS])
+        return counts
+
+
+class SubmissionBundleTests(Form1ReviewFixture, TestCase):
+    def test_query_counts_do_not_grow_with_rows(self):
+        self._add_rows(1)
+        baseline = self._query_counts()
+        self._add_rows(4)
+        self.assertEqual(self._query_counts(), baseline)
+
+    def test_collections_are_ordered(self):
+        self._add_rows(2)
+        bundle = SubmissionBundle(self.submission)
+        with self.assertNumQueries(2):
+            activities = [len(project.activities.all()) for project in bundle.projects]
+        self.assertEqual(activities, [3, 3])
+        self.assertEqual([row.grade_label for row in bundle.rma_rows][:3], ["g1", "g2", "g3"])
+        self.assertEqual(bundle.rma_rows[-1].grade_label, "g10")
+
+
+class ReviewFragmentCacheTests(Form1ReviewFixture, TestCase):
+    def setUp(self):
+        super().setUp()
+        cache.clear()
+        self._add_rows(2)
+        self.submission.mark_submitted(self.school_head)
+        self.client.force_login(self.reviewer)
+        self.detail_url = reverse("review_detail", args=[self.submission.pk])
+        self.tabs_url = reverse("review_submission_tabs", args=[self.submission.pk])
+
+    def _get(self, url, params=None):
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get(url, params or {})
+        self.assertEqual(response.status_code, 200)
+        return response, len(queries)
+
+    def test_noted_fragments_are_served_from_cache(self):
+        self.submission.mark_noted(self.reviewer, "Looks good")
+        for url, params in ((self.detail_url, None), (self.tabs_url, {"tab": "projects"})):
+            first, first_queries = self._get(url, params)
+            second, second_queries = self._get(url, params)
+            self.assertContains(second, "Project 2")
+            self.assertLess(second_queries, first_queries)
+
+        # Any later save moves updated_at, so the fragments are rendered again.
+        self.submission.save()
+        _, queries = self._get(self.tabs_url, {"tab": "projects"})
+        self.assertEqual(queries, first_queries)
+
+    def test_submitted_pages_are_not_cached_and_transition_discards_fragments(self):
+        _, first_queries = self._get(self.detail_url)
+        _, second_queries = self._get(self.detail_url)
+        self.assertEqual(first_queries, second_queries)
+
+        self.submission.mark_noted(self.reviewer, "Looks good")
+        self._get(self.detail_url)
+        key = fragment_key(self.submission, "detail")
+        self.assertIsNotNone(cache.get(key))
+        self.submission.mark_draft(self.school_head)
+        self.assertIsNone(cache.get(key))
+
+
+class ExportCacheTests(Form1ReviewFixture, TestCase):
+    def setUp(self):
+        super().setUp()
+        self.cache_dir = use_temp_export_cache(self)
+        self._add_rows(1)
+        self.client.force_login(self.reviewer)
+        self.csv_url = reverse("review_submission_export", args=[self.submission.pk, "csv"])
+
+    def _download(self, **headers):
+        response = self.client.get(self.csv_url, {"tab": "slp"}, **headers)
+        body = b"".join(response.streaming_content) if response.streaming else response.content
+        return response, body
+
+    def test_submitted_export_is_written_once_and_served_with_ranges(self):
+        self.submission.mark_submitted(self.school_head)
+        first, body = self._download()
+        self.assertEqual(first.status_code, 200)
+        self.assertEqual(first["Accept-Ranges"], "bytes")
+        path = export_path(self.submission, "slp", "csv")
+        self.assertEqual(path.read_bytes(), body)
+
+        with CaptureQueriesContext(connection) as queries:
+            again, again_body = self._download()
+        self.assertEqual(again_body, body)
+        self.assertFalse(any("submissions_submissionsnapshot" in query["sql"] for query in queries.captured_queries))
+
+        partial, chunk = self._download(HTTP_RANGE="bytes=2-9")
+        self.assertEqual(partial.status_code, 206)
+        self.assertEqual(chunk, body[2:10])
+        self.assertEqual(partial["Content-Range"], f"bytes 2-9/{len(body)}")
+        tail, chunk = self._download(HTTP_RANGE="bytes=-5")
+        self.assertEqual(chunk, body[-5:])
+        stale_validator, chunk = self._download(HTTP_RANGE="bytes=2-9", HTTP_IF_RANGE='"other"')
+        self.assertEqual((stale_validator.status_code, chunk), (200, body))
+        unsatisfiable, _ = self._download(HTTP_RANGE=f"bytes={len(body)}-")
+        self.assertEqual(unsatisfiable.status_code, 416)
+
+    def test_drafts_are_not_cached_and_purge_removes_stale_files(self):
+        response, _ = self._download()
+        self.assertEqual(response.status_code, 200)
+        self.assertFalse(any(self.cache_dir.iterdir()))
+
+        self.submission.mark_submitted(self.school_head)
+        self._download()
+        stale = export_path(self.submission, "slp", "csv")
+        self.submission.mark_noted(self.reviewer, "Looks good")
+        self._download()
+        current = export_path(self.submission, "slp", "csv")
+        self.assertNotEqual(stale, current)
+
+        call_command("purge_export_cache", "--dry-run", stdout=io.StringIO())
+        self.assertTrue(stale.exists())
+        call_command("purge_export_cache", stdout=io.StringIO())
+        self.assertFalse(stale.exists())
+        self.assertTrue(current.exists())
+
+        self.submission.mark_draft(self.school_head)
+        call_command("purge_export_cache", stdout=io.StringIO())
+        self.assertFalse(current.parent.exists())
+
+
+class BulkReviewTests(TestCase):
+    def setUp(self):
+        User = get_user_model()
+        self.section = Section.objects.create(code="smme", name="School Management")
+        other_section = Section.objects.create(code="hrd", name="Human Resource")
+        self.district = District.objects.create(code="north", name="North District")
+        self.period = Period.objects.create(label="Q1", school_year_start=2025, quarter_tag="Q1", display_order=1)
+        self.form = FormTemplate.objects.create(
+            section=self.section,
+            code="smea-form-1",
+            title="SMEA Form 1",
+            period_type=FormTemplate.PeriodType.QUARTER,
+            open_at=timezone.now().date(),
+            close_at=timezone.now().date(),
+        )
+        self.other_form = FormTemplate.objects.create(
+            section=other_section,
+            code="hrd-form",
+            title="HRD Form",
+            period_type=FormTemplate.PeriodType.QUARTER,
+            open_at=timezone.now().date(),
+            close_at=timezone.now().date(),
+        )
+        self.reviewer = User.objects.create_user(username="bulkadmin", email="bulk@example.com", password="password")
+        profile = UserProfile.objects.get(user=self.reviewer)
+        profile.section_admin_codes = [self.section.code]
+        profile.save(update_fields=["section_admin_codes", "updated_at"])
+        self.url = reverse("review_queue_bulk", args=[self.section.code])
+
+    def _submitted(self, count, form=None, email=True):
+        created = []
+        for _ in range(count):
+            index = School.objects.count() + 1
+            school = School.objects.create(code=f"bulk-{index}", name=f"Bulk School {index}", district=self.district)
+            SchoolProfile.objects.create(
+                school=school, head_name="Head", notification_email=f"head{index}@example.com" if email else ""
+            )
+            created.append(
+                Submission.objects.create(
+                    school=school,
+                    form_template=form or self.form,
+                    period=self.period,
+                    status=Submission.Status.SUBMITTED,
+                    submitted_at=timezone.now(),
+                )
+            )
+        return created
+
+    def _post(self, submissions, **data):
+        payload = {"action": "note", "remarks": "", "submission_ids": [s.pk for s in submissions], **data}
+        return self.client.post(self.url, payload)
+
+    def test_bulk_note_batches_writes(self):
+        self.client.force_login(self.reviewer)
+        few = self._submitted(2)
+        with CaptureQueriesContext(connection) as few_queries:
+            response = self._post(few, remarks="Complete")
+        self.assertRedirects(response, f"{reverse('review_queue', args=[self.section.code])}?tab=pending", fetch_redirect_response=False)
+        many = self._submitted(12)
+        with CaptureQueriesContext(connection) as many_queries:
+            self._post(many, remarks="Complete")
+        self.assertEqual(len(many_queries), len(few_queries))
+        self.assertEqual(NotificationEvent.objects.filter(kind=STATUS_CHANGED).count(), 14)
+        self.assertFalse(EmailNotification.objects.exists())
+        self.assertEqual(process_pending_events(limit=None)["emails"], 14)
+
+        for submission in Submission.objects.filter(pk__in=[s.pk for s in few + many]):
+            self.assertEqual(submission.status, Submission.Status.NOTED)
+            self.assertEqual(submission.noted_by, self.reviewer)
+            self.assertEqual(submission.noted_remarks, "Complete")
+        self.assertEqual(
+            SubmissionTimeline.objects.filter(to_status=Submission.Status.NOTED, remarks="Complete").count(), 14
+        )
+        self.assertEqual(EmailNotification.objects.filter(subject__startswith="Noted:").count(), 14)
+        last = many[-1]
+        email = EmailNotification.objects.get(to_email=last.school.profile.notification_email)
+        self.assertIn(last.email_path, email.html_body)
+        self.assertNotIn(many[0].email_path, email.html_body)
+
+    def test_bulk_return_requires_remarks_and_skips_other_submissions(self):
+        self.client.force_login(self.reviewer)
+        pending = self._submitted(2)
+        already_noted = self._submitted(1)[0]
+        already_noted.mark_noted(self.reviewer)
+        other_section = self._submitted(1, form=self.other_form)[0]
+        SubmissionSnapshot.objects.create(submission=pending[0], version=1, payload={})
+
+        self._post(pending, action="return")
+        self.assertEqual(Submission.objects.filter(status=Submission.Status.RETURNED).count(), 0)
+
+        self._post(pending + [already_noted, other_section], action="return", remarks="Fix SLP")
+        statuses = dict(Submission.objects.values_list("pk", "status"))
+        self.assertEqual({statuses[s.pk] for s in pending}, {Submission.Status.RETURNED})
+        self.assertEqual(statuses[already_noted.pk], Submission.Status.NOTED)
+        self.assertEqual(statuses[other_section.pk], Submission.Status.SUBMITTED)
+        self.assertFalse(SubmissionSnapshot.objects.filter(submission=pending[0]).exists())
+
+    def test_transition_records_outbox_event_instead_of_rendering_email(self):
+        submission = self._submitted(1)[0]
+        with CaptureQueriesContext(connection) as queries:
+            submission.mark_returned(self.reviewer, "Fix SLP")
+        self.assertFalse(any("notifications_emailnotification" in query["sql"] for query in queries.captured_queries))
+        event = NotificationEvent.objects.get(object_id=submission.pk)
+        self.assertEqual(event.payload, {"from_status": "submitted", "to_status": "returned", "remarks": "Fix SLP"})
+
+        self.assertEqual(process_pending_events()["processed"], 1)
+        email = EmailNotification.objects.get()
+        self.assertTrue(email.subject.startswith("Returned:"))
+        self.assertIn("Fix SLP", email.body)
+        event.refresh_from_db()
+        self.assertEqual(event.status, NotificationEvent.Status.PROCESSED)
+
+    @override_settings(NOTIFICATION_RATE_LIMITS={})
+    def test_notification_worker_delivers_transitions(self):
+        submission = self._submitted(1)[0]
+        submission.mark_returned(self.reviewer, "Fix SLP")
+
+        totals = NotificationWorker(threads=1, idle_seconds=0).run(max_batches=1)
+
+        self.assertEqual(totals, {"batches": 1, "events": 1, "leased": 1, "sent": 1})
+        self.assertEqual(NotificationEvent.objects.get().status, NotificationEvent.Status.PROCESSED)
+        self.assertEqual(len(mail.outbox), 1)
+        self.assertEqual(mail.outbox[0].to, [submission.school.profile.notification_email])
+        self.assertTrue(mail.outbox[0].subject.startswith("Returned:"))
+
+    @override_settings(NOTIFICATION_DIGEST_WINDOWS={STATUS_CHANGED: 600})
+    def test_digest_mode_coalesces_a_schools_transitions(self):
+        first = self._submitted(1)[0]
+        other_school = self._submitted(1)[0]
+        school_reports = [first]
+        for order in range(2, 5):
+            period = Period.objects.create(
+                label=f"Q{order}", school_year_start=2025, quarter_tag=f"Q{order}", display_order=order
+            )
+            school_reports.append(Submission.objects.create(
+                school=first.school, form_template=self.form, period=period,
+                status=Submission.Status.SUBMITTED, submitted_at=timezone.now(),
+            ))
+        bulk_review(Submission.objects.filter(pk__in=[s.pk for s in school_reports[:3]]), ACTION_NOTE, self.reviewer, "Complete")
+        school_reports[3].mark_returned(self.reviewer, "Fix SLP")
+        other_school.mark_noted(self.reviewer, "")
+
+        # Still inside the window: nothing is rendered yet.
+        self.assertEqual(process_pending_events()["processed"], 0)
+
+        NotificationEvent.objects.update(created_at=timezone.now() - timezone.timedelta(minutes=11))
+        # The limit cuts into the first school's group, which is still taken whole.
+        stats = process_pending_events(limit=2)
+        self.assertEqual((stats["processed"], stats["emails"]), (4, 1))
+        self.assertEqual(process_pending_events(limit=2)["processed"], 1)
+        digest = EmailNotification.objects.get(to_email=first.school.profile.notification_email)
+        self.assertEqual(digest.subject, f"4 report updates — {first.school.name}")
+        self.assertEqual(digest.html_body.count("View Submission"), 4)
+        self.assertIn("Fix SLP", digest.body)
+        single = EmailNotification.objects.get(to_email=other_school.school.profile.notification_email)
+        self.assertTrue(single.subject.startswith("Noted:"))
+
+    @override_settings(
+        NOTIFICATION_DIGEST_WINDOWS={STATUS_CHANGED: 600}, NOTIFICATIONS_SEND_IMMEDIATELY=True, NOTIFICATION_RATE_LIMITS={}
+    )
+    def test_held_digest_is_released_once_its_window_ends(self):
+        first, second = self._submitted(2)
+        second.school = first.school
+        second.period = Period.objects.create(label="Q3", school_year_start=2025, quarter_tag="Q3", display_order=3)
+        second.save(update_fields=["school", "period"])
+        first.mark_noted(self.reviewer, "")
+        second.mark_returned(self.reviewer, "Fix SLP")
+
+        release_state = mock.patch.multiple(outbox, _release_timer=None, _release_at=None)
+        release_state.start()
+        self.addCleanup(release_state.stop)
+        with mock.patch("notifications.outbox.threading.Timer") as timer:
+            self.assertEqual(process_pending_events()["processed"], 0)
+        (delay, target), _ = timer.call_args
+        self.assertAlmostEqual(delay, 601, delta=5)
+        self.assertIs(target, outbox._drain_in_background)
+
+        # No new events arrive; once the window has passed the next drain queues the digest.
+        later = timezone.now() + timezone.timedelta(seconds=delay)
+        with mock.patch("django.utils.timezone.now", return_value=later):
+            totals = NotificationWorker(threads=1, idle_seconds=0).run(max_batches=1)
+        self.assertEqual((totals["events"], totals["sent"]), (2, 1))
+        self.assertEqual(mail.outbox[0].subject, f"2 report updates — {first.school.name}")
+
+    def test_queue_posts_bulk_form_only_for_section_admins_on_pending_tab(self):
+        self._submitted(1)
+        self.client.force_login(self.reviewer)
+        queue_url = reverse("review_queue", args=[self.section.code])
+        self.assertContains(self.client.get(queue_url), self.url)
+        self.assertNotContains(self.client.get(queue_url, {"tab": "noted"}), self.url)
+
+
+class StatusCounterTests(TestCase):
+    def setUp(self):
+        User = get_user_model()
+        self.section = Section.objects.create(code="smme", name="School Management")
+        self.north = District.objects.create(code="north", name="North District")
+        self.south = District.objects.create(code="south", name="South District")
+        self.period = Period.objects.create(label="Q1", school_year_start=2025, quarter_tag="Q1", display_order=1)
+        self.form = FormTemplate.objects.create(
+            section=self.section,
+            code="smea-form-1",
+            title="SMEA Form 1",
+            period_type=FormTemplate.PeriodType.QUARTER,
+            open_at=timezone.now().date(),
+            close_at=timezone.now().date(),
+        )
+        self.reviewer = User.objects.create_user(username="counteradmin", password="password")
+        profile = UserProfile.objects.get(user=self.reviewer)
+        profile.section_admin_codes = [self.section.code]
+        profile.save(update_fields=["section_admin_codes", "updated_at"])
+        self.psds = User.objects.create_user(username="counterpsds", password="password")
+        UserProfile.objects.get(user=self.psds).districts.add(self.north)
+        self.queue_url = reverse("review_queue", args=[self.section.code])
+
+    def _submission(self, district, status=Submission.Status.SUBMITTED, name=None):
+        index = School.objects.count() + 1
+        school = School.objects.create(code=f"count-{index}", name=name or f"Counter School {index}", district=district)
+        now = timezone.now()
+        return Submission.objects.create(
+            school=school,
+            form_template=self.form,
+            period=self.period,
+            status=status,
+            submitted_at=now,
+            noted_at=now if status == Submission.Status.NOTED else None,
+        )
+
+    def _counts(self, **filters):
+        return status_counts(SubmissionStatusCounter.objects.filter(section=self.section, **filters))
+
+    def test_counters_follow_creates_transitions_bulk_reviews_and_deletes(self):
+        first, second, third = (self._submission(self.north) for _ in range(3))
+        other = self._submission(self.south)
+        self.assertEqual(self._counts(), {"submitted": 4})
+        self.assertEqual(self._counts(district=self.north), {"submitted": 3})
+
+        first.mark_returned(self.reviewer, "Fix enrolment")
+        bulk_review(Submission.objects.filter(pk__in=[second.pk, third.pk]), ACTION_NOTE, self.reviewer)
+        first.mark_draft(self.reviewer)
+        other.delete()
+
+        expected = {"submitted": 0, "returned": 0, "noted": 2, "draft": 1}
+        self.assertEqual(self._counts(), expected)
+        call_command("rebuild_status_counters", stdout=io.StringIO())
+        self.assertEqual(self._counts(), {"noted": 2, "draft": 1})
+
+    def test_queue_counts_come_from_counters_and_listing_is_paginated(self):
+        for _ in range(5):
+            self._submission(self.north)
+        self._submission(self.south, status=Submission.Status.NOTED)
+        self.client.force_login(self.reviewer)
+
+        with mock.patch("submissions.views.REVIEW_QUEUE_PAGE_SIZE", 2):
+            with CaptureQueriesContext(connection) as few_queries:
+                response = self.client.get(self.queue_url)
+            self.assertEqual(response.context["tab_counts"], {"pending": 5, "returned": 0, "noted": 1})
+            stats = response.context["quick_stats"]
+            self.assertEqual((stats["submitted_today"], stats["noted_this_week"]), (5, 1))
+            self.assertEqual(len(response.context["submissions"]), 2)
+            self.assertEqual(response.context["page_obj"].paginator.num_pages, 3)
+            self.assertContains(response, "Page 1 of 3")
+
+            last_page = self.client.get(self.queue_url, {"page": 3})
+            self.assertEqual(len(last_page.context["submissions"]), 1)
+
+            for _ in range(10):
+                self._submission(self.north)
+            with CaptureQueriesContext(connection) as many_queries:
+                response = self.client.get(self.queue_url)
+        self.assertEqual(response.context["tab_counts"]["pending"], 15)
+        self.assertEqual(len(many_queries), len(few_queries))
+
+    def test_deleting_a_form_takes_its_submissions_out_of_the_counters(self):
+        other_form = FormTemplate.objects.create(
+            section=self.section,
+            code="smea-form-2",
+            title="SMEA Form 2",
+            period_type=FormTemplate.PeriodType.QUARTER,
+            open_at=timezone.now().date(),
+            close_at=timezone.now().date(),
+        )
+        self._submission(self.north)
+        self._submission(self.south, status=Submission.Status.NOTED)
+        kept = self._submission(self.north)
+        kept.form_template = other_form
+        kept.save()
+        self.client.force_login(self.reviewer)
+        generation = generations.current(Submission.STATUS_GENERATION)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            response = self.client.post(
+                reverse("manage_section_forms"), {"action": "delete_form", "form_id": self.form.id}
+            )
+        self.assertEqual(response.status_code, 302)
+        self.assertNotEqual(generations.current(Submission.STATUS_GENERATION), generation)
+
+        response = self.client.get(self.queue_url)
+        self.assertEqual(response.context["tab_counts"], {"pending": 1, "returned": 0, "noted": 0})
+        self.assertEqual(response.context["page_obj"].paginator.count, 1)
+        self.assertEqual(self._counts(), {"submitted": 1, "noted": 0})
+
+    def test_queue_search_matches_school_code_head_and_form_title(self):
+        by_name = self._submission(self.north, name="Alpha Elementary")
+        by_head = self._submission(self.north, name="Beta Elementary")
+        SchoolProfile.objects.create(school=by_head.school, head_name="Corazon Alpha-Lim")
+        other = self._submission(self.south, name="Gamma Elementary")
+        self.client.force_login(self.reviewer)
+
+        def found(query):
+            response = self.client.get(self.queue_url, {"q": query})
+            return {submission.pk for submission in response.context["submissions"]}
+
+        self.assertEqual(found("alpha"), {by_name.pk, by_head.pk})
+        self.assertEqual(found(other.school.code), {other.pk})
+        self.assertEqual(found("SMEA Form"), {by_name.pk, by_head.pk, other.pk})
+        self.assertEqual(found("no such school"), set())
+
+    def _with_project(self, submission):
+        project = SMEAProject.objects.create(submission=submission, project_title="Project", area_of_concern="Reading")
+        SMEAActivityRow.objects.create(project=project, activity="Baseline study")
+        return submission
+
+    def test_progress_sort_ranks_submissions_without_a_snapshot(self):
+        started = self._with_project(self._submission(self.north, name="Alpha Elementary"))
+        empty = self._submission(self.north, name="Beta Elementary")
+        stored = self._submission(self.north, name="Gamma Elementary")
+        stored.refresh_completion()
+        self.assertIsNone(Submission.objects.get(pk=started.pk).completion_updated_at)
+        self.client.force_login(self.reviewer)
+
+        response = self.client.get(self.queue_url, {"sort": "progress"})
+
+        order = [submission.pk for submission in response.context["submissions"]]
+        self.assertEqual(order[0], started.pk)
+        self.assertEqual(set(order), {started.pk, empty.pk, stored.pk})
+        started.refresh_from_db()
+        self.assertEqual(started.completion_progress, started.get_overall_progress())
+
+    def test_district_gaps_count_drafts_without_a_snapshot(self):
+        draft = self._with_project(self._submission(self.north, status=Submission.Status.DRAFT))
+        self.client.force_login(self.reviewer)
+
+        response = self.client.get(reverse("district_submission_gaps"), {
+            "section": self.section.code, "form_code": self.form.code, "period_id": self.period.id,
+        })
+
+        self.assertEqual(response.status_code, 200)
+        [entry] = [
+            entry for row in response.context["district_rows"] for entry in row["missing_schools"]
+            if entry["school"] == draft.school
+        ]
+        self.assertTrue(entry["has_draft"])
+        self.assertEqual(entry["draft_progress"], draft.get_overall_progress())
+        self.assertGreater(entry["draft_progress"], 0)
+
+    def test_queue_links_keep_the_search_query_encoded(self):
+        self._submission(self.north, name="A&B #1+ School")
+        self.client.force_login(self.reviewer)
+        response = self.client.get(self.queue_url, {"q": "A&B #1+"})
+        self.assertEqual(len(response.context["submissions"]), 1)
+        self.assertContains(response, "&q=A%26B%20%231%2B&sort=progress")
+        self.assertNotContains(response, "&q=A&amp;B")
+
+    def test_psds_counts_are_scoped_and_search_counts_live(self):
+        self._submission(self.north, name="Alpha Elementary")
+        self._submission(self.north, name="Beta Elementary")
+        self._submission(self.south, name="Alpha South")
+        self.client.force_login(self.psds)
+
+        response = self.client.get(self.queue_url)
+        self.assertEqual(response.context["tab_counts"]["pending"], 2)
+
+        response = self.client.get(self.queue_url, {"q": "Alpha"})
+        self.assertEqual(response.context["tab_counts"]["pending"], 1)
+        self.assertEqual([s.school.name for s in response.context["submissions"]], ["Alpha Elementary"])
+
+
+class DeadlineLoadTestCommandTests(TransactionTestCase):
+    def _run(self, *extra):
+        out = io.StringIO()
+        # One worker: the in-memory test database is shared-cache SQLite, where concurrent
+        # connections fail with "database table is locked" instead of waiting for the lock.
+        call_command(
+            "deadline_load_test",
+            "--school-heads", "2", "--reviewers", "1", "--autosaves", "2", "--flush-every", "2",
+            "--tabs", "rma", "--think-time", "0", "--workers", "1", "--prefix", "smoke", *extra,
+            stdout=out, stderr=io.StringIO(),
+        )
+        return out.getvalue()
+
+    def test_in_process_run_reports_phases_and_removes_its_data(self):
+        output = self._run()
+        # Every phase ran without an error; autosaves carry the row versions rendered by the editor.
+        for phase in ("start", "open_tab", "autosave", "submit", "review_queue", "kpi_dashboard"):
+            self.assertRegex(output, rf"\n{phase} +\d+ +[\d.]+ +0\.0% ")
+        self.assertIn("Load-test data removed.", output)
+        self.assertFalse(get_user_model().objects.filter(username__startswith="smoke-").exists())
+        self.assertFalse(School.objects.filter(code__startswith="smoke-").exists())
+        self.assertFalse(FormTemplate.objects.filter(code="smoke-form").exists())
+        self.assertFalse(Submission.objects.exists())
+
+    def test_reset_keeps_status_counters_in_step(self):
+        self._run("--keep-data")
+        output = self._run("--keep-data")
+        self.assertIn("Reset ", output)
+        statuses = list(Submission.objects.values_list("status", flat=True))
+        self.assertEqual(len(statuses), 2)
+        self.assertEqual(
+            status_counts(SubmissionStatusCounter.objects.all()), {status: statuses.count(status) for status in statuses}
+        )
@@ -11,6 +11,11 @@ urlpatterns = [
         name="start_submission",
     ),
     path("submission/<int:submission_id>/", views.edit_submission, name="edit_submission"),
+    path(
+        "submission/<int:submission_id>/autosave/",
+        views.autosave_submission,
+        name="autosave_submission",
+    ),
     path(
         "submission/<int:submission_id>/add-project/",
         views.add_project,
@@ -23,6 +28,7 @@ urlpatterns = [
     ),
     path("project/<int:project_id>/add-activity/", views.add_activity, name="add_activity"),
     path("review/<slug:section_code>/queue/", views.review_queue, name="review_queue"),
+    path("review/<slug:section_code>/queue/bulk/", views.review_queue_bulk, name="review_queue_bulk"),
     path("review/<int:submission_id>/tabs/", views.review_submission_tabs, name="review_submission_tabs"),
     path("review/<int:submission_id>/export/<str:file_format>/", views.review_submission_export, name="review_submission_export"),
     path("review/<int:submission_id>/", views.review_detail, name="review_detail"),
@@ -1,5 +1,6 @@
 from __future__ import annotations
 import datetime
+import hashlib
 import json
 import time
 import logging
@@ -8,8 +9,11 @@ from django.db import connection
 from django.contrib import messages
 from django.contrib.auth.decorators import login_required
 from django.core.exceptions import PermissionDenied, ValidationError
-from django.http import HttpResponse
-from django.db.models import Case, IntegerField, Q, Value, When, Sum, F, Count, Prefetch
+from django.core.paginator import Paginator
+from django.http import HttpResponse, JsonResponse
+from django.views.decorators.http import require_http_methods
+from django.db.models import Case, Exists, IntegerField, OuterRef, Q, Value, When, Sum, F, Count
+from django.db.models.functions import Trim
 from django.shortcuts import get_object_or_404, redirect, render
 from django.db import transaction
 from django import forms
@@ -29,22 +33,34 @@ from .forms import (
 )
 from django.urls import reverse
 from django.utils import timezone
+from django.utils.functional import cached_property
 
 from accounts import roles as account_roles
 from accounts import scope as account_scope
 from accounts import services as account_services
 from accounts.decorators import require_school_head, require_section_admin
+from common import generations, search
+from common.db import coordinated_transaction, coordinated_write
 from organizations.models import Section
+from organizations.search import SCHOOL_DOCUMENTS
 
 from . import constants as smea_constants
+from . import autosave as submission_autosave
+from . import bulk_review as submission_bulk_review
+from . import counters as submission_counters
+from . import drafts as submission_drafts
+from . import fragments as submission_fragments
 from . import exports as submission_exports
+from . import export_cache as submission_export_cache
+from .bundle import SubmissionBundle
+from .search import FORM_DOCUMENTS
+from . import snapshots as submission_snapshots
+from .formset_saving import FormsetSaveStats, save_formset_diff
+from .progress import SECTION_KEYS, completion_summaries, fill_missing_snapshots
 from .forms import (
     Form1ADMHeaderForm,
     Form1ADMRowFormSet,
     Form1PctRowFormSet,
-    Form1ReadingCRLAFormSet,
-    Form1ReadingInterventionFormSet,
-    Form1ReadingPHILIRIFormSet,
     Form1RMAInterventionFormSet,
     Form1RMARowFormSet,
     Form1SLPAnalysisForm,
@@ -61,6 +77,7 @@ from .forms import (
     SMEAProjectFormSet,
     SubmissionAttachmentForm,
     SubmissionReviewForm,
+    BulkSubmissionReviewForm,
     # New Reading Assessment Forms
     ReadingAssessmentCRLAForm,
     ReadingAssessmentPHILIRIForm,
@@ -76,9 +93,7 @@ from .models import (
     Form1ADMRow,
     Form1PctHeader,
     Form1PctRow,
-    Form1ReadingCRLA,
     Form1ReadingIntervention,
-    Form1ReadingPHILIRI,
     Form1RMAIntervention,
     Form1RMARow,
     Form1SLPAnalysis,
@@ -305,71 +320,98 @@ def rma_grade_labels_for_school(school) -> list[str]:
 
 def ensure_pct_rows(submission: Submission) -> Form1PctHeader:
     header, _ = Form1PctHeader.objects.get_or_create(submission=submission)
-    required_areas = {choice[0] for choice in Form1PctRow._meta.get_field("area").choices}
+    required_areas = [choice[0] for choice in Form1PctRow._meta.get_field("area").choices]
     existing = set(header.rows.values_list("area", flat=True))
-    for area in required_areas - existing:
-        Form1PctRow.objects.create(header=header, area=area, percent=0, action_points="")
+    missing = [area for area in required_areas if area not in existing]
+    if missing:
+        Form1PctRow.objects.bulk_create(
+            [Form1PctRow(header=header, area=area, percent=0, action_points="") for area in missing]
+        )
     header.rows.exclude(area__in=required_areas).delete()
     return header
 
 
+_SLP_ANALYSIS_TEXT_FIELDS = ("dnme_factors", "fs_factors", "s_practices", "vs_practices", "o_practices", "overall_strategy")
+
+
+def _empty_slp_rows_filter() -> Q:
+    """Filter matching SLP rows that hold no user-entered data.
+
+    A row is "empty" when enrolment and proficiency counts are zero, the
+    narrative/intervention and non-mastery fields are blank, and it has no
+    analysis record with text in it.
+    """
+    analysis_has_text = Q()
+    for field in _SLP_ANALYSIS_TEXT_FIELDS:
+        analysis_has_text |= ~Q(**{f"_trim_{field}": ""})
+    analysis_with_text = (
+        Form1SLPAnalysis.objects.filter(slp_row=OuterRef("pk"))
+        .alias(**{f"_trim_{field}": Trim(field) for field in _SLP_ANALYSIS_TEXT_FIELDS})
+        .filter(analysis_has_text)
+    )
+    return (
+        Q(enrolment=0, dnme=0, fs=0, s=0, vs=0, o=0)
+        & Q(_trim_llc="", _trim_plan="", _trim_nm_reasons="", _trim_nm_other="")
+        & ~Q(Exists(analysis_with_text))
+    )
+
+
 def ensure_slp_rows(submission: Submission, grade_subject_pairs: list[tuple[str, str]]) -> None:
-    existing_pairs = {
-        (row.grade_label, row.subject)
-        for row in Form1SLPRow.objects.filter(submission=submission)
+    """Reconcile SLP rows with the school's grade/subject pairs.
+
+    Missing pairs are inserted with one bulk_create. Extraneous rows are removed
+    with one filtered DELETE that only matches truly empty rows, so user-entered
+    data is kept (and never loaded) if grade/subject mappings change.
+    """
+    existing = {
+        (grade_label, subject): row_id
+        for row_id, grade_label, subject in Form1SLPRow.objects.filter(submission=submission).values_list(
+            "id", "grade_label", "subject"
+        )
     }
     pairs_set = set(grade_subject_pairs)
-    for grade_label, subject_code in grade_subject_pairs:
-        if (grade_label, subject_code) not in existing_pairs:
-            Form1SLPRow.objects.create(
-                submission=submission,
-                grade_label=grade_label,
-                subject=subject_code,
-                enrolment=0,
-                dnme=0,
-                fs=0,
-                s=0,
-                vs=0,
-                o=0,
-                is_offered=True,
-            )
-    # Protective deletion logic: only remove extraneous rows that are truly empty.
-    # A row is considered "empty" if it has zero enrolment & proficiency counts,
-    # no narrative/intervention fields, no non-mastery metadata, and no analysis record.
-    # This prevents accidental loss of user-entered data if grade/subject mappings change.
-    deleted_ids: list[int] = []
-    skipped_ids: list[int] = []
-    try:
-        for row in Form1SLPRow.objects.filter(submission=submission).select_related("analysis"):
-            pair = (row.grade_label, row.subject)
-            if pair in pairs_set:
-                continue
-            has_counts = any((row.enrolment or 0, row.dnme or 0, row.fs or 0, row.s or 0, row.vs or 0, row.o or 0))
-            has_narrative = bool((row.top_three_llc or '').strip()) or bool((row.intervention_plan or '').strip())
-            has_nm = bool((row.non_mastery_reasons or '').strip()) or bool((row.non_mastery_other or '').strip())
-            has_analysis = getattr(row, 'analysis', None) is not None and any(
-                (getattr(row.analysis, f) or '').strip() for f in (
-                    'dnme_factors','fs_factors','s_practices','vs_practices','o_practices','overall_strategy'
+    missing = [pair for pair in dict.fromkeys(grade_subject_pairs) if pair not in existing]
+    if missing:
+        Form1SLPRow.objects.bulk_create(
+            [
+                Form1SLPRow(
+                    submission=submission,
+                    grade_label=grade_label,
+                    subject=subject_code,
+                    enrolment=0,
+                    dnme=0,
+                    fs=0,
+                    s=0,
+                    vs=0,
+                    o=0,
+                    is_offered=True,
                 )
+                for grade_label, subject_code in missing
+            ]
+        )
+
+    extraneous_ids = [row_id for pair, row_id in existing.items() if pair not in pairs_set]
+    if not extraneous_ids:
+        return
+    try:
+        _, deleted_by_model = (
+            Form1SLPRow.objects.filter(pk__in=extraneous_ids)
+            .alias(
+                _trim_llc=Trim("top_three_llc"),
+                _trim_plan=Trim("intervention_plan"),
+                _trim_nm_reasons=Trim("non_mastery_reasons"),
+                _trim_nm_other=Trim("non_mastery_other"),
             )
-            if not (has_counts or has_narrative or has_nm or has_analysis):
-                deleted_ids.append(row.id)
-                row.delete()
-            else:
-                skipped_ids.append(row.id)
-        if deleted_ids or skipped_ids:
-            try:
-                logger.info(
-                    "[SLP][ensure] extraneous rows processed submission=%d deleted=%d skipped=%d deleted_ids=%s skipped_ids=%s",
-                    submission.id, len(deleted_ids), len(skipped_ids), deleted_ids, skipped_ids
-                )
-            except Exception:
-                pass
+            .filter(_empty_slp_rows_filter())
+            .delete()
+        )
+        deleted = deleted_by_model.get(Form1SLPRow._meta.label, 0)
+        logger.info(
+            "[SLP][ensure] extraneous rows processed submission=%d deleted=%d skipped=%d",
+            submission.id, deleted, len(extraneous_ids) - deleted
+        )
     except Exception as e:
-        try:
-            logger.warning("[SLP][ensure] error during protective deletion submission=%d error=%s", submission.id, e)
-        except Exception:
-            pass
+        logger.warning("[SLP][ensure] error during protective deletion submission=%d error=%s", submission.id, e)
 
 
 def _apply_shs_strand_defaults(submission: Submission) -> None:
@@ -434,27 +476,75 @@ def ordered_slp_rows(submission: Submission):
     )
 
 
+SLP_ANALYSIS_FIELDS = ("dnme_factors", "fs_factors", "s_practices", "vs_practices", "o_practices", "overall_strategy")
+
+
+def save_slp_analyses(request, submission: Submission, slp_formset, stats: FormsetSaveStats) -> None:
+    """Upsert the ``slp_analysis_<idx>_*`` answers posted for each SLP form.
+
+    Rows that post no analysis fields are left alone, and analyses whose
+    answers did not change are not rewritten.
+    """
+    to_create = []
+    to_update = []
+    now = timezone.now()
+    for idx, form in enumerate(slp_formset.forms):
+        row = form.instance
+        if row.pk is None:
+            continue
+        posted = {name: request.POST.get(f"slp_analysis_{idx}_{name}") for name in SLP_ANALYSIS_FIELDS}
+        if all(value is None for value in posted.values()):
+            continue
+        values = {name: value or "" for name, value in posted.items()}
+        try:
+            analysis = row.analysis  # select_related by ordered_slp_rows
+        except Form1SLPAnalysis.DoesNotExist:
+            to_create.append(Form1SLPAnalysis(slp_row=row, **values))
+            continue
+        if all(getattr(analysis, name) == value for name, value in values.items()):
+            stats.unchanged += 1
+            continue
+        for name, value in values.items():
+            setattr(analysis, name, value)
+        analysis.updated_at = now
+        to_update.append(analysis)
+    if to_create:
+        Form1SLPAnalysis.objects.bulk_create(to_create)
+        stats.created += len(to_create)
+        stats.statements += 1
+    if to_update:
+        Form1SLPAnalysis.objects.bulk_update(to_update, [*SLP_ANALYSIS_FIELDS, "updated_at"])
+        stats.updated += len(to_update)
+        stats.statements += 1
+
+
 def ensure_slp_top_entries(model, submission: Submission) -> None:
     existing_positions = set(model.objects.filter(submission=submission).values_list("position", flat=True))
-    for position in range(1, 6):
-        if position not in existing_positions:
-            model.objects.create(submission=submission, position=position, grade_label="", count=0)
+    missing = [position for position in range(1, 6) if position not in existing_positions]
+    if missing:
+        model.objects.bulk_create(
+            [model(submission=submission, position=position, grade_label="", count=0) for position in missing]
+        )
     model.objects.filter(submission=submission).exclude(position__in=range(1, 6)).delete()
 
 
 def ensure_fixed_order_interventions(model, submission: Submission) -> None:
     existing_orders = set(model.objects.filter(submission=submission).values_list("order", flat=True))
-    for order in range(1, 6):
-        if order not in existing_orders:
-            model.objects.create(submission=submission, order=order, description="")
+    missing = [order for order in range(1, 6) if order not in existing_orders]
+    if missing:
+        model.objects.bulk_create(
+            [model(submission=submission, order=order, description="") for order in missing]
+        )
     model.objects.filter(submission=submission).exclude(order__in=range(1, 6)).delete()
 
 
 def ensure_rma_rows(submission: Submission, grade_labels: list[str]) -> None:
     existing = set(Form1RMARow.objects.filter(submission=submission).values_list("grade_label", flat=True))
-    for label in grade_labels:
-        if label not in existing:
-            Form1RMARow.objects.create(submission=submission, grade_label=label, enrolment=0)
+    missing = [label for label in grade_labels if label not in existing]
+    if missing:
+        Form1RMARow.objects.bulk_create(
+            [Form1RMARow(submission=submission, grade_label=label, enrolment=0) for label in missing]
+        )
     Form1RMARow.objects.filter(submission=submission).exclude(grade_label__in=grade_labels).delete()
 
 
@@ -477,49 +567,24 @@ def ensure_reading_assessments_new(submission: Submission, period: str) -> None:
     """
     Ensure CRLA and PHILIRI assessment records exist for the given period.
     Creates one record per proficiency/reading level for the selected assessment period.
+    All grade counts default to zero on the models.
     """
     from submissions.constants import CRLAProficiencyLevel, PHILIRIReadingLevel
     from submissions.models import ReadingAssessmentCRLA, ReadingAssessmentPHILIRI
-    
-    # Ensure CRLA records (all 4 proficiency levels: Low Emerging, High Emerging, Developing, Transitioning)
-    for level_code, level_display in CRLAProficiencyLevel.CHOICES:
-        ReadingAssessmentCRLA.objects.get_or_create(
-            submission=submission,
-            period=period,
-            level=level_code,
-            defaults={
-                'mt_grade_1': 0,
-                'mt_grade_2': 0,
-                'mt_grade_3': 0,
-                'fil_grade_2': 0,
-                'fil_grade_3': 0,
-                'eng_grade_3': 0,
-            }
-        )
-    
-    # Ensure PHILIRI records (3 reading levels)
-    for level_code, level_display in PHILIRIReadingLevel.CHOICES:
-        ReadingAssessmentPHILIRI.objects.get_or_create(
-            submission=submission,
-            period=period,
-            level=level_code,
-            defaults={
-                'eng_grade_4': 0,
-                'eng_grade_5': 0,
-                'eng_grade_6': 0,
-                'eng_grade_7': 0,
-                'eng_grade_8': 0,
-                'eng_grade_9': 0,
-                'eng_grade_10': 0,
-                'fil_grade_4': 0,
-                'fil_grade_5': 0,
-                'fil_grade_6': 0,
-                'fil_grade_7': 0,
-                'fil_grade_8': 0,
-                'fil_grade_9': 0,
-                'fil_grade_10': 0,
-            }
+
+    # CRLA: 4 proficiency levels; PHILIRI: 3 reading levels
+    for model, choices in (
+        (ReadingAssessmentCRLA, CRLAProficiencyLevel.CHOICES),
+        (ReadingAssessmentPHILIRI, PHILIRIReadingLevel.CHOICES),
+    ):
+        existing = set(
+            model.objects.filter(submission=submission, period=period).values_list("level", flat=True)
         )
+        missing = [level_code for level_code, _ in choices if level_code not in existing]
+        if missing:
+            model.objects.bulk_create(
+                [model(submission=submission, period=period, level=level_code) for level_code in missing]
+            )
 
 
 def ensure_reading_interventions_new(submission: Submission) -> None:
@@ -527,9 +592,11 @@ def ensure_reading_interventions_new(submission: Submission) -> None:
     from submissions.models import ReadingInterventionNew
     
     existing_orders = set(ReadingInterventionNew.objects.filter(submission=submission).values_list("order", flat=True))
-    for order in range(1, 6):
-        if order not in existing_orders:
-            ReadingInterventionNew.objects.create(submission=submission, order=order, description="")
+    missing = [order for order in range(1, 6) if order not in existing_orders]
+    if missing:
+        ReadingInterventionNew.objects.bulk_create(
+            [ReadingInterventionNew(submission=submission, order=order, description="") for order in missing]
+        )
     ReadingInterventionNew.objects.filter(submission=submission).exclude(order__in=range(1, 6)).delete()
 
 
@@ -542,15 +609,14 @@ def ensure_reading_difficulty_plans(submission: Submission, period: str, grade_n
         0: 'k', 1: 'g1', 2: 'g2', 3: 'g3', 4: 'g4', 5: 'g5', 6: 'g6',
         7: 'g7', 8: 'g8', 9: 'g9', 10: 'g10'
     }
-    for g in grade_numbers:
-        label = number_to_label.get(g)
-        if not label:
-            continue
-        ReadingDifficultyPlan.objects.get_or_create(
-            submission=submission,
-            period=period,
-            grade_label=label,
-            defaults={"data": []}
+    labels = [number_to_label[g] for g in grade_numbers if g in number_to_label]
+    existing = set(
+        ReadingDifficultyPlan.objects.filter(submission=submission, period=period).values_list("grade_label", flat=True)
+    )
+    missing = [label for label in labels if label not in existing]
+    if missing:
+        ReadingDifficultyPlan.objects.bulk_create(
+            [ReadingDifficultyPlan(submission=submission, period=period, grade_label=label, data=[]) for label in missing]
         )
 
 
@@ -629,6 +695,82 @@ def ensure_signatories(submission: Submission) -> Form1Signatories:
     return signatories
 
 
+# Bump when the set of rows created by materialize_submission_skeleton changes.
+SUBMISSION_SKELETON_VERSION = 1
+
+
+def submission_skeleton_signature(submission: Submission) -> str:
+    """Hash of everything that decides which child rows a submission needs."""
+    school = submission.school
+    profile = getattr(school, "profile", None)
+    payload = {
+        "version": SUBMISSION_SKELETON_VERSION,
+        "grade_span": list(_resolve_grade_span(school)),
+        "strands": sorted(getattr(profile, "strands", None) or []),
+        "reading_period": _reading_period_for_submission(submission),
+    }
+    return hashlib.sha1(json.dumps(payload, sort_keys=True).encode("utf-8")).hexdigest()
+
+
+@coordinated_write
+def _write_skeleton_rows(submission: Submission, signature: str, reading_period, reading_grade_numbers) -> None:
+    school = submission.school
+    ensure_pct_rows(submission)
+    ensure_slp_rows(submission, slp_grade_subject_pairs(school))
+    # Apply strand defaults for SHS based on school profile (safe: only empties)
+    try:
+        _apply_shs_strand_defaults(submission)
+    except Exception:
+        # Non-fatal: proceed even if profile data is unavailable
+        pass
+    ensure_slp_top_entries(Form1SLPTopDNME, submission)
+    ensure_slp_top_entries(Form1SLPTopOutstanding, submission)
+    ensure_fixed_order_interventions(Form1ReadingIntervention, submission)
+    ensure_rma_rows(submission, rma_grade_labels_for_school(school))
+    ensure_fixed_order_interventions(Form1RMAIntervention, submission)
+    ensure_supervision_rows(submission)
+    # Do not auto-create ADM rows; user adds PPAs explicitly
+    ensure_signatories(submission)
+    ensure_reading_assessments_new(submission, reading_period)
+    ensure_reading_interventions_new(submission)
+    ensure_reading_difficulty_plans(submission, reading_period, reading_grade_numbers)
+    Submission.objects.filter(pk=submission.pk).update(skeleton_signature=signature)
+
+
+def materialize_submission_skeleton(submission: Submission, *, force: bool = False) -> bool:
+    """Create the fixed child rows edit_submission renders, in one transaction.
+
+    Runs only when the stored skeleton_signature no longer matches the school's
+    grade span/strands or the reading period (or on the first visit of an older
+    draft); otherwise it is a no-op without queries. Returns True when rows
+    were reconciled.
+    """
+    signature = submission_skeleton_signature(submission)
+    if not force and submission.skeleton_signature == signature:
+        return False
+
+    school = submission.school
+    reading_period = _reading_period_for_submission(submission)
+    reading_grade_numbers = [g for g in grade_numbers_for_school(school) if 1 <= g <= 10]
+    _write_skeleton_rows(submission, signature, reading_period, reading_grade_numbers)
+    submission.skeleton_signature = signature
+    # New fixed rows change the counts, and a first visit may have no snapshot at all.
+    submission.refresh_completion()
+    logger.info("[SKELETON] materialized submission=%s signature=%s", submission.pk, signature[:12])
+    return True
+
+
+SUBMISSION_TABS = (
+    {"key": "projects", "label": "Projects & Activities"},
+    {"key": "pct", "label": "% Implementation"},
+    {"key": "slp", "label": "SLP"},
+    {"key": "reading", "label": "Reading (CRLA/PHILIRI)"},
+    {"key": "rma", "label": "RMA"},
+    {"key": "supervision", "label": "Instructional Supervision & TA"},
+    {"key": "adm", "label": "ADM One-Stop-Shop & EiE"},
+)
+
+
 def _submission_tabs(submission: Submission) -> list[dict[str, str]]:
     """Return ordered tabs, optionally filtered by template schema.
 
@@ -636,15 +778,7 @@ def _submission_tabs(submission: Submission) -> list[dict[str, str]]:
     submission.form_template.schema_descriptor["enabled_tabs"] exists,
     filter to that set while preserving the default order.
     """
-    all_tabs = [
-        {"key": "projects", "label": "Projects & Activities"},
-        {"key": "pct", "label": "% Implementation"},
-        {"key": "slp", "label": "SLP"},
-        {"key": "reading", "label": "Reading (CRLA/PHILIRI)"},
-        {"key": "rma", "label": "RMA"},
-        {"key": "supervision", "label": "Instructional Supervision & TA"},
-        {"key": "adm", "label": "ADM One-Stop-Shop & EiE"},
-    ]
+    all_tabs = [dict(tab) for tab in SUBMISSION_TABS]
     try:
         schema = submission.form_template.schema_descriptor or {}
         enabled = schema.get("enabled_tabs") or []
@@ -668,6 +802,337 @@ def disable_formset(formset):
         formset.can_delete = False
 
 
+# --- edit_submission tab registry ------------------------------------------
+# Each tab declares the formsets (and their queries) it needs. Only the active
+# tab's builder runs, bound to POST data when that tab is being saved; the
+# other tabs are built when the editor navigates to them.
+
+def _pct_area_ordering():
+    # Access, Quality, Equity, Enabling Mechanisms
+    return Case(
+        When(area='access', then=Value(1)),
+        When(area='quality', then=Value(2)),
+        When(area='equity', then=Value(3)),
+        When(area='enabling_mechanisms', then=Value(4)),
+        output_field=IntegerField(),
+    )
+
+
+def _crla_level_ordering():
+    # Low Emerging, High Emerging, Developing, Transitioning
+    return Case(
+        When(level='low_emerging', then=Value(1)),
+        When(level='high_emerging', then=Value(2)),
+        When(level='developing', then=Value(3)),
+        When(level='transitioning', then=Value(4)),
+        output_field=IntegerField(),
+    )
+
+
+def _philiri_level_ordering():
+    # Frustration, Instructional, Independent
+    return Case(
+        When(level='frustration', then=Value(1)),
+        When(level='instructional', then=Value(2)),
+        When(level='independent', then=Value(3)),
+        output_field=IntegerField(),
+    )
+
+
+def _rma_grade_ordering():
+    return Case(
+        When(grade_label='k', then=0),
+        *[When(grade_label=f'g{n}', then=n) for n in range(1, 11)],
+        default=99,
+        output_field=IntegerField(),
+    )
+
+
+def _bound_if_present(data, prefix: str):
+    """Bind optional formsets only when their management form was posted."""
+    if data is not None and data.get(f"{prefix}-TOTAL_FORMS") is not None:
+        return data
+    return None
+
+
+def _projects_tab_forms(request, submission, data, bundle=None, **_):
+    bundle = bundle or SubmissionBundle(submission)
+    projects_formset = SMEAProjectFormSet(data=data, instance=submission, prefix="projects", rows=bundle.projects)
+    # Activity formsets for each existing project
+    activity_formsets = []
+    for i, project_form in enumerate(projects_formset):
+        if project_form.instance.pk:
+            activity_formsets.append({
+                'project_form': project_form,
+                'formset': SMEAActivityRowFormSet(
+                    data=data,
+                    instance=project_form.instance,
+                    prefix=f"activities_{project_form.instance.pk}",
+                    rows=project_form.instance.activities.all(),
+                ),
+                'project_index': i,
+            })
+    return {"projects_formset": projects_formset, "activity_formsets": activity_formsets}
+
+
+def _pct_tab_forms(request, submission, data, **_):
+    header, _ = Form1PctHeader.objects.get_or_create(submission=submission)
+    return {
+        "pct_formset": Form1PctRowFormSet(
+            data=data,
+            queryset=header.rows.annotate(sort_order=_pct_area_ordering()).order_by("sort_order"),
+            prefix="pct",
+        ),
+    }
+
+
+def _slp_tab_forms(request, submission, data, action=None, **_):
+    slp_formset = Form1SLPRowFormSet(
+        data=data if action != "save_subject" else None,
+        queryset=ordered_slp_rows(submission),
+        prefix="slp_rows",
+    )
+    slp_rows = list(slp_formset.queryset)
+    return {
+        "slp_formset": slp_formset,
+        "slp_top_dnme_formset": Form1SLPTopDNMEFormSet(
+            data=_bound_if_present(data, "slp_top_dnme"),
+            queryset=Form1SLPTopDNME.objects.filter(submission=submission).order_by("position"),
+            prefix="slp_top_dnme",
+        ),
+        "slp_top_outstanding_formset": Form1SLPTopOutstandingFormSet(
+            data=_bound_if_present(data, "slp_top_outstanding"),
+            queryset=Form1SLPTopOutstanding.objects.filter(submission=submission).order_by("position"),
+            prefix="slp_top_outstanding",
+        ),
+        "slp_dnme_summary": build_slp_dnme_summary(slp_rows),
+        "slp_outstanding_summary": build_slp_outstanding_summary(slp_rows),
+        "slp_dnme_recommendations": build_slp_dnme_recommendations(slp_rows),
+    }
+
+
+def _reading_tab_forms(request, submission, data, reading_period="", **_):
+    return {
+        "reading_crla_new_formset": ReadingAssessmentCRLAFormSet(
+            data=_bound_if_present(data, "reading_crla_new"),
+            queryset=ReadingAssessmentCRLA.objects.filter(
+                submission=submission,
+                period=reading_period,
+            ).annotate(sort_order=_crla_level_ordering()).order_by("sort_order"),
+            prefix="reading_crla_new",
+        ),
+        "reading_philiri_new_formset": ReadingAssessmentPHILIRIFormSet(
+            data=_bound_if_present(data, "reading_philiri_new"),
+            queryset=ReadingAssessmentPHILIRI.objects.filter(
+                submission=submission,
+                period=reading_period,
+            ).annotate(sort_order=_philiri_level_ordering()).order_by("sort_order"),
+            prefix="reading_philiri_new",
+        ),
+        "reading_interventions_new_formset": ReadingInterventionNewFormSet(
+            data=_bound_if_present(data, "reading_interventions_new"),
+            queryset=ReadingInterventionNew.objects.filter(submission=submission).order_by("order"),
+            prefix="reading_interventions_new",
+        ),
+    }
+
+
+def _rma_tab_forms(request, submission, data, **_):
+    return {
+        "rma_row_formset": Form1RMARowFormSet(
+            data=data,
+            queryset=Form1RMARow.objects.filter(submission=submission).annotate(
+                grade_order=_rma_grade_ordering()
+            ).order_by("grade_order"),
+            prefix="rma_rows",
+        ),
+        "rma_intervention_formset": Form1RMAInterventionFormSet(
+            data=data,
+            queryset=Form1RMAIntervention.objects.filter(submission=submission).order_by("order"),
+            prefix="rma_interventions",
+        ),
+    }
+
+
+def _signatories_form(request, submission, data):
+    signatories = ensure_signatories(submission)
+    signatories_initial = {}
+    if not signatories.prepared_by:
+        school_profile = getattr(submission.school, "profile", None)
+        signatories_initial["prepared_by"] = getattr(school_profile, "head_name", None) or ""
+    if not signatories.submitted_to:
+        profile = account_roles.get_profile(request.user)
+        first_district = profile.districts.first() if profile else None
+        if first_district:
+            signatories_initial["submitted_to"] = first_district.name
+    return Form1SignatoriesForm(
+        data=data,
+        instance=signatories,
+        initial=signatories_initial,
+        prefix="signatories",
+    )
+
+
+def _supervision_tab_forms(request, submission, data, **_):
+    return {
+        "supervision_formset": Form1SupervisionRowFormSet(
+            data=data,
+            queryset=Form1SupervisionRow.objects.filter(submission=submission).order_by("grade_label", "id"),
+            prefix="supervision_rows",
+        ),
+        "signatories_form": _signatories_form(request, submission, data),
+    }
+
+
+def _adm_tab_forms(request, submission, data, **_):
+    # ADM Header Form (for is_offered checkbox); always available regardless of school.implements_adm
+    adm_header, _ = Form1ADMHeader.objects.get_or_create(
+        submission=submission,
+        defaults={'is_offered': True}
+    )
+    adm_header_form = Form1ADMHeaderForm(data=data, instance=adm_header, prefix="adm_header")
+    adm_formset = Form1ADMRowFormSet(
+        data=data,
+        queryset=Form1ADMRow.objects.filter(submission=submission).order_by("id"),
+        prefix="adm_rows",
+    ) if submission.school_id else None
+    if adm_formset is not None:
+        for form in adm_formset.forms:
+            form.instance.submission = submission
+
+    adm_is_offered = bool(getattr(adm_header, "is_offered", True))
+    raw_value = adm_header_form["is_offered"].value()
+    if isinstance(raw_value, str):
+        adm_is_offered = raw_value.lower() in {"1", "true", "on", "checked", "yes"}
+    elif raw_value is not None:
+        adm_is_offered = bool(raw_value)
+    return {
+        "adm_header_form": adm_header_form,
+        "adm_formset": adm_formset,
+        "adm_is_offered": adm_is_offered,
+        "signatories_form": _signatories_form(request, submission, data),
+    }
+
+
+EDIT_TAB_FORM_BUILDERS = {
+    "projects": _projects_tab_forms,
+    "pct": _pct_tab_forms,
+    "slp": _slp_tab_forms,
+    "reading": _reading_tab_forms,
+    "rma": _rma_tab_forms,
+    "supervision": _supervision_tab_forms,
+    "adm": _adm_tab_forms,
+}
+
+
+def build_edit_tab_forms(tab: str, request, submission: Submission, data=None, **options) -> dict:
+    """Build only the forms/formsets (and tab-specific context) for ``tab``."""
+    tab_forms = EDIT_TAB_FORM_BUILDERS[tab](request, submission, data, **options)
+    submission_autosave.stamp_row_versions(
+        value for key, value in tab_forms.items() if key.endswith("_formset") and value is not None
+    )
+    return tab_forms
+
+
+def disable_tab_forms(tab_forms: dict) -> None:
+    for key, value in tab_forms.items():
+        if value is None:
+            continue
+        if key == "activity_formsets":
+            for activity_formset_data in value:
+                disable_formset(activity_formset_data['formset'])
+        elif key.endswith("_formset"):
+            disable_formset(value)
+        elif key.endswith("_form"):
+            disable_form(value)
+
+
+def _edit_submission_context(request, submission: Submission, tabs, current_tab: str, tab_forms: dict, selected_reading_period: str) -> dict:
+    school = submission.school
+    school_profile = getattr(school, "profile", None)
+    school_profile_strands = ", ".join(school_profile.strands) if getattr(school_profile, "strands", None) else ""
+    # Compute SHS selected/unselected strand prefixes for UI filtering (Grade 11/12 specialized subjects)
+    try:
+        raw_selected = set(getattr(school_profile, "strands", []) or [])
+    except Exception:
+        raw_selected = set()
+    code_to_prefix = {c: p for (c, _label, p) in smea_constants.SHS_STRANDS}
+    code_to_label = {c: l for (c, l, _p) in smea_constants.SHS_STRANDS}
+    label_to_code = {l: c for (c, l, _p) in smea_constants.SHS_STRANDS}
+    # Normalize selections: allow either codes (e.g., 'stem') or labels (e.g., 'STEM')
+    selected_codes = set()
+    for item in raw_selected:
+        if item in code_to_prefix:
+            selected_codes.add(item)
+        elif item in label_to_code:
+            selected_codes.add(label_to_code[item])
+    shs_selected_prefixes = [code_to_prefix[c] for c in selected_codes if c in code_to_prefix]
+    shs_unselected_prefixes = [p for (c, _l, p) in smea_constants.SHS_STRANDS if c not in selected_codes]
+    shs_selected_labels = [code_to_label[c] for c in selected_codes if c in code_to_label]
+
+    expected_timings = EXPECTED_TIMINGS_BY_QUARTER.get(submission.period.quarter_tag, [])
+
+    school_grades = grade_numbers_for_school(school) if school else []
+
+    # Determine which CRLA grades to show (1-3 are the CRLA grades)
+    crla_grades = [g for g in [1, 2, 3] if g in school_grades] if school_grades else [1, 2, 3]
+
+    # Determine which PHILIRI grades to show
+    # Elementary: 4-6, Junior High: 7-9, Senior High: 10
+    philiri_elementary_grades = [g for g in [4, 5, 6] if g in school_grades] if school_grades else []
+    # Include Grade 10 with the junior high grouping so the matrix renders its inputs
+    philiri_junior_grades = [g for g in [7, 8, 9, 10] if g in school_grades] if school_grades else []
+    philiri_senior_grades = [g for g in [10] if g in school_grades] if school_grades else []
+
+    # Compute dynamic progress width for current tab
+    current_index = next((i for i, t in enumerate(tabs) if t["key"] == current_tab), 0)
+    denom = max(1, len(tabs) - 1)
+    progress_width = int(round((current_index / denom) * 100)) if denom else 100
+
+    ctx = {
+        "submission": submission,
+        "timeline_entries": submission.timeline.all()[:10],
+        "tabs": tabs,
+        "current_tab": current_tab,
+        "current_tab_template": f"submissions/_edit_tab_{current_tab}.html",
+        "autosave_url": reverse("autosave_submission", args=[submission.pk]),
+        "autosave_prefixes_json": json.dumps(submission_autosave.autosave_prefix_map()),
+        "can_edit": submission.is_editable_by_school(),
+        "can_submit": submission.can_submit(),
+        "selected_reading_period": selected_reading_period,
+        "expected_timings": json.dumps(expected_timings),
+        "expected_timings_json": json.dumps(expected_timings),
+        "grade_span_label": school.grade_span_label if school else "",
+        "school_profile": school_profile,
+        "school_profile_strands": school_profile_strands,
+        # JSON for client-side hiding of unselected specializations
+        "shs_selected_prefixes_json": json.dumps(shs_selected_prefixes),
+        "shs_unselected_prefixes_json": json.dumps(shs_unselected_prefixes),
+        "shs_selected_labels": shs_selected_labels,
+        "shs_selected_labels_join": ", ".join(shs_selected_labels) if shs_selected_labels else "",
+        "crla_grades": crla_grades,
+        "philiri_elementary_grades": philiri_elementary_grades,
+        "philiri_junior_grades": philiri_junior_grades,
+        "philiri_senior_grades": philiri_senior_grades,
+        "school_grades": school_grades,
+        # Helper list for template condition (avoid parentheses in template logic)
+        "shs_grades": ["Grade 11", "Grade 12"],
+        # Provide tabs JSON for dynamic JS ordering
+        "tabs_json": json.dumps(tabs),
+        "progress_width": progress_width,
+        # Reading difficulties serialized storage
+        "reading_difficulties_json_dump": json.dumps(submission.data.get('reading_difficulties_json', [])),
+        "reading_difficulties_json": submission.data.get('reading_difficulties_json', []),
+        # RMA structured difficulties storage (Pre-Test/Q3, EOSY/Q1)
+        "rma_pretest_json_dump": json.dumps(submission.data.get('rma_pretest_json', [])),
+        "rma_eosy_json_dump": json.dumps(submission.data.get('rma_eosy_json', [])),
+        # Provide only Grades 1-10 actually offered by the school for Reading Difficulties builder
+        "reading_grade_range": [g for g in school_grades if 1 <= g <= 10],
+    }
+    ctx.update(tab_forms)
+    return ctx
+
+
 @login_required
 def open_forms_list(request, section_code):
     section = get_object_or_404(Section, code__iexact=section_code)
@@ -818,6 +1283,9 @@ def manage_section_forms(request):
                     # Capture affected schools for cache invalidation before delete
                     affected_school_ids = list(submissions_qs.values_list("school_id", flat=True).distinct())
                     submission_count = submissions_qs.count()
+                    # A queryset delete skips Submission.delete, so keep the counters and matrix cache in step here.
+                    submission_counters.record_deletions(submissions_qs)
+                    generations.bump(Submission.STATUS_GENERATION)
                     submissions_qs.delete()
                     template_title = template.title
                     template.delete()
@@ -857,6 +1325,7 @@ def manage_section_forms(request):
 
 @login_required
 @require_school_head()
+@coordinated_write
 def start_submission(request, form_code, period_id):
     form_template = get_object_or_404(FormTemplate, code=form_code, is_active=True)
     period = get_object_or_404(Period, pk=period_id)
@@ -876,19 +1345,43 @@ def start_submission(request, form_code, period_id):
         },
     )
     if created:
+        materialize_submission_skeleton(submission)
         messages.success(request, "Draft submission created. You can start filling it out.")
     return redirect("edit_submission", submission_id=submission.pk)
 
 
+@coordinated_write
+def _submit_submission(submission_id: int, user) -> Submission:
+    """Submit a freshly read copy, so a retry after a lock error starts from the stored status."""
+    submission = Submission.objects.get(pk=submission_id)
+    submission.mark_submitted(user)
+    return submission
+
+
+def _validate_tab_forms(tab_forms: dict) -> None:
+    """Run validation of every bound form of the tab; Django caches the results."""
+    for key, value in tab_forms.items():
+        if value is None:
+            continue
+        if key == "activity_formsets":
+            forms_to_check = [activity_formset_data['formset'] for activity_formset_data in value]
+        elif key.endswith("_formset") or key.endswith("_form"):
+            forms_to_check = [value]
+        else:
+            continue
+        for form in forms_to_check:
+            if form.is_bound:
+                form.is_valid()
+
+
 @login_required
 @require_school_head(submission_kwarg="submission_id")
 def edit_submission(request, submission_id, submission_obj=None):
     submission = submission_obj or get_object_or_404(
-        Submission.objects.select_related("form_template", "period", "school"),
+        Submission.objects.select_related("form_template", "period", "school", "school__profile"),
         pk=submission_id,
     )
 
-    school = submission.school
     can_edit = submission.is_editable_by_school()
     can_submit = submission.can_submit()
 
@@ -909,264 +1402,43 @@ def edit_submission(request, submission_id, submission_obj=None):
     current_subject_prefix = request.POST.get("current_subject_prefix") if request.method == "POST" else None
     current_subject_index = request.POST.get("current_subject_index") if request.method == "POST" else None
 
-    slp_grade_labels = slp_grade_labels_for_school(school)
-    slp_pairs = slp_grade_subject_pairs(school)
-    rma_grade_labels = rma_grade_labels_for_school(school)
+    # Child rows are created once per skeleton signature (grade span, strands,
+    # reading period); unchanged submissions skip straight to the formsets.
+    materialize_submission_skeleton(submission)
+
+    unsaved_cells = []
+    if can_edit:
+        # Apply buffered autosaves before the formsets read the rows; a POST
+        # then writes its own rows on top, so cells of rows it does not carry
+        # (a single-subject save, a failed validation) are kept.
+        if submission.draft_buffers.exists():
+            coordinated_write(submission_drafts.flush_draft_buffers)(submission, user=request.user)
+            unsaved_cells = submission_drafts.unsaved_cells(submission)
 
-    header = ensure_pct_rows(submission)
-    ensure_slp_rows(submission, slp_pairs)
-    # Apply strand defaults for SHS based on school profile (safe: only empties)
-    try:
-        _apply_shs_strand_defaults(submission)
-    except Exception:
-        # Non-fatal: proceed even if profile data is unavailable
-        pass
-    ensure_slp_top_entries(Form1SLPTopDNME, submission)
-    ensure_slp_top_entries(Form1SLPTopOutstanding, submission)
-    ensure_fixed_order_interventions(Form1ReadingIntervention, submission)
-    ensure_rma_rows(submission, rma_grade_labels)
-    ensure_fixed_order_interventions(Form1RMAIntervention, submission)
-    ensure_supervision_rows(submission)
-    # Do not auto-create ADM rows; user adds PPAs explicitly
-    signatories = ensure_signatories(submission)
-    
     # Determine assessment timing for Reading based strictly on the submission's Quarter
     # This is enforced (no user choice) to ensure data consistency with the dashboard/API/export.
     selected_reading_period = _reading_period_for_submission(submission)
-    
-    # Ensure reading assessment records exist for the selected period
-    ensure_reading_assessments_new(submission, selected_reading_period)
-    ensure_reading_interventions_new(submission)
-    # Compute school grades early for Reading Difficulty Plans (may be used later again)
-    try:
-        school_grades = grade_numbers_for_school(school) if school else []
-    except Exception:
-        school_grades = []
-    # Reading assessments limited to Grades 1-10; exclude Kinder (0) & SHS (11-12)
-    reading_grade_numbers = [g for g in school_grades if 1 <= g <= 10]
-    ensure_reading_difficulty_plans(submission, selected_reading_period, reading_grade_numbers or [])
-
-    # Order PCT rows by correct sequence: Access, Quality, Equity, Enabling Mechanisms
-    from django.db.models import Case, When, Value, IntegerField
-    pct_ordering = Case(
-        When(area='access', then=Value(1)),
-        When(area='quality', then=Value(2)),
-        When(area='equity', then=Value(3)),
-        When(area='enabling_mechanisms', then=Value(4)),
-        output_field=IntegerField(),
-    )
-    
-    pct_formset = Form1PctRowFormSet(
-        data=request.POST if request.method == "POST" and current_tab == "pct" else None,
-        queryset=header.rows.annotate(sort_order=pct_ordering).order_by("sort_order"),
-        prefix="pct",
-    )
-    slp_formset = Form1SLPRowFormSet(
-        data=request.POST if request.method == "POST" and current_tab == "slp" and action != "save_subject" else None,
-        queryset=ordered_slp_rows(submission),
-        prefix="slp_rows",
-    )
-    # Bind SLP Top lists only if their management forms are present in POST
-    slp_top_dnme_formset = Form1SLPTopDNMEFormSet(
-        data=(request.POST if request.method == "POST" and current_tab == "slp" and request.POST.get('slp_top_dnme-TOTAL_FORMS') is not None else None),
-        queryset=Form1SLPTopDNME.objects.filter(submission=submission).order_by("position"),
-        prefix="slp_top_dnme",
-    )
-    slp_top_outstanding_formset = Form1SLPTopOutstandingFormSet(
-        data=(request.POST if request.method == "POST" and current_tab == "slp" and request.POST.get('slp_top_outstanding-TOTAL_FORMS') is not None else None),
-        queryset=Form1SLPTopOutstanding.objects.filter(submission=submission).order_by("position"),
-        prefix="slp_top_outstanding",
-    )
-    reading_crla_formset = Form1ReadingCRLAFormSet(
-        data=request.POST if request.method == "POST" and current_tab == "reading" else None,
-        queryset=Form1ReadingCRLA.objects.filter(submission=submission).order_by("level", "timing", "subject", "band"),
-        prefix="reading_crla",
-    )
-    reading_philiri_formset = Form1ReadingPHILIRIFormSet(
-        data=request.POST if request.method == "POST" and current_tab == "reading" else None,
-        queryset=Form1ReadingPHILIRI.objects.filter(submission=submission).order_by("level", "timing", "language"),
-        prefix="reading_philiri",
-    )
-    reading_intervention_formset = Form1ReadingInterventionFormSet(
-        data=request.POST if request.method == "POST" and current_tab == "reading" else None,
-        queryset=Form1ReadingIntervention.objects.filter(submission=submission).order_by("order"),
-        prefix="reading_interventions",
-    )
-    
-    # Custom ordering for CRLA levels: Low Emerging, High Emerging, Developing, Transitioning (all 4 levels)
-    crla_ordering = Case(
-        When(level='low_emerging', then=Value(1)),
-        When(level='high_emerging', then=Value(2)),
-        When(level='developing', then=Value(3)),
-        When(level='transitioning', then=Value(4)),
-        output_field=IntegerField(),
-    )
-    
-    # Custom ordering for PHILIRI levels: Frustration, Instructional, Independent
-    philiri_ordering = Case(
-        When(level='frustration', then=Value(1)),
-        When(level='instructional', then=Value(2)),
-        When(level='independent', then=Value(3)),
-        output_field=IntegerField(),
-    )
-    
-    # New Reading Assessment Formsets (Matrix-based)
-    reading_crla_new_formset = ReadingAssessmentCRLAFormSet(
-        data=(request.POST if request.method == "POST" and current_tab == "reading" and request.POST.get('reading_crla_new-TOTAL_FORMS') is not None else None),
-        queryset=ReadingAssessmentCRLA.objects.filter(
-            submission=submission,
-            period=selected_reading_period
-        ).annotate(sort_order=crla_ordering).order_by("sort_order"),
-        prefix="reading_crla_new",
-    )
-    reading_philiri_new_formset = ReadingAssessmentPHILIRIFormSet(
-        data=(request.POST if request.method == "POST" and current_tab == "reading" and request.POST.get('reading_philiri_new-TOTAL_FORMS') is not None else None),
-        queryset=ReadingAssessmentPHILIRI.objects.filter(
-            submission=submission,
-            period=selected_reading_period
-        ).annotate(sort_order=philiri_ordering).order_by("sort_order"),
-        prefix="reading_philiri_new",
-    )
-    reading_interventions_new_formset = ReadingInterventionNewFormSet(
-        data=(request.POST if request.method == "POST" and current_tab == "reading" and request.POST.get('reading_interventions_new-TOTAL_FORMS') is not None else None),
-        queryset=ReadingInterventionNew.objects.filter(submission=submission).order_by("order"),
-        prefix="reading_interventions_new",
-    )
-    
-    from django.db.models import Case, When, IntegerField
-    
-    # Create custom ordering for RMA rows based on grade number
-    rma_ordering = Case(
-        When(grade_label='k', then=0),
-        When(grade_label='g1', then=1),
-        When(grade_label='g2', then=2),
-        When(grade_label='g3', then=3),
-        When(grade_label='g4', then=4),
-        When(grade_label='g5', then=5),
-        When(grade_label='g6', then=6),
-        When(grade_label='g7', then=7),
-        When(grade_label='g8', then=8),
-        When(grade_label='g9', then=9),
-        When(grade_label='g10', then=10),
-        default=99,
-        output_field=IntegerField(),
-    )
-    
-    rma_row_formset = Form1RMARowFormSet(
-        data=request.POST if request.method == "POST" and current_tab == "rma" else None,
-        queryset=Form1RMARow.objects.filter(submission=submission).annotate(
-            grade_order=rma_ordering
-        ).order_by("grade_order"),
-        prefix="rma_rows",
-    )
-    rma_intervention_formset = Form1RMAInterventionFormSet(
-        data=request.POST if request.method == "POST" and current_tab == "rma" else None,
-        queryset=Form1RMAIntervention.objects.filter(submission=submission).order_by("order"),
-        prefix="rma_interventions",
-    )
-    supervision_formset = Form1SupervisionRowFormSet(
-        data=request.POST if request.method == "POST" and current_tab == "supervision" else None,
-        queryset=Form1SupervisionRow.objects.filter(submission=submission).order_by("grade_label", "id"),
-        prefix="supervision_rows",
-    )
-    signatories_initial = {}
-    if not signatories.prepared_by:
-        school_profile = getattr(school, "profile", None)
-        if school_profile and getattr(school_profile, "head_name", None):
-            signatories_initial["prepared_by"] = school_profile.head_name
-        else:
-            signatories_initial["prepared_by"] = ""
-    profile = account_roles.get_profile(request.user)
-    if not signatories.submitted_to and profile and profile.districts.exists():
-        signatories_initial["submitted_to"] = profile.districts.first().name
-    signatories_form = Form1SignatoriesForm(
-        data=request.POST if request.method == "POST" and current_tab in {"supervision", "adm"} else None,
-        instance=signatories,
-        initial=signatories_initial,
-        prefix="signatories",
-    )
-    
-    # ADM Header Form (for is_offered checkbox)
-    # Always create/get the ADM header regardless of current tab or school.implements_adm
-    adm_header, _ = Form1ADMHeader.objects.get_or_create(
-        submission=submission,
-        defaults={'is_offered': True}
-    )
-    adm_header_form = Form1ADMHeaderForm(
-        data=request.POST if request.method == "POST" and current_tab == "adm" else None,
-        instance=adm_header,
-        prefix="adm_header"
-    )
-    
-    # ADM Row Formset - create if school implements ADM OR if the checkbox says it's offered
-    # This allows all schools to access the ADM section and use the checkbox
-    adm_formset = Form1ADMRowFormSet(
-        data=request.POST if request.method == "POST" and current_tab == "adm" else None,
-        queryset=Form1ADMRow.objects.filter(submission=submission).order_by("id"),
-        prefix="adm_rows",
-    ) if school else None
-    if adm_formset is not None:
-        for form in adm_formset.forms:
-            form.instance.submission = submission
 
-    adm_is_offered = bool(getattr(adm_header, "is_offered", True))
-    if adm_header_form:
-        raw_value = adm_header_form["is_offered"].value()
-        if isinstance(raw_value, str):
-            adm_is_offered = raw_value.lower() in {"1", "true", "on", "checked", "yes"}
-        elif raw_value is not None:
-            adm_is_offered = bool(raw_value)
-
-    # Projects Formset - inline formset for projects
-    projects_formset = SMEAProjectFormSet(
-        data=request.POST if request.method == "POST" and current_tab == "projects" else None,
-        instance=submission,
-        prefix="projects",
+    tab_forms = build_edit_tab_forms(
+        current_tab,
+        request,
+        submission,
+        data=request.POST if request.method == "POST" else None,
+        action=action,
+        reading_period=selected_reading_period,
     )
-    
-    # Create activity formsets for each existing project
-    activity_formsets = []
-    if current_tab == "projects":
-        for i, project_form in enumerate(projects_formset):
-            if project_form.instance.pk:
-                activity_formset = SMEAActivityRowFormSet(
-                    data=request.POST if request.method == "POST" else None,
-                    instance=project_form.instance,
-                    prefix=f"activities_{project_form.instance.pk}",
-                )
-                activity_formsets.append({
-                    'project_form': project_form,
-                    'formset': activity_formset,
-                    'project_index': i,
-                })
 
     if not can_edit:
-        # On locked submissions, disable all formsets for GET; for POST, return 403
-        disable_formset(pct_formset)
-        disable_formset(slp_formset)
-        disable_formset(slp_top_dnme_formset)
-        disable_formset(slp_top_outstanding_formset)
-        disable_formset(reading_crla_formset)
-        disable_formset(reading_philiri_formset)
-        disable_formset(reading_intervention_formset)
-        disable_formset(reading_crla_new_formset)
-        disable_formset(reading_philiri_new_formset)
-        disable_formset(reading_interventions_new_formset)
-        disable_formset(rma_row_formset)
-        disable_formset(rma_intervention_formset)
-        disable_formset(supervision_formset)
-        disable_formset(projects_formset)
-        # Also disable activity formsets
-        for activity_formset_data in activity_formsets:
-            disable_formset(activity_formset_data['formset'])
-        disable_form(signatories_form)
-        if adm_formset:
-            disable_formset(adm_formset)
+        # On locked submissions, disable the tab's forms for GET; for POST, return 403
+        disable_tab_forms(tab_forms)
         if request.method == "POST":
             # Explicitly forbid modifying a submitted/locked report
             raise PermissionDenied("Submission is read-only.")
 
     success = False
+    save_stats = FormsetSaveStats()
+    # Rows written back by the POST; None means every bound formset row of the tab.
+    persisted_refs = None
 
     if request.method == "POST":
         next_tab = request.POST.get("next_tab") or current_tab
@@ -1179,7 +1451,7 @@ def edit_submission(request, submission_id, submission_obj=None):
                 messages.error(request, "Submission cannot be submitted in its current state.")
             else:
                 try:
-                    submission.mark_submitted(request.user)
+                    _submit_submission(submission.pk, request.user)
                 except ValidationError as exc:
                     messages.error(request, '\n'.join(exc.messages if hasattr(exc, 'messages') else [str(exc)]))
                 else:
@@ -1190,529 +1462,477 @@ def edit_submission(request, submission_id, submission_obj=None):
                 # Handled earlier with a 403; keep this branch as a safety net
                 raise PermissionDenied("Submission is read-only.")
 
-            if current_tab == "projects":
-                if is_autosave:
-                    # Quick save scope: persist only the project formset, ignore activities validation
-                    # DIAGNOSTIC: Log POST data
-                    print("[DIAGNOSTIC] AUTOSAVE POST DATA:", dict(request.POST))
-                    if projects_formset.is_valid():
-                        project_instances = projects_formset.save(commit=False)
-                        # Delete flagged projects explicitly
-                        for obj in getattr(projects_formset, 'deleted_objects', []):
-                            print(f"[DIAGNOSTIC] Deleting project (autosave): {obj.pk}")
-                            obj.delete()
-                        for inst in project_instances:
-                            inst.submission = submission
-                            inst.save()
-                        # Save M2M if present (not expected here, but safe)
-                        try:
-                            projects_formset.save_m2m()
-                        except Exception:
-                            pass
-                        success = True
-                else:
-                    # Validate all formsets (projects + activities)
-                    all_valid = projects_formset.is_valid()
-                    # Track if any deletions were performed
-                    any_activity_deleted = False
-                    # Always process deletions for activities, even if formset is invalid
-                    for formset_data in activity_formsets:
-                        fs = formset_data['formset']
-                        # Delete flagged rows first (even if formset is invalid)
-                        for obj in getattr(fs, 'deleted_objects', []):
-                            obj.delete()
-                            any_activity_deleted = True
-                    # Now validate all activity formsets
-                    for formset_data in activity_formsets:
-                        if not formset_data['formset'].is_valid():
-                            all_valid = False
-
-                    if all_valid:
-                        # Save projects (commit=False to ensure deletes apply)
-                        proj_instances = projects_formset.save(commit=False)
-                        for obj in getattr(projects_formset, 'deleted_objects', []):
-                            obj.delete()
-                        for inst in proj_instances:
-                            inst.submission = submission
-                            inst.save()
-                        try:
-                            projects_formset.save_m2m()
-                        except Exception:
-                            pass
-                        # Then save activities for each project (apply deletes first)
-                        for formset_data in activity_formsets:
-                            fs = formset_data['formset']
-                            act_instances = fs.save(commit=False)
-                            for inst in act_instances:
-                                inst.save()
-                            try:
-                                fs.save_m2m()
-                            except Exception:
-                                pass
-                        success = True
+            # Validate outside the write slot; the checks below reuse the cached results.
+            _validate_tab_forms(tab_forms)
+            with coordinated_transaction():
+                if current_tab == "projects":
+                    if is_autosave:
+                        # Quick save scope: persist only the project formset, ignore activities validation
+                        # DIAGNOSTIC: Log POST data
+                        print("[DIAGNOSTIC] AUTOSAVE POST DATA:", dict(request.POST))
+                        if tab_forms["projects_formset"].is_valid():
+                            # Flagged projects are deleted in the same pass
+                            save_formset_diff(tab_forms["projects_formset"], save_stats, submission=submission)
+                            success = True
                     else:
-                        # Log all errors for projects_formset
-                        for form in projects_formset:
-                            # Suppress global error banners for project form errors
-                            pass
-                        # Log all errors for each activity formset
-                        for formset_data in activity_formsets:
+                        # Validate all formsets (projects + activities)
+                        all_valid = tab_forms["projects_formset"].is_valid()
+                        # Track if any deletions were performed
+                        any_activity_deleted = False
+                        # Always process deletions for activities, even if formset is invalid
+                        for formset_data in tab_forms["activity_formsets"]:
                             fs = formset_data['formset']
-                            # Suppress global error banners for activity formset errors
-                            pass
-                        # If any deletions were performed, show a message
-                        if any_activity_deleted:
-                            messages.info(request, "Some activities were deleted even though other errors prevented saving. Please review remaining errors.")
-
-                # Always apply any posted deletes as a safety net
-                ids_to_delete: list[int] = []
-                any_activity_delete_flag = False
-                print("[DIAGNOSTIC] POST KEYS:", list(request.POST.keys()))
-                for key, val in request.POST.items():
-                    if not key.endswith('-DELETE'):
-                        continue
-                    if not key.startswith('activities_'):
-                        continue
-                    sval = str(val).lower()
-                    if sval not in {"1", "true", "on", "yes", "checked"}:
-                        continue
-                    any_activity_delete_flag = True
-                    id_name = key[:-7] + '-id'  # replace -DELETE with -id
-                    obj_id = request.POST.get(id_name)
-                    print(f"[DIAGNOSTIC] Found DELETE: {key} (id field: {id_name} = {obj_id})")
-                    try:
-                        obj_pk = int(obj_id) if obj_id is not None else None
-                    except (TypeError, ValueError):
-                        obj_pk = None
-                    if obj_pk:
-                        ids_to_delete.append(obj_pk)
-
-                # Fallback: if TOTAL_FORMS < INITIAL_FORMS and a row id has no matching DELETE,
-                # treat it as a deletion (some browsers may not post the DELETE field reliably)
-                try:
-                    import re
-                    totals: dict[str, int] = {}
-                    initials: dict[str, int] = {}
-                    for k, v in request.POST.items():
-                        if k.startswith('activities_') and k.endswith('-TOTAL_FORMS'):
-                            totals[k[:-12]] = int(v) if str(v).isdigit() else 0
-                        elif k.startswith('activities_') and k.endswith('-INITIAL_FORMS'):
-                            initials[k[:-14]] = int(v) if str(v).isdigit() else 0
-                    id_row_re = re.compile(r'^(activities_\d+)-(\d+)-id$')
-                    for k, v in request.POST.items():
-                        m = id_row_re.match(k)
-                        if not m:
+                            # Delete flagged rows first (even if formset is invalid)
+                            for obj in getattr(fs, 'deleted_objects', []):
+                                obj.delete()
+                                any_activity_deleted = True
+                        # Now validate all activity formsets
+                        for formset_data in tab_forms["activity_formsets"]:
+                            if not formset_data['formset'].is_valid():
+                                all_valid = False
+
+                        if all_valid:
+                            # Save projects (deletes apply in the same pass), then their activities
+                            save_formset_diff(tab_forms["projects_formset"], save_stats, submission=submission)
+                            for formset_data in tab_forms["activity_formsets"]:
+                                save_formset_diff(formset_data['formset'], save_stats)
+                            success = True
+                        else:
+                            # Log all errors for tab_forms["projects_formset"]
+                            for form in tab_forms["projects_formset"]:
+                                # Suppress global error banners for project form errors
+                                pass
+                            # Log all errors for each activity formset
+                            for formset_data in tab_forms["activity_formsets"]:
+                                fs = formset_data['formset']
+                                # Suppress global error banners for activity formset errors
+                                pass
+                            # If any deletions were performed, show a message
+                            if any_activity_deleted:
+                                messages.info(request, "Some activities were deleted even though other errors prevented saving. Please review remaining errors.")
+
+                    # Always apply any posted deletes as a safety net
+                    ids_to_delete: list[int] = []
+                    any_activity_delete_flag = False
+                    print("[DIAGNOSTIC] POST KEYS:", list(request.POST.keys()))
+                    for key, val in request.POST.items():
+                        if not key.endswith('-DELETE'):
                             continue
-                        prefix, idx = m.group(1), m.group(2)
-                        tot = totals.get(prefix)
-                        ini = initials.get(prefix)
-                        if tot is None or ini is None:
+                        if not key.startswith('activities_'):
                             continue
-                        if tot < ini:
-                            del_key = f"{prefix}-{idx}-DELETE"
-                            if del_key not in request.POST:
-                                try:
-                                    obj_pk = int(v) if v is not None else None
-                                except (TypeError, ValueError):
-                                    obj_pk = None
-                                if obj_pk:
-                                    ids_to_delete.append(obj_pk)
-                except Exception as e:
-                    print(f"[DIAGNOSTIC] Exception in fallback delete logic: {e}")
-                print(f"[DIAGNOSTIC] ids_to_delete: {ids_to_delete}")
-                print(f"[DIAGNOSTIC] Activities before delete: {list(SMEAActivityRow.objects.filter(project__submission=submission).values_list('id', flat=True))}")
-                if ids_to_delete:
-                    # Diagnostic: show activities to be deleted
-                    print(f"[DIAGNOSTIC] Attempting to delete activities with ids: {ids_to_delete}")
-                    before_qs = list(SMEAActivityRow.objects.filter(id__in=ids_to_delete, project__submission=submission).values('id', 'activity', 'project_id'))
-                    print(f"[DIAGNOSTIC] Activities found before delete: {before_qs}")
-                    SMEAActivityRow.objects.filter(id__in=ids_to_delete, project__submission=submission).delete()
-                    after_qs = list(SMEAActivityRow.objects.filter(id__in=ids_to_delete, project__submission=submission).values('id', 'activity', 'project_id'))
-                    print(f"[DIAGNOSTIC] Activities found after delete: {after_qs}")
-                    print(f"[DIAGNOSTIC] All activities after delete: {list(SMEAActivityRow.objects.filter(project__submission=submission).values_list('id', flat=True))}")
-                    success = True
-                elif any_activity_delete_flag:
-                    # All flagged were unsaved rows; still treat as success to redirect away
-                    print("[DIAGNOSTIC] All flagged for delete were unsaved rows.")
-                    success = True
-
-                # Safety net for project deletions as well (in case formset save didn't run)
-                proj_ids_to_delete: list[int] = []
-                any_project_delete_flag = False
-                for key, val in request.POST.items():
-                    if not key.startswith('projects-') or not key.endswith('-DELETE'):
-                        continue
-                    sval = str(val).lower()
-                    if sval not in {"1", "true", "on", "yes", "checked"}:
-                        continue
-                    any_project_delete_flag = True
-                    id_name = key[:-7] + '-id'  # projects-<idx>-id (corrected)
-                    obj_id = request.POST.get(id_name)
-                    try:
-                        obj_pk = int(obj_id) if obj_id is not None else None
-                    except (TypeError, ValueError):
-                        obj_pk = None
-                    if obj_pk:
-                        proj_ids_to_delete.append(obj_pk)
-                if proj_ids_to_delete:
-                    SMEAProject.objects.filter(id__in=proj_ids_to_delete, submission=submission).delete()
-                    success = True
-                elif any_project_delete_flag:
-                    # Deleted forms were new/unsaved; still consider operation successful
-                    success = True
-            elif current_tab == "pct":
-                if pct_formset.is_valid():
-                    pct_formset.save()
-                    success = True
-            elif current_tab == "slp" and action == "save_subject":
-                # Optimized fast-path: manual parse + selective queryset update, minimal validation.
-                t0 = time.perf_counter()
-                next_tab = "slp"
-                subject_row = None
-                idx_value = None
-                if current_subject_id:
-                    subject_row = Form1SLPRow.objects.select_related("analysis").filter(submission=submission, pk=current_subject_id).first()
-                if subject_row is None and current_subject_index:
-                    try:
-                        idx_value = int(current_subject_index)
-                    except (TypeError, ValueError):
-                        idx_value = None
-                if idx_value is None and current_subject_prefix:
-                    try:
-                        idx_value = int(current_subject_prefix.split('-')[1])
-                    except (IndexError, ValueError):
-                        idx_value = None
-                if subject_row is None and idx_value is not None:
-                    rows = list(Form1SLPRow.objects.filter(submission=submission).order_by('id'))
-                    if 0 <= idx_value < len(rows):
-                        subject_row = rows[idx_value]
-                if not subject_row:
-                    messages.error(request, "Unable to determine which subject to save.")
-                else:
-                    # Snapshot BEFORE state for all rows (diagnostic only)
-                    pre_rows_snapshot = []
-                    try:
-                        pre_rows_snapshot = list(Form1SLPRow.objects.filter(submission=submission).values(
-                            'id','grade_label','subject','enrolment','dnme','fs','s','vs','o','is_offered',
-                            'top_three_llc','intervention_plan','non_mastery_reasons','non_mastery_other'
-                        ))
-                    except Exception:
-                        pre_rows_snapshot = []
-                    prefix = current_subject_prefix or f"slp_rows-{idx_value if idx_value is not None else 0}"
-                    # Server safeguard: ensure prefix matches the actual index of the target row; if mismatch, abort update.
-                    if idx_value is not None and not prefix.endswith(str(idx_value)):
-                        logger.warning("[SLP][fast-path] prefix/index mismatch; refusing to update row=%d prefix=%s idx=%s", subject_row.id, prefix, idx_value)
-                        messages.error(request, "Subject prefix mismatch; changes not applied.")
-                        prefix_mismatch = True
-                    else:
-                        prefix_mismatch = False
-                    post = request.POST
-                    # Parse numeric proficiency + enrolment
-                    try:
-                        dnme_v = int(post.get(f"{prefix}-dnme") or 0)
-                        fs_v = int(post.get(f"{prefix}-fs") or 0)
-                        s_v = int(post.get(f"{prefix}-s") or 0)
-                        vs_v = int(post.get(f"{prefix}-vs") or 0)
-                        o_v = int(post.get(f"{prefix}-o") or 0)
-                    except (TypeError, ValueError):
-                        dnme_v = fs_v = s_v = vs_v = o_v = 0
-                    enrol_raw = post.get(f"{prefix}-enrolment")
-                    try:
-                        enrol_v = int(enrol_raw) if enrol_raw not in {None, '', '0'} else 0
-                    except (TypeError, ValueError):
-                        enrol_v = 0
-                    prof_sum = dnme_v + fs_v + s_v + vs_v + o_v
-                    if enrol_v == 0 and prof_sum > 0:
-                        enrol_v = prof_sum
-                    elif prof_sum > enrol_v and enrol_v > 0:
-                        enrol_v = prof_sum
-                    # Basic integrity: do not allow proficiency sum > enrolment on offered subject (after auto-adjust this should hold)
-                    is_offered_flag = post.get(f"{prefix}-is_offered")
-                    is_offered_v = bool(is_offered_flag) if is_offered_flag is not None else subject_row.is_offered
-                    try:
-                        logger.info(
-                            "[SLP][fast-path] is_offered evaluation row=%d prefix=%s posted=%s resulting=%s existing=%s",
-                            subject_row.id, prefix, is_offered_flag, is_offered_v, subject_row.is_offered
-                        )
-                    except Exception:
-                        pass
-                    # Collate changed fields
-                    changed = {}
-                    if subject_row.enrolment != enrol_v: changed['enrolment'] = enrol_v
-                    if subject_row.dnme != dnme_v: changed['dnme'] = dnme_v
-                    if subject_row.fs != fs_v: changed['fs'] = fs_v
-                    if subject_row.s != s_v: changed['s'] = s_v
-                    if subject_row.vs != vs_v: changed['vs'] = vs_v
-                    if subject_row.o != o_v: changed['o'] = o_v
-                    if subject_row.is_offered != is_offered_v: changed['is_offered'] = is_offered_v
-                    top_llc = post.get(f"{prefix}-top_three_llc")
-                    if top_llc is not None and top_llc.strip() != '' and top_llc != (subject_row.top_three_llc or ''):
-                        changed['top_three_llc'] = top_llc
-                    interv_plan = post.get(f"{prefix}-intervention_plan")
-                    if interv_plan is not None and interv_plan.strip() != '' and interv_plan != (subject_row.intervention_plan or ''):
-                        changed['intervention_plan'] = interv_plan
-                    nm_codes_key = f"{prefix}-non_mastery_reasons"
-                    nm_other_key = f"{prefix}-non_mastery_other"
-                    if nm_codes_key in post:
-                        val = post.get(nm_codes_key, '')
-                        if val != (subject_row.non_mastery_reasons or ''):
-                            changed['non_mastery_reasons'] = val
-                    if nm_other_key in post:
-                        val = post.get(nm_other_key, '')
-                        if val != (subject_row.non_mastery_other or ''):
-                            changed['non_mastery_other'] = val
-                    if changed:
-                        if not prefix_mismatch:
-                            Form1SLPRow.objects.filter(pk=subject_row.pk).update(**changed)
-                            for k, v in changed.items(): setattr(subject_row, k, v)
-                        else:
-                            changed.clear()
-                    # Analysis (only if any analysis fields posted)
-                    if idx_value is None:
+                        sval = str(val).lower()
+                        if sval not in {"1", "true", "on", "yes", "checked"}:
+                            continue
+                        any_activity_delete_flag = True
+                        id_name = key[:-7] + '-id'  # replace -DELETE with -id
+                        obj_id = request.POST.get(id_name)
+                        print(f"[DIAGNOSTIC] Found DELETE: {key} (id field: {id_name} = {obj_id})")
                         try:
-                            idx_value = int(prefix.split('-')[1])
-                        except (IndexError, ValueError):
-                            idx_value = None
-                    if idx_value is not None:
-                        analysis_defaults = {
-                            'dnme_factors': post.get(f'slp_analysis_{idx_value}_dnme_factors', ''),
-                            'fs_factors': post.get(f'slp_analysis_{idx_value}_fs_factors', ''),
-                            's_practices': post.get(f'slp_analysis_{idx_value}_s_practices', ''),
-                            'vs_practices': post.get(f'slp_analysis_{idx_value}_vs_practices', ''),
-                            'o_practices': post.get(f'slp_analysis_{idx_value}_o_practices', ''),
-                            'overall_strategy': post.get(f'slp_analysis_{idx_value}_overall_strategy', ''),
-                        }
-                        if any(v.strip() for v in analysis_defaults.values()):
-                            Form1SLPAnalysis.objects.update_or_create(slp_row=subject_row, defaults=analysis_defaults)
-                    success = True
-                    t1 = time.perf_counter()
-                    # Snapshot AFTER and compute unintended changes to other rows
+                            obj_pk = int(obj_id) if obj_id is not None else None
+                        except (TypeError, ValueError):
+                            obj_pk = None
+                        if obj_pk:
+                            ids_to_delete.append(obj_pk)
+
+                    # Fallback: if TOTAL_FORMS < INITIAL_FORMS and a row id has no matching DELETE,
+                    # treat it as a deletion (some browsers may not post the DELETE field reliably)
                     try:
-                        post_rows_snapshot = list(Form1SLPRow.objects.filter(submission=submission).values(
-                            'id','grade_label','subject','enrolment','dnme','fs','s','vs','o','is_offered',
-                            'top_three_llc','intervention_plan','non_mastery_reasons','non_mastery_other'
-                        ))
-                        by_id_pre = {r['id']: r for r in pre_rows_snapshot}
-                        unintended = []
-                        for r in post_rows_snapshot:
-                            if r['id'] == subject_row.id:
+                        import re
+                        totals: dict[str, int] = {}
+                        initials: dict[str, int] = {}
+                        for k, v in request.POST.items():
+                            if k.startswith('activities_') and k.endswith('-TOTAL_FORMS'):
+                                totals[k[:-12]] = int(v) if str(v).isdigit() else 0
+                            elif k.startswith('activities_') and k.endswith('-INITIAL_FORMS'):
+                                initials[k[:-14]] = int(v) if str(v).isdigit() else 0
+                        id_row_re = re.compile(r'^(activities_\d+)-(\d+)-id$')
+                        for k, v in request.POST.items():
+                            m = id_row_re.match(k)
+                            if not m:
                                 continue
-                            pre = by_id_pre.get(r['id'])
-                            if not pre:
+                            prefix, idx = m.group(1), m.group(2)
+                            tot = totals.get(prefix)
+                            ini = initials.get(prefix)
+                            if tot is None or ini is None:
                                 continue
-                            # Detect any diff in non-target row
-                            diff_fields = [f for f in r.keys() if f != 'id' and pre.get(f) != r.get(f)]
-                            if diff_fields:
-                                unintended.append({'id': r['id'], 'fields': diff_fields})
-                        if unintended:
-                            logger.warning(
-                                "[SLP][fast-path] unintended cross-row modifications submission=%d target_row=%d unintended=%s",
-                                submission.id, subject_row.id, unintended
-                            )
-                    except Exception:
-                        pass
-                    try:
-                        logger.info(
-                            "[PERF][SLP] save_subject fast-path: %.2f ms queries=%d changed=%d", (t1 - t0) * 1000, len(connection.queries), len(changed)
-                        )
-                    except Exception:
-                        pass
-                    if not is_autosave:
-                        messages.success(request, f"Saved {subject_row.grade_label} - {subject_row.get_subject_display()}")
-            
-            elif current_tab == "slp":
-                # Validate core SLP rows; top lists are optional (not rendered in current UI)
-                core_valid = slp_formset.is_valid()
-                # Enforce aggregate equality only on explicit draft save / submit (not autosave)
-                if core_valid and not is_autosave and action in {"save_draft", "submit_submission"}:
-                    for form in slp_formset.forms:
-                        if not hasattr(form, "cleaned_data"):
-                            continue
-                        cd = getattr(form, "cleaned_data", {}) or {}
-                        if not cd.get("is_offered", True):
+                            if tot < ini:
+                                del_key = f"{prefix}-{idx}-DELETE"
+                                if del_key not in request.POST:
+                                    try:
+                                        obj_pk = int(v) if v is not None else None
+                                    except (TypeError, ValueError):
+                                        obj_pk = None
+                                    if obj_pk:
+                                        ids_to_delete.append(obj_pk)
+                    except Exception as e:
+                        print(f"[DIAGNOSTIC] Exception in fallback delete logic: {e}")
+                    print(f"[DIAGNOSTIC] ids_to_delete: {ids_to_delete}")
+                    print(f"[DIAGNOSTIC] Activities before delete: {list(SMEAActivityRow.objects.filter(project__submission=submission).values_list('id', flat=True))}")
+                    if ids_to_delete:
+                        # Diagnostic: show activities to be deleted
+                        print(f"[DIAGNOSTIC] Attempting to delete activities with ids: {ids_to_delete}")
+                        before_qs = list(SMEAActivityRow.objects.filter(id__in=ids_to_delete, project__submission=submission).values('id', 'activity', 'project_id'))
+                        print(f"[DIAGNOSTIC] Activities found before delete: {before_qs}")
+                        SMEAActivityRow.objects.filter(id__in=ids_to_delete, project__submission=submission).delete()
+                        after_qs = list(SMEAActivityRow.objects.filter(id__in=ids_to_delete, project__submission=submission).values('id', 'activity', 'project_id'))
+                        print(f"[DIAGNOSTIC] Activities found after delete: {after_qs}")
+                        print(f"[DIAGNOSTIC] All activities after delete: {list(SMEAActivityRow.objects.filter(project__submission=submission).values_list('id', flat=True))}")
+                        success = True
+                    elif any_activity_delete_flag:
+                        # All flagged were unsaved rows; still treat as success to redirect away
+                        print("[DIAGNOSTIC] All flagged for delete were unsaved rows.")
+                        success = True
+
+                    # Safety net for project deletions as well (in case formset save didn't run)
+                    proj_ids_to_delete: list[int] = []
+                    any_project_delete_flag = False
+                    for key, val in request.POST.items():
+                        if not key.startswith('projects-') or not key.endswith('-DELETE'):
                             continue
-                        enrol = cd.get("enrolment") or 0
-                        if not enrol:
+                        sval = str(val).lower()
+                        if sval not in {"1", "true", "on", "yes", "checked"}:
                             continue
-                        total = sum([
-                            cd.get("dnme") or 0,
-                            cd.get("fs") or 0,
-                            cd.get("s") or 0,
-                            cd.get("vs") or 0,
-                            cd.get("o") or 0,
-                        ])
-                        if total != enrol:
-                            form.add_error(None, f"Sum of proficiency counts ({total}) must equal enrolment ({enrol}) for {form.instance.grade_label} - {form.instance.get_subject_display()}.")
-                            core_valid = False
-                dnme_valid = (not slp_top_dnme_formset.is_bound) or slp_top_dnme_formset.is_valid()
-                out_valid = (not slp_top_outstanding_formset.is_bound) or slp_top_outstanding_formset.is_valid()
-                if core_valid and dnme_valid and out_valid:
-                    # Save SLP row data
-                    slp_rows = slp_formset.save()
-                    
-                    # Save per-row analysis data
-                    for idx, slp_row in enumerate(slp_rows):
-                        # Get analysis fields for this row
-                        dnme_factors = request.POST.get(f'slp_analysis_{idx}_dnme_factors', '')
-                        fs_factors = request.POST.get(f'slp_analysis_{idx}_fs_factors', '')
-                        s_practices = request.POST.get(f'slp_analysis_{idx}_s_practices', '')
-                        vs_practices = request.POST.get(f'slp_analysis_{idx}_vs_practices', '')
-                        o_practices = request.POST.get(f'slp_analysis_{idx}_o_practices', '')
-                        overall_strategy = request.POST.get(f'slp_analysis_{idx}_overall_strategy', '')
-                        
-                        # Persist non-mastery reasons (Q2) posted via hidden fields alongside row
+                        any_project_delete_flag = True
+                        id_name = key[:-7] + '-id'  # projects-<idx>-id (corrected)
+                        obj_id = request.POST.get(id_name)
+                        try:
+                            obj_pk = int(obj_id) if obj_id is not None else None
+                        except (TypeError, ValueError):
+                            obj_pk = None
+                        if obj_pk:
+                            proj_ids_to_delete.append(obj_pk)
+                    if proj_ids_to_delete:
+                        SMEAProject.objects.filter(id__in=proj_ids_to_delete, submission=submission).delete()
+                        success = True
+                    elif any_project_delete_flag:
+                        # Deleted forms were new/unsaved; still consider operation successful
+                        success = True
+                elif current_tab == "pct":
+                    if tab_forms["pct_formset"].is_valid():
+                        save_formset_diff(tab_forms["pct_formset"], save_stats)
+                        success = True
+                elif current_tab == "slp" and action == "save_subject":
+                    # Optimized fast-path: manual parse + selective queryset update, minimal validation.
+                    t0 = time.perf_counter()
+                    next_tab = "slp"
+                    subject_row = None
+                    idx_value = None
+                    if current_subject_id:
+                        subject_row = Form1SLPRow.objects.select_related("analysis").filter(submission=submission, pk=current_subject_id).first()
+                    if subject_row is None and current_subject_index:
+                        try:
+                            idx_value = int(current_subject_index)
+                        except (TypeError, ValueError):
+                            idx_value = None
+                    if idx_value is None and current_subject_prefix:
+                        try:
+                            idx_value = int(current_subject_prefix.split('-')[1])
+                        except (IndexError, ValueError):
+                            idx_value = None
+                    if subject_row is None and idx_value is not None:
+                        rows = list(Form1SLPRow.objects.filter(submission=submission).order_by('id'))
+                        if 0 <= idx_value < len(rows):
+                            subject_row = rows[idx_value]
+                    if not subject_row:
+                        messages.error(request, "Unable to determine which subject to save.")
+                    else:
+                        # Snapshot BEFORE state for all rows (diagnostic only)
+                        pre_rows_snapshot = []
                         try:
-                            nm_codes = request.POST.get(f'{slp_formset.prefix}-{idx}-non_mastery_reasons', '')
-                            nm_other = request.POST.get(f'{slp_formset.prefix}-{idx}-non_mastery_other', '')
-                            if nm_codes is not None:
-                                slp_row.non_mastery_reasons = nm_codes
-                            if nm_other is not None:
-                                slp_row.non_mastery_other = nm_other
-                            slp_row.save(update_fields=['non_mastery_reasons','non_mastery_other'])
+                            pre_rows_snapshot = list(Form1SLPRow.objects.filter(submission=submission).values(
+                                'id','grade_label','subject','enrolment','dnme','fs','s','vs','o','is_offered',
+                                'top_three_llc','intervention_plan','non_mastery_reasons','non_mastery_other'
+                            ))
                         except Exception:
-                            pass
-                        # Create or update analysis record
-                        analysis, created = Form1SLPAnalysis.objects.update_or_create(
-                            slp_row=slp_row,
-                            defaults={
-                                'dnme_factors': dnme_factors,
-                                'fs_factors': fs_factors,
-                                's_practices': s_practices,
-                                'vs_practices': vs_practices,
-                                'o_practices': o_practices,
-                                'overall_strategy': overall_strategy,
-                            }
-                        )
-                    
-                    if slp_top_dnme_formset.is_bound:
-                        slp_top_dnme_formset.save()
-                    if slp_top_outstanding_formset.is_bound:
-                        slp_top_outstanding_formset.save()
-                    success = True
-            elif current_tab == "reading":
-                # Use new matrix-based formsets; treat absent sections as optional
-                crla_valid = (not reading_crla_new_formset.is_bound) or reading_crla_new_formset.is_valid()
-                philiri_valid = (not reading_philiri_new_formset.is_bound) or reading_philiri_new_formset.is_valid()
-                interventions_valid = (not reading_interventions_new_formset.is_bound) or reading_interventions_new_formset.is_valid()
-                if crla_valid and philiri_valid and interventions_valid:
-                    for formset in [reading_crla_new_formset, reading_philiri_new_formset, reading_interventions_new_formset]:
-                        if not formset.is_bound:
-                            continue
-                        instances = formset.save(commit=False)
-                        for instance in instances:
-                            instance.submission = submission
-                            instance.save()
-                        formset.save_m2m()
-                    # Persist reading difficulties JSON (paired difficulties/interventions per grade)
-                    rd_json = request.POST.get('reading_difficulties_json')
-                    if rd_json is not None:
+                            pre_rows_snapshot = []
+                        prefix = current_subject_prefix or f"slp_rows-{idx_value if idx_value is not None else 0}"
+                        # Server safeguard: ensure prefix matches the actual index of the target row; if mismatch, abort update.
+                        if idx_value is not None and not prefix.endswith(str(idx_value)):
+                            logger.warning("[SLP][fast-path] prefix/index mismatch; refusing to update row=%d prefix=%s idx=%s", subject_row.id, prefix, idx_value)
+                            messages.error(request, "Subject prefix mismatch; changes not applied.")
+                            prefix_mismatch = True
+                        else:
+                            prefix_mismatch = False
+                        post = request.POST
+                        # Parse numeric proficiency + enrolment
+                        try:
+                            dnme_v = int(post.get(f"{prefix}-dnme") or 0)
+                            fs_v = int(post.get(f"{prefix}-fs") or 0)
+                            s_v = int(post.get(f"{prefix}-s") or 0)
+                            vs_v = int(post.get(f"{prefix}-vs") or 0)
+                            o_v = int(post.get(f"{prefix}-o") or 0)
+                        except (TypeError, ValueError):
+                            dnme_v = fs_v = s_v = vs_v = o_v = 0
+                        enrol_raw = post.get(f"{prefix}-enrolment")
+                        try:
+                            enrol_v = int(enrol_raw) if enrol_raw not in {None, '', '0'} else 0
+                        except (TypeError, ValueError):
+                            enrol_v = 0
+                        prof_sum = dnme_v + fs_v + s_v + vs_v + o_v
+                        if enrol_v == 0 and prof_sum > 0:
+                            enrol_v = prof_sum
+                        elif prof_sum > enrol_v and enrol_v > 0:
+                            enrol_v = prof_sum
+                        # Basic integrity: do not allow proficiency sum > enrolment on offered subject (after auto-adjust this should hold)
+                        is_offered_flag = post.get(f"{prefix}-is_offered")
+                        is_offered_v = bool(is_offered_flag) if is_offered_flag is not None else subject_row.is_offered
                         try:
-                            parsed = json.loads(rd_json) if rd_json.strip() else []
+                            logger.info(
+                                "[SLP][fast-path] is_offered evaluation row=%d prefix=%s posted=%s resulting=%s existing=%s",
+                                subject_row.id, prefix, is_offered_flag, is_offered_v, subject_row.is_offered
+                            )
                         except Exception:
-                            parsed = []
-                        # Persist raw JSON first
+                            pass
+                        # Collate changed fields
+                        changed = {}
+                        if subject_row.enrolment != enrol_v: changed['enrolment'] = enrol_v
+                        if subject_row.dnme != dnme_v: changed['dnme'] = dnme_v
+                        if subject_row.fs != fs_v: changed['fs'] = fs_v
+                        if subject_row.s != s_v: changed['s'] = s_v
+                        if subject_row.vs != vs_v: changed['vs'] = vs_v
+                        if subject_row.o != o_v: changed['o'] = o_v
+                        if subject_row.is_offered != is_offered_v: changed['is_offered'] = is_offered_v
+                        top_llc = post.get(f"{prefix}-top_three_llc")
+                        if top_llc is not None and top_llc.strip() != '' and top_llc != (subject_row.top_three_llc or ''):
+                            changed['top_three_llc'] = top_llc
+                        interv_plan = post.get(f"{prefix}-intervention_plan")
+                        if interv_plan is not None and interv_plan.strip() != '' and interv_plan != (subject_row.intervention_plan or ''):
+                            changed['intervention_plan'] = interv_plan
+                        nm_codes_key = f"{prefix}-non_mastery_reasons"
+                        nm_other_key = f"{prefix}-non_mastery_other"
+                        if nm_codes_key in post:
+                            val = post.get(nm_codes_key, '')
+                            if val != (subject_row.non_mastery_reasons or ''):
+                                changed['non_mastery_reasons'] = val
+                        if nm_other_key in post:
+                            val = post.get(nm_other_key, '')
+                            if val != (subject_row.non_mastery_other or ''):
+                                changed['non_mastery_other'] = val
+                        if changed:
+                            if not prefix_mismatch:
+                                Form1SLPRow.objects.filter(pk=subject_row.pk).update(**changed)
+                                for k, v in changed.items(): setattr(subject_row, k, v)
+                            else:
+                                changed.clear()
+                        persisted_refs = set() if prefix_mismatch else {f"slp_row:{subject_row.pk}"}
+                        # Analysis (only if any analysis fields posted)
+                        if idx_value is None:
+                            try:
+                                idx_value = int(prefix.split('-')[1])
+                            except (IndexError, ValueError):
+                                idx_value = None
+                        if idx_value is not None:
+                            analysis_defaults = {
+                                'dnme_factors': post.get(f'slp_analysis_{idx_value}_dnme_factors', ''),
+                                'fs_factors': post.get(f'slp_analysis_{idx_value}_fs_factors', ''),
+                                's_practices': post.get(f'slp_analysis_{idx_value}_s_practices', ''),
+                                'vs_practices': post.get(f'slp_analysis_{idx_value}_vs_practices', ''),
+                                'o_practices': post.get(f'slp_analysis_{idx_value}_o_practices', ''),
+                                'overall_strategy': post.get(f'slp_analysis_{idx_value}_overall_strategy', ''),
+                            }
+                            if any(v.strip() for v in analysis_defaults.values()):
+                                Form1SLPAnalysis.objects.update_or_create(slp_row=subject_row, defaults=analysis_defaults)
+                        success = True
+                        t1 = time.perf_counter()
+                        # Snapshot AFTER and compute unintended changes to other rows
                         try:
-                            data = dict(submission.data or {})
-                            data['reading_difficulties_json'] = parsed
-                            submission.data = data
-                            submission.save(update_fields=['data'])
+                            post_rows_snapshot = list(Form1SLPRow.objects.filter(submission=submission).values(
+                                'id','grade_label','subject','enrolment','dnme','fs','s','vs','o','is_offered',
+                                'top_three_llc','intervention_plan','non_mastery_reasons','non_mastery_other'
+                            ))
+                            by_id_pre = {r['id']: r for r in pre_rows_snapshot}
+                            unintended = []
+                            for r in post_rows_snapshot:
+                                if r['id'] == subject_row.id:
+                                    continue
+                                pre = by_id_pre.get(r['id'])
+                                if not pre:
+                                    continue
+                                # Detect any diff in non-target row
+                                diff_fields = [f for f in r.keys() if f != 'id' and pre.get(f) != r.get(f)]
+                                if diff_fields:
+                                    unintended.append({'id': r['id'], 'fields': diff_fields})
+                            if unintended:
+                                logger.warning(
+                                    "[SLP][fast-path] unintended cross-row modifications submission=%d target_row=%d unintended=%s",
+                                    submission.id, subject_row.id, unintended
+                                )
                         except Exception:
                             pass
-                        # Sync into structured model rows
                         try:
-                            update_reading_difficulty_plans(submission, selected_reading_period, parsed)
+                            logger.info(
+                                "[PERF][SLP] save_subject fast-path: %.2f ms queries=%d changed=%d", (t1 - t0) * 1000, len(connection.queries), len(changed)
+                            )
                         except Exception:
                             pass
-                    success = True
-                else:
-                    # Keep errors inline near the forms only (no global banner)
-                    pass
-            elif current_tab == "rma":
-                rows_valid = rma_row_formset.is_valid()
-                interventions_valid = rma_intervention_formset.is_valid()
-                if rows_valid and not is_autosave and action in {"save_draft", "submit_submission"}:
-                    for form in rma_row_formset.forms:
-                        if not hasattr(form, "cleaned_data"):
-                            continue
-                        cd = getattr(form, "cleaned_data", {}) or {}
-                        enrol = cd.get("enrolment") or 0
-                        if not enrol:
-                            continue
-                        total = sum([
-                            cd.get("emerging_not_proficient") or 0,
-                            cd.get("emerging_low_proficient") or 0,
-                            cd.get("developing_nearly_proficient") or 0,
-                            cd.get("transitioning_proficient") or 0,
-                            cd.get("at_grade_level") or 0,
-                        ])
-                        if total != enrol:
-                            # Attempt to get display label
+                        if not is_autosave:
+                            messages.success(request, f"Saved {subject_row.grade_label} - {subject_row.get_subject_display()}")
+            
+                elif current_tab == "slp":
+                    # Validate core SLP rows; top lists are optional (not rendered in current UI)
+                    core_valid = tab_forms["slp_formset"].is_valid()
+                    # Enforce aggregate equality only on explicit draft save / submit (not autosave)
+                    if core_valid and not is_autosave and action in {"save_draft", "submit_submission"}:
+                        for form in tab_forms["slp_formset"].forms:
+                            if not hasattr(form, "cleaned_data"):
+                                continue
+                            cd = getattr(form, "cleaned_data", {}) or {}
+                            if not cd.get("is_offered", True):
+                                continue
+                            enrol = cd.get("enrolment") or 0
+                            if not enrol:
+                                continue
+                            total = sum([
+                                cd.get("dnme") or 0,
+                                cd.get("fs") or 0,
+                                cd.get("s") or 0,
+                                cd.get("vs") or 0,
+                                cd.get("o") or 0,
+                            ])
+                            if total != enrol:
+                                form.add_error(None, f"Sum of proficiency counts ({total}) must equal enrolment ({enrol}) for {form.instance.grade_label} - {form.instance.get_subject_display()}.")
+                                core_valid = False
+                    dnme_valid = (not tab_forms["slp_top_dnme_formset"].is_bound) or tab_forms["slp_top_dnme_formset"].is_valid()
+                    out_valid = (not tab_forms["slp_top_outstanding_formset"].is_bound) or tab_forms["slp_top_outstanding_formset"].is_valid()
+                    if core_valid and dnme_valid and out_valid:
+                        # Save SLP row data. The posted non_mastery_* storage fields are
+                        # model fields on the form, so the diff covers them directly.
+                        save_formset_diff(tab_forms["slp_formset"], save_stats)
+                        save_slp_analyses(request, submission, tab_forms["slp_formset"], save_stats)
+
+                        if tab_forms["slp_top_dnme_formset"].is_bound:
+                            save_formset_diff(tab_forms["slp_top_dnme_formset"], save_stats)
+                        if tab_forms["slp_top_outstanding_formset"].is_bound:
+                            save_formset_diff(tab_forms["slp_top_outstanding_formset"], save_stats)
+                        success = True
+                elif current_tab == "reading":
+                    # Use new matrix-based formsets; treat absent sections as optional
+                    crla_valid = (not tab_forms["reading_crla_new_formset"].is_bound) or tab_forms["reading_crla_new_formset"].is_valid()
+                    philiri_valid = (not tab_forms["reading_philiri_new_formset"].is_bound) or tab_forms["reading_philiri_new_formset"].is_valid()
+                    interventions_valid = (not tab_forms["reading_interventions_new_formset"].is_bound) or tab_forms["reading_interventions_new_formset"].is_valid()
+                    if crla_valid and philiri_valid and interventions_valid:
+                        for formset in [tab_forms["reading_crla_new_formset"], tab_forms["reading_philiri_new_formset"], tab_forms["reading_interventions_new_formset"]]:
+                            if not formset.is_bound:
+                                continue
+                            save_formset_diff(formset, save_stats, submission=submission)
+                        # Persist reading difficulties JSON (paired difficulties/interventions per grade)
+                        rd_json = request.POST.get('reading_difficulties_json')
+                        if rd_json is not None:
                             try:
-                                grade_display = form.instance.get_grade_label_display()
+                                parsed = json.loads(rd_json) if rd_json.strip() else []
                             except Exception:
-                                grade_display = form.instance.grade_label
-                            form.add_error(None, f"Sum of proficiency counts ({total}) must equal enrolment ({enrol}) for grade {grade_display}.")
-                            rows_valid = False
-                if rows_valid and interventions_valid:
-                    rma_row_formset.save()
-                    # Persist new RMA structured difficulties/interventions JSON (optional)
-                    try:
-                        pre_json = request.POST.get('rma_pretest_json')
-                        eosy_json = request.POST.get('rma_eosy_json')
-                        data = dict(submission.data or {})
-                        if pre_json is not None:
+                                parsed = []
+                            # Persist raw JSON first
                             try:
-                                data['rma_pretest_json'] = json.loads(pre_json) if pre_json.strip() else []
+                                data = dict(submission.data or {})
+                                data['reading_difficulties_json'] = parsed
+                                submission.data = data
+                                submission.save(update_fields=['data'])
                             except Exception:
-                                data['rma_pretest_json'] = []
-                        if eosy_json is not None:
+                                pass
+                            # Sync into structured model rows
                             try:
-                                data['rma_eosy_json'] = json.loads(eosy_json) if eosy_json.strip() else []
+                                update_reading_difficulty_plans(submission, selected_reading_period, parsed)
                             except Exception:
-                                data['rma_eosy_json'] = []
-                        if pre_json is not None or eosy_json is not None:
-                            submission.data = data
-                            submission.save(update_fields=['data'])
-                    except Exception:
-                        pass
-                    # Keep saving legacy interventions if posted/bound
-                    try:
-                        rma_intervention_formset.save()
-                    except Exception:
+                                pass
+                        success = True
+                    else:
+                        # Keep errors inline near the forms only (no global banner)
                         pass
-                    success = True
-            elif current_tab == "supervision":
-                if supervision_formset.is_valid() and signatories_form.is_valid():
-                    # Save supervision formset with proper submission assignment
-                    instances = supervision_formset.save(commit=False)
-                    for instance in instances:
-                        instance.submission = submission
-                        instance.save()
-                    supervision_formset.save_m2m()
-                    signatories_form.save()
-                    success = True
-            elif current_tab == "adm":
-                # Save ADM header form first
-                if adm_header_form and adm_header_form.is_valid():
-                    adm_header_form.save()
-                # Then save ADM formset if it exists
-                if adm_formset is not None and adm_formset.is_valid():
-                    # Save ADM formset with proper submission assignment
-                    instances = adm_formset.save(commit=False)
-                    for instance in instances:
-                        instance.submission = submission
-                        instance.save()
-                    for obj in adm_formset.deleted_objects:
-                        obj.delete()
-                    adm_formset.save_m2m()
-                    success = True
-                elif adm_formset is None:
-                    # If ADM formset doesn't exist but header form was valid, still count as success
-                    success = adm_header_form and adm_header_form.is_valid()
+                elif current_tab == "rma":
+                    rows_valid = tab_forms["rma_row_formset"].is_valid()
+                    interventions_valid = tab_forms["rma_intervention_formset"].is_valid()
+                    if rows_valid and not is_autosave and action in {"save_draft", "submit_submission"}:
+                        for form in tab_forms["rma_row_formset"].forms:
+                            if not hasattr(form, "cleaned_data"):
+                                continue
+                            cd = getattr(form, "cleaned_data", {}) or {}
+                            enrol = cd.get("enrolment") or 0
+                            if not enrol:
+                                continue
+                            total = sum([
+                                cd.get("emerging_not_proficient") or 0,
+                                cd.get("emerging_low_proficient") or 0,
+                                cd.get("developing_nearly_proficient") or 0,
+                                cd.get("transitioning_proficient") or 0,
+                                cd.get("at_grade_level") or 0,
+                            ])
+                            if total != enrol:
+                                # Attempt to get display label
+                                try:
+                                    grade_display = form.instance.get_grade_label_display()
+                                except Exception:
+                                    grade_display = form.instance.grade_label
+                                form.add_error(None, f"Sum of proficiency counts ({total}) must equal enrolment ({enrol}) for grade {grade_display}.")
+                                rows_valid = False
+                    if rows_valid and interventions_valid:
+                        save_formset_diff(tab_forms["rma_row_formset"], save_stats)
+                        # Persist new RMA structured difficulties/interventions JSON (optional)
+                        try:
+                            pre_json = request.POST.get('rma_pretest_json')
+                            eosy_json = request.POST.get('rma_eosy_json')
+                            data = dict(submission.data or {})
+                            if pre_json is not None:
+                                try:
+                                    data['rma_pretest_json'] = json.loads(pre_json) if pre_json.strip() else []
+                                except Exception:
+                                    data['rma_pretest_json'] = []
+                            if eosy_json is not None:
+                                try:
+                                    data['rma_eosy_json'] = json.loads(eosy_json) if eosy_json.strip() else []
+                                except Exception:
+                                    data['rma_eosy_json'] = []
+                            if pre_json is not None or eosy_json is not None:
+                                submission.data = data
+                                submission.save(update_fields=['data'])
+                        except Exception:
+                            pass
+                        # Keep saving legacy interventions if posted/bound
+                        try:
+                            save_formset_diff(tab_forms["rma_intervention_formset"], save_stats)
+                        except Exception:
+                            pass
+                        success = True
+                elif current_tab == "supervision":
+                    if tab_forms["supervision_formset"].is_valid() and tab_forms["signatories_form"].is_valid():
+                        # Save supervision formset with proper submission assignment
+                        save_formset_diff(tab_forms["supervision_formset"], save_stats, submission=submission)
+                        tab_forms["signatories_form"].save()
+                        success = True
+                elif current_tab == "adm":
+                    # Save ADM header form first
+                    if tab_forms["adm_header_form"] and tab_forms["adm_header_form"].is_valid():
+                        tab_forms["adm_header_form"].save()
+                    # Then save ADM formset if it exists
+                    if tab_forms["adm_formset"] is not None and tab_forms["adm_formset"].is_valid():
+                        # Save ADM formset with proper submission assignment
+                        save_formset_diff(tab_forms["adm_formset"], save_stats, submission=submission)
+                        success = True
+                    elif tab_forms["adm_formset"] is None:
+                        # If ADM formset doesn't exist but header form was valid, still count as success
+                        success = tab_forms["adm_header_form"] and tab_forms["adm_header_form"].is_valid()
+
+                if success:
+                    submission.last_modified_by = request.user
+                    submission.refresh_completion([current_tab] if current_tab in SECTION_KEYS else [], save=False)
+                    submission.save(update_fields=[
+                        "last_modified_by",
+                        "updated_at",
+                        "completion_progress",
+                        "completion_sections",
+                        "completion_updated_at",
+                    ])
+                    if persisted_refs is None:
+                        persisted_refs = submission_autosave.posted_row_refs(
+                            value for key, value in tab_forms.items() if key.endswith("_formset") and value is not None
+                        )
+                    submission_drafts.discard_rows(submission, persisted_refs)
 
             if success:
-                submission.last_modified_by = request.user
-                submission.save(update_fields=["last_modified_by", "updated_at"])
+                logger.info(
+                    "[PERF][SAVE] submission=%s tab=%s autosave=%s %s",
+                    submission.pk, current_tab, is_autosave, save_stats,
+                )
                 if not is_autosave:
                     messages.success(request, "Changes saved.")
                 # Preserve reading period when navigating to the Reading tab
@@ -1724,121 +1944,49 @@ def edit_submission(request, submission_id, submission_obj=None):
                     return redirect(f"{reverse('edit_submission', args=[submission.id])}?tab={next_tab}&reading_period={selected_reading_period}")
                 return redirect(f"{reverse('edit_submission', args=[submission.id])}?tab={next_tab}")
 
-    projects = submission.smea_projects.prefetch_related("activities").all()
-    timeline_entries = list(submission.timeline.all()[:10])
-    school_profile = getattr(school, "profile", None)
-    school_profile_strands = ", ".join(school_profile.strands) if getattr(school_profile, "strands", None) else ""
-    # Compute SHS selected/unselected strand prefixes for UI filtering (Grade 11/12 specialized subjects)
-    try:
-        raw_selected = set(getattr(school_profile, "strands", []) or [])
-    except Exception:
-        raw_selected = set()
-    code_to_prefix = {c: p for (c, _label, p) in smea_constants.SHS_STRANDS}
-    code_to_label = {c: l for (c, l, _p) in smea_constants.SHS_STRANDS}
-    label_to_code = {l: c for (c, l, _p) in smea_constants.SHS_STRANDS}
-    # Normalize selections: allow either codes (e.g., 'stem') or labels (e.g., 'STEM')
-    selected_codes = set()
-    for item in raw_selected:
-        if item in code_to_prefix:
-            selected_codes.add(item)
-        elif item in label_to_code:
-            selected_codes.add(label_to_code[item])
-    shs_selected_prefixes = [code_to_prefix[c] for c in selected_codes if c in code_to_prefix]
-    shs_unselected_prefixes = [p for (c, _l, p) in smea_constants.SHS_STRANDS if c not in selected_codes]
-    shs_selected_labels = [code_to_label[c] for c in selected_codes if c in code_to_label]
+    ctx = _edit_submission_context(request, submission, tabs, current_tab, tab_forms, selected_reading_period)
+    ctx["unsaved_cells"] = unsaved_cells
+    return render(request, "submissions/edit_submission.html", ctx)
 
-    expected_timings = EXPECTED_TIMINGS_BY_QUARTER.get(submission.period.quarter_tag, [])
 
-    # Add grade span information for reading assessment tables
-    grade_span_start, grade_span_end = _resolve_grade_span(school)
-    school_grades = grade_numbers_for_school(school) if school else []
-    
-    # Determine which CRLA grades to show (1-3 are the CRLA grades)
-    crla_grades = [g for g in [1, 2, 3] if g in school_grades] if school_grades else [1, 2, 3]
-    
-    # Determine which PHILIRI grades to show
-    # Elementary: 4-6, Junior High: 7-9, Senior High: 10
-    philiri_elementary_grades = [g for g in [4, 5, 6] if g in school_grades] if school_grades else []
-    # Include Grade 10 with the junior high grouping so the matrix renders its inputs
-    philiri_junior_grades = [g for g in [7, 8, 9, 10] if g in school_grades] if school_grades else []
-    philiri_senior_grades = [g for g in [10] if g in school_grades] if school_grades else []
-    
-    slp_rows_queryset = list(slp_formset.queryset)
-    slp_dnme_summary = build_slp_dnme_summary(slp_rows_queryset)
-    slp_outstanding_summary = build_slp_outstanding_summary(slp_rows_queryset)
-    slp_dnme_recommendations = build_slp_dnme_recommendations(slp_rows_queryset)
+@login_required
+@require_http_methods(["PATCH", "POST"])
+@require_school_head(submission_kwarg="submission_id")
+def autosave_submission(request, submission_id, submission_obj=None):
+    """Apply field-level autosave changes sent as JSON (see submissions.autosave).
 
-    # Compute dynamic progress width for current tab
+    With ``"buffer": true`` the changes only go to the draft buffer
+    (submissions.drafts); otherwise buffered cells are applied along with them.
+    """
+    submission = submission_obj or get_object_or_404(Submission, pk=submission_id)
+    if not submission.is_editable_by_school():
+        return JsonResponse({"error": "Submission is read-only."}, status=403)
     try:
-        current_index = next((i for i, t in enumerate(tabs) if t["key"] == current_tab), 0)
-    except Exception:
-        current_index = 0
-    denom = max(1, len(tabs) - 1)
-    progress_width = int(round((current_index / denom) * 100)) if denom else 100
+        payload = json.loads(request.body or b"{}")
+        changes = submission_autosave.parse_changes(payload)
+    except (ValueError, ValidationError) as exc:
+        message = "; ".join(exc.messages) if isinstance(exc, ValidationError) else "Invalid JSON body."
+        return JsonResponse({"error": message}, status=400)
+
+    t0 = time.perf_counter()
+    if payload.get("buffer"):
+        # Periodic autosave: keep the cells in the draft buffer (one small
+        # write) and leave the Form 1 tables untouched until a flush.
+        buffered = coordinated_write(submission_drafts.buffer_changes)(submission, changes, request.user)
+        logger.info(
+            "[PERF][AUTOSAVE] submission=%s changes=%d buffered=%s unchanged=%s %.2f ms",
+            submission.pk, len(changes), ",".join(buffered.buffered_tabs) or "-",
+            ",".join(buffered.unchanged_tabs) or "-", (time.perf_counter() - t0) * 1000,
+        )
+        return JsonResponse(buffered.as_dict())
 
-    ctx = {
-        "submission": submission,
-        "timeline_entries": timeline_entries,
-        "projects": projects,
-        "tabs": tabs,
-        "current_tab": current_tab,
-        "can_edit": can_edit,
-        "can_submit": can_submit,
-        "pct_formset": pct_formset,
-        "slp_formset": slp_formset,
-        "slp_top_dnme_formset": slp_top_dnme_formset,
-        "slp_top_outstanding_formset": slp_top_outstanding_formset,
-        "reading_crla_formset": reading_crla_formset,
-        "reading_philiri_formset": reading_philiri_formset,
-        "reading_intervention_formset": reading_intervention_formset,
-        "reading_crla_new_formset": reading_crla_new_formset,
-        "reading_philiri_new_formset": reading_philiri_new_formset,
-        "reading_interventions_new_formset": reading_interventions_new_formset,
-        "selected_reading_period": selected_reading_period,
-        "rma_row_formset": rma_row_formset,
-        "rma_intervention_formset": rma_intervention_formset,
-        "supervision_formset": supervision_formset,
-        "signatories_form": signatories_form,
-        "adm_header_form": adm_header_form,
-        "adm_formset": adm_formset,
-        "adm_is_offered": adm_is_offered,
-        "projects_formset": projects_formset,
-        "activity_formsets": activity_formsets,
-        "expected_timings": json.dumps(expected_timings),
-        "expected_timings_json": json.dumps(expected_timings),
-        "grade_span_label": school.grade_span_label if school else "",
-        "school_profile": school_profile,
-        "school_profile_strands": school_profile_strands,
-    # JSON for client-side hiding of unselected specializations
-    "shs_selected_prefixes_json": json.dumps(shs_selected_prefixes),
-    "shs_unselected_prefixes_json": json.dumps(shs_unselected_prefixes),
-    "shs_selected_labels": shs_selected_labels,
-    "shs_selected_labels_join": ", ".join(shs_selected_labels) if shs_selected_labels else "",
-        "crla_grades": crla_grades,
-        "philiri_elementary_grades": philiri_elementary_grades,
-        "philiri_junior_grades": philiri_junior_grades,
-        "philiri_senior_grades": philiri_senior_grades,
-        "school_grades": school_grades,
-        "slp_dnme_summary": slp_dnme_summary,
-        "slp_dnme_recommendations": slp_dnme_recommendations,
-        "slp_outstanding_summary": slp_outstanding_summary,
-    # SHS strands: bulk actions removed; School Profile governs defaults
-        # Helper list for template condition (avoid parentheses in template logic)
-        "shs_grades": ["Grade 11", "Grade 12"],
-        # Provide tabs JSON for dynamic JS ordering
-        "tabs_json": json.dumps(tabs),
-        "progress_width": progress_width,
-        # Reading difficulties serialized storage
-        "reading_difficulties_json_dump": json.dumps(submission.data.get('reading_difficulties_json', [])),
-        "reading_difficulties_json": submission.data.get('reading_difficulties_json', []),
-        # RMA structured difficulties storage (Pre-Test/Q3, EOSY/Q1)
-        "rma_pretest_json_dump": json.dumps(submission.data.get('rma_pretest_json', [])),
-        "rma_eosy_json_dump": json.dumps(submission.data.get('rma_eosy_json', [])),
-        # Provide simple grade range for Reading Difficulties builder
-    # Provide only Grades 1-10 actually offered by the school for Reading Difficulties builder
-    "reading_grade_range": [g for g in school_grades if 1 <= g <= 10],
-    }
-    return render(request, "submissions/edit_submission.html", ctx)
+    result = coordinated_write(submission_drafts.flush_draft_buffers)(submission, changes=changes, user=request.user)
+    logger.info(
+        "[PERF][AUTOSAVE] submission=%s changes=%d rows=%d conflicts=%d errors=%d %.2f ms",
+        submission.pk, len(changes), result.updated_rows, len(result.conflicts), len(result.errors),
+        (time.perf_counter() - t0) * 1000,
+    )
+    return JsonResponse(result.as_dict(), status=200 if result.ok else 409 if result.conflicts else 422)
 
 
 @login_required
@@ -1855,6 +2003,7 @@ def add_project(request, submission_id, submission_obj=None):
             project = form.save(commit=False)
             project.submission = submission
             project.save()
+            submission.refresh_completion(["projects"])
             messages.success(request, "Project added.")
             return redirect("edit_submission", submission_id=submission.pk)
     else:
@@ -1880,6 +2029,7 @@ def add_activity(request, project_id):
             activity = form.save(commit=False)
             activity.project = project
             activity.save()
+            project.submission.refresh_completion(["projects"])
             messages.success(request, "Activity added.")
             return redirect("edit_submission", submission_id=project.submission.pk)
     else:
@@ -1917,6 +2067,21 @@ def delete_attachment(request, submission_id, attachment_id, submission_obj=None
     )
 
 
+REVIEW_QUEUE_PAGE_SIZE = 50
+
+
+class KnownCountPaginator(Paginator):
+    """Paginator that takes the total from the caller instead of running ``COUNT(*)``."""
+
+    def __init__(self, object_list, per_page, *, count: int, **kwargs):
+        super().__init__(object_list, per_page, **kwargs)
+        self._known_count = count
+
+    @cached_property
+    def count(self) -> int:
+        return self._known_count
+
+
 @login_required
 def review_queue(request, section_code):
     section = get_object_or_404(Section, code__iexact=section_code)
@@ -1947,32 +2112,58 @@ def review_queue(request, section_code):
     # Handle separate school year and quarter filters
     school_year = request.GET.get("school_year")
     quarter = request.GET.get("quarter")
+    period_filters = {}
     
     if school_year:
-        base_qs = base_qs.filter(period__school_year_start=school_year)
+        period_filters["period__school_year_start"] = school_year
     
     if quarter:
-        base_qs = base_qs.filter(period__quarter_tag=quarter)
+        period_filters["period__quarter_tag"] = quarter
 
     # Legacy period_id filter support (for backwards compatibility)
     period_id = request.GET.get("period_id")
     if period_id:
-        base_qs = base_qs.filter(period_id=period_id)
+        period_filters["period_id"] = period_id
+    base_qs = base_qs.filter(**period_filters)
 
     search_query = request.GET.get("q", "").strip()
     if search_query:
+        # School documents cover name, code and the head's name and contact; form documents the title.
         base_qs = base_qs.filter(
-            Q(school__name__icontains=search_query)
-            | Q(form_template__title__icontains=search_query)
+            Q(school_id__in=search.search_ids(SCHOOL_DOCUMENTS, search_query))
+            | Q(form_template_id__in=search.search_ids(FORM_DOCUMENTS, search_query))
         )
 
-    submissions = base_qs.filter(status=status)
-
+    # Tab counts come from the status counters unless a search (or a school-only scope) needs a real count.
+    counters = None if search_query else account_scope.scope_status_counters(user)
+    if counters is not None:
+        counts_by_status = submission_counters.status_counts(counters.filter(section=section, **period_filters))
+    else:
+        counts_by_status = dict(base_qs.order_by().values_list("status").annotate(total=Count("pk")))
     tab_counts = {
-        key: base_qs.filter(status=value).count()
+        key: counts_by_status.get(value, 0)
         for key, value in status_map.items()
     }
 
+    sort = request.GET.get("sort", "")
+    submissions_qs = base_qs.filter(status=status)
+    if sort in ("progress", "-progress"):
+        fill_missing_snapshots(submissions_qs)
+    if sort == "progress":
+        submissions_qs = submissions_qs.order_by("-completion_progress", "-submitted_at")
+    elif sort == "-progress":
+        submissions_qs = submissions_qs.order_by("completion_progress", "-submitted_at")
+    paginator = KnownCountPaginator(
+        submissions_qs, REVIEW_QUEUE_PAGE_SIZE, count=counts_by_status.get(status, 0)
+    )
+    page_obj = paginator.get_page(request.GET.get("page"))
+    submissions = list(page_obj.object_list)
+    completion_by_id = completion_summaries(submissions)
+    for submission in submissions:
+        submission.completion = completion_by_id[submission.id]
+    page_query = request.GET.copy()
+    page_query.pop("page", None)
+
     # Get available school years and quarters for filters
     available_periods = Period.objects.filter(is_active=True).order_by("-school_year_start", "-display_order")
     available_school_years = sorted(set(p.school_year_start for p in available_periods), reverse=True)
@@ -1999,25 +2190,42 @@ def review_queue(request, section_code):
     if reviewer_role:
         today = timezone.localdate()
         week_start = today - datetime.timedelta(days=today.weekday())
+        submitted_today = Q(status=Submission.Status.SUBMITTED, submitted_at__date=today)
+        noted_this_week = Q(status=Submission.Status.NOTED, noted_at__date__gte=week_start)
+        # The range pre-filter lets the (status, submitted_at) / (status, noted_at) indexes do the work.
+        day_start = timezone.make_aware(datetime.datetime.combine(today, datetime.time.min))
+        week_start_at = timezone.make_aware(datetime.datetime.combine(week_start, datetime.time.min))
+        recent = base_qs.order_by().filter(
+            Q(status=Submission.Status.SUBMITTED, submitted_at__gte=day_start)
+            | Q(status=Submission.Status.NOTED, noted_at__gte=week_start_at)
+        ).aggregate(
+            submitted_today=Count("pk", filter=submitted_today),
+            noted_this_week=Count("pk", filter=noted_this_week),
+        )
         quick_stats = {
             "pending_total": tab_counts.get("pending", 0),
-            "submitted_today": base_qs.filter(status=Submission.Status.SUBMITTED, submitted_at__date=today).count(),
+            "submitted_today": recent["submitted_today"],
             "returned_total": tab_counts.get("returned", 0),
-            "noted_this_week": base_qs.filter(status=Submission.Status.NOTED, noted_at__date__gte=week_start).count(),
+            "noted_this_week": recent["noted_this_week"],
         }
 
     ctx = {
         "section": section,
         "tab": tab,
         "submissions": submissions,
+        "page_obj": page_obj,
+        "page_query": page_query.urlencode(),
         "periods": Period.objects.order_by("-school_year_start", "-display_order"),
         "period_id": period_id or "",
         "search_query": search_query,
+        "sort": sort,
         "selected_period": selected_period,
         "tab_counts": tab_counts,
         "district_dashboard_url": reverse("district_submission_gaps"),
         "smme_dashboard_url": reverse("smme_kpi_dashboard"),
         "quick_stats": quick_stats,
+        "bulk_review_enabled": is_section_admin and status == Submission.Status.SUBMITTED,
+        "bulk_review_limit": submission_bulk_review.MAX_BULK_REVIEW,
         # New filter data
         "available_school_years": available_school_years,
         "available_quarters": available_quarters,
@@ -2028,144 +2236,47 @@ def review_queue(request, section_code):
 
 
 @login_required
-@require_section_admin(submission_kwarg="submission_id")
-def review_detail(request, submission_id, submission_obj=None):
-    project_prefetch = Prefetch(
-        "smea_projects",
-        queryset=SMEAProject.objects.prefetch_related("activities").order_by("id"),
-    )
-    slp_llc_prefetch = Prefetch(
-        "slp_llc_entries",
-        queryset=Form1SLPLLCEntry.objects.order_by("order"),
-    )
-    slp_top_dnme_prefetch = Prefetch(
-        "form1_slp_top_dnme",
-        queryset=Form1SLPTopDNME.objects.order_by("position"),
-    )
-    slp_top_outstanding_prefetch = Prefetch(
-        "form1_slp_top_outstanding",
-        queryset=Form1SLPTopOutstanding.objects.order_by("position"),
-    )
-    pct_row_prefetch = Prefetch(
-        "form1_pct__rows",
-        queryset=Form1PctRow.objects.order_by("area"),
-    )
-    legacy_crla_prefetch = Prefetch(
-        "form1_crla",
-        queryset=Form1ReadingCRLA.objects.order_by("level", "timing", "subject", "band"),
-    )
-    legacy_philiri_prefetch = Prefetch(
-        "form1_philiri",
-        queryset=Form1ReadingPHILIRI.objects.order_by("level", "timing", "language"),
-    )
-    legacy_reading_interventions_prefetch = Prefetch(
-        "form1_reading_interventions",
-        queryset=Form1ReadingIntervention.objects.order_by("order"),
-    )
-    crla_level_order = Case(
-        When(level="low_emerging", then=1),
-        When(level="high_emerging", then=2),
-        When(level="developing", then=3),
-        When(level="transitioning", then=4),
-        default=99,
-        output_field=IntegerField(),
-    )
-    philiri_level_order = Case(
-        When(level="frustration", then=1),
-        When(level="instructional", then=2),
-        When(level="independent", then=3),
-        default=99,
-        output_field=IntegerField(),
-    )
-    assessment_period_order = Case(
-        When(period="bosy", then=0),
-        When(period="mosy", then=1),
-        When(period="eosy", then=2),
-        default=99,
-        output_field=IntegerField(),
-    )
-    matrix_crla_prefetch = Prefetch(
-        "crla_assessments",
-        queryset=ReadingAssessmentCRLA.objects.annotate(
-            period_order=assessment_period_order,
-            level_order=crla_level_order,
-        ).order_by("period_order", "level_order"),
-    )
-    matrix_philiri_prefetch = Prefetch(
-        "philiri_assessments",
-        queryset=ReadingAssessmentPHILIRI.objects.annotate(
-            period_order=assessment_period_order,
-            level_order=philiri_level_order,
-        ).order_by("period_order", "level_order"),
-    )
-    matrix_interventions_prefetch = Prefetch(
-        "reading_interventions_new",
-        queryset=ReadingInterventionNew.objects.order_by("order"),
-    )
-    rma_grade_order = Case(
-        When(grade_label="k", then=0),
-        When(grade_label="g1", then=1),
-        When(grade_label="g2", then=2),
-        When(grade_label="g3", then=3),
-        When(grade_label="g4", then=4),
-        When(grade_label="g5", then=5),
-        When(grade_label="g6", then=6),
-        When(grade_label="g7", then=7),
-        When(grade_label="g8", then=8),
-        When(grade_label="g9", then=9),
-        When(grade_label="g10", then=10),
-        default=99,
-        output_field=IntegerField(),
-    )
-    rma_rows_prefetch = Prefetch(
-        "form1_rma_rows",
-        queryset=Form1RMARow.objects.annotate(order_key=rma_grade_order).order_by("order_key", "id"),
-    )
-    rma_interventions_prefetch = Prefetch(
-        "form1_rma_interventions",
-        queryset=Form1RMAIntervention.objects.order_by("order"),
+@require_http_methods(["POST"])
+@require_section_admin()
+def review_queue_bulk(request, section_code, section_obj=None):
+    """Note or return the submissions ticked on the pending tab of ``review_queue``."""
+    section = section_obj or get_object_or_404(Section, code__iexact=section_code)
+    queue_url = f"{reverse('review_queue', args=[section.code])}?tab=pending"
+    form = BulkSubmissionReviewForm(request.POST)
+    if not form.is_valid():
+        for errors in form.errors.values():
+            for error in errors:
+                messages.error(request, error)
+        return redirect(queue_url)
+
+    action = form.cleaned_data["action"]
+    submissions = account_scope.scope_submissions(request.user).filter(
+        form_template__section=section, pk__in=form.cleaned_data["submission_ids"]
     )
-    supervision_prefetch = Prefetch(
-        "form1_supervision_rows",
-        queryset=Form1SupervisionRow.objects.order_by("grade_label", "id"),
-    )
-    adm_rows_prefetch = Prefetch(
-        "form1_adm_rows",
-        queryset=Form1ADMRow.objects.order_by("id"),
-    )
-
-    submission_qs = (
-        Submission.objects.select_related(
-            "school",
-            "form_template",
-            "period",
-            "form1_pct",
-            "form1_slp_analysis",
-            "form1_signatories",
-            "form1_adm_header",
+    try:
+        result = submission_bulk_review.bulk_review(
+            submissions, action, request.user, form.cleaned_data["remarks"]
         )
-        .prefetch_related(
-            "timeline__actor",
-            "attachments",
-            project_prefetch,
-            slp_llc_prefetch,
-            slp_top_dnme_prefetch,
-            slp_top_outstanding_prefetch,
-            pct_row_prefetch,
-            legacy_crla_prefetch,
-            legacy_philiri_prefetch,
-            legacy_reading_interventions_prefetch,
-            matrix_crla_prefetch,
-            matrix_philiri_prefetch,
-            matrix_interventions_prefetch,
-            rma_rows_prefetch,
-            rma_interventions_prefetch,
-            supervision_prefetch,
-            adm_rows_prefetch,
+    except ValidationError as exc:
+        messages.error(request, exc.message)
+        return redirect(queue_url)
+
+    verb = "marked as noted" if action == SubmissionReviewForm.ACTION_NOTE else "returned to their schools"
+    messages.success(request, f"{len(result.transitioned)} submissions {verb}.")
+    skipped = len(form.cleaned_data["submission_ids"]) - len(result.transitioned)
+    if skipped:
+        messages.warning(
+            request,
+            f"{skipped} selected submissions were skipped: they are no longer pending or are outside your review scope.",
         )
-    )
+    return redirect(queue_url)
+
+
+@login_required
+@require_section_admin(submission_kwarg="submission_id")
+def review_detail(request, submission_id, submission_obj=None):
     submission = submission_obj or get_object_or_404(
-        submission_qs,
+        Submission.objects.select_related("school", "form_template__section", "period", "snapshot"),
         pk=submission_id,
     )
 
@@ -2188,157 +2299,25 @@ def review_detail(request, submission_id, submission_obj=None):
             else:
                 return redirect("review_queue", section_code=submission.form_template.section.code)
 
-    projects = list(submission.smea_projects.all())
-    attachments = list(submission.attachments.all())
-    school_profile = getattr(submission.school, "profile", None)
-    # --- Clean & normalize SHS strands for display (avoid serialized noise) ---
-    def _clean_strands(raw):
-        if not raw:
-            return []
-        valid_codes = {c for (c, _l, _p) in smea_constants.SHS_STRANDS}
-        label_for_code = {c: l for (c, l, _p) in smea_constants.SHS_STRANDS}
-        # Accept either codes or labels; ignore malformed entries containing excessive quoting/brackets
-        cleaned_codes = []
-        for item in raw:
-            if not item:
-                continue
-            s = str(item).strip()
-            if any(ch in s for ch in ['\\\\\\\\', '[', ']', '""', "']"]):
-                # Skip obviously corrupted serialized artifacts
-                continue
-            lower = s.lower()
-            if lower in valid_codes:
-                cleaned_codes.append(lower)
-            else:
-                # Match by label (case-insensitive)
-                for code, label in label_for_code.items():
-                    if lower == label.lower():
-                        cleaned_codes.append(code)
-                        break
-        # De-duplicate preserving original order
-        seen = set()
-        ordered = []
-        for code in cleaned_codes:
-            if code not in seen:
-                seen.add(code)
-                ordered.append(code)
-        return [label_for_code[c] for c in ordered]
-    raw_strands = getattr(school_profile, 'strands', None) if school_profile else None
-    school_profile_strands_list = _clean_strands(raw_strands)
-    school_profile_strands = ", ".join(school_profile_strands_list)
-
-    slp_rows = list(ordered_slp_rows(submission))
-    # Contextualize SLP: limit to school's grade span and SHS-offered specializations
-    try:
-        allowed_grades = set(grade_numbers_for_school(submission.school))
-    except Exception:
-        allowed_grades = None
-    # Build SHS strand prefix allow-list if the school has declared strands
-    try:
-        profile = getattr(submission.school, "profile", None)
-        raw_strands = set(getattr(profile, "strands", []) or [])
-        code_to_prefix = {c: p for (c, _l, p) in smea_constants.SHS_STRANDS}
-        label_to_code = {l: c for (c, l, _p) in smea_constants.SHS_STRANDS}
-        selected_codes = set()
-        for item in raw_strands:
-            if item in code_to_prefix:
-                selected_codes.add(item)
-            elif item in label_to_code:
-                selected_codes.add(label_to_code[item])
-        allowed_prefixes = {code_to_prefix[c] for c in selected_codes if c in code_to_prefix}
-        all_spec_prefixes = tuple(p for (_c, _l, p) in smea_constants.SHS_STRANDS)
-    except Exception:
-        allowed_prefixes = set()
-        all_spec_prefixes = tuple()
-
-    def _gnum(label: str):
-        return smea_constants.GRADE_LABEL_TO_NUMBER.get(label)
-
-    def _is_specialized(code: str) -> bool:
-        sc = (code or '').strip()
-        return any(sc.startswith(p) for p in all_spec_prefixes)
-
-    filtered_slp_rows = []
-    for r in slp_rows:
-        # Respect offered flag
-        if hasattr(r, 'is_offered') and not r.is_offered:
-            continue
-        gnum = _gnum(r.grade_label)
-        if allowed_grades is not None and gnum is not None and gnum not in allowed_grades:
-            continue
-        # If the school declared SHS strands, restrict specialized G11/G12 subjects to those strands only
-        if gnum in (11, 12) and _is_specialized(r.subject) and allowed_prefixes:
-            if not any((r.subject or '').startswith(p) for p in allowed_prefixes):
-                continue
-        filtered_slp_rows.append(r)
-
-    slp_rows = filtered_slp_rows
-    slp_dnme_summary = build_slp_dnme_summary(slp_rows)
-    slp_outstanding_summary = build_slp_outstanding_summary(slp_rows)
-    slp_dnme_recommendations = build_slp_dnme_recommendations(slp_rows)
-    slp_llc_entries = list(submission.slp_llc_entries.all())
-    slp_top_dnme = list(submission.form1_slp_top_dnme.all())
-    slp_top_outstanding = list(submission.form1_slp_top_outstanding.all())
-    slp_analysis = getattr(submission, "form1_slp_analysis", None)
-
-    pct_header = getattr(submission, "form1_pct", None)
-    pct_rows = list(pct_header.rows.all()) if pct_header else []
-
-    legacy_crla_entries = list(submission.form1_crla.all())
-    legacy_philiri_entries = list(submission.form1_philiri.all())
-    legacy_reading_interventions = list(submission.form1_reading_interventions.all())
-
-    matrix_crla_entries = list(submission.crla_assessments.all())
-    matrix_philiri_entries = list(submission.philiri_assessments.all())
-    matrix_reading_interventions = list(submission.reading_interventions_new.all())
-
-    # --- Contextual RMA rows: restrict to school's grade span & ordered lowest→highest ---
-    rma_rows_all = list(submission.form1_rma_rows.all())
-    try:
-        allowed_grade_numbers = set(grade_numbers_for_school(submission.school))
-    except Exception:
-        allowed_grade_numbers = None
-    rma_code_to_num = {"k": 0, "g1": 1, "g2": 2, "g3": 3, "g4": 4, "g5": 5, "g6": 6, "g7": 7, "g8": 8, "g9": 9, "g10": 10}
-    def _include_rma_row(row):
-        num = rma_code_to_num.get(row.grade_label)
-        if num is None:
-            return False
-        if allowed_grade_numbers is not None and num not in allowed_grade_numbers:
-            return False
-        return True
-    rma_rows = sorted([r for r in rma_rows_all if _include_rma_row(r)], key=lambda r: rma_code_to_num.get(r.grade_label, 999))
-    rma_interventions = list(submission.form1_rma_interventions.all())
-    supervision_rows = list(submission.form1_supervision_rows.all())
-    adm_rows = list(submission.form1_adm_rows.all())
-    adm_header = getattr(submission, "form1_adm_header", None)
-    signatories = getattr(submission, "form1_signatories", None)
+    def fragment_context():
+        review = submission_snapshots.review_data(submission)
+        slp_rows = review["slp_rows"]
+        return {
+            **review,
+            "submission": submission,
+            "attachments": list(submission.attachments.all()),
+            "timeline_entries": submission.timeline.select_related("actor"),
+            "slp_dnme_summary": build_slp_dnme_summary(slp_rows),
+            "slp_dnme_recommendations": build_slp_dnme_recommendations(slp_rows),
+            "slp_outstanding_summary": build_slp_outstanding_summary(slp_rows),
+        }
 
+    fragments = submission_fragments.render_fragments(submission, ["detail"], fragment_context)
     ctx = {
         "submission": submission,
-        "projects": projects,
-        "attachments": attachments,
-        "timeline_entries": submission.timeline.all(),
+        "timeline_entries": submission.timeline.select_related("actor"),
         "review_form": review_form,
-        "school_profile": school_profile,
-        "school_profile_strands": school_profile_strands,
-        "slp_rows": slp_rows,
-        "slp_llc_entries": slp_llc_entries,
-        "pct_rows": pct_rows,
-        "slp_dnme_summary": slp_dnme_summary,
-        "slp_dnme_recommendations": slp_dnme_recommendations,
-        "slp_outstanding_summary": slp_outstanding_summary,
-        "legacy_crla_entries": legacy_crla_entries,
-        "legacy_philiri_entries": legacy_philiri_entries,
-        "legacy_reading_interventions": legacy_reading_interventions,
-        "matrix_crla_entries": matrix_crla_entries,
-        "matrix_philiri_entries": matrix_philiri_entries,
-        "matrix_reading_interventions": matrix_reading_interventions,
-        "rma_rows": rma_rows,
-        "rma_interventions": rma_interventions,
-        "supervision_rows": supervision_rows,
-        "adm_rows": adm_rows,
-        "adm_header": adm_header,
-        "signatories": signatories,
+        "body_html": fragments["detail"],
     }
     return render(request, "submissions/review_detail.html", ctx)
 
@@ -2346,25 +2325,9 @@ def review_detail(request, submission_id, submission_obj=None):
 
 @login_required
 def review_submission_tabs(request, submission_id):
-    submission_qs = account_scope.scope_submissions(request.user).select_related("school", "form_template__section", "period")
-    submission_qs = submission_qs.select_related("form1_pct", "form1_slp_analysis", "form1_signatories")
-    submission_qs = submission_qs.prefetch_related(
-        "timeline__actor",
-        "smea_projects__activities",
-        "form1_pct__rows",
-        "form1_slp_rows",
-        "form1_slp_top_dnme",
-        "form1_slp_top_outstanding",
-        "form1_crla",
-        "form1_philiri",
-        "form1_reading_interventions",
-        "form1_rma_rows",
-        "form1_rma_interventions",
-        "form1_supervision_rows",
-        "form1_adm_rows",
-        "attachments",
+    submission_qs = account_scope.scope_submissions(request.user).select_related(
+        "school", "form_template__section", "period", "snapshot"
     )
-
     submission = get_object_or_404(submission_qs, pk=submission_id)
     section = submission.form_template.section
 
@@ -2380,146 +2343,53 @@ def review_submission_tabs(request, submission_id):
     if current_tab not in tab_keys:
         current_tab = tab_keys[0]
 
-    timeline_entries = submission.timeline.all()
-    projects = submission.smea_projects.all()
-    pct_header = getattr(submission, "form1_pct", None)
-    pct_rows = list(pct_header.rows.all()) if pct_header else []
-
-    slp_rows = list(ordered_slp_rows(submission))
-    # Contextualize SLP similarly in tabs view
-    try:
-        allowed_grades = set(grade_numbers_for_school(submission.school))
-    except Exception:
-        allowed_grades = None
-    try:
-        profile = getattr(submission.school, 'profile', None)
-        raw_strands = set(getattr(profile, 'strands', []) or [])
-        code_to_prefix = {c: p for (c, _l, p) in smea_constants.SHS_STRANDS}
-        label_to_code = {l: c for (c, l, _p) in smea_constants.SHS_STRANDS}
-        selected_codes = set()
-        for item in raw_strands:
-            if item in code_to_prefix:
-                selected_codes.add(item)
-            elif item in label_to_code:
-                selected_codes.add(label_to_code[item])
-        allowed_prefixes = {code_to_prefix[c] for c in selected_codes if c in code_to_prefix}
-        all_spec_prefixes = tuple(p for (_c, _l, p) in smea_constants.SHS_STRANDS)
-    except Exception:
-        allowed_prefixes = set()
-        all_spec_prefixes = tuple()
-
-    def _gnum2(label: str):
-        return smea_constants.GRADE_LABEL_TO_NUMBER.get(label)
-
-    def _is_spec2(code: str) -> bool:
-        sc = (code or '').strip()
-        return any(sc.startswith(p) for p in all_spec_prefixes)
-
-    slp_rows = [
-        r for r in slp_rows
-        if (not hasattr(r, 'is_offered') or r.is_offered)
-        and (allowed_grades is None or (_gnum2(r.grade_label) is None or _gnum2(r.grade_label) in allowed_grades))
-        and (not (_gnum2(r.grade_label) in (11, 12) and _is_spec2(r.subject) and allowed_prefixes and not any((r.subject or '').startswith(p) for p in allowed_prefixes)))
-    ]
-
-    slp_dnme_summary = build_slp_dnme_summary(slp_rows)
-    slp_outstanding_summary = build_slp_outstanding_summary(slp_rows)
-    slp_dnme_recommendations = build_slp_dnme_recommendations(slp_rows)
-    slp_analysis = getattr(submission, "form1_slp_analysis", None)
-    slp_top_dnme = list(submission.form1_slp_top_dnme.all())
-    slp_top_outstanding = list(submission.form1_slp_top_outstanding.all())
-
-    reading_crla = list(submission.form1_crla.all())
-    reading_philiri = list(submission.form1_philiri.all())
-    reading_interventions = list(submission.form1_reading_interventions.all())
-    school_profile = getattr(submission.school, "profile", None)
-    # Clean strands again for tabs view
-    def _clean_strands_tabs(raw):
-        if not raw:
-            return []
-        valid_codes = {c for (c, _l, _p) in smea_constants.SHS_STRANDS}
-        label_for_code = {c: l for (c, l, _p) in smea_constants.SHS_STRANDS}
-        cleaned_codes = []
-        for item in raw:
-            if not item:
-                continue
-            s = str(item).strip()
-            if any(ch in s for ch in ['\\\\\\\\', '[', ']', '""', "']"]):
-                continue
-            lower = s.lower()
-            if lower in valid_codes:
-                cleaned_codes.append(lower)
-            else:
-                for code, label in label_for_code.items():
-                    if lower == label.lower():
-                        cleaned_codes.append(code)
-                        break
-        seen = set(); ordered=[]
-        for code in cleaned_codes:
-            if code not in seen:
-                seen.add(code); ordered.append(code)
-        return ", ".join(label_for_code[c] for c in ordered)
-    school_profile_strands = _clean_strands_tabs(getattr(school_profile, 'strands', None))
-
-    # Contextual + ordered RMA rows for tabs view
-    rma_rows_all = list(submission.form1_rma_rows.all())
-    try:
-        allowed_grade_numbers = set(grade_numbers_for_school(submission.school))
-    except Exception:
-        allowed_grade_numbers = None
-    rma_code_to_num = {"k": 0, "g1": 1, "g2": 2, "g3": 3, "g4": 4, "g5": 5, "g6": 6, "g7": 7, "g8": 8, "g9": 9, "g10": 10}
-    def _include_rma_row(row):
-        num = rma_code_to_num.get(row.grade_label)
-        if num is None:
-            return False
-        if allowed_grade_numbers is not None and num not in allowed_grade_numbers:
-            return False
-        return True
-    rma_rows = sorted([r for r in rma_rows_all if _include_rma_row(r)], key=lambda r: rma_code_to_num.get(r.grade_label, 999))
-    rma_interventions = list(submission.form1_rma_interventions.all())
-
-    supervision_rows = list(submission.form1_supervision_rows.all())
-    signatories = getattr(submission, "form1_signatories", None)
-
-    adm_rows = list(submission.form1_adm_rows.all())  # Show ADM rows for all schools
-    adm_header = getattr(submission, "form1_adm_header", None)
-
-    attachments = list(submission.attachments.all())
+    def fragment_context():
+        review = submission_snapshots.review_data(submission)
+        slp_rows = review["slp_rows"]
+        return {
+            "submission": submission,
+            "current_tab": current_tab,
+            "timeline_entries": submission.timeline.select_related("actor"),
+            "projects": review["projects"],
+            "pct_header": review["pct_header"],
+            "pct_rows": review["pct_rows"],
+            "slp_rows": slp_rows,
+            "slp_dnme_recommendations": build_slp_dnme_recommendations(slp_rows),
+            "slp_dnme_summary": build_slp_dnme_summary(slp_rows),
+            "slp_outstanding_summary": build_slp_outstanding_summary(slp_rows),
+            "slp_top_dnme": review["slp_top_dnme"],
+            "slp_top_outstanding": review["slp_top_outstanding"],
+            "reading_crla": review["legacy_crla_entries"],
+            "reading_philiri": review["legacy_philiri_entries"],
+            "reading_interventions": review["legacy_reading_interventions"],
+            "rma_rows": review["rma_rows"],
+            "rma_interventions": review["rma_interventions"],
+            "supervision_rows": review["supervision_rows"],
+            "signatories": review["signatories"],
+            "adm_rows": review["adm_rows"],
+            "adm_header": review["adm_header"],
+            "attachments": list(submission.attachments.all()),
+            "grade_span_label": review["grade_span_label"],
+            "school_profile": review["school_profile"],
+            "school_profile_strands": review["school_profile_strands"],
+        }
 
+    fragments = submission_fragments.render_fragments(
+        submission, ["tabs-summary", f"tabs-panel:{current_tab}"], fragment_context
+    )
     ctx = {
         "submission": submission,
         "tabs": tabs,
         "current_tab": current_tab,
-        "timeline_entries": timeline_entries,
-        "projects": projects,
-        "pct_header": pct_header,
-        "pct_rows": pct_rows,
-        "slp_rows": slp_rows,
-        "slp_dnme_recommendations": slp_dnme_recommendations,
-        "slp_dnme_summary": slp_dnme_summary,
-        "slp_outstanding_summary": slp_outstanding_summary,
-        "slp_analysis": slp_analysis,
-        "slp_top_dnme": slp_top_dnme,
-        "slp_top_outstanding": slp_top_outstanding,
-        "reading_crla": reading_crla,
-        "reading_philiri": reading_philiri,
-        "reading_interventions": reading_interventions,
-        "rma_rows": rma_rows,
-        "rma_interventions": rma_interventions,
-        "supervision_rows": supervision_rows,
-        "signatories": signatories,
-        "adm_rows": adm_rows,
-        "adm_header": adm_header,
-        "attachments": attachments,
+        "timeline_entries": submission.timeline.select_related("actor"),
+        "summary_html": fragments["tabs-summary"],
+        "panel_html": fragments[f"tabs-panel:{current_tab}"],
         "is_section_admin": account_services.user_is_section_admin(request.user, section),
         "is_psds": account_services.user_is_psds(request.user),
-        "grade_span_label": submission.school.grade_span_label if submission.school else "",
         "review_url": reverse("review_detail", args=[submission.id]),
         "queue_url": reverse("review_queue", args=[section.code]),
         "district_dashboard_url": reverse("district_submission_gaps"),
         "smme_dashboard_url": reverse("smme_kpi_dashboard"),
-        "school_profile": school_profile,
-        "school_profile_strands": school_profile_strands,
         "export_urls": {
             "csv": f"{reverse('review_submission_export', args=[submission.id, 'csv'])}?tab={current_tab}",
             "xlsx": f"{reverse('review_submission_export', args=[submission.id, 'xlsx'])}?tab={current_tab}",
@@ -2535,7 +2405,10 @@ def review_submission_export(request, submission_id, file_format):
     if file_format not in allowable_formats:
         raise PermissionDenied("Unsupported export format.")
 
-    submission_qs = account_scope.scope_submissions(request.user).select_related("school", "period", "form_template__section")
+    # The snapshot payload is only loaded on an export cache miss.
+    submission_qs = account_scope.scope_submissions(request.user).select_related(
+        "school", "period", "form_template__section"
+    )
     submission = get_object_or_404(submission_qs, pk=submission_id)
     section = submission.form_template.section
 
@@ -2543,32 +2416,29 @@ def review_submission_export(request, submission_id, file_format):
         raise PermissionDenied("Reviewer role required.")
 
     tab = request.GET.get("tab", "slp")
+    renderers = {
+        "csv": submission_exports.render_export_to_csv,
+        "xlsx": submission_exports.render_export_to_xlsx,
+    }
+
+    def render_payload() -> bytes:
+        return renderers[file_format](submission_snapshots.export_for_tab(submission, tab))
+
     try:
-        export_bundle = submission_exports.build_export_for_tab(submission, tab)
+        exported = submission_export_cache.cached_export(submission, tab, file_format, render_payload)
+    except ImportError as exc:
+        messages.error(request, str(exc))
+        return redirect('submission_detail', submission_id=submission_id)
     except Exception as e:
         messages.error(request, f"Error generating export: {str(e)}")
         return redirect('submission_detail', submission_id=submission_id)
 
-    # Render and return the export file
-    if file_format == "csv":
-        payload = submission_exports.render_export_to_csv(export_bundle)
-        response = HttpResponse(payload, content_type="text/csv")
-        filename = f"{export_bundle.filename_prefix}-{tab}.csv"
-        response["Content-Disposition"] = f"attachment; filename=\"{filename}\""
-        return response
-    elif file_format == "xlsx":
-        try:
-            payload = submission_exports.render_export_to_xlsx(export_bundle)
-        except ImportError as exc:
-            messages.error(request, str(exc))
-            return redirect('submission_detail', submission_id=submission_id)
-        response = HttpResponse(
-            payload,
-            content_type="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet",
-        )
-        filename = f"{export_bundle.filename_prefix}-{tab}.xlsx"
+    filename = f"{submission_exports.export_filename_prefix(submission)}-{tab}.{file_format}"
+    if isinstance(exported, bytes):
+        response = HttpResponse(exported, content_type=submission_export_cache.EXPORT_FORMATS[file_format])
         response["Content-Disposition"] = f"attachment; filename=\"{filename}\""
         return response
+    return submission_export_cache.export_file_response(request, exported, filename, file_format)
 
 # ---- SLP (School Learning Progress) Views ----
 